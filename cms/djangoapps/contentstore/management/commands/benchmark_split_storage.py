@@ -0,0 +1,97 @@
+"""
+Django management command to compare the storage of a course's structures in the split Mongo datastore as
+full documents and as deltas (see xmodule.modulestore.split_mongo.mongo_connection).
+"""
+import time
+import uuid
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+
+
+class Command(BaseCommand):
+    "Benchmark the storage of a split Mongo course's structures as full documents and as deltas"
+
+    help = "Compare the size and read time of a split Mongo course's structures as full documents and as deltas"
+    args = "package_id"
+
+    option_list = BaseCommand.option_list + (
+        make_option('--snapshot-interval',
+                    type='int',
+                    dest='snapshot_interval',
+                    default=20,
+                    help='Maximum number of versions between full documents when storing deltas'),
+        make_option('--reads',
+                    type='int',
+                    default=10,
+                    help='Number of times the head versions are read'),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 1:
+            raise CommandError("benchmark_split_storage requires one argument: a package_id")
+        if options['reads'] < 1 or options['snapshot_interval'] < 1:
+            raise CommandError("--reads and --snapshot-interval must be positive")
+
+        db_connection = modulestore('split').db_connection
+        index = db_connection.get_course_index(args[0])
+        if index is None:
+            raise CommandError("No course found with package_id {}".format(args[0]))
+        heads = index['versions'].values()
+        originals = [db_connection.get_structure(head)['original_version'] for head in heads]
+        # ancestors before their successors, as they were written
+        versions = sorted(
+            db_connection.find_matching_structures({'original_version': {'$in': originals}}),
+            key=lambda structure: structure['edited_on']
+        )
+
+        self.stdout.write("{} versions of {}\n".format(len(versions), args[0]))
+        self.stdout.write("{:<8}{:>14}{:>14}{:>16}{:>16}\n".format(
+            'format', 'size (bytes)', 'write (ms)', 'cold read (ms)', 'head read (ms)'
+        ))
+        for delta_structures in (False, True):
+            result = self.benchmark(versions, heads, delta_structures, options)
+            self.stdout.write("{:<8}{:>14}{:>14.2f}{:>16.2f}{:>16.2f}\n".format(
+                'delta' if delta_structures else 'full', *result
+            ))
+
+    def benchmark(self, versions, heads, delta_structures, options):
+        """
+        Write versions to new collections, in the format given by delta_structures, and read them back.
+
+        Returns the size of the structures, the mean time to write a version, the mean time to read each
+        version in turn starting with an empty cache, and the mean time to read a head version again.
+        """
+        doc_store_config = dict(settings.MODULESTORE['split']['DOC_STORE_CONFIG'])
+        doc_store_config.update({
+            'collection': 'benchmark{}'.format(uuid.uuid4().hex[:5]),
+            'delta_structures': delta_structures,
+            'snapshot_interval': options['snapshot_interval'],
+        })
+        connection = MongoConnection(**doc_store_config)  # pylint: disable=W0142
+        try:
+            start = time.time()
+            for structure in versions:
+                connection.insert_structure(structure)
+            write_time = (time.time() - start) / len(versions)
+            size = connection.database.command('collstats', connection.structures.name)['size']
+
+            # a new connection, whose cache is empty
+            connection = MongoConnection(**doc_store_config)  # pylint: disable=W0142
+            start = time.time()
+            for structure in versions:
+                connection.get_structure(structure['_id'])
+            cold_read_time = (time.time() - start) / len(versions)
+
+            start = time.time()
+            for _ in range(options['reads']):
+                for head in heads:
+                    connection.get_structure(head)
+            head_read_time = (time.time() - start) / (options['reads'] * len(heads))
+        finally:
+            connection.database.drop_collection(connection.structures)
+
+        return size, write_time * 1000, cold_read_time * 1000, head_read_time * 1000
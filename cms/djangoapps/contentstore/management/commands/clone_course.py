@@ -7,6 +7,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.django import contentstore
 from xmodule.course_module import CourseDescriptor
 from student.roles import CourseInstructorRole, CourseStaffRole
+from contentstore.utils import update_course_listing
 
 
 #
@@ -35,9 +36,14 @@ class Command(BaseCommand):
         source_location = CourseDescriptor.id_to_location(source_course_id)
         dest_location = CourseDescriptor.id_to_location(dest_course_id)
 
-        if clone_course(mstore, cstore, source_location, dest_location):
+        def print_progress(kind, copied, total):
+            "Report the progress of the clone"
+            print("copied {0} of {1} {2}".format(copied, total, kind))
+
+        if clone_course(mstore, cstore, source_location, dest_location, progress_callback=print_progress):
             # be sure to recompute metadata inheritance after all those updates
             mstore.refresh_cached_metadata_inheritance_tree(dest_location)
+            update_course_listing(mstore.get_course(dest_course_id))
 
             print("copying User permissions...")
             # purposely avoids auth.add_user b/c it doesn't have a caller to authorize
@@ -0,0 +1,60 @@
+"""
+Django management command to delete the old versions of the structures of the courses in the split Mongo
+datastore, and the definitions they no longer use.
+"""
+import datetime
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.split_mongo import compaction
+
+
+class Command(BaseCommand):
+    "Compact the version history of the split Mongo datastore"
+
+    help = (
+        "Delete the old versions of the indexed courses' structures and the unused definitions from split Mongo; "
+        "the history of courses removed from the index is kept"
+    )
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '--keep',
+            type='int',
+            default=compaction.DEFAULT_KEEP_VERSIONS,
+            help='Number of versions to keep before the head of each branch of each course',
+        ),
+        make_option(
+            '--days',
+            type='int',
+            default=compaction.DEFAULT_MIN_AGE.days,
+            help='Keep the versions and definitions younger than this many days',
+        ),
+        make_option(
+            '--dry-run',
+            action='store_true',
+            dest='dry_run',
+            default=False,
+            help='Only report what would be deleted',
+        ),
+    )
+
+    def handle(self, *args, **options):
+        if args:
+            raise CommandError("compact_split_history takes no arguments")
+        if options['keep'] < 0 or options['days'] < 0:
+            raise CommandError("--keep and --days must not be negative")
+
+        report = modulestore('split').compact_history(
+            keep_versions=options['keep'],
+            min_age=datetime.timedelta(days=options['days']),
+            dry_run=options['dry_run'],
+        )
+        self.stdout.write(
+            "{action} {structures} structures and {definitions} definitions, reclaiming {size} bytes\n".format(
+                action="Would delete" if options['dry_run'] else "Deleted",
+                structures=report['structures'][0],
+                definitions=report['definitions'][0],
+                size=report['structures'][1] + report['definitions'][1],
+            )
+        )
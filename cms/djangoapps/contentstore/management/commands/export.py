@@ -4,7 +4,7 @@ Script for exporting courseware from Mongo to a tar.gz file
 import os
 
 from django.core.management.base import BaseCommand, CommandError
-from xmodule.modulestore.xml_exporter import export_to_xml
+from xmodule.modulestore.xml_exporter import export_to_xml, export_to_archive
 from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.django import contentstore
 from xmodule.course_module import CourseDescriptor
@@ -28,6 +28,15 @@ class Command(BaseCommand):
 
         location = CourseDescriptor.id_to_location(course_id)
 
+        if output_path.endswith('.tar.gz'):
+            # write the archive directly, without exporting to a directory first
+            course_dir = os.path.basename(output_path)[:-len('.tar.gz')]
+            with open(output_path, 'wb') as output_file:
+                export_to_archive(
+                    modulestore('direct'), contentstore(), location, output_file, course_dir, modulestore()
+                )
+            return
+
         root_dir = os.path.dirname(output_path)
         course_dir = os.path.splitext(os.path.basename(output_path))[0]
 
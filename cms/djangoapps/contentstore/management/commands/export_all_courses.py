@@ -1,17 +1,71 @@
 """
 Script for exporting all courseware from Mongo to a directory
 """
+import os
+from multiprocessing import Pool
+from optparse import make_option
+
+from django import db
 from django.core.management.base import BaseCommand, CommandError
-from xmodule.modulestore.xml_exporter import export_to_xml
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.xml_exporter import export_to_xml, export_to_archive
+from xmodule.modulestore.django import modulestore, clear_existing_modulestores
+from xmodule.contentstore import django as contentstore_django
 from xmodule.contentstore.django import contentstore
 from xmodule.course_module import CourseDescriptor
 
 
+def export_course(course_id, output_path, archive):
+    """
+    Export the course `course_id` to a directory, or a tar.gz archive, in
+    `output_path`. Return the error message if the export failed.
+    """
+    try:
+        location = CourseDescriptor.id_to_location(course_id)
+        course_dir = course_id.replace('/', '...')
+        if archive:
+            with open(os.path.join(output_path, course_dir + '.tar.gz'), 'wb') as output_file:
+                export_to_archive(
+                    modulestore('direct'), contentstore(), location, output_file, course_dir, modulestore()
+                )
+        else:
+            export_to_xml(modulestore('direct'), contentstore(), location, output_path, course_dir, modulestore())
+    except Exception as err:  # pylint: disable=broad-except
+        return unicode(err)
+    return None
+
+
+def _export_course_in_worker(args):
+    """
+    Export a course in a worker process of the pool (see `export_course`).
+    """
+    course_id = args[0]
+    return course_id, export_course(*args)
+
+
+def _init_worker():
+    """
+    Don't share the parent's connections with the worker processes
+    """
+    clear_existing_modulestores()
+    contentstore_django._CONTENTSTORE.clear()  # pylint: disable=protected-access
+    db.close_connection()
+
+
 class Command(BaseCommand):
     """Export all courses from mongo to the specified data directory"""
     help = 'Export all courses from mongo to the specified data directory'
 
+    option_list = BaseCommand.option_list + (
+        make_option('--processes',
+                    type='int',
+                    default=1,
+                    help='Number of courses to export at once, in separate processes'),
+        make_option('--archive',
+                    action='store_true',
+                    default=False,
+                    help='Export each course to a tar.gz file rather than a directory'),
+    )
+
     def handle(self, *args, **options):
         "Execute the command"
         if len(args) != 1:
@@ -19,26 +73,34 @@ class Command(BaseCommand):
 
         output_path = args[0]
 
-        cs = contentstore()
         ms = modulestore('direct')
-        root_dir = output_path
         courses = ms.get_courses()
 
         print("%d courses to export:" % len(courses))
         cids = [x.id for x in courses]
         print(cids)
 
-        for course_id in cids:
-
-            print("-"*77)
-            print("Exporting course id = {0} to {1}".format(course_id, output_path))
+        exports = [(course_id, output_path, options['archive']) for course_id in cids]
+        if options['processes'] > 1:
+            pool = Pool(options['processes'], _init_worker)
+            try:
+                results = pool.imap_unordered(_export_course_in_worker, exports)
+                for course_id, error in results:
+                    self._report(course_id, output_path, error)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for export in exports:
+                self._report(export[0], output_path, export_course(*export))
 
-            if 1:
-                try:
-                    location = CourseDescriptor.id_to_location(course_id)
-                    course_dir = course_id.replace('/', '...')
-                    export_to_xml(ms, cs, location, root_dir, course_dir, modulestore())
-                except Exception as err:
-                    print("="*30 + "> Oops, failed to export %s" % course_id)
-                    print("Error:")
-                    print(err)
+    def _report(self, course_id, output_path, error):
+        """
+        Print the outcome of the export of `course_id`
+        """
+        print("-" * 77)
+        print("Exported course id = {0} to {1}".format(course_id, output_path))
+        if error is not None:
+            print("=" * 30 + "> Oops, failed to export %s" % course_id)
+            print("Error:")
+            print(error)
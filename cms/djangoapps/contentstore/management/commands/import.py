@@ -8,6 +8,8 @@ from django_comment_common.utils import (seed_permissions_roles,
 from xmodule.modulestore.xml_importer import import_from_xml
 from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.django import contentstore
+from course_overviews.models import CourseOverview
+from contentstore.utils import update_course_listing
 
 
 class Command(BaseCommand):
@@ -52,6 +54,8 @@ class Command(BaseCommand):
 
         for module in course_items:
             course_id = module.location.course_id
+            CourseOverview.mark_stale(course_id)
+            update_course_listing(module)
             if not are_permissions_roles_seeded(course_id):
                 self.stdout.write('Seeding forum roles for course {0}'.format(course_id))
                 seed_permissions_roles(course_id)
@@ -0,0 +1,35 @@
+"""
+Record all the courses in the modulestore, or the given courses, in the index
+of Studio's course listing. Run before turning on
+FEATURES['ENABLE_COURSE_LISTING_INDEX'].
+"""
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand
+
+from contentstore.utils import update_course_listing
+from xmodule.error_module import ErrorDescriptor
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Build the course listing index
+    """
+    args = '[<course_id> ...]'
+    help = dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        store = modulestore('direct')
+        if args:
+            course_ids = args
+        else:
+            course_ids = [course.location.course_id for course in store.get_courses()]
+
+        for course_id in course_ids:
+            course = store.get_course(course_id)
+            if course is None or isinstance(course, ErrorDescriptor):
+                self.stderr.write('Course {0} not found\n'.format(course_id))
+            else:
+                update_course_listing(course)
+                self.stdout.write('Indexed {0}\n'.format(course_id))
@@ -2,6 +2,9 @@
 Django management command to migrate a course from the old Mongo modulestore
 to the new split-Mongo modulestore.
 """
+import time
+from optparse import make_option
+
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import User
 from xmodule.modulestore import Location
@@ -32,6 +35,17 @@ class Command(BaseCommand):
     help = "Migrate a course from old-Mongo to split-Mongo"
     args = "location email <locator>"
 
+    option_list = BaseCommand.option_list + (
+        make_option('--bulk',
+                    action='store_true',
+                    default=False,
+                    help='Write each branch of the new course at once rather than item by item'),
+        make_option('--time',
+                    action='store_true',
+                    default=False,
+                    help='Report how long the migration took, and how many structures and definitions it wrote'),
+    )
+
     def parse_args(self, *args):
         """
         Return a three-tuple of (location, user, locator_string).
@@ -71,4 +85,20 @@ class Command(BaseCommand):
             loc_mapper=loc_mapper(),
         )
 
-        migrator.migrate_mongo_course(location, user, package_id)
+        if not options.get('time'):
+            migrator.migrate_mongo_course(location, user, package_id, bulk=options.get('bulk', False))
+            return
+
+        # benchmark the migration
+        split_connection = modulestore('split').db_connection
+        structure_count = split_connection.structures.count()
+        definition_count = split_connection.definitions.count()
+        start = time.time()
+        migrator.migrate_mongo_course(location, user, package_id, bulk=options.get('bulk', False))
+        self.stdout.write(
+            "Migrated {0} in {1:.2f} seconds, writing {2} structures and {3} definitions\n".format(
+                location, time.time() - start,
+                split_connection.structures.count() - structure_count,
+                split_connection.definitions.count() - definition_count,
+            )
+        )
@@ -2,6 +2,7 @@
 Unittests for migrating a course to split mongo
 """
 import unittest
+from StringIO import StringIO
 
 from django.contrib.auth.models import User
 from django.core.management import CommandError, call_command
@@ -87,3 +88,18 @@ class TestMigrateToSplit(ModuleStoreTestCase):
         locator = CourseLocator(package_id="org.dept.name.run", branch="published")
         course_from_split = modulestore('split').get_course(locator)
         self.assertIsNotNone(course_from_split)
+
+    def test_bulk(self):
+        output = StringIO()
+        call_command(
+            "migrate_to_split",
+            str(self.course.location),
+            str(self.user.id),
+            bulk=True,
+            time=True,
+            stdout=output,
+        )
+        locator = loc_mapper().translate_location(self.course.id, self.course.location)
+        course_from_split = modulestore('split').get_course(locator)
+        self.assertIsNotNone(course_from_split)
+        self.assertIn("writing 2 structures", output.getvalue())
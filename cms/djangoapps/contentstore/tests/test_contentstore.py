@@ -3,6 +3,7 @@
 import json
 import mock
 import shutil
+import tarfile
 
 from textwrap import dedent
 
@@ -30,7 +31,7 @@ from xmodule.modulestore.store_utilities import clone_course
 from xmodule.modulestore.store_utilities import delete_course
 from xmodule.modulestore.django import modulestore
 from xmodule.contentstore.django import contentstore, _CONTENTSTORE
-from xmodule.modulestore.xml_exporter import export_to_xml
+from xmodule.modulestore.xml_exporter import export_to_xml, export_to_archive
 from xmodule.modulestore.xml_importer import import_from_xml, perform_xlint
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.contentstore.content import StaticContent
@@ -847,6 +848,51 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
 
         self.assertIn('/static/foo.jpg', html_module.data)
 
+    def test_clone_course_assets_and_retry(self):
+        course_data = {
+            'org': 'MITx',
+            'number': '999',
+            'display_name': 'Robot Super Course',
+            'run': '2013_Spring'
+        }
+
+        module_store = modulestore('direct')
+        content_store = contentstore()
+        import_from_xml(module_store, 'common/test/data/', ['toy'], static_content_store=content_store)
+
+        source_location = CourseDescriptor.id_to_location('edX/toy/2012_Fall')
+        dest_location = CourseDescriptor.id_to_location('MITx/999/2013_Spring')
+        _create_course(self, course_data)
+
+        progress = []
+        clone_course(
+            module_store, content_store, source_location, dest_location,
+            progress_callback=lambda kind, copied, total: progress.append((kind, copied, total))
+        )
+        # cloning again, as after an interruption, replaces the copies
+        clone_course(module_store, content_store, source_location, dest_location)
+
+        source_items = module_store.get_items(Location([source_location.tag, source_location.org, source_location.course, None, None]))
+        clone_items = module_store.get_items(Location([dest_location.tag, dest_location.org, dest_location.course, None, None]))
+        self.assertEqual(len(source_items), len(clone_items))
+
+        source_assets, source_count = content_store.get_all_content_for_course(source_location)
+        clone_assets, clone_count = content_store.get_all_content_for_course(dest_location)
+        self.assertGreater(source_count, 0)
+        self.assertEqual(source_count, clone_count)
+        for asset in clone_assets:
+            asset_location = Location(asset['_id'])
+            self.assertEqual((asset_location.org, asset_location.course), ('MITx', '999'))
+            content = content_store.find(asset_location)
+            source_content = content_store.find(asset_location.replace(org='edX', course='toy'))
+            self.assertEqual(content.data, source_content.data)
+            if content.thumbnail_location is not None:
+                self.assertEqual(content.thumbnail_location.course, '999')
+
+        # every kind of document was reported as fully copied
+        finished = dict((kind, copied == total) for (kind, copied, total) in progress)
+        self.assertEqual(finished, {'modules': True, 'assets': True})
+
     def test_illegal_draft_crud_ops(self):
         draft_store = modulestore('draft')
         direct_store = modulestore('direct')
@@ -1136,6 +1182,72 @@ class ContentStoreToyCourseTest(ModuleStoreTestCase):
 
         shutil.rmtree(root_dir)
 
+    def test_export_course_to_archive(self):
+        module_store = modulestore('direct')
+        draft_store = modulestore('draft')
+        content_store = contentstore()
+
+        import_from_xml(module_store, 'common/test/data/', ['toy'], static_content_store=content_store)
+        location = CourseDescriptor.id_to_location('edX/toy/2012_Fall')
+
+        root_dir = path(mkdtemp_clean())
+        archive_path = root_dir / 'test_export.tar.gz'
+        with open(archive_path, 'wb') as archive_file:
+            export_to_archive(
+                module_store, content_store, location, archive_file, 'test_export', draft_modulestore=draft_store
+            )
+
+        # the archive holds the same files as an export to a directory
+        export_to_xml(module_store, content_store, location, root_dir, 'test_export', draft_modulestore=draft_store)
+        exported = set(filename.relpath(root_dir) for filename in (root_dir / 'test_export').walkfiles())
+        archive = tarfile.open(archive_path)
+        try:
+            archived = set(member.name for member in archive.getmembers() if member.isfile())
+            self.assertEqual(archived, exported)
+            for filename in ['course.xml', 'policies/assets.json']:
+                self.assertEqual(
+                    archive.extractfile('test_export/' + filename).read(),
+                    (root_dir / 'test_export' / filename).bytes()
+                )
+        finally:
+            archive.close()
+
+        shutil.rmtree(root_dir)
+
+    def test_export_course_with_shared_child_to_archive(self):
+        module_store = modulestore('direct')
+        content_store = contentstore()
+
+        course = CourseFactory.create(org='edX', course='shared', display_name='Shared child')
+        chapter = ItemFactory.create(parent_location=course.location, category='chapter')
+        sequentials = [
+            ItemFactory.create(parent_location=chapter.location, category='sequential') for __ in range(2)
+        ]
+        # the html module is a child of both sequentials
+        html = ItemFactory.create(parent_location=sequentials[0].location, category='html', data='<p>shared</p>')
+        sequentials[1].children.append(html.location.url())
+        module_store.update_item(sequentials[1], self.user.id)
+
+        root_dir = path(mkdtemp_clean())
+        archive_path = root_dir / 'test_export.tar.gz'
+        with open(archive_path, 'wb') as archive_file:
+            export_to_archive(module_store, content_store, course.location, archive_file, 'test_export')
+        archive = tarfile.open(archive_path)
+        try:
+            # its files are archived once, as they were written twice with the same contents
+            html_names = [
+                member.name for member in archive.getmembers()
+                if member.isfile() and member.name.startswith('test_export/html/')
+            ]
+            self.assertEqual(
+                sorted(html_names),
+                ['test_export/html/{}.{}'.format(html.location.name, ext) for ext in ('html', 'xml')]
+            )
+        finally:
+            archive.close()
+
+        shutil.rmtree(root_dir)
+
     def test_export_course_with_metadata_only_word_cloud(self):
         """
         Similar to `test_export_course_with_metadata_only_video`.
@@ -9,12 +9,16 @@ from unittest import skip
 from django.contrib.auth.models import Group
 from django.test import RequestFactory
 
-from contentstore.views.course import _accessible_courses_list, _accessible_courses_list_from_groups
+from contentstore.views.course import (
+    _accessible_courses_list, _accessible_courses_list_from_groups, _accessible_course_listings
+)
+from contentstore.utils import update_course_listing
+from course_overviews.models import CourseListing
 from contentstore.tests.utils import AjaxEnabledTestClient
 from student.tests.factories import UserFactory
 from student.roles import CourseInstructorRole, CourseStaffRole
 from xmodule.modulestore import Location
-from xmodule.modulestore.django import loc_mapper
+from xmodule.modulestore.django import loc_mapper, modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -145,6 +149,54 @@ class TestCourseListing(ModuleStoreTestCase):
         with self.assertRaises(ItemNotFoundError):
             courses_list_by_groups = _accessible_courses_list_from_groups(request)
 
+    def test_get_course_listings_from_index(self):
+        """
+        Test getting the listings of courses by joining the course listing index with the user's groups
+        """
+        self.user = UserFactory()
+        request = self.factory.get('/course')
+        request.user = self.user
+
+        course = self._create_course_with_access_groups(
+            Location(['i4x', 'Org1', 'Course1', 'course', 'Run1']), 'group_name_with_dots', self.user
+        )
+        self._create_course_with_access_groups(Location(['i4x', 'Org2', 'Course2', 'course', 'Run2']))
+        for indexed_course in modulestore('direct').get_courses():
+            update_course_listing(indexed_course)
+
+        listings = _accessible_course_listings(request)
+        self.assertEqual([listing.course_id for listing in listings], [course.location.course_id])
+        self.assertEqual(listings[0].display_name, course.display_name)
+        self.assertEqual(listings[0].run, 'Run1')
+
+        # courses missing from the index make the listing fall back to the modulestore
+        CourseListing.remove(course.location.course_id)
+        with self.assertRaises(ItemNotFoundError):
+            _accessible_course_listings(request)
+
+    def test_get_course_listings_from_index_as_global_staff(self):
+        """
+        Test that global staff get all the listings, unless the index misses courses
+        """
+        request = self.factory.get('/course')
+        request.user = self.user
+
+        for number in range(2):
+            self._create_course_with_access_groups(
+                Location(['i4x', 'Org{}'.format(number), 'Course{}'.format(number), 'course', 'Run'])
+            )
+        courses = modulestore('direct').get_courses()
+        for indexed_course in courses:
+            update_course_listing(indexed_course)
+        self.assertEqual(
+            sorted(listing.course_id for listing in _accessible_course_listings(request)),
+            sorted(course.location.course_id for course in courses)
+        )
+
+        # courses missing from the index make the listing fall back to the modulestore
+        CourseListing.remove(courses[0].location.course_id)
+        with self.assertRaises(ItemNotFoundError):
+            _accessible_course_listings(request)
 
     # Temporarily disabling this test because it caused the following failure intermittently in Jenkins.
     # Perhaps due to a test ordering or cleanup issue?
@@ -10,13 +10,14 @@ from django.utils.translation import ugettext as _
 from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore import Location
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import modulestore, loc_mapper
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from django_comment_common.utils import unseed_permissions_roles
 from xmodule.modulestore.store_utilities import delete_course
 from xmodule.course_module import CourseDescriptor
 from xmodule.modulestore.draft import DIRECT_ONLY_CATEGORIES
 from student.roles import CourseInstructorRole, CourseStaffRole
+from course_overviews.models import CourseListing
 
 
 log = logging.getLogger(__name__)
@@ -46,6 +47,7 @@ def delete_course_and_groups(course_id, commit=False):
         print 'removing User permissions from course....'
         # in the django layer, we need to remove all the user permissions groups associated with this course
         if commit:
+            CourseListing.remove(course_id)
             try:
                 staff_role = CourseStaffRole(loc)
                 staff_role.remove_users(*staff_role.users_with_role())
@@ -55,6 +57,20 @@ def delete_course_and_groups(course_id, commit=False):
                 log.error("Error in deleting course groups for {0}: {1}".format(loc, err))
 
 
+def update_course_listing(course):
+    """
+    Record the CourseDescriptor `course` in the index of Studio's course listing.
+    Call this when a course is created, imported or has its settings changed.
+    """
+    # published = false b/c studio manipulates draft versions not b/c the course isn't pub'd
+    course_locator = loc_mapper().translate_location(
+        course.location.course_id, course.location, published=False, add_entry_if_missing=True
+    )
+    return CourseListing.update_for_course(
+        course, course_locator.package_id, get_lms_link_for_item(course.location)
+    )
+
+
 def get_modulestore(category_or_location):
     """
     Returns the correct modulestore to use for modifying the specified location
@@ -30,7 +30,7 @@ from xmodule.modulestore import Location
 from contentstore.course_info_model import get_course_updates, update_course_updates, delete_course_update
 from contentstore.utils import (
     get_lms_link_for_item, add_extra_panel_tab, remove_extra_panel_tab,
-    get_modulestore)
+    get_modulestore, update_course_listing)
 from models.settings.course_details import CourseDetails, CourseSettingsEncoder
 
 from models.settings.course_grading import CourseGradingModel
@@ -46,6 +46,7 @@ from .component import (
 from django_comment_common.utils import seed_permissions_roles
 
 from student.models import CourseEnrollment
+from course_overviews.models import CourseOverview, CourseListing
 
 from xmodule.html_module import AboutDescriptor
 from xmodule.modulestore.locator import BlockUsageLocator, CourseLocator
@@ -180,15 +181,14 @@ def _accessible_courses_list(request):
     return courses
 
 
-# pylint: disable=invalid-name
-def _accessible_courses_list_from_groups(request):
+def _user_course_group_keys(user):
     """
-    List all courses available to the logged in user by reversing access group names
+    Return the course ids, lowercase and in the format with dots (e.g. "edx.course.run"),
+    named by the instructor and staff groups of the user
     """
-    courses_list = []
     course_ids = set()
 
-    user_staff_group_names = request.user.groups.filter(
+    user_staff_group_names = user.groups.filter(
         Q(name__startswith='instructor_') | Q(name__startswith='staff_')
     ).values_list('name', flat=True)
 
@@ -203,9 +203,19 @@ def _accessible_courses_list_from_groups(request):
             # strip starting text "staff_"
             course_id = user_staff_group_name[6:]
 
-        course_ids.add(course_id.replace('/', '.').lower())
+        course_ids.add(CourseListing.make_group_key(course_id))
+
+    return course_ids
+
+
+# pylint: disable=invalid-name
+def _accessible_courses_list_from_groups(request):
+    """
+    List all courses available to the logged in user by reversing access group names
+    """
+    courses_list = []
 
-    for course_id in course_ids:
+    for course_id in _user_course_group_keys(request.user):
         # get course_location with lowercase idget_item
         course_location = loc_mapper().translate_locator_to_location(
             CourseLocator(package_id=course_id), get_course=True, lower_only=True
@@ -219,14 +229,73 @@ def _accessible_courses_list_from_groups(request):
     return courses_list
 
 
+def _modulestore_course_count():
+    """
+    Return the number of courses in the modulestore, without loading them
+    when the modulestore can count them.
+    """
+    store = modulestore('direct')
+    if hasattr(store, 'collection'):
+        # pylint: disable=fixme
+        # TODO remove the templates condition when templates purged from db
+        return store.collection.find({'_id.category': 'course', '_id.course': {'$ne': 'templates'}}).count()
+    return len(store.get_courses())
+
+
+def _accessible_course_listings(request):
+    """
+    List the course listings of all courses available to the logged in user, by
+    joining the course listing index with the user's access group names.
+
+    Raises ItemNotFoundError if a group doesn't name a listed course, or, for
+    global staff, if the index doesn't list as many courses as the modulestore has.
+    """
+    if GlobalStaff().has_user(request.user):
+        listings = CourseListing.objects.exclude(number='templates')
+        indexed_count = listings.count()
+        if indexed_count != _modulestore_course_count():
+            raise ItemNotFoundError("{} courses in the course listing index".format(indexed_count))
+    else:
+        group_keys = _user_course_group_keys(request.user)
+        listings = CourseListing.objects.filter(group_key__in=group_keys)
+        missing_keys = group_keys - set(listing.group_key for listing in listings)
+        if missing_keys:
+            raise ItemNotFoundError(missing_keys.pop())
+
+    # pylint: disable=fixme
+    # TODO remove this condition when templates purged from db
+    return [listing for listing in listings if listing.number != 'templates']
+
+
 @login_required
 @ensure_csrf_cookie
 def course_listing(request):
     """
     List all courses available to the logged in user
-    Try to get all courses by first reversing django groups and fallback to old method if it fails
+    With FEATURES['ENABLE_COURSE_LISTING_INDEX'], courses are read from the course listing index
+    Otherwise, or if that fails, try to get all courses by first reversing django groups and fallback
+    to old method if it fails
     Note: overhead of pymongo reads will increase if getting courses from django groups fails
     """
+    if settings.FEATURES.get('ENABLE_COURSE_LISTING_INDEX'):
+        try:
+            listings = _accessible_course_listings(request)
+        except ItemNotFoundError:
+            # user have some old groups, or courses which aren't indexed yet
+            listings = None
+        if listings is not None:
+            return _render_course_listing(request, [
+                (
+                    listing.display_name,
+                    CourseLocator(package_id=listing.package_id).url_reverse('course/', ''),
+                    listing.lms_link,
+                    listing.display_org,
+                    listing.display_number,
+                    listing.run
+                )
+                for listing in listings
+            ])
+
     if GlobalStaff().has_user(request.user):
         # user has global access so no need to get courses from django groups
         courses = _accessible_courses_list(request)
@@ -260,8 +329,17 @@ def course_listing(request):
             course.location.name
         )
 
+    return _render_course_listing(
+        request, [format_course_for_view(c) for c in courses if not isinstance(c, ErrorDescriptor)]
+    )
+
+
+def _render_course_listing(request, courses):
+    """
+    Render the course listing page, for the tuples of course values `courses`
+    """
     return render_to_response('index.html', {
-        'courses': [format_course_for_view(c) for c in courses if not isinstance(c, ErrorDescriptor)],
+        'courses': courses,
         'user': request.user,
         'request_course_creator_url': reverse('contentstore.views.request_course_creator'),
         'course_creator_status': _get_course_creator_status(request.user),
@@ -404,6 +482,10 @@ def create_new_course(request):
     # seed the forums
     seed_permissions_roles(new_course.location.course_id)
 
+    # list the new course in the LMS catalog and in Studio
+    CourseOverview.mark_stale(new_course.location.course_id)
+    update_course_listing(new_course)
+
     # auto-enroll the course creator in the course so that "View Live" will
     # work.
     CourseEnrollment.enroll(request.user, new_course.location.course_id)
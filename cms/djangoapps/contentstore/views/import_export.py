@@ -7,7 +7,6 @@ import os
 import tarfile
 import shutil
 import re
-from tempfile import mkdtemp
 from path import path
 
 from django.conf import settings
@@ -22,10 +21,12 @@ from django.views.decorators.http import require_http_methods, require_GET
 from django.utils.translation import ugettext as _
 
 from edxmako.shortcuts import render_to_response
+from course_overviews.models import CourseOverview
+from contentstore.utils import update_course_listing
 
 from xmodule.modulestore.xml_importer import import_from_xml
 from xmodule.contentstore.django import contentstore
-from xmodule.modulestore.xml_exporter import export_to_xml
+from xmodule.modulestore.xml_exporter import export_to_archive
 from xmodule.modulestore.django import modulestore, loc_mapper
 from xmodule.exceptions import SerializationError
 
@@ -228,6 +229,8 @@ def import_handler(request, tag=None, package_id=None, branch=None, version_guid
 
                     new_location = course_items[0].location
                     logging.debug('new course at {0}'.format(new_location))
+                    CourseOverview.mark_stale(new_location.course_id)
+                    update_course_listing(course_items[0])
 
                     session_status[key] = 3
                     request.session.modified = True
@@ -319,10 +322,11 @@ def export_handler(request, tag=None, package_id=None, branch=None, version_guid
     if 'application/x-tgz' in requested_format:
         name = old_location.name
         export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-        root_dir = path(mkdtemp())
 
         try:
-            export_to_xml(modulestore('direct'), contentstore(), old_location, root_dir, name, modulestore())
+            # the archive is spooled to a file, rather than streamed in the response,
+            # so that export errors can still be reported
+            export_to_archive(modulestore('direct'), contentstore(), old_location, export_file, name, modulestore())
 
         except SerializationError, e:
             logging.exception('There was an error exporting course {0}. {1}'.format(course_module.location, unicode(e)))
@@ -365,13 +369,9 @@ def export_handler(request, tag=None, package_id=None, branch=None, version_guid
                 'export_url': export_url
             })
 
-        logging.debug('tar file being generated at {0}'.format(export_file.name))
-        tar_file = tarfile.open(name=export_file.name, mode='w:gz')
-        tar_file.add(root_dir / name, arcname=name)
-        tar_file.close()
-
-        # remove temp dir
-        shutil.rmtree(root_dir / name)
+        logging.debug('tar file generated at {0}'.format(export_file.name))
+        export_file.flush()
+        export_file.seek(0)
 
         wrapper = FileWrapper(export_file)
         response = HttpResponse(wrapper, content_type='application/x-tgz')
@@ -142,15 +142,14 @@ def xblock_handler(request, tag=None, package_id=None, branch=None, version_guid
             parent_locator = BlockUsageLocator(request.json['parent_locator'])
             duplicate_source_locator = BlockUsageLocator(request.json['duplicate_source_locator'])
 
-            # _duplicate_item is dealing with locations to facilitate the recursive call for
-            # duplicating children.
+            # _duplicate_item is dealing with locations, as the modulestore duplicates the
+            # children along with the item.
             parent_location = loc_mapper().translate_locator_to_location(parent_locator)
             duplicate_source_location = loc_mapper().translate_locator_to_location(duplicate_source_locator)
             dest_location = _duplicate_item(
                 parent_location,
                 duplicate_source_location,
                 request.json.get('display_name'),
-                request.user,
             )
             course_location = loc_mapper().translate_locator_to_location(BlockUsageLocator(parent_locator), get_course=True)
             dest_locator = loc_mapper().translate_location(course_location.course_id, dest_location, False, True)
@@ -316,19 +315,11 @@ def _save_item(request, usage_loc, item_location, data=None, children=None, meta
     # Make public after updating the xblock, in case the caller asked
     # for both an update and a publish.
     if publish and publish == 'make_public':
-        def _publish(block):
-            # This is super gross, but prevents us from publishing something that
-            # we shouldn't. Ideally, all modulestores would have a consistant
-            # interface for publishing. However, as of now, only the DraftMongoModulestore
-            # does, so we have to check for the attribute explicitly.
-            store = get_modulestore(block.location)
-            if hasattr(store, 'publish'):
-                store.publish(block.location, request.user.id)
-
-        _xmodule_recurse(
-            existing_item,
-            _publish
-        )
+        # Only the DraftMongoModulestore has a notion of publishing, which it
+        # does for the item and all its descendants at once.
+        draft_store = modulestore()
+        if hasattr(draft_store, 'publish_subtree'):
+            draft_store.publish_subtree(item_location, request.user.id)
 
     # Note that children aren't being returned until we have a use case.
     return JsonResponse(result)
@@ -382,55 +373,33 @@ def _create_item(request):
     return JsonResponse({"locator": unicode(locator)})
 
 
-def _duplicate_item(parent_location, duplicate_source_location, display_name=None, user=None):
+def _duplicate_item(parent_location, duplicate_source_location, display_name=None):
     """
-    Duplicate an existing xblock as a child of the supplied parent_location.
+    Duplicate an existing xblock, and its children, as a child of the supplied parent_location.
     """
-    store = get_modulestore(duplicate_source_location)
+    store = modulestore()
     source_item = store.get_item(duplicate_source_location)
-    # Change the blockID to be unique.
-    dest_location = duplicate_source_location.replace(name=uuid4().hex)
-    category = dest_location.category
-
-    # Update the display name to indicate this is a duplicate (unless display name provided).
-    duplicate_metadata = own_metadata(source_item)
-    if display_name is not None:
-        duplicate_metadata['display_name'] = display_name
-    else:
-        if source_item.display_name is None:
-            duplicate_metadata['display_name'] = _("Duplicate of {0}").format(source_item.category)
-        else:
-            duplicate_metadata['display_name'] = _("Duplicate of '{0}'").format(source_item.display_name)
-
-    get_modulestore(category).create_and_save_xmodule(
-        dest_location,
-        definition_data=source_item.data if hasattr(source_item, 'data') else None,
-        metadata=duplicate_metadata,
-        system=source_item.runtime,
-    )
-
-    dest_module = get_modulestore(category).get_item(dest_location)
-    # Children are not automatically copied over (and not all xblocks have a 'children' attribute).
-    # Because DAGs are not fully supported, we need to actually duplicate each child as well.
-    if source_item.has_children:
-        dest_module.children = []
-        for child in source_item.children:
-            dupe = _duplicate_item(dest_location, Location(child), user=user)
-            dest_module.children.append(dupe.url())
-        get_modulestore(dest_location).update_item(dest_module, user.id if user else None)
-
-    if not 'detached' in source_item.runtime.load_block_type(category)._class_tags:
-        parent = get_modulestore(parent_location).get_item(parent_location)
-        # If source was already a child of the parent, add duplicate immediately afterward.
-        # Otherwise, add child to end.
-        if duplicate_source_location.url() in parent.children:
-            source_index = parent.children.index(duplicate_source_location.url())
-            parent.children.insert(source_index + 1, dest_location.url())
+    duplicate_source_location = duplicate_source_location.replace(revision=None)
+
+    def duplicate_metadata(location, metadata):
+        """
+        Update the display name to indicate this is a duplicate (unless display name provided).
+        """
+        if location == duplicate_source_location and display_name is not None:
+            metadata['display_name'] = display_name
+            return
+        source_display_name = metadata.get(
+            'display_name', source_item.runtime.load_block_type(location.category).display_name.default
+        )
+        if source_display_name is None:
+            metadata['display_name'] = _("Duplicate of {0}").format(location.category)
         else:
-            parent.children.append(dest_location.url())
-        get_modulestore(parent_location).update_item(parent, user.id if user else None)
+            metadata['display_name'] = _("Duplicate of '{0}'").format(source_display_name)
 
-    return dest_location
+    # Children are duplicated too, as DAGs are not fully supported.
+    if 'detached' in source_item.runtime.load_block_type(source_item.category)._class_tags:
+        parent_location = None
+    return store.duplicate_subtree(duplicate_source_location, parent_location, duplicate_metadata)
 
 
 def _delete_item_at_location(item_location, delete_children=False, delete_all_versions=False, user=None):
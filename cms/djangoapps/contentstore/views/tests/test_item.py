@@ -294,6 +294,25 @@ class TestDuplicateItem(ItemTest):
         # Now send a custom display name for the duplicate.
         verify_name(self.seq_locator, self.chapter_locator, "customized name", display_name="customized name")
 
+    def test_duplicate_unit(self):
+        """
+        Tests that the children of a duplicated unit are duplicated as drafts.
+        """
+        resp = self.create_xblock(parent_locator=self.seq_locator, category='vertical')
+        unit_locator = self.response_locator(resp)
+        resp = self.create_xblock(parent_locator=unit_locator, category='html', display_name='Page')
+        html_locator = self.response_locator(resp)
+
+        dupe_locator = self._duplicate_item(self.seq_locator, unit_locator)
+        dupe = self.get_item_from_modulestore(dupe_locator, draft=True)
+        self.assertEqual(len(dupe.children), 1)
+        self.assertNotEqual(dupe.children[0], self.get_old_id(html_locator).url())
+        dupe_child = modulestore('draft').get_item(Location(dupe.children[0]))
+        self.assertTrue(dupe_child.is_draft)
+        self.assertEqual(dupe_child.display_name, "Duplicate of 'Page'")
+        with self.assertRaises(ItemNotFoundError):
+            self.get_item_from_modulestore(dupe_locator, draft=False)
+
     def _duplicate_item(self, parent_locator, source_locator, display_name=None):
         data = {
             'parent_locator': parent_locator,
@@ -447,6 +466,36 @@ class TestEditItem(ItemTest):
         )
         self.assertIsNotNone(self.get_item_from_modulestore(self.problem_locator, False))
 
+    def test_make_public_subtree(self):
+        """ Test that publishing a unit publishes its children, and deletes those removed from it. """
+        resp = self.create_xblock(parent_locator=self.seq_locator, category='vertical')
+        unit_locator = self.response_locator(resp)
+        unit_update_url = '/xblock/' + unit_locator
+        html_locators = [
+            self.response_locator(self.create_xblock(parent_locator=unit_locator, category='html'))
+            for __ in range(2)
+        ]
+        self.client.ajax_post(unit_update_url, data={'publish': 'make_public'})
+        unit = self.get_item_from_modulestore(unit_locator, False)
+        self.assertEqual(len(unit.children), 2)
+        for locator in [unit_locator] + html_locators:
+            item = self.get_item_from_modulestore(locator, True)
+            self.assertFalse(item.is_draft)
+            self.assertIsNotNone(item.published_date)
+            self.assertEqual(item.published_by, self.user.id)
+
+        # remove a child from a draft of the unit, then publish it
+        self.client.ajax_post(
+            unit_update_url,
+            data={'children': [html_locators[1]], 'publish': 'create_draft'}
+        )
+        self.client.ajax_post(unit_update_url, data={'publish': 'make_public'})
+        unit = self.get_item_from_modulestore(unit_locator, True)
+        self.assertFalse(unit.is_draft)
+        self.assertEqual(unit.children, [self.get_old_id(html_locators[1]).url()])
+        with self.assertRaises(ItemNotFoundError):
+            self.get_item_from_modulestore(html_locators[0], True)
+
     def test_make_private(self):
         """ Test making a public problem private (un-publishing it). """
         # Make problem public.
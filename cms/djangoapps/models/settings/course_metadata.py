@@ -1,6 +1,6 @@
 from xblock.fields import Scope
 
-from contentstore.utils import get_modulestore
+from contentstore.utils import get_modulestore, update_course_listing
 from cms.lib.xblock.mixin import CmsBlockMixin
 
 
@@ -78,5 +78,8 @@ class CourseMetadata(object):
 
         if dirty:
             get_modulestore(descriptor.location).update_item(descriptor, user.id if user else None)
+            if descriptor.location.category == 'course':
+                # the display name of the course may have changed
+                update_course_listing(descriptor)
 
         return cls.fetch(descriptor)
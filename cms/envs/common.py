@@ -76,6 +76,11 @@ FEATURES = {
 
     # Allow editing of short description in course settings in cms
     'EDITABLE_SHORT_DESCRIPTION': True,
+
+    # List courses on the Studio home page from the course listing index
+    # instead of loading them from the modulestore.
+    # Run the index_course_listings command when turning this on.
+    'ENABLE_COURSE_LISTING_INDEX': False,
 }
 ENABLE_JASMINE = False
 
@@ -460,6 +465,9 @@ INSTALLED_APPS = (
     # Student identity reverification
     'reverification',
 
+    # Course listings, refreshed when courses are created or imported
+    'course_overviews',
+
     # User preferences
     'user_api',
     'django_openid_auth',
@@ -489,6 +497,10 @@ TRACKING_BACKENDS = {
     }
 }
 
+# Set to a dict of options for track.dispatcher.BufferedDispatcher to send
+# tracking events to the backends in batches from a background thread.
+TRACKING_BUFFER = None
+
 #### PASSWORD POLICY SETTINGS #####
 
 PASSWORD_MIN_LENGTH = None
@@ -54,20 +54,35 @@ class CourseMode(models.Model):
 
         If no modes have been set in the table, returns the default mode
         """
+        return cls.modes_for_courses([course_id])[course_id]
+
+    @classmethod
+    def modes_for_courses(cls, course_ids):
+        """
+        Returns a dictionary of course id to the list of non-expired modes
+        of each of the given courses, read with a single query.
+
+        Courses with no modes set in the table get the default mode
+        """
         now = datetime.now(pytz.UTC)
-        found_course_modes = cls.objects.filter(Q(course_id=course_id) &
+        modes = dict((course_id, []) for course_id in course_ids)
+        if not modes:
+            return modes
+        found_course_modes = cls.objects.filter(Q(course_id__in=modes.keys()) &
                                                 (Q(expiration_datetime__isnull=True) |
                                                 Q(expiration_datetime__gte=now)))
-        modes = ([Mode(
-            mode.mode_slug,
-            mode.mode_display_name,
-            mode.min_price,
-            mode.suggested_prices,
-            mode.currency,
-            mode.expiration_datetime
-        ) for mode in found_course_modes])
-        if not modes:
-            modes = [cls.DEFAULT_MODE]
+        for mode in found_course_modes:
+            modes[mode.course_id].append(Mode(
+                mode.mode_slug,
+                mode.mode_display_name,
+                mode.min_price,
+                mode.suggested_prices,
+                mode.currency,
+                mode.expiration_datetime
+            ))
+        for course_id, course_modes in modes.items():
+            if not course_modes:
+                modes[course_id] = [cls.DEFAULT_MODE]
         return modes
 
     @classmethod
@@ -78,6 +93,17 @@ class CourseMode(models.Model):
         """
         return {mode.slug: mode for mode in cls.modes_for_course(course_id)}
 
+    @classmethod
+    def modes_for_courses_dict(cls, course_ids):
+        """
+        Returns a dictionary of course id to the non-expired modes of each of
+        the given courses, as a dictionary with the mode slug as the key
+        """
+        return {
+            course_id: {mode.slug: mode for mode in course_modes}
+            for course_id, course_modes in cls.modes_for_courses(course_ids).items()
+        }
+
     @classmethod
     def mode_for_course(cls, course_id, mode_slug):
         """
@@ -112,3 +112,21 @@ class CourseModeModelTest(TestCase):
 
         modes = CourseMode.modes_for_course('second_test_course')
         self.assertEqual([CourseMode.DEFAULT_MODE], modes)
+
+    def test_modes_for_courses(self):
+        """
+        Finding the modes of several courses at once
+        """
+        mode = Mode(u'verified', u'Verified Certificate', 0, '', 'usd', None)
+        self.create_mode(mode.slug, mode.name)
+
+        with self.assertNumQueries(1):
+            modes = CourseMode.modes_for_courses([self.course_id, 'second_test_course'])
+        self.assertEqual(modes, {
+            self.course_id: [mode],
+            'second_test_course': [CourseMode.DEFAULT_MODE],
+        })
+
+        modes_dict = CourseMode.modes_for_courses_dict([self.course_id])
+        self.assertEqual(modes_dict, {self.course_id: {u'verified': mode}})
+        self.assertEqual(CourseMode.modes_for_courses([]), {})
@@ -0,0 +1,33 @@
+"""
+Build the overviews of all the courses in the modulestore, or of the given
+courses. Run in the LMS before turning on FEATURES['ENABLE_COURSE_OVERVIEWS'].
+"""
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand
+
+from course_overviews.models import CourseOverview
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.exceptions import ItemNotFoundError
+
+
+class Command(BaseCommand):
+    """
+    Build course overviews
+    """
+    args = '[<course_id> ...]'
+    help = dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        if args:
+            course_ids = args
+        else:
+            course_ids = [course.id for course in modulestore().get_courses()]
+
+        for course_id in course_ids:
+            try:
+                CourseOverview.refresh(course_id)
+            except ItemNotFoundError:
+                self.stderr.write('Course {0} not found\n'.format(course_id))
+            else:
+                self.stdout.write('Built the overview of {0}\n'.format(course_id))
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'CourseOverview'
+        db.create_table('course_overviews_courseoverview', (
+            ('id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('course_id', self.gf('django.db.models.fields.CharField')(unique=True, max_length=255)),
+            ('version', self.gf('django.db.models.fields.CharField')(default='', max_length=255, blank=True)),
+            ('modulestore_type', self.gf('django.db.models.fields.CharField')(default='', max_length=32, blank=True)),
+            ('org', self.gf('django.db.models.fields.CharField')(default='', max_length=255, db_index=True, blank=True)),
+            ('number', self.gf('django.db.models.fields.CharField')(default='', max_length=255, blank=True)),
+            ('display_name', self.gf('django.db.models.fields.TextField')(default='', blank=True)),
+            ('display_organization', self.gf('django.db.models.fields.TextField')(null=True, blank=True)),
+            ('display_coursenumber', self.gf('django.db.models.fields.TextField')(null=True, blank=True)),
+            ('start', self.gf('django.db.models.fields.DateTimeField')(null=True, blank=True)),
+            ('end', self.gf('django.db.models.fields.DateTimeField')(null=True, blank=True)),
+            ('advertised_start', self.gf('django.db.models.fields.TextField')(null=True, blank=True)),
+            ('announcement', self.gf('django.db.models.fields.DateTimeField')(null=True, blank=True)),
+            ('is_new', self.gf('django.db.models.fields.NullBooleanField')(null=True, blank=True)),
+            ('enrollment_start', self.gf('django.db.models.fields.DateTimeField')(null=True, blank=True)),
+            ('enrollment_end', self.gf('django.db.models.fields.DateTimeField')(null=True, blank=True)),
+            ('enrollment_domain', self.gf('django.db.models.fields.TextField')(null=True, blank=True)),
+            ('days_early_for_beta', self.gf('django.db.models.fields.FloatField')(null=True, blank=True)),
+            ('ispublic', self.gf('django.db.models.fields.NullBooleanField')(null=True, blank=True)),
+            ('invitation_only', self.gf('django.db.models.fields.BooleanField')(default=False)),
+            ('lowest_passing_grade', self.gf('django.db.models.fields.FloatField')(null=True, blank=True)),
+            ('end_of_course_survey_url', self.gf('django.db.models.fields.TextField')(null=True, blank=True)),
+            ('course_image_url', self.gf('django.db.models.fields.TextField')(default='', blank=True)),
+            ('short_description', self.gf('django.db.models.fields.TextField')(default='', blank=True)),
+        ))
+        db.send_create_signal('course_overviews', ['CourseOverview'])
+
+
+    def backwards(self, orm):
+        # Deleting model 'CourseOverview'
+        db.delete_table('course_overviews_courseoverview')
+
+
+    models = {
+        'course_overviews.courseoverview': {
+            'Meta': {'object_name': 'CourseOverview'},
+            'advertised_start': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'announcement': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            'course_id': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '255'}),
+            'course_image_url': ('django.db.models.fields.TextField', [], {'default': "''", 'blank': 'True'}),
+            'days_early_for_beta': ('django.db.models.fields.FloatField', [], {'null': 'True', 'blank': 'True'}),
+            'display_coursenumber': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'display_name': ('django.db.models.fields.TextField', [], {'default': "''", 'blank': 'True'}),
+            'display_organization': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'end': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            'end_of_course_survey_url': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'enrollment_domain': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'enrollment_end': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            'enrollment_start': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'invitation_only': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_new': ('django.db.models.fields.NullBooleanField', [], {'null': 'True', 'blank': 'True'}),
+            'ispublic': ('django.db.models.fields.NullBooleanField', [], {'null': 'True', 'blank': 'True'}),
+            'lowest_passing_grade': ('django.db.models.fields.FloatField', [], {'null': 'True', 'blank': 'True'}),
+            'modulestore_type': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '32', 'blank': 'True'}),
+            'number': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '255', 'blank': 'True'}),
+            'org': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '255', 'db_index': 'True', 'blank': 'True'}),
+            'short_description': ('django.db.models.fields.TextField', [], {'default': "''", 'blank': 'True'}),
+            'start': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            'version': ('django.db.models.fields.CharField', [], {'default': "''", 'max_length': '255', 'blank': 'True'})
+        }
+    }
+
+    complete_apps = ['course_overviews']
@@ -0,0 +1,304 @@
+"""
+Denormalized summaries of courses, for pages that list many courses.
+
+Listing courses used to mean loading every CourseDescriptor from the
+modulestore. A CourseOverview holds the handful of values the catalog,
+dashboard and university pages need, in a single indexed table.
+
+Each overview records the content version of its course (see
+`xmodule.modulestore.django.course_cache_version`) at the time it was
+built. Publishing or importing a course gives it a new version, so its
+overview is rebuilt from the modulestore the next time it is read.
+
+A CourseListing holds the values of Studio's course listing. Studio keeps
+it up to date itself, so it is never rebuilt on read.
+"""
+import logging
+
+from django.db import models
+
+from xmodule.course_module import CourseDescriptor, CourseListingMixin
+from xmodule.modulestore import XML_MODULESTORE_TYPE
+from xmodule.modulestore.django import modulestore, course_cache_version, ModuleI18nService
+from xmodule.modulestore.exceptions import ItemNotFoundError
+
+from course_overviews.utils import course_image_url, course_about_html
+
+log = logging.getLogger(__name__)
+
+# XML courses only change when the process restarts, so their overviews
+# are rebuilt once per process, the first time they are read.
+_REFRESHED_XML_COURSES = set()
+
+# The number of out of date overviews `CourseOverview.get_all` rebuilds per
+# call. Losing the course versions (e.g. when the cache is flushed) makes
+# every overview out of date, and rebuilding them all would load every
+# course within a single request; the others are listed as they are, and
+# rebuilt by later calls.
+MAX_REFRESHES_PER_LISTING = 5
+
+# The version of overviews marked stale, which still hold the values of
+# the course from before the change
+STALE_VERSION = 'stale'
+
+
+class CourseOverview(CourseListingMixin, models.Model):
+    """
+    The values of a course shown in course listings.
+
+    Provides the same attributes as CourseDescriptor for these values, so
+    that it can be used in its place by listing templates and by
+    `courseware.access.has_access`.
+    """
+    course_id = models.CharField(max_length=255, unique=True)
+
+    # content version of the course when this overview was built; an empty
+    # version marks a course which has been created or imported, but whose
+    # overview hasn't been built yet
+    version = models.CharField(max_length=255, blank=True, default='')
+    modulestore_type = models.CharField(max_length=32, blank=True, default='')
+
+    org = models.CharField(max_length=255, blank=True, default='', db_index=True)
+    number = models.CharField(max_length=255, blank=True, default='')
+    display_name = models.TextField(blank=True, default='')
+    display_organization = models.TextField(null=True, blank=True)
+    display_coursenumber = models.TextField(null=True, blank=True)
+
+    start = models.DateTimeField(null=True, blank=True)
+    end = models.DateTimeField(null=True, blank=True)
+    advertised_start = models.TextField(null=True, blank=True)
+    announcement = models.DateTimeField(null=True, blank=True)
+    is_new = models.NullBooleanField()
+    enrollment_start = models.DateTimeField(null=True, blank=True)
+    enrollment_end = models.DateTimeField(null=True, blank=True)
+    enrollment_domain = models.TextField(null=True, blank=True)
+    days_early_for_beta = models.FloatField(null=True, blank=True)
+
+    ispublic = models.NullBooleanField()
+    invitation_only = models.BooleanField(default=False)
+
+    lowest_passing_grade = models.FloatField(null=True, blank=True)
+    end_of_course_survey_url = models.TextField(null=True, blank=True)
+    course_image_url = models.TextField(blank=True, default='')
+    short_description = models.TextField(blank=True, default='')
+
+    # Overviews are never detached modules (see courseware.access)
+    _class_tags = frozenset()
+
+    def __unicode__(self):
+        return self.course_id
+
+    def _i18n_service(self):
+        return ModuleI18nService()
+
+    @property
+    def id(self):  # pylint: disable=invalid-name
+        """Return the course_id for this course"""
+        return self.course_id
+
+    @property
+    def location(self):
+        """The location of the course"""
+        return CourseDescriptor.id_to_location(self.course_id)
+
+    @property
+    def display_name_with_default(self):
+        """The display name of the course"""
+        return self.display_name
+
+    def load_descriptor(self, depth=0):
+        """
+        Return the CourseDescriptor of this course, for the values which
+        are not part of the overview.
+        """
+        return modulestore().get_instance(self.course_id, self.location, depth=depth)
+
+    def is_current(self):
+        """
+        Return whether this overview was built from the current version of
+        its course.
+        """
+        if not self.version:
+            return False
+        if self.modulestore_type == XML_MODULESTORE_TYPE:
+            return self.course_id in _REFRESHED_XML_COURSES
+        return self.version == course_cache_version(self.course_id)
+
+    @classmethod
+    def get_from_id(cls, course_id):
+        """
+        Return the overview of the course `course_id`, building it if it is
+        missing or out of date.
+
+        Raises ItemNotFoundError if the course doesn't exist.
+        """
+        try:
+            overview = cls.objects.get(course_id=course_id)
+        except cls.DoesNotExist:
+            overview = None
+        if overview is None or not overview.is_current():
+            overview = cls.refresh(course_id)
+        return overview
+
+    @classmethod
+    def get_all(cls):
+        """
+        Return the overviews of all the courses, sorted by course number.
+
+        Overviews which were never built are built, and up to
+        MAX_REFRESHES_PER_LISTING out of date ones are rebuilt; the others
+        are returned as they are. Overviews of courses which no longer exist
+        are removed when they are rebuilt.
+        """
+        overviews = []
+        refreshes = 0
+        for overview in cls.objects.order_by('number'):
+            if not overview.is_current():
+                if overview.version:
+                    if refreshes >= MAX_REFRESHES_PER_LISTING:
+                        overviews.append(overview)
+                        continue
+                    refreshes += 1
+                try:
+                    overview = cls.refresh(overview.course_id)
+                except ItemNotFoundError:
+                    continue
+            overviews.append(overview)
+        return overviews
+
+    @classmethod
+    def mark_stale(cls, course_id):
+        """
+        Record that the course `course_id` was created or changed, so that
+        its overview is built and listed, or rebuilt, the next time overviews
+        are read. Cheap enough to call from Studio on course creation and
+        import.
+        """
+        overview, created = cls.objects.get_or_create(course_id=course_id)
+        if not created and overview.version:
+            overview.version = STALE_VERSION
+            overview.save()
+
+    @classmethod
+    def refresh(cls, course_id):
+        """
+        Rebuild the overview of the course `course_id` from the modulestore,
+        and return it.
+
+        Raises ItemNotFoundError, after removing the overview, if the course
+        doesn't exist.
+        """
+        # Read the version first, so that a change made while the overview
+        # is being built leaves it out of date
+        version = course_cache_version(course_id)
+        store = modulestore()
+        try:
+            course = store.get_instance(course_id, CourseDescriptor.id_to_location(course_id))
+        except ItemNotFoundError:
+            cls.objects.filter(course_id=course_id).delete()
+            raise
+
+        overview, _created = cls.objects.get_or_create(course_id=course_id)
+        overview.version = version
+        overview.modulestore_type = store.get_modulestore_type(course_id)
+        overview._update_from_course(course)  # pylint: disable=protected-access
+        overview.save()
+
+        if overview.modulestore_type == XML_MODULESTORE_TYPE:
+            _REFRESHED_XML_COURSES.add(course_id)
+        return overview
+
+    def _update_from_course(self, course):
+        """
+        Copy the listed values of the CourseDescriptor `course`.
+        """
+        self.org = course.location.org
+        self.number = course.location.course
+        self.display_name = course.display_name_with_default
+        self.display_organization = course.display_organization
+        self.display_coursenumber = course.display_coursenumber
+        self.start = course.start
+        self.end = course.end
+        self.advertised_start = course.advertised_start
+        self.announcement = course.announcement
+        is_new = course.is_new
+        if isinstance(is_new, basestring):
+            is_new = is_new.lower() in ['true', 'yes', 'y']
+        self.is_new = is_new
+        self.enrollment_start = course.enrollment_start
+        self.enrollment_end = course.enrollment_end
+        self.enrollment_domain = course.enrollment_domain
+        self.days_early_for_beta = course.days_early_for_beta
+        self.ispublic = course.ispublic
+        self.invitation_only = course.invitation_only
+        try:
+            self.lowest_passing_grade = course.lowest_passing_grade
+        except (KeyError, ValueError):
+            self.lowest_passing_grade = None
+        self.end_of_course_survey_url = course.end_of_course_survey_url
+        self.course_image_url = course_image_url(course)
+        self.short_description = course_about_html(course, 'short_description')
+
+
+class CourseListing(models.Model):
+    """
+    The values of a course shown in Studio's course listing.
+
+    Unlike overviews, listings are written by Studio whenever a course is
+    created, imported, cloned, has its settings changed or is deleted, so
+    the listing is read without loading any course.
+    """
+    course_id = models.CharField(max_length=255, unique=True)
+    # the course id in the form used by the names of the course's role
+    # groups (see `make_group_key`), to join listings with a user's groups
+    group_key = models.CharField(max_length=255, db_index=True)
+
+    display_name = models.TextField(blank=True, default='')
+    org = models.CharField(max_length=255, blank=True, default='')
+    number = models.CharField(max_length=255, blank=True, default='')
+    run = models.CharField(max_length=255, blank=True, default='')
+    display_org = models.TextField(blank=True, default='')
+    display_number = models.TextField(blank=True, default='')
+
+    # the package id of the course's locator, and its LMS link
+    package_id = models.CharField(max_length=255, blank=True, default='')
+    lms_link = models.TextField(null=True, blank=True)
+
+    def __unicode__(self):
+        return self.course_id
+
+    @staticmethod
+    def make_group_key(course_id):
+        """
+        Return the key of `course_id` (in the org/number/run or org.number.run
+        formats of role group names) in listings.
+        """
+        return course_id.replace('/', '.').lower()
+
+    @classmethod
+    def update_for_course(cls, course, package_id, lms_link):
+        """
+        Record the listing of the CourseDescriptor `course`, whose locator has
+        the package id `package_id`.
+        """
+        course_id = course.location.course_id
+        listing, _created = cls.objects.get_or_create(
+            course_id=course_id, defaults={'group_key': cls.make_group_key(course_id)}
+        )
+        listing.display_name = course.display_name_with_default
+        listing.org = course.location.org
+        listing.number = course.location.course
+        listing.run = course.location.name
+        listing.display_org = course.display_org_with_default
+        listing.display_number = course.display_number_with_default
+        listing.package_id = package_id
+        listing.lms_link = lms_link
+        listing.save()
+        return listing
+
+    @classmethod
+    def remove(cls, course_id):
+        """
+        Remove the listing of the course `course_id`.
+        """
+        cls.objects.filter(course_id=course_id).delete()
@@ -0,0 +1,80 @@
+"""
+Tests for the course overviews used by course listings.
+"""
+import datetime
+
+from mock import patch
+from pytz import UTC
+
+from django.test.utils import override_settings
+
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
+from course_overviews.models import CourseOverview
+
+
+@override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
+class CourseOverviewTest(ModuleStoreTestCase):
+    """
+    Check that overviews mirror their courses, and are rebuilt when the
+    courses change.
+    """
+    def setUp(self):
+        self.start = datetime.datetime(2030, 1, 1, tzinfo=UTC)
+        self.course = CourseFactory.create(
+            org='edX', number='Overview', display_name='Overview Course', start=self.start
+        )
+
+    def test_mirrors_course(self):
+        overview = CourseOverview.get_from_id(self.course.id)
+        self.assertEqual(overview.id, self.course.id)
+        self.assertEqual(overview.location, self.course.location)
+        self.assertEqual(overview.display_name_with_default, self.course.display_name_with_default)
+        self.assertEqual(overview.display_number_with_default, self.course.display_number_with_default)
+        self.assertEqual(overview.display_org_with_default, self.course.display_org_with_default)
+        self.assertEqual(overview.start, self.start)
+        self.assertEqual(overview.start_date_text, self.course.start_date_text)
+        self.assertEqual(overview.has_started(), self.course.has_started())
+        self.assertEqual(overview.sorting_score, self.course.sorting_score)
+
+    def test_reused_until_course_changes(self):
+        CourseOverview.get_from_id(self.course.id)
+        with patch.object(CourseOverview, 'refresh') as mock_refresh:
+            CourseOverview.get_from_id(self.course.id)
+        self.assertFalse(mock_refresh.called)
+
+        self.course.display_name = 'Renamed'
+        modulestore().update_item(self.course, '**replace_user**')
+        self.assertEqual(CourseOverview.get_from_id(self.course.id).display_name, 'Renamed')
+
+    def test_mark_stale(self):
+        CourseOverview.get_from_id(self.course.id)
+        CourseOverview.mark_stale(self.course.id)
+        self.assertFalse(CourseOverview.objects.get(course_id=self.course.id).is_current())
+        self.assertTrue(CourseOverview.get_from_id(self.course.id).is_current())
+
+    def test_get_all_drops_deleted_courses(self):
+        CourseOverview.mark_stale('edX/Missing/2014')
+        self.assertIn(
+            self.course.id, [overview.id for overview in CourseOverview.get_all()]
+        )
+        self.assertFalse(CourseOverview.objects.filter(course_id='edX/Missing/2014').exists())
+
+    @patch('course_overviews.models.MAX_REFRESHES_PER_LISTING', 1)
+    def test_get_all_bounds_refreshes(self):
+        other_course = CourseFactory.create(org='edX', number='Other', display_name='Other Course')
+        CourseOverview.get_from_id(self.course.id)
+        CourseOverview.get_from_id(other_course.id)
+        CourseOverview.mark_stale(self.course.id)
+        CourseOverview.mark_stale(other_course.id)
+
+        # one stale overview is rebuilt, the other is listed as it is
+        overviews = CourseOverview.get_all()
+        self.assertEqual(
+            sorted(overview.display_name for overview in overviews), ['Other Course', 'Overview Course']
+        )
+        self.assertEqual(len([overview for overview in overviews if overview.is_current()]), 1)
+        self.assertEqual(len([overview for overview in CourseOverview.get_all() if overview.is_current()]), 2)
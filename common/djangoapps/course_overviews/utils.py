@@ -0,0 +1,38 @@
+"""
+Values of course descriptors stored in course overviews, which the LMS
+also shows for descriptors.
+"""
+from static_replace import replace_static_urls
+from xmodule.contentstore.content import StaticContent
+from xmodule.modulestore import XML_MODULESTORE_TYPE
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.exceptions import ItemNotFoundError
+
+
+def course_image_url(course):
+    """
+    Return the url of the image of the CourseDescriptor `course`.
+    """
+    if course.static_asset_path or modulestore().get_modulestore_type(course.location.course_id) == XML_MODULESTORE_TYPE:
+        return '/static/' + (course.static_asset_path or getattr(course, 'data_dir', '')) + "/images/course_image.jpg"
+    else:
+        loc = StaticContent.compute_location(course.location.org, course.location.course, course.course_image)
+        return StaticContent.get_url_path_from_location(loc)
+
+
+def course_about_html(course, section_key):
+    """
+    Return the html of an about section of the course, with static urls
+    replaced, without rendering it for a user.
+    """
+    loc = course.location.replace(category='about', name=section_key)
+    try:
+        about = modulestore().get_instance(course.id, loc)
+    except ItemNotFoundError:
+        return ''
+    return replace_static_urls(
+        about.data,
+        getattr(course, 'data_dir', None),
+        course_id=course.id,
+        static_asset_path=course.static_asset_path
+    )
@@ -0,0 +1,52 @@
+"""
+Compile every Mako template in the configured lookups ahead of time.
+
+Run this during deploy, with MAKO_MODULE_DIR pointing at a directory shared
+by the web workers, so that freshly started workers find every template
+already compiled instead of compiling on their first requests.
+"""
+import logging
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand
+
+from edxmako import LOOKUP
+
+log = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml', '.rss', '.json', '.js')
+
+
+class Command(NoArgsCommand):
+    """
+    Management command to precompile Mako templates.
+    """
+    option_list = NoArgsCommand.option_list + (
+        make_option('--namespace',
+                    dest='namespace',
+                    default=None,
+                    help='Only compile templates in this lookup namespace'),
+    )
+
+    help = "Precompile the Mako templates in every configured lookup."
+
+    def handle_noargs(self, **options):
+        """
+        Load every template in each lookup, which compiles it to the lookup's
+        module directory.
+        """
+        compiled = failed = 0
+        for namespace, lookup in LOOKUP.items():
+            if options['namespace'] and namespace != options['namespace']:
+                continue
+            for uri in sorted(set(lookup.template_uris(TEMPLATE_EXTENSIONS))):
+                try:
+                    lookup.get_template(uri)
+                except Exception:  # pylint: disable=broad-except
+                    # Not every file next to the templates is a Mako template
+                    log.warning("Could not compile template %s in namespace %s", uri, namespace, exc_info=True)
+                    failed += 1
+                else:
+                    compiled += 1
+
+        self.stdout.write("Compiled {0} templates, {1} failed.\n".format(compiled, failed))
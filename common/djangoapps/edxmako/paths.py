@@ -1,10 +1,13 @@
 """
 Set up lookup paths for mako templates.
 """
+import hashlib
 import os
 import pkg_resources
+import time
 
 from django.conf import settings
+from dogapi import dog_stats_api
 from mako.lookup import TemplateLookup
 
 from . import LOOKUP
@@ -14,13 +17,55 @@ class DynamicTemplateLookup(TemplateLookup):
     """
     A specialization of the standard mako `TemplateLookup` class which allows
     for adding directories progressively.
+
+    Compiled template modules are named after a hash of the template source,
+    so a `module_directory` can be shared by every process on a machine (and
+    survive deploys): a process only compiles a template if no other process
+    has compiled the same source before.
     """
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('modulename_callable', self._module_filename)
+        super(DynamicTemplateLookup, self).__init__(*args, **kwargs)
+
     def add_directory(self, directory):
         """
         Add a new directory to the template lookup path.
         """
         self.directories.append(os.path.normpath(directory))
 
+    def _module_filename(self, filename, uri):
+        """
+        Return the path of the compiled module for the template at `filename`.
+        """
+        module_directory = self.template_args['module_directory']
+        if module_directory is None:
+            return None
+        with open(filename, 'rb') as template_file:
+            digest = hashlib.sha1(template_file.read()).hexdigest()
+        relative_path = os.path.normpath(uri.lstrip('/'))
+        return os.path.join(module_directory, '{0}.{1}.py'.format(relative_path, digest))
+
+    def _load(self, filename, uri):
+        """
+        Load (and compile, if needed) the template, recording how long it took.
+        """
+        start = time.time()
+        template = super(DynamicTemplateLookup, self)._load(filename, uri)
+        dog_stats_api.histogram('mako.template.load_time', time.time() - start, tags=[u'template:{0}'.format(uri)])
+        return template
+
+    def template_uris(self, extensions=None):
+        """
+        Yield the uri of every template file found in the lookup directories,
+        optionally only those ending in one of `extensions`.
+        """
+        for directory in self.directories:
+            for root, _dirs, files in os.walk(directory):
+                for name in files:
+                    if extensions and not name.endswith(tuple(extensions)):
+                        continue
+                    yield os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/')
+
 
 def add_lookup(namespace, directory, package=None):
     """
@@ -12,8 +12,8 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from django.template import Context
 from django.http import HttpResponse
+from dogapi import dog_stats_api
 import logging
 
 from microsite_configuration.middleware import MicrositeConfiguration
@@ -82,26 +82,24 @@ def render_to_string(template_name, dictionary, context=None, namespace='main'):
     # see if there is an override template defined in the microsite
     template_name = MicrositeConfiguration.get_microsite_template_path(template_name)
 
-    context_instance = Context(dictionary)
-    # add dictionary to context_instance
-    context_instance.update(dictionary or {})
-    # collapse context_instance to a single dictionary for mako
+    # collapse the request context and dictionary to a single dictionary for mako
     context_dictionary = {}
-    context_instance['settings'] = settings
-    context_instance['EDX_ROOT_URL'] = settings.EDX_ROOT_URL
-    context_instance['marketing_link'] = marketing_link
 
     # In various testing contexts, there might not be a current request context.
     if edxmako.middleware.requestcontext is not None:
         for d in edxmako.middleware.requestcontext:
             context_dictionary.update(d)
-    for d in context_instance:
-        context_dictionary.update(d)
+    if dictionary:
+        context_dictionary.update(dictionary)
+    context_dictionary['settings'] = settings
+    context_dictionary['EDX_ROOT_URL'] = settings.EDX_ROOT_URL
+    context_dictionary['marketing_link'] = marketing_link
     if context:
         context_dictionary.update(context)
     # fetch and render template
     template = lookup_template(namespace, template_name)
-    return template.render_unicode(**context_dictionary)
+    with dog_stats_api.timer('mako.template.render_time', tags=[u'template:{0}'.format(template_name)]):
+        return template.render_unicode(**context_dictionary)
 
 
 def render_to_response(template_name, dictionary=None, context_instance=None, namespace='main', **kwargs):
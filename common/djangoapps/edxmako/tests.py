@@ -1,7 +1,13 @@
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
 from django.test import TestCase
 from django.test.utils import override_settings
 from django.core.urlresolvers import reverse
 from edxmako import add_lookup, LOOKUP
+from edxmako.paths import DynamicTemplateLookup
 from edxmako.shortcuts import marketing_link
 from mock import patch
 from util.testing import UrlResetMixin
@@ -37,3 +43,70 @@ class AddLookupTests(TestCase):
         dirs = LOOKUP['test'].directories
         self.assertEqual(len(dirs), 1)
         self.assertTrue(dirs[0].endswith('management'))
+
+
+class DynamicTemplateLookupTests(TestCase):
+    """
+    Test compiling templates to a shared module directory.
+    """
+    def setUp(self):
+        self.template_dir = tempfile.mkdtemp()
+        self.module_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.template_dir)
+        self.addCleanup(shutil.rmtree, self.module_dir)
+        self._write_template('hello.html', 'Hello ${name}')
+        self._write_template('sub/other.html', 'Other')
+        self._write_template('sub/script.underscore', '<%= name %>')
+
+    def _write_template(self, uri, content):
+        """
+        Write a template file into the template directory.
+        """
+        path = os.path.join(self.template_dir, uri)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as template_file:
+            template_file.write(content)
+
+    def _lookup(self):
+        """
+        Make a lookup over the template directory.
+        """
+        lookup = DynamicTemplateLookup(module_directory=self.module_dir)
+        lookup.add_directory(self.template_dir)
+        return lookup
+
+    def _compiled_modules(self):
+        """
+        Return the compiled module files in the module directory.
+        """
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.module_dir)
+            for root, _dirs, files in os.walk(self.module_dir)
+            for name in files if name.endswith('.py')
+        )
+
+    def test_module_keyed_by_content(self):
+        self.assertEqual(self._lookup().get_template('hello.html').render_unicode(name='you'), 'Hello you')
+        modules = self._compiled_modules()
+        self.assertEqual(len(modules), 1)
+
+        # Another lookup (e.g. another process) reuses the compiled module
+        with patch('mako.template._compile_module_file') as compile_module:
+            self.assertEqual(self._lookup().get_template('hello.html').render_unicode(name='me'), 'Hello me')
+            self.assertFalse(compile_module.called)
+
+        # Changing the source compiles a new module
+        self._write_template('hello.html', 'Goodbye ${name}')
+        self.assertEqual(self._lookup().get_template('hello.html').render_unicode(name='you'), 'Goodbye you')
+        self.assertEqual(len(self._compiled_modules()), 2)
+
+    def test_template_uris(self):
+        lookup = self._lookup()
+        self.assertItemsEqual(lookup.template_uris(['.html']), ['hello.html', 'sub/other.html'])
+        self.assertEqual(len(list(lookup.template_uris())), 3)
+
+    def test_compile_templates_command(self):
+        with patch.dict('edxmako.LOOKUP', {'test': self._lookup()}, clear=True):
+            call_command('compile_templates')
+        self.assertEqual(len(self._compiled_modules()), 2)
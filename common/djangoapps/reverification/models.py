@@ -52,3 +52,22 @@ class MidcourseReverificationWindow(ValidateOnSaveMixin, models.Model):
             return cls.objects.get(course_id=course_id, start_date__lte=date, end_date__gte=date)
         except cls.DoesNotExist:
             return None
+
+    @classmethod
+    def get_windows(cls, course_ids, date):
+        """
+        Returns a dictionary of course id to the window that is open for
+        each of the given courses at a particular date, read with a single
+        query. Courses with no open window, or more than one, are left out.
+        """
+        windows = {}
+        duplicated = set()
+        if not course_ids:
+            return windows
+        for window in cls.objects.filter(course_id__in=course_ids, start_date__lte=date, end_date__gte=date):
+            if window.course_id in windows:
+                duplicated.add(window.course_id)
+            windows[window.course_id] = window
+        for course_id in duplicated:
+            del windows[course_id]
+        return windows
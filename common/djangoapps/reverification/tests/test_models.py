@@ -56,6 +56,25 @@ class TestMidcourseReverificationWindow(TestCase):
             MidcourseReverificationWindow.get_window(self.course_id, datetime.now(pytz.utc))
         )
 
+    def test_get_windows(self):
+        other_course_id = CourseFactory.create().id
+        # courses without an open window are left out
+        self.assertEquals(
+            MidcourseReverificationWindow.get_windows([self.course_id, other_course_id], datetime.now(pytz.utc)),
+            {}
+        )
+
+        window_valid = MidcourseReverificationWindowFactory(
+            course_id=self.course_id,
+            start_date=datetime.now(pytz.utc) - timedelta(days=3),
+            end_date=datetime.now(pytz.utc) + timedelta(days=3)
+        )
+        with self.assertNumQueries(1):
+            windows = MidcourseReverificationWindow.get_windows(
+                [self.course_id, other_course_id], datetime.now(pytz.utc)
+            )
+        self.assertEquals(windows, {self.course_id: window_valid})
+
     def test_no_overlapping_windows(self):
         window_valid = MidcourseReverificationWindow(
             course_id=self.course_id,
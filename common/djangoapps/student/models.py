@@ -497,6 +497,29 @@ class CourseEnrollment(models.Model):
             if event_name and self.course_id:
                 log.exception('Unable to emit event %s for user %s and course %s', event_name, self.user.username, self.course_id)
 
+    @classmethod
+    def emit_events(cls, enrollments, event_name):
+        """
+        Emits the event `event_name` for each of `enrollments`, which must all
+        be in the same course, within a single tracking context.
+        """
+        if not enrollments:
+            return
+        course_id = enrollments[0].course_id
+        try:
+            context = contexts.course_context_from_course_id(course_id)
+            request = crum.get_current_request()
+            with tracker.get_tracker().context(event_name, context):
+                for enrollment in enrollments:
+                    data = {
+                        'user_id': enrollment.user_id,
+                        'course_id': course_id,
+                        'mode': enrollment.mode,
+                    }
+                    server_track(request, event_name, data)
+        except:  # pylint: disable=bare-except
+            log.exception('Unable to emit events %s for course %s', event_name, course_id)
+
     @classmethod
     def enroll(cls, user, course_id, mode="honor"):
         """
@@ -597,6 +620,97 @@ class CourseEnrollment(models.Model):
             err_msg = u"Tried to unenroll email {} from course {}, but user not found"
             log.error(err_msg.format(email, course_id))
 
+    @classmethod
+    def bulk_enroll(cls, users, course_id, mode="honor", send_events=True):
+        """
+        Enroll many users in a course. This saves immediately.
+
+        Has the same effect as calling `enroll()` for each of `users`, but
+        reads their enrollments with one query, creates the missing ones with
+        another and activates the others with a third. The events of the
+        activated enrollments are emitted together, unless `send_events` is
+        False, in which case the caller emits them with `emit_events` (e.g.
+        once its transaction is committed).
+
+        Returns the list of CourseEnrollments that were activated.
+
+        `users` is a list of saved Django User objects.
+
+        `course_id` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
+
+        `mode` is a string specifying what kind of enrollment this is, as in
+               `enroll()`.
+
+        It is expected that this method is called from a method which has already
+        verified the user authentication and access.
+        """
+        users_by_id = dict((user.id, user) for user in users)
+        existing = dict(
+            (enrollment.user_id, enrollment)
+            for enrollment in cls.objects.filter(course_id=course_id, user__in=users_by_id.keys())
+        )
+        created = [
+            cls(user=user, course_id=course_id, mode=mode, is_active=True)
+            for user_id, user in users_by_id.items()
+            if user_id not in existing
+        ]
+        changed = [
+            enrollment for enrollment in existing.values()
+            if not enrollment.is_active or enrollment.mode != mode
+        ]
+        activated = [enrollment for enrollment in changed if not enrollment.is_active]
+
+        cls.objects.bulk_create(created)
+        if changed:
+            cls.objects.filter(id__in=[enrollment.id for enrollment in changed]).update(is_active=True, mode=mode)
+            for enrollment in changed:
+                enrollment.is_active = True
+                enrollment.mode = mode
+
+        activated.extend(created)
+        if send_events:
+            cls.emit_events(activated, EVENT_NAME_ENROLLMENT_ACTIVATED)
+        return activated
+
+    @classmethod
+    def bulk_unenroll(cls, users, course_id, send_events=True):
+        """
+        Remove many users from a course. This saves immediately.
+
+        Has the same effect as calling `unenroll()` for each of `users`, with
+        one query to read their active enrollments and one to deactivate them.
+        Users who aren't enrolled are skipped. Unless `send_events` is False,
+        `send_unenrollment_events` is called for the deactivated enrollments.
+
+        Returns the list of CourseEnrollments that were deactivated.
+
+        `users` is a list of saved Django User objects.
+
+        `course_id` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
+        """
+        enrollments = list(cls.objects.filter(
+            course_id=course_id,
+            user__in=[user.id for user in users],
+            is_active=True
+        ))
+        if enrollments:
+            cls.objects.filter(id__in=[enrollment.id for enrollment in enrollments]).update(is_active=False)
+        for enrollment in enrollments:
+            enrollment.is_active = False
+        if send_events:
+            cls.send_unenrollment_events(enrollments)
+        return enrollments
+
+    @classmethod
+    def send_unenrollment_events(cls, enrollments):
+        """
+        Send the unenroll_done signal and emit the deactivation events of
+        `enrollments`, deactivated by `bulk_unenroll`.
+        """
+        for enrollment in enrollments:
+            unenroll_done.send(sender=None, course_enrollment=enrollment)
+        cls.emit_events(enrollments, EVENT_NAME_ENROLLMENT_DEACTIVATED)
+
     @classmethod
     def is_enrolled(cls, user, course_id):
         """
@@ -20,6 +20,86 @@ class CourseContextRequired(Exception):
     pass
 
 
+# The suffixes of a course's role group names, keyed by the way the course
+# was referenced. Computing them means translating the course through the
+# loc mapper, and the result can't change once the course has been mapped,
+# so mapped courses are only translated once per process. Unmapped courses
+# are translated each time, since they may get mapped at any point.
+_COURSE_GROUP_SUFFIXES = {}
+
+
+def course_group_suffixes(location, course_context=None):
+    """
+    Return the suffixes (after '<role>_') of the group names which grant a
+    role in the course of `location`, most preferred first.
+
+    `location` is a Location or a CourseLocator. `course_context` is the
+    course_id to use when `location` is not a course location.
+    """
+    if isinstance(location, Location):
+        # direct copy from auth.authz.get_all_course_role_groupnames will refactor to one impl asap
+        try:
+            course_context = location.course_id  # course_id is valid for translation
+        except InvalidLocationError:  # will occur on old locations where location is not of category course
+            if course_context is None:
+                raise CourseContextRequired()
+        key = (course_context, location.org, location.course)  # pylint: disable=E1101, E1103
+        if key in _COURSE_GROUP_SUFFIXES:
+            return _COURSE_GROUP_SUFFIXES[key]
+
+        suffixes = [course_context]
+        try:
+            locator = loc_mapper().translate_location_to_course_locator(course_context, location)
+            suffixes.append(locator.package_id)
+        except (InvalidLocationError, ItemNotFoundError):
+            # if it's never been mapped, the auth won't be via the Locator syntax
+            locator = None
+        # least preferred legacy role_course format
+        suffixes.append(location.course)  # pylint: disable=E1101, E1103
+        if locator is not None:
+            _COURSE_GROUP_SUFFIXES[key] = suffixes
+        return suffixes
+
+    elif isinstance(location, CourseLocator):
+        key = location.package_id
+        if key in _COURSE_GROUP_SUFFIXES:
+            return _COURSE_GROUP_SUFFIXES[key]
+
+        suffixes = [location.package_id]
+        # handle old Location syntax
+        old_location = loc_mapper().translate_locator_to_location(location, get_course=True)
+        if old_location:
+            # the slashified version of the course_id (myu/mycourse/myrun)
+            suffixes.append(old_location.course_id)
+            # add the least desirable but sometimes occurring format.
+            suffixes.append(old_location.course)  # pylint: disable=E1101, E1103
+            _COURSE_GROUP_SUFFIXES[key] = suffixes
+        return suffixes
+
+    return []
+
+
+def clear_user_role_caches(user):
+    """
+    Forget the groups and access decisions cached on `user`, after its
+    roles have changed.
+    """
+    for attr in ('_groups', '_access_decisions'):
+        if hasattr(user, attr):
+            delattr(user, attr)
+
+
+def user_group_names(user):
+    """
+    Return the set of (lowercased) names of the groups `user` belongs to,
+    cached on the user object for the life of the request.
+    """
+    # pylint: disable=protected-access
+    if not hasattr(user, '_groups'):
+        user._groups = set(name.lower() for name in user.groups.values_list('name', flat=True))
+    return user._groups
+
+
 class AccessRole(object):
     """
     Object representing a role with particular access to a resource
@@ -67,12 +147,14 @@ class GlobalStaff(AccessRole):
             if (user.is_authenticated and user.is_active):
                 user.is_staff = True
                 user.save()
+                clear_user_role_caches(user)
 
     def remove_users(self, *users):
         for user in users:
             # don't check is_authenticated nor is_active on purpose
             user.is_staff = False
             user.save()
+            clear_user_role_caches(user)
 
     def users_with_role(self):
         raise Exception("This operation is un-indexed, and shouldn't be used")
@@ -94,6 +176,13 @@ class GroupBasedRole(AccessRole):
         """
         self._group_names = [name.lower() for name in group_names]
 
+    @property
+    def group_names(self):
+        """
+        The lowercased names of the groups granting this role
+        """
+        return self._group_names
+
     def has_user(self, user):
         """
         Return whether the supplied django user has access to this role.
@@ -101,11 +190,7 @@ class GroupBasedRole(AccessRole):
         if not (user.is_authenticated and user.is_active):
             return False
 
-        # pylint: disable=protected-access
-        if not hasattr(user, '_groups'):
-            user._groups = set(name.lower() for name in user.groups.values_list('name', flat=True))
-
-        return len(user._groups.intersection(self._group_names)) > 0
+        return len(user_group_names(user).intersection(self._group_names)) > 0
 
     def add_users(self, *users):
         """
@@ -118,8 +203,7 @@ class GroupBasedRole(AccessRole):
         group.user_set.add(*users)
         # remove cache
         for user in users:
-            if hasattr(user, '_groups'):
-                del user._groups
+            clear_user_role_caches(user)
 
     def remove_users(self, *users):
         """
@@ -130,8 +214,7 @@ class GroupBasedRole(AccessRole):
             group.user_set.remove(*users)
         # remove cache
         for user in users:
-            if hasattr(user, '_groups'):
-                del user._groups
+            clear_user_role_caches(user)
 
     def users_with_role(self):
         """
@@ -150,40 +233,12 @@ class CourseRole(GroupBasedRole):
         in its constructor, or a CourseLocator. Handle all these giving some preference to
         the preferred naming.
         """
-        # TODO: figure out how to make the group name generation lazy so it doesn't force the
-        # loc mapping?
         self.location = Locator.to_locator_or_location(location)
         self.role = role
-        # direct copy from auth.authz.get_all_course_role_groupnames will refactor to one impl asap
-        groupnames = []
-
-        if isinstance(self.location, Location):
-            try:
-                groupnames.append(u'{0}_{1}'.format(role, self.location.course_id))
-                course_context = self.location.course_id  # course_id is valid for translation
-            except InvalidLocationError:  # will occur on old locations where location is not of category course
-                if course_context is None:
-                    raise CourseContextRequired()
-                else:
-                    groupnames.append(u'{0}_{1}'.format(role, course_context))
-            try:
-                locator = loc_mapper().translate_location_to_course_locator(course_context, self.location)
-                groupnames.append(u'{0}_{1}'.format(role, locator.package_id))
-            except (InvalidLocationError, ItemNotFoundError):
-                # if it's never been mapped, the auth won't be via the Locator syntax
-                pass
-            # least preferred legacy role_course format
-            groupnames.append(u'{0}_{1}'.format(role, self.location.course))  # pylint: disable=E1101, E1103
-        elif isinstance(self.location, CourseLocator):
-            groupnames.append(u'{0}_{1}'.format(role, self.location.package_id))
-            # handle old Location syntax
-            old_location = loc_mapper().translate_locator_to_location(self.location, get_course=True)
-            if old_location:
-                # the slashified version of the course_id (myu/mycourse/myrun)
-                groupnames.append(u'{0}_{1}'.format(role, old_location.course_id))
-                # add the least desirable but sometimes occurring format.
-                groupnames.append(u'{0}_{1}'.format(role, old_location.course))  # pylint: disable=E1101, E1103
-
+        groupnames = [
+            u'{0}_{1}'.format(role, suffix)
+            for suffix in course_group_suffixes(self.location, course_context)
+        ]
         super(CourseRole, self).__init__(groupnames)
 
 
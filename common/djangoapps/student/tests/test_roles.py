@@ -1,14 +1,17 @@
 """
 Tests of student.roles
 """
+from uuid import uuid4
 
 from django.test import TestCase
+from mock import patch
 
 from xmodule.modulestore import Location
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
 from student.tests.factories import AnonymousUserFactory
 
-from student.roles import GlobalStaff, CourseRole, CourseStaffRole
+from student import roles
+from student.roles import GlobalStaff, CourseRole, CourseStaffRole, CourseInstructorRole
 from xmodule.modulestore.django import loc_mapper
 from xmodule.modulestore.locator import BlockUsageLocator
 
@@ -84,3 +87,40 @@ class RolesTestCase(TestCase):
             CourseStaffRole(vertical_location, course_context=self.course.course_id).has_user(self.student),
             "Student doesn't have access to {}".format(unicode(vertical_location.url()))
         )
+
+    def test_course_group_names_translated_once(self):
+        """
+        Test that a mapped course is only translated through the loc mapper
+        the first time one of its roles is built
+        """
+        roles._COURSE_GROUP_SUFFIXES.clear()  # pylint: disable=protected-access
+        loc_mapper().translate_location(self.course.course_id, self.course, add_entry_if_missing=True)
+        vertical_location = self.course.replace(category='vertical', name='madeuptoo')
+        with patch('student.roles.loc_mapper', wraps=loc_mapper) as mock_loc_mapper:
+            for _ in range(3):
+                CourseStaffRole(self.course).has_user(self.course_staff)
+                CourseInstructorRole(self.course).has_user(self.course_staff)
+                CourseStaffRole(vertical_location, course_context=self.course.course_id).has_user(self.course_staff)
+        self.assertEqual(mock_loc_mapper.call_count, 1)
+
+    def test_unmapped_course_group_names_not_kept(self):
+        """
+        Test that group names of courses which aren't mapped yet are
+        recomputed, so that they pick up the mapping once it is made
+        """
+        course = Location('i4x://edX/{0}/course/2014_Spring'.format(uuid4().hex))
+        self.assertEqual(len(CourseStaffRole(course).group_names), 2)
+        loc_mapper().translate_location(course.course_id, course, add_entry_if_missing=True)
+        self.assertEqual(len(CourseStaffRole(course).group_names), 3)
+
+    def test_user_groups_queried_once(self):
+        """
+        Test that the user's groups are read once, and reread after the
+        user's roles change
+        """
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                self.assertTrue(CourseStaffRole(self.course).has_user(self.course_staff))
+                self.assertFalse(CourseInstructorRole(self.course).has_user(self.course_staff))
+        CourseInstructorRole(self.course).add_users(self.course_staff)
+        self.assertTrue(CourseInstructorRole(self.course).has_user(self.course_staff))
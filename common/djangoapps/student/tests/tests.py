@@ -21,6 +21,7 @@ from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import int_to_base36
 from django.core.urlresolvers import reverse
 from django.http import HttpResponse
+from django.db import connection
 
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -297,6 +298,31 @@ class DashboardTest(TestCase):
         verified_mode.save()
         self.assertFalse(enrollment.refundable())
 
+    def _dashboard_query_count(self):
+        """
+        Render the dashboard for self.user, and return the number of queries made
+        """
+        connection.use_debug_cursor = True
+        try:
+            start = len(connection.queries)
+            response = self.client.get(reverse('dashboard'))
+            self.assertEqual(response.status_code, 200)
+            return len(connection.queries) - start
+        finally:
+            connection.use_debug_cursor = False
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_INSTRUCTOR_EMAIL': True})
+    def test_dashboard_queries_independent_of_enrollments(self):
+        self.client.login(username=self.user.username, password='test')
+        CourseEnrollment.enroll(self.user, self.course.id)
+        single = self._dashboard_query_count()
+
+        for number in ('101', '102', '103'):
+            course = CourseFactory.create(org=self.COURSE_ORG, display_name=self.COURSE_NAME, number=number)
+            CourseModeFactory.create(course_id=course.id, mode_slug='verified', mode_display_name='Verified')
+            CourseEnrollment.enroll(self.user, course.id, mode='verified')
+        self.assertLessEqual(self._dashboard_query_count(), single)
+
 
 
 class EnrollInCourseTest(TestCase):
@@ -35,6 +35,7 @@ from ratelimitbackend.exceptions import RateLimitException
 from edxmako.shortcuts import render_to_response, render_to_string
 
 from course_modes.models import CourseMode
+from course_overviews.models import CourseOverview
 from student.models import (
     Registration, UserProfile, PendingNameChange,
     PendingEmailChange, CourseEnrollment, unique_id_for_user,
@@ -44,7 +45,7 @@ from student.forms import PasswordResetFormNoActive
 from student.firebase_token_generator import create_token
 
 from verify_student.models import SoftwareSecurePhotoVerification, MidcourseReverificationWindow
-from certificates.models import CertificateStatuses, certificate_status_for_student
+from certificates.models import CertificateStatuses, certificate_status_for_student, certificate_statuses_for_student
 from dark_lang.models import DarkLangConfig
 
 from xmodule.course_module import CourseDescriptor
@@ -182,6 +183,21 @@ def cert_info(user, course):
     return _cert_info(user, course, certificate_status_for_student(user, course.id))
 
 
+def cert_infos(user, courses):
+    """
+    Get the certificate info (see `cert_info`) of the given student for each
+    of `courses`, reading the certificates with a single query.
+
+    Returns a dictionary of course id to certificate info.
+    """
+    ended = [course for course in courses if course.has_ended()]
+    statuses = certificate_statuses_for_student(user, [course.id for course in ended])
+    infos = dict((course.id, {}) for course in courses)
+    for course in ended:
+        infos[course.id] = _cert_info(user, course, statuses[course.id])
+    return infos
+
+
 def reverification_info(course_enrollment_pairs, user, statuses):
     """
     Returns reverification-related information for *all* of user's enrollments whose
@@ -199,8 +215,12 @@ def reverification_info(course_enrollment_pairs, user, statuses):
             dict["must_reverify"] = [some information]
     """
     reverifications = defaultdict(list)
+    windows = MidcourseReverificationWindow.get_windows(
+        [course.id for course, _enrollment in course_enrollment_pairs],
+        datetime.datetime.now(UTC)
+    )
     for (course, enrollment) in course_enrollment_pairs:
-        info = single_course_reverification_info(user, course, enrollment)
+        info = single_course_reverification_info(user, course, enrollment, window=windows.get(course.id))
         if info:
             reverifications[info.status].append(info)
 
@@ -211,7 +231,7 @@ def reverification_info(course_enrollment_pairs, user, statuses):
     return reverifications
 
 
-def single_course_reverification_info(user, course, enrollment):  # pylint: disable=invalid-name
+def single_course_reverification_info(user, course, enrollment, window=False):  # pylint: disable=invalid-name
     """Returns midcourse reverification-related information for user with enrollment in course.
 
     If a course has an open re-verification window, and that user has a verified enrollment in
@@ -221,12 +241,15 @@ def single_course_reverification_info(user, course, enrollment):  # pylint: disa
         user (User): the user we want to get information for
         course (Course): the course in which the student is enrolled
         enrollment (CourseEnrollment): the object representing the type of enrollment user has in course
+        window (MidcourseReverificationWindow): the open window of the course, if already known
+            (None if there is none)
 
     Returns:
         ReverifyInfo: (course_id, course_name, course_number, date, status)
         OR, None: None if there is no re-verification info for this enrollment
     """
-    window = MidcourseReverificationWindow.get_window(course.id, datetime.datetime.now(UTC))
+    if window is False:
+        window = MidcourseReverificationWindow.get_window(course.id, datetime.datetime.now(UTC))
 
     # If there's no window OR the user is not verified, we don't get reverification info
     if (not window) or (enrollment.mode != "verified"):
@@ -242,11 +265,15 @@ def single_course_reverification_info(user, course, enrollment):  # pylint: disa
 def get_course_enrollment_pairs(user, course_org_filter, org_filter_out_set):
     """
     Get the relevant set of (Course, CourseEnrollment) pairs to be displayed on
-    a student's dashboard.
+    a student's dashboard. The courses are CourseOverviews if
+    FEATURES['ENABLE_COURSE_OVERVIEWS'] is set.
     """
     for enrollment in CourseEnrollment.enrollments_for_user(user):
         try:
-            course = course_from_id(enrollment.course_id)
+            if settings.FEATURES.get('ENABLE_COURSE_OVERVIEWS'):
+                course = CourseOverview.get_from_id(enrollment.course_id)
+            else:
+                course = course_from_id(enrollment.course_id)
 
             # if we are in a Microsite, then filter out anything that is not
             # attributed (by ORG) to that Microsite
@@ -375,16 +402,20 @@ def register_user(request, extra_context=None):
     return render_to_response('register.html', context)
 
 
-def complete_course_mode_info(course_id, enrollment):
+def complete_course_mode_info(course_id, enrollment, modes=None):
     """
     We would like to compute some more information from the given course modes
     and the user's current enrollment
 
+    `modes` are the course modes (see CourseMode.modes_for_course_dict), if
+    they have already been read.
+
     Returns the given information:
         - whether to show the course upsell information
         - numbers of days until they can't upsell anymore
     """
-    modes = CourseMode.modes_for_course_dict(course_id)
+    if modes is None:
+        modes = CourseMode.modes_for_course_dict(course_id)
     mode_info = {'show_upsell': False, 'days_for_upsell': None}
     # we want to know if the user is already verified and if verified is an
     # option
@@ -437,17 +468,23 @@ def dashboard(request):
     show_courseware_links_for = frozenset(course.id for course, _enrollment in course_enrollment_pairs
                                           if has_access(request.user, course, 'load'))
 
-    course_modes = {course.id: complete_course_mode_info(course.id, enrollment) for course, enrollment in course_enrollment_pairs}
-    cert_statuses = {course.id: cert_info(request.user, course) for course, _enrollment in course_enrollment_pairs}
+    # The modes, certificates and email authorizations of all the courses
+    # are each read with a single query
+    course_ids = [course.id for course, _enrollment in course_enrollment_pairs]
+    modes_by_course = CourseMode.modes_for_courses_dict(course_ids)
+    course_modes = {
+        course.id: complete_course_mode_info(course.id, enrollment, modes_by_course[course.id])
+        for course, enrollment in course_enrollment_pairs
+    }
+    cert_statuses = cert_infos(request.user, [course for course, _enrollment in course_enrollment_pairs])
 
     # only show email settings for Mongo course and when bulk email is turned on
-    show_email_settings_for = frozenset(
-        course.id for course, _enrollment in course_enrollment_pairs if (
-            settings.FEATURES['ENABLE_INSTRUCTOR_EMAIL'] and
-            modulestore().get_modulestore_type(course.id) != XML_MODULESTORE_TYPE and
-            CourseAuthorization.instructor_email_enabled(course.id)
+    show_email_settings_for = frozenset()
+    if settings.FEATURES['ENABLE_INSTRUCTOR_EMAIL']:
+        show_email_settings_for = frozenset(
+            course_id for course_id in CourseAuthorization.instructor_email_enabled_courses(course_ids)
+            if modulestore().get_modulestore_type(course_id) != XML_MODULESTORE_TYPE
         )
-    )
 
     # Verification Attempts
     # Used to generate the "you must reverify for course x" banner
@@ -457,8 +494,9 @@ def dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(course_enrollment_pairs, user, statuses)
 
-    show_refund_option_for = frozenset(course.id for course, _enrollment in course_enrollment_pairs
-                                       if _enrollment.refundable())
+    # equivalent to CourseEnrollment.refundable, using the modes read above
+    show_refund_option_for = frozenset(course_id for course_id in course_ids
+                                       if 'verified' in modes_by_course[course_id])
 
     # get info w.r.t ExternalAuthMap
     external_auth_map = None
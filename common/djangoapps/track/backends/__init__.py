@@ -26,3 +26,14 @@ class BaseBackend(object):
     def send(self, event):
         """Send event to tracker."""
         pass
+
+    def send_batch(self, events):
+        """
+        Send a list of events to tracker.
+
+        Backends that can write several events in one operation should
+        override this; by default each event is sent individually.
+
+        """
+        for event in events:
+            self.send(event)
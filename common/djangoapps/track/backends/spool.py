@@ -0,0 +1,268 @@
+"""
+Event tracker backend that appends events to rotating local spool files.
+
+Each event is written as a frame: a 4 byte big-endian length followed by
+the compact JSON serialization of the event.  Every process writes to its
+own active file, which is rotated once it reaches `max_bytes` or becomes
+older than `max_age` seconds.  Rotated files are compressed with gzip or
+zlib, which for JSON events typically makes them an order of magnitude
+smaller.
+
+Use `iter_spool_events` or `read_spool_file` to stream the events back.
+
+"""
+
+from __future__ import absolute_import
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+
+from track.backends import BaseBackend
+from track.utils import DateTimeJSONEncoder
+
+
+log = logging.getLogger(__name__)
+
+
+FRAME_HEADER = struct.Struct('>I')
+
+ACTIVE_SUFFIX = '.spool'
+COMPRESSED_SUFFIXES = {
+    'gzip': '.spool.gz',
+    'zlib': '.spool.z',
+}
+
+FSYNC_ALWAYS = 'always'
+FSYNC_INTERVAL = 'interval'
+FSYNC_NEVER = 'never'
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class SpoolBackend(BaseBackend):
+    """Event tracker backend that writes framed events to local files"""
+
+    def __init__(self, directory, prefix='tracking', max_bytes=64 * 1024 * 1024, max_age=3600,
+                 compression='gzip', fsync=FSYNC_INTERVAL, fsync_interval=1.0, **kwargs):
+        """
+        Configure the spool.
+
+        :Parameters:
+
+          - `directory`: where spool files are written
+          - `prefix`: file name prefix for spool files
+          - `max_bytes`: rotate the active file once it is this large
+          - `max_age`: rotate the active file once it is this many seconds old
+          - `compression`: 'gzip', 'zlib' or None for rotated files
+          - `fsync`: 'always' to fsync after every event, 'interval' to
+            fsync at most every `fsync_interval` seconds, or 'never' to
+            leave flushing to the operating system
+
+        """
+        super(SpoolBackend, self).__init__(**kwargs)
+
+        if compression is not None and compression not in COMPRESSED_SUFFIXES:
+            raise ValueError('Invalid spool compression %s' % compression)
+        if fsync not in (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER):
+            raise ValueError('Invalid spool fsync policy %s' % fsync)
+
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._opened_at = 0
+        self._synced_at = 0
+
+    @property
+    def active_path(self):
+        """Path of the file this process is currently appending to"""
+        return os.path.join(self.directory, '{0}.{1}{2}'.format(self.prefix, os.getpid(), ACTIVE_SUFFIX))
+
+    def send(self, event):
+        self.send_batch([event])
+
+    def send_batch(self, events):
+        data = ''.join(_frame(event) for event in events)
+        with self._lock:
+            now = time.time()
+            if self._file is None:
+                self._open(now)
+            elif self._file.tell() >= self.max_bytes or now - self._opened_at >= self.max_age:
+                self._rotate(now)
+
+            self._file.write(data)
+
+            if self.fsync == FSYNC_ALWAYS or (
+                    self.fsync == FSYNC_INTERVAL and now - self._synced_at >= self.fsync_interval):
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._synced_at = now
+
+    def rotate(self):
+        """Close and compress the active file; the next event starts a new one"""
+        with self._lock:
+            if self._file is not None:
+                self._close_and_archive()
+
+    def _open(self, now):
+        """Open the active file for appending"""
+        self._file = open(self.active_path, 'ab')
+        self._opened_at = now
+
+    def _rotate(self, now):
+        """Archive the active file and start a new one"""
+        self._close_and_archive()
+        self._open(now)
+
+    def _close_and_archive(self):
+        """Close the active file, and rename it to a timestamped archive"""
+        self._file.close()
+        self._file = None
+
+        timestamp = datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+        base = os.path.join(self.directory, '{0}.{1}.{2}'.format(self.prefix, timestamp, os.getpid()))
+        archive_path = base + ACTIVE_SUFFIX
+        try:
+            os.rename(self.active_path, archive_path)
+        except OSError:
+            # The active file was removed or rotated by another process (or
+            # opened before a fork); events must not fail because of it, and
+            # the next write opens a new active file
+            log.exception('Error archiving tracking spool file %s', self.active_path)
+            return
+
+        if self.compression is not None:
+            try:
+                _compress(archive_path, base + COMPRESSED_SUFFIXES[self.compression], self.compression)
+            except (IOError, OSError):
+                # The uncompressed archive is kept and can still be read
+                log.exception('Error compressing tracking spool file %s', archive_path)
+            else:
+                os.remove(archive_path)
+
+
+def _frame(event):
+    """Serialize an event into a length-prefixed frame"""
+    data = json.dumps(event, cls=DateTimeJSONEncoder, separators=(',', ':'))
+    if isinstance(data, unicode):
+        data = data.encode('utf-8')
+    return FRAME_HEADER.pack(len(data)) + data
+
+
+def _compress(source_path, target_path, compression):
+    """Write a compressed copy of `source_path` to `target_path`"""
+    with open(source_path, 'rb') as source:
+        if compression == 'gzip':
+            with gzip.open(target_path, 'wb') as target:
+                shutil.copyfileobj(source, target, READ_CHUNK_SIZE)
+        else:
+            compressor = zlib.compressobj()
+            with open(target_path, 'wb') as target:
+                for chunk in iter(lambda: source.read(READ_CHUNK_SIZE), ''):
+                    target.write(compressor.compress(chunk))
+                target.write(compressor.flush())
+
+
+def _read_chunks(path):
+    """Yield the decompressed contents of a spool file in chunks"""
+    if path.endswith(COMPRESSED_SUFFIXES['gzip']):
+        with gzip.open(path, 'rb') as spool_file:
+            for chunk in iter(lambda: spool_file.read(READ_CHUNK_SIZE), ''):
+                yield chunk
+    elif path.endswith(COMPRESSED_SUFFIXES['zlib']):
+        decompressor = zlib.decompressobj()
+        with open(path, 'rb') as spool_file:
+            for chunk in iter(lambda: spool_file.read(READ_CHUNK_SIZE), ''):
+                yield decompressor.decompress(chunk)
+        yield decompressor.flush()
+    else:
+        with open(path, 'rb') as spool_file:
+            for chunk in iter(lambda: spool_file.read(READ_CHUNK_SIZE), ''):
+                yield chunk
+
+
+def read_spool_file(path):
+    """
+    Yield the events stored in a single spool file.
+
+    A truncated frame at the end of the file, left by a process that died
+    while writing, is ignored.
+
+    """
+    buf = ''
+    for chunk in _read_chunks(path):
+        buf += chunk
+        offset = 0
+        while len(buf) - offset >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(buf, offset)
+            end = offset + FRAME_HEADER.size + length
+            if end > len(buf):
+                break
+            yield json.loads(buf[offset + FRAME_HEADER.size:end])
+            offset = end
+        buf = buf[offset:]
+
+
+def spool_files(directory, prefix='tracking'):
+    """
+    Return the paths of the spool files in `directory`, oldest first.
+
+    Archives are ordered by their rotation timestamp, and the files still
+    being appended to come last.
+
+    """
+    archives = []
+    active = []
+    for name in os.listdir(directory):
+        if not name.startswith(prefix + '.'):
+            continue
+        path = os.path.join(directory, name)
+        parts = name[len(prefix) + 1:].split('.')
+        if len(parts) == 2 and name.endswith(ACTIVE_SUFFIX):
+            # <prefix>.<pid>.spool
+            active.append((os.path.getmtime(path), path))
+        elif len(parts) >= 3:
+            # <prefix>.<timestamp>.<pid>.spool[.gz|.z]
+            archives.append((parts[0], path))
+    return [path for _, path in sorted(archives)] + [path for _, path in sorted(active)]
+
+
+def iter_spool_events(directory, prefix='tracking'):
+    """Yield every event in the spool `directory`, oldest file first"""
+    for path in spool_files(directory, prefix):
+        for event in read_spool_file(path):
+            yield event
+
+
+def recent_spool_events(directory, prefix='tracking', count=100, predicate=None):
+    """
+    Return up to `count` of the most recent events in the spool, newest
+    first, optionally only those for which `predicate(event)` is true.
+
+    Only as many files as needed are read, starting from the newest.
+
+    """
+    found = []
+    for path in reversed(spool_files(directory, prefix)):
+        events = [event for event in read_spool_file(path) if predicate is None or predicate(event)]
+        found.extend(reversed(events))
+        if len(found) >= count:
+            break
+    return found[:count]
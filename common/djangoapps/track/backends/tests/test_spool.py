@@ -0,0 +1,86 @@
+from __future__ import absolute_import
+
+import datetime
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase
+
+from track.backends.spool import (
+    SpoolBackend, iter_spool_events, read_spool_file, recent_spool_events, spool_files
+)
+
+
+class TestSpoolBackend(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _events(self, count):
+        return [{'username': 'user{0}'.format(i % 2), 'event_type': 'test', 'event': {'n': i}} for i in range(count)]
+
+    def test_round_trip(self):
+        backend = SpoolBackend(self.directory, fsync='always')
+        event = {'test': 1, 'time': datetime.datetime(2013, 1, 1, 12, 1)}
+        backend.send(event)
+
+        events = list(read_spool_file(backend.active_path))
+        self.assertEqual(events, [{'test': 1, 'time': '2013-01-01T12:01:00+00:00'}])
+
+    def test_rotation_and_compression(self):
+        for compression in ('gzip', 'zlib', None):
+            directory = os.path.join(self.directory, str(compression))
+            backend = SpoolBackend(directory, max_bytes=100, compression=compression, fsync='never')
+            events = self._events(10)
+            for event in events:
+                backend.send(event)
+            backend.rotate()
+
+            paths = spool_files(directory)
+            self.assertTrue(len(paths) > 1)
+            self.assertFalse(os.path.exists(backend.active_path))
+            if compression is not None:
+                self.assertTrue(all(not path.endswith('.spool') for path in paths))
+
+            self.assertEqual(list(iter_spool_events(directory)), events)
+
+    def test_send_batch(self):
+        backend = SpoolBackend(self.directory)
+        events = self._events(5)
+        backend.send_batch(events)
+        backend.rotate()
+        self.assertEqual(list(iter_spool_events(self.directory)), events)
+
+    def test_missing_active_file(self):
+        backend = SpoolBackend(self.directory, max_bytes=1, fsync='always')
+        backend.send({'test': 1})
+        # Another process removed the active file
+        os.remove(backend.active_path)
+
+        # Rotating fails to archive it, but the event is still written
+        backend.send({'test': 2})
+        self.assertEqual(list(read_spool_file(backend.active_path)), [{'test': 2}])
+
+    def test_truncated_frame_is_ignored(self):
+        backend = SpoolBackend(self.directory, fsync='always')
+        backend.send({'test': 1})
+        with open(backend.active_path, 'ab') as spool_file:
+            spool_file.write('\x00\x00\x01\x00{"partial')
+
+        self.assertEqual(list(read_spool_file(backend.active_path)), [{'test': 1}])
+
+    def test_recent_events(self):
+        backend = SpoolBackend(self.directory, max_bytes=100, fsync='always')
+        events = self._events(10)
+        for event in events:
+            backend.send(event)
+
+        recent = recent_spool_events(self.directory, count=3, predicate=lambda e: e['username'] == 'user1')
+        self.assertEqual([event['event']['n'] for event in recent], [9, 7, 5])
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            SpoolBackend(self.directory, compression='lzma')
+        with self.assertRaises(ValueError):
+            SpoolBackend(self.directory, fsync='sometimes')
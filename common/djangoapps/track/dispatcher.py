@@ -0,0 +1,195 @@
+"""
+Buffered delivery of tracking events to the configured backends.
+
+Instead of calling every backend in the request thread, events are put
+on a bounded in-process queue.  A background thread flushes the queue
+whenever `flush_size` events are waiting or every `flush_interval`
+seconds, handing each backend the whole batch through
+`BaseBackend.send_batch`.
+
+The dispatcher is configured using Django settings::
+
+  TRACKING_BUFFER = {
+      'max_size': 10000,
+      'flush_size': 100,
+      'flush_interval': 1.0,
+      'full_policy': 'drop_oldest',  # or 'block'
+  }
+
+"""
+
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from dogapi import dog_stats_api
+
+
+log = logging.getLogger(__name__)
+
+
+DROP_OLDEST = 'drop_oldest'
+BLOCK = 'block'
+
+
+class BufferedDispatcher(object):
+    """
+    Bounded event queue drained by a background flusher thread.
+
+    `backends` is a dict of backend name to backend instance; it is read
+    at every flush, so backends can be reconfigured while running.
+
+    """
+
+    def __init__(self, backends, max_size=10000, flush_size=100, flush_interval=1.0, full_policy=DROP_OLDEST):
+        if full_policy not in (DROP_OLDEST, BLOCK):
+            raise ValueError('Invalid tracking buffer policy %s' % full_policy)
+
+        self.backends = backends
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.full_policy = full_policy
+
+        self.dropped = 0
+        self.flushed = 0
+
+        self._events = deque()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+
+    def put(self, event):
+        """
+        Add an event to the queue, applying the full policy if needed.
+
+        Once the dispatcher is stopped nothing drains the queue anymore, so
+        the event is sent to the backends right away instead.
+
+        """
+        if self._stopping:
+            self._send_batch([event])
+            return
+
+        self._ensure_thread()
+        dropped = False
+        with self._condition:
+            if len(self._events) >= self.max_size:
+                if self.full_policy == DROP_OLDEST:
+                    self._events.popleft()
+                    self.dropped += 1
+                    dropped = True
+                else:
+                    while len(self._events) >= self.max_size and not self._stopping:
+                        self._condition.wait()
+            self._events.append(event)
+            if len(self._events) >= self.flush_size:
+                self._condition.notify_all()
+
+        if dropped:
+            dog_stats_api.increment('track.buffer.dropped')
+
+    def flush(self):
+        """
+        Send every queued event to the backends, in batches of at most
+        `flush_size` events.  Returns the number of events flushed.
+
+        """
+        total = 0
+        with self._flush_lock:
+            while True:
+                with self._condition:
+                    batch = []
+                    while self._events and len(batch) < self.flush_size:
+                        batch.append(self._events.popleft())
+                    # Wake up producers blocked on a full queue
+                    self._condition.notify_all()
+
+                if not batch:
+                    break
+
+                self._send_batch(batch)
+                total += len(batch)
+
+        if total:
+            self.flushed += total
+            dog_stats_api.increment('track.buffer.flushed', total)
+        return total
+
+    def stop(self):
+        """
+        Stop the flusher thread and send any events still queued.
+
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(self.flush_interval * 2)
+        self.flush()
+
+    def __len__(self):
+        return len(self._events)
+
+    def _send_batch(self, batch):
+        """
+        Hand a batch of events to every backend.
+
+        """
+        for name, backend in self.backends.items():
+            with dog_stats_api.timer('track.send.backend.{0}'.format(name)):
+                try:
+                    backend.send_batch(batch)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception('Error sending events to tracking backend %s', name)
+
+    def _ensure_thread(self):
+        """
+        Start the flusher thread the first time an event is queued, and
+        again in a forked child, which does not inherit the thread.
+
+        """
+        pid = os.getpid()
+        if self._pid == pid or self._stopping:
+            return
+        if self._pid is not None:
+            self._reset_after_fork()
+        with self._condition:
+            if self._pid != pid:
+                self._thread = threading.Thread(target=self._run, name='track-buffer')
+                self._thread.daemon = True
+                self._thread.start()
+                if self._pid is None:
+                    # Forked children inherit this registration
+                    atexit.register(self.stop)
+                self._pid = pid
+
+    def _reset_after_fork(self):
+        """
+        Drop the state a forked child copied from its parent.
+
+        The locks may have been held by a parent thread at fork time, and
+        the queued events are still flushed by the parent.
+
+        """
+        self._events = deque()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def _run(self):
+        """
+        Flush when a full batch is waiting or the flush interval elapses.
+
+        """
+        while True:
+            with self._condition:
+                if len(self._events) < self.flush_size and not self._stopping:
+                    self._condition.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            self.flush()
@@ -0,0 +1,46 @@
+"""
+Write the events stored by the spool tracking backend as JSON lines, for
+offline analysis.
+"""
+
+import json
+import sys
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+
+from track.backends.spool import iter_spool_events, read_spool_file
+from track.utils import DateTimeJSONEncoder
+
+
+class Command(BaseCommand):
+    """
+    Dump tracking spool files to stdout, one JSON event per line.
+    """
+    option_list = BaseCommand.option_list + (
+        make_option('--prefix',
+                    dest='prefix',
+                    default='tracking',
+                    help='File name prefix of the spool files'),
+        make_option('--file',
+                    action='store_true',
+                    dest='single_file',
+                    default=False,
+                    help='Read a single spool file instead of a spool directory'),
+    )
+
+    args = '<spool directory|spool file>'
+    help = 'Writes the events in a tracking spool as JSON lines'
+
+    def handle(self, *args, **options):
+        if len(args) != 1:
+            raise CommandError('Usage is dump_tracking_spool {0}'.format(self.args))
+
+        if options['single_file']:
+            events = read_spool_file(args[0])
+        else:
+            events = iter_spool_events(args[0], options['prefix'])
+
+        for event in events:
+            sys.stdout.write(json.dumps(event, cls=DateTimeJSONEncoder))
+            sys.stdout.write('\n')
@@ -0,0 +1,95 @@
+"""Tests for the buffered tracking event dispatcher."""
+
+from django.test import TestCase
+from mock import patch
+
+from track.backends import BaseBackend
+from track.dispatcher import BufferedDispatcher, BLOCK
+
+
+class BatchRecordingBackend(BaseBackend):
+    """Backend that remembers the batches it was sent."""
+    def __init__(self, **options):
+        super(BatchRecordingBackend, self).__init__(**options)
+        self.batches = []
+
+    def send(self, event):
+        self.batches.append([event])
+
+    def send_batch(self, events):
+        self.batches.append(list(events))
+
+
+class TestBufferedDispatcher(TestCase):
+    """Test batching, full policies and shutdown flushing."""
+
+    def setUp(self):
+        self.backend = BatchRecordingBackend()
+        self.dispatcher = BufferedDispatcher(
+            {'recording': self.backend}, max_size=5, flush_size=2, flush_interval=60
+        )
+        # Flush explicitly rather than from the background thread
+        self.dispatcher._ensure_thread = lambda: None  # pylint: disable=protected-access
+
+    def test_flush_in_batches(self):
+        for i in xrange(5):
+            self.dispatcher.put({'event': i})
+
+        self.assertEqual(self.dispatcher.flush(), 5)
+        self.assertEqual(
+            self.backend.batches,
+            [[{'event': 0}, {'event': 1}], [{'event': 2}, {'event': 3}], [{'event': 4}]]
+        )
+        self.assertEqual(self.dispatcher.flushed, 5)
+        self.assertEqual(len(self.dispatcher), 0)
+
+    def test_drop_oldest_when_full(self):
+        for i in xrange(7):
+            self.dispatcher.put({'event': i})
+
+        self.assertEqual(self.dispatcher.dropped, 2)
+        self.dispatcher.flush()
+        sent = [event['event'] for batch in self.backend.batches for event in batch]
+        self.assertEqual(sent, [2, 3, 4, 5, 6])
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            BufferedDispatcher({}, full_policy='spill')
+
+    def test_stop_flushes(self):
+        self.dispatcher.put({'event': 0})
+        self.dispatcher.stop()
+        self.assertEqual(self.backend.batches, [[{'event': 0}]])
+
+    def test_put_after_stop_sends_immediately(self):
+        self.dispatcher.stop()
+        self.dispatcher.put({'event': 0})
+
+        self.assertEqual(self.backend.batches, [[{'event': 0}]])
+        self.assertEqual(len(self.dispatcher), 0)
+
+    def test_restart_thread_after_fork(self):
+        dispatcher = BufferedDispatcher({'recording': self.backend}, flush_size=1, flush_interval=0.01)
+        dispatcher.put({'event': 0})
+        parent_thread = dispatcher._thread  # pylint: disable=protected-access
+
+        with patch('track.dispatcher.os.getpid', return_value=-1):
+            dispatcher.put({'event': 1})
+        child_thread = dispatcher._thread  # pylint: disable=protected-access
+        dispatcher.stop()
+
+        self.assertIsNot(child_thread, parent_thread)
+        sent = [event['event'] for batch in self.backend.batches for event in batch]
+        self.assertIn(1, sent)
+
+    def test_background_flush(self):
+        dispatcher = BufferedDispatcher(
+            {'recording': self.backend}, max_size=2, flush_size=1, flush_interval=0.01, full_policy=BLOCK
+        )
+        for i in xrange(10):
+            dispatcher.put({'event': i})
+        dispatcher.stop()
+
+        sent = [event['event'] for batch in self.backend.batches for event in batch]
+        self.assertEqual(sent, range(10))
+        self.assertEqual(dispatcher.dropped, 0)
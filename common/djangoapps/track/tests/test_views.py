@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from mock import patch
+from mock import Mock, patch
 from mock import sentinel
 from pytz import UTC
 
@@ -128,3 +128,14 @@ class TestTrackViews(TestCase):
             },
         }
         self.mock_tracker.send.assert_called_once_with(expected_event)
+
+    @patch('track.views.recent_spool_events')
+    def test_spooled_events_without_time(self, mock_recent_spool_events):
+        mock_recent_spool_events.return_value = [
+            {'username': 'user', 'event_type': 'with_time', 'time': '2013-01-01T12:01:00+00:00'},
+            {'username': 'user', 'event_type': 'without_time'},
+        ]
+        spool = Mock(directory='spool', prefix='tracking')
+
+        records = views._spooled_tracking_logs(spool, 10)  # pylint: disable=protected-access
+        self.assertEqual([record.event_type for record in records], ['with_time'])
@@ -16,6 +16,10 @@ below::
       }
   }
 
+Events can be handed to the backends in batches from a background
+thread instead of synchronously, by configuring `TRACKING_BUFFER` (see
+`track.dispatcher`).
+
 """
 
 import inspect
@@ -26,12 +30,14 @@ from dogapi import dog_stats_api
 from django.conf import settings
 
 from track.backends import BaseBackend
+from track.dispatcher import BufferedDispatcher
 
 
 __all__ = ['send']
 
 
 backends = {}
+dispatcher = None
 
 
 def _initialize_backends_from_django_settings():
@@ -40,6 +46,13 @@ def _initialize_backends_from_django_settings():
     configuration in django settings
 
     """
+    global dispatcher  # pylint: disable=global-statement
+
+    # Deliver anything still buffered to the old backends first
+    if dispatcher is not None:
+        dispatcher.stop()
+        dispatcher = None
+
     backends.clear()
 
     config = getattr(settings, 'TRACKING_BACKENDS', {})
@@ -51,6 +64,10 @@ def _initialize_backends_from_django_settings():
             options = values.get('OPTIONS', {})
             backends[name] = _instantiate_backend_from_name(engine, options)
 
+    buffer_options = getattr(settings, 'TRACKING_BUFFER', None)
+    if buffer_options:
+        dispatcher = BufferedDispatcher(backends, **buffer_options)
+
 
 def _instantiate_backend_from_name(name, options):
     """
@@ -91,6 +108,10 @@ def send(event):
     """
     dog_stats_api.increment('track.send.count')
 
+    if dispatcher is not None:
+        dispatcher.put(event)
+        return
+
     for name, backend in backends.iteritems():
         with dog_stats_api.timer('track.send.backend.{0}'.format(name)):
             backend.send(event)
@@ -1,5 +1,7 @@
 import datetime
 
+import dateutil.parser
+import pytz
 from pytz import UTC
 
 from django.contrib.auth.decorators import login_required
@@ -13,6 +15,8 @@ from edxmako.shortcuts import render_to_response
 from track import tracker
 from track import contexts
 from track.models import TrackingLog
+from track.backends.django import LOGFIELDS
+from track.backends.spool import SpoolBackend, recent_spool_events
 from eventtracking import tracker as eventtracker
 
 
@@ -159,10 +163,14 @@ def view_tracking_log(request, args=''):
             if arg.startswith('username='):
                 username = arg[9:]
 
-    record_instances = TrackingLog.objects.all().order_by('-time')
-    if username:
-        record_instances = record_instances.filter(username=username)
-    record_instances = record_instances[0:nlen]
+    spool = _get_spool_backend()
+    if spool is not None:
+        record_instances = _spooled_tracking_logs(spool, nlen, username)
+    else:
+        record_instances = TrackingLog.objects.all().order_by('-time')
+        if username:
+            record_instances = record_instances.filter(username=username)
+        record_instances = record_instances[0:nlen]
 
     # fix dtstamp
     fmt = '%a %d-%b-%y %H:%M:%S'  # "%Y-%m-%d %H:%M:%S %Z%z"
@@ -170,3 +178,31 @@ def view_tracking_log(request, args=''):
         rinst.dtstr = rinst.time.replace(tzinfo=pytz.utc).astimezone(pytz.timezone('US/Eastern')).strftime(fmt)
 
     return render_to_response('tracking_log.html', {'records': record_instances})
+
+
+def _get_spool_backend():
+    """Return the configured spool tracking backend, if there is one."""
+    for backend in tracker.backends.itervalues():
+        if isinstance(backend, SpoolBackend):
+            return backend
+    return None
+
+
+def _spooled_tracking_logs(spool, count, username=''):
+    """
+    Read the most recent events from a spool backend as unsaved
+    TrackingLog instances, so they can be displayed like database rows.
+    """
+    predicate = (lambda event: event.get('username') == username) if username else None
+    events = recent_spool_events(spool.directory, spool.prefix, count, predicate)
+    records = []
+    for event in events:
+        # events without a usable time can't be shown alongside the others
+        try:
+            event_time = dateutil.parser.parse(event['time'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        record = TrackingLog(**{field: event.get(field, '') for field in LOGFIELDS if field != 'time'})
+        record.time = event_time
+        records.append(record)
+    return records
@@ -128,28 +128,15 @@ def replace_static_urls(data_dir, block, view, frag, context, course_id=None, st
 
 def grade_histogram(module_id):
     '''
-    Print out a histogram of grades on a given problem in staff member debug info.
+    Return the histogram of grades on a given problem, as a sorted list of
+    (grade, count), for staff member debug info.
 
-    Warning: If a student has just looked at an xmodule and not attempted
-    it, their grade is None. Since there will always be at least one such student
-    this function almost always returns [].
+    The histogram is read from the buckets maintained as grades are
+    published, rather than counted from the student modules, and only
+    includes students who have been graded.
     '''
-    from django.db import connection
-    cursor = connection.cursor()
-
-    q = """SELECT courseware_studentmodule.grade,
-                  COUNT(courseware_studentmodule.student_id)
-    FROM courseware_studentmodule
-    WHERE courseware_studentmodule.module_id=%s
-    GROUP BY courseware_studentmodule.grade"""
-    # Passing module_id this way prevents sql-injection.
-    cursor.execute(q, [module_id])
-
-    grades = list(cursor.fetchall())
-    grades.sort(key=lambda x: x[0])  # Add ORDER BY to sql query?
-    if len(grades) >= 1 and grades[0][0] is None:
-        return []
-    return grades
+    from courseware.models import StudentModuleGradeBucket
+    return StudentModuleGradeBucket.histogram(module_id)
 
 
 def add_staff_debug_info(user, block, view, frag, context):  # pylint: disable=unused-argument
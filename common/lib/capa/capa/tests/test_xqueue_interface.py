@@ -0,0 +1,152 @@
+"""
+Tests for the spooled, non-blocking xqueue submission client.
+"""
+
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from StringIO import StringIO
+
+from mock import Mock, patch
+
+from capa.xqueue_interface import AsyncXQueueInterface, XQueueOutbox
+
+
+class XQueueOutboxTest(unittest.TestCase):
+    """
+    Tests for the on-disk outbox.
+    """
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spool_dir)
+        self.outbox = XQueueOutbox(self.spool_dir, max_depth=2)
+
+    def test_fifo_and_bounded(self):
+        first = self.outbox.put('header1', 'body1')
+        second = self.outbox.put('header2', 'body2')
+        self.assertIsNotNone(first)
+        self.assertIsNotNone(second)
+        self.assertEqual(self.outbox.depth(), 2)
+
+        # The outbox is full
+        self.assertIsNone(self.outbox.put('header3', 'body3'))
+
+        item = self.outbox.claim()
+        self.assertEqual(item['id'], first)
+        self.assertEqual(item['body'], 'body1')
+        self.assertEqual(self.outbox.depth(), 1)
+        self.outbox.done(item)
+
+        self.assertEqual(self.outbox.claim()['id'], second)
+        self.assertIsNone(self.outbox.claim())
+
+    def test_retry_is_delayed(self):
+        self.outbox.put('header', 'body')
+        item = self.outbox.claim()
+        self.outbox.retry(item, delay=60)
+
+        self.assertEqual(self.outbox.depth(), 1)
+        self.assertIsNone(self.outbox.claim())
+        retried = self.outbox.claim(now=item['next_attempt_at'] + 1)
+        self.assertEqual(retried['attempts'], 1)
+
+    def test_files_are_copied(self):
+        upload = StringIO('print "hello"')
+        upload.name = 'prog1.py'
+        self.outbox.put('header', 'body', [upload])
+
+        item = self.outbox.claim()
+        self.assertEqual(item['files'][0]['name'], 'prog1.py')
+        with open(item['files'][0]['path']) as stored:
+            self.assertEqual(stored.read(), 'print "hello"')
+
+        self.outbox.done(item)
+        self.assertFalse(os.path.exists(item['files'][0]['path']))
+
+    def test_recover_dead_claims(self):
+        self.outbox.put('header', 'body')
+        item = self.outbox.claim()
+        # Pretend the claim was made by a process that no longer exists
+        os.rename(item['_claimed_path'], item['_claimed_path'].rpartition('.')[0] + '.999999999')
+
+        self.outbox.recover()
+        self.assertEqual(self.outbox.depth(), 1)
+
+    def test_recover_keeps_claims_of_other_users(self):
+        self.outbox.put('header', 'body')
+        self.outbox.claim()
+        # The claiming process is alive but can't be signalled by this one
+        with patch('os.kill', Mock(side_effect=OSError(errno.EPERM, 'Operation not permitted'))):
+            self.outbox.recover()
+        self.assertEqual(self.outbox.depth(), 0)
+
+
+@patch('capa.xqueue_interface.dog_stats_api')
+class AsyncXQueueInterfaceTest(unittest.TestCase):
+    """
+    Tests for the non-blocking xqueue client.
+    """
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spool_dir)
+        self.xqueue = AsyncXQueueInterface(
+            "http://example.com/xqueue", Mock(), spool_dir=self.spool_dir,
+            max_depth=1, max_attempts=2, retry_delay=0,
+        )
+        self.xqueue._http_post = Mock(return_value=(0, "ok"))  # pylint: disable=protected-access
+        # Drain the outbox explicitly instead of in a background thread
+        self.xqueue._ensure_worker = Mock()  # pylint: disable=protected-access
+
+    def test_send_does_not_block(self, _mock_stats):
+        self.assertEqual(self.xqueue.send_to_queue('header', 'body'), (0, ''))
+        self.assertFalse(self.xqueue._http_post.called)  # pylint: disable=protected-access
+        self.assertTrue(self.xqueue._ensure_worker.called)  # pylint: disable=protected-access
+
+        self.assertEqual(self.xqueue.deliver_pending(), 1)
+        self.assertEqual(self.xqueue._http_post.call_count, 1)  # pylint: disable=protected-access
+        self.assertEqual(self.xqueue.outbox.depth(), 0)
+
+    def test_files_keep_their_names(self, _mock_stats):
+        upload = StringIO('print "hello"')
+        upload.name = 'prog1.py'
+        self.xqueue.send_to_queue('header', 'body', [upload])
+        self.xqueue.deliver_pending()
+
+        _, kwargs = self.xqueue._http_post.call_args  # pylint: disable=protected-access
+        self.assertEqual(kwargs['files'].keys(), ['prog1.py'])
+
+    def test_overflow_sends_synchronously(self, _mock_stats):
+        self.xqueue.send_to_queue('header1', 'body1')
+        self.assertEqual(self.xqueue.send_to_queue('header2', 'body2'), (0, "ok"))
+        self.assertEqual(self.xqueue._http_post.call_count, 1)  # pylint: disable=protected-access
+
+    def test_retry_then_fail(self, mock_stats):
+        self.xqueue._http_post.return_value = (1, 'cannot connect to server')  # pylint: disable=protected-access
+        self.xqueue.send_to_queue('header', 'body')
+
+        # First attempt fails and is put back for retry, second gives up
+        self.assertEqual(self.xqueue.deliver_pending(), 0)
+        self.assertEqual(self.xqueue.outbox.depth(), 0)
+        self.assertEqual(len(os.listdir(self.xqueue.outbox.failed_dir)), 1)
+        mock_stats.increment.assert_any_call('xqueue.outbox.retried')
+        mock_stats.increment.assert_any_call('xqueue.outbox.failed')
+
+    def test_latency_is_reported(self, mock_stats):
+        self.xqueue.send_to_queue('header', 'body')
+        self.xqueue.deliver_pending()
+        mock_stats.gauge.assert_called_with('xqueue.outbox.depth', 1)
+        self.assertEqual(mock_stats.histogram.call_args[0][0], 'xqueue.outbox.latency')
+
+    def test_unexpected_error_is_retried(self, mock_stats):
+        self.xqueue._http_post.side_effect = IOError('cannot read upload')  # pylint: disable=protected-access
+        self.xqueue.send_to_queue('header', 'body')
+
+        # The submission isn't left claimed: it's retried, then given up on
+        self.assertEqual(self.xqueue.deliver_pending(), 0)
+        self.assertEqual(os.listdir(self.xqueue.outbox.inflight_dir), [])
+        self.assertEqual(len(os.listdir(self.xqueue.outbox.failed_dir)), 1)
+        mock_stats.increment.assert_any_call('xqueue.outbox.failed')
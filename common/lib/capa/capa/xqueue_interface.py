@@ -1,10 +1,19 @@
 #
 #  LMS Interface to external queueing system (xqueue)
 #
+import errno
 import hashlib
 import json
 import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+
 import requests
+from requests.adapters import HTTPAdapter
+from dogapi import dog_stats_api
 
 
 log = logging.getLogger(__name__)
@@ -61,11 +70,17 @@ class XQueueInterface(object):
     Interface to the external grading system
     """
 
-    def __init__(self, url, django_auth, requests_auth=None):
+    def __init__(self, url, django_auth, requests_auth=None, pool_maxsize=None):
         self.url = unicode(url)
         self.auth = django_auth
         self.session = requests.Session()
         self.session.auth = requests_auth
+        if pool_maxsize is not None:
+            # Keep more keep-alive connections to xqueue than the requests
+            # default, so concurrent deliveries don't reconnect each time.
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
 
     def send_to_queue(self, header, body, files_to_upload=None):
         """
@@ -128,3 +143,281 @@ class XQueueInterface(object):
             return (1, 'unexpected HTTP status code [%d]' % r.status_code)
 
         return parse_xreply(r.text)
+
+
+class _SpooledFile(object):
+    """
+    A file read back from the outbox, presented under the name it was
+    originally uploaded with so that xqueue sees the same filename.
+    """
+
+    def __init__(self, name, path):
+        self.name = name
+        self._file = open(path, 'rb')
+
+    def read(self, *args):
+        return self._file.read(*args)
+
+    def seek(self, *args):
+        return self._file.seek(*args)
+
+    def close(self):
+        self._file.close()
+
+
+class XQueueOutbox(object):
+    """
+    A bounded, on-disk spool of submissions waiting to be delivered to xqueue.
+
+    Each submission is stored as a JSON file in `pending/`, with any uploaded
+    files copied next to it.  A delivering process claims a submission by
+    renaming it into `inflight/`, which is atomic on a single filesystem, so
+    several web worker processes can safely share one spool directory.
+    """
+
+    def __init__(self, spool_dir, max_depth=1000):
+        self.spool_dir = spool_dir
+        self.max_depth = max_depth
+        self.pending_dir = os.path.join(spool_dir, 'pending')
+        self.inflight_dir = os.path.join(spool_dir, 'inflight')
+        self.files_dir = os.path.join(spool_dir, 'files')
+        self.failed_dir = os.path.join(spool_dir, 'failed')
+        for dirname in (self.pending_dir, self.inflight_dir, self.files_dir, self.failed_dir):
+            try:
+                os.makedirs(dirname)
+            except OSError as err:
+                if err.errno != errno.EEXIST:
+                    raise
+
+    def depth(self):
+        """
+        Return the number of submissions waiting to be delivered.
+        """
+        return len([name for name in os.listdir(self.pending_dir) if name.endswith('.json')])
+
+    def put(self, header, body, files_to_upload=None):
+        """
+        Spool a submission.  Returns the id of the spooled submission, or None
+        if the outbox is full.
+        """
+        if self.depth() >= self.max_depth:
+            return None
+
+        # Ids sort in enqueue order, so the outbox drains first-in, first-out.
+        item_id = '{0:017.6f}-{1}'.format(time.time(), uuid.uuid4().hex)
+        files = []
+        if files_to_upload:
+            files_path = os.path.join(self.files_dir, item_id)
+            os.makedirs(files_path)
+            for index, upload in enumerate(files_to_upload):
+                upload.seek(0)
+                stored_path = os.path.join(files_path, str(index))
+                with open(stored_path, 'wb') as stored:
+                    shutil.copyfileobj(upload, stored)
+                files.append({'name': upload.name, 'path': stored_path})
+
+        self._write(os.path.join(self.pending_dir, item_id + '.json'), {
+            'id': item_id,
+            'header': header,
+            'body': body,
+            'files': files,
+            'queued_at': time.time(),
+            'attempts': 0,
+            'next_attempt_at': 0,
+        })
+        return item_id
+
+    def claim(self, now=None):
+        """
+        Claim the oldest submission that is due for delivery, moving it out of
+        `pending/` so no other process delivers it.  Returns the submission
+        dict, or None if nothing is due.
+        """
+        now = time.time() if now is None else now
+        for name in sorted(os.listdir(self.pending_dir)):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.pending_dir, name)
+            try:
+                with open(path) as spooled:
+                    item = json.load(spooled)
+            except (IOError, ValueError):
+                # Either another process claimed it, or it is still being written.
+                continue
+            if item['next_attempt_at'] > now:
+                continue
+            claimed_path = os.path.join(self.inflight_dir, '{0}.{1}'.format(name, os.getpid()))
+            try:
+                os.rename(path, claimed_path)
+            except OSError:
+                continue
+            item['_claimed_path'] = claimed_path
+            return item
+        return None
+
+    def done(self, item):
+        """
+        Remove a delivered submission and its files from the outbox.
+        """
+        os.remove(item['_claimed_path'])
+        shutil.rmtree(os.path.join(self.files_dir, item['id']), ignore_errors=True)
+
+    def retry(self, item, delay):
+        """
+        Return a claimed submission to `pending/`, to be retried after `delay` seconds.
+        """
+        claimed_path = item.pop('_claimed_path')
+        item['attempts'] += 1
+        item['next_attempt_at'] = time.time() + delay
+        self._write(os.path.join(self.pending_dir, item['id'] + '.json'), item)
+        os.remove(claimed_path)
+
+    def fail(self, item):
+        """
+        Give up on a claimed submission, keeping it in `failed/` for inspection.
+        """
+        os.rename(item['_claimed_path'], os.path.join(self.failed_dir, item['id'] + '.json'))
+
+    def recover(self):
+        """
+        Return submissions claimed by processes that have since died to `pending/`.
+        """
+        for name in os.listdir(self.inflight_dir):
+            base, _, pid = name.rpartition('.')
+            try:
+                os.kill(int(pid), 0)
+            except ValueError:
+                continue
+            except OSError as err:
+                # EPERM means the process exists but belongs to another user
+                if err.errno != errno.ESRCH:
+                    continue
+                try:
+                    os.rename(os.path.join(self.inflight_dir, name), os.path.join(self.pending_dir, base))
+                except OSError:
+                    pass
+
+    def _write(self, path, item):
+        """
+        Atomically write a submission dict to `path`.
+        """
+        tmp_path = '{0}.tmp.{1}'.format(path, os.getpid())
+        with open(tmp_path, 'w') as spooled:
+            json.dump(item, spooled)
+        os.rename(tmp_path, path)
+
+
+class AsyncXQueueInterface(XQueueInterface):
+    """
+    Interface to the external grading system that does not block the caller.
+
+    `send_to_queue` spools the submission to an `XQueueOutbox` and returns
+    immediately.  A background thread drains the outbox over the pooled
+    session, retrying failed deliveries with exponential backoff.  When the
+    outbox is full, submissions are sent synchronously instead of dropped.
+    """
+
+    def __init__(self, url, django_auth, requests_auth=None, spool_dir=None, max_depth=1000,
+                 max_attempts=5, retry_delay=2, poll_interval=1, pool_maxsize=10):
+        super(AsyncXQueueInterface, self).__init__(url, django_auth, requests_auth, pool_maxsize=pool_maxsize)
+        self.outbox = XQueueOutbox(spool_dir, max_depth=max_depth)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def send_to_queue(self, header, body, files_to_upload=None):
+        """
+        Spool a request to xqueue for background delivery.
+
+        Takes the same arguments as `XQueueInterface.send_to_queue`.  Returns
+        (0, '') once the submission is safely spooled, or the result of a
+        synchronous delivery if the outbox is full.
+        """
+        item_id = self.outbox.put(header, body, files_to_upload)
+        if item_id is None:
+            log.warning("XQueue outbox is full, sending submission synchronously")
+            dog_stats_api.increment('xqueue.outbox.overflow')
+            return super(AsyncXQueueInterface, self).send_to_queue(header, body, files_to_upload)
+
+        dog_stats_api.increment('xqueue.outbox.queued')
+        self._ensure_worker()
+        self._wakeup.set()
+        return (0, '')
+
+    def deliver_pending(self):
+        """
+        Deliver every submission in the outbox that is currently due.
+
+        Returns the number of submissions delivered.
+        """
+        delivered = 0
+        dog_stats_api.gauge('xqueue.outbox.depth', self.outbox.depth())
+        while True:
+            item = self.outbox.claim()
+            if item is None:
+                return delivered
+            if self._deliver(item):
+                delivered += 1
+
+    def _deliver(self, item):
+        """
+        Attempt to deliver one claimed submission.  Returns True on success.
+        """
+        files = []
+        try:
+            for spooled in item['files']:
+                files.append(_SpooledFile(spooled['name'], spooled['path']))
+            (error, msg) = super(AsyncXQueueInterface, self).send_to_queue(
+                item['header'], item['body'], files or None
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            # anything else leaving the submission claimed would strand it in inflight/
+            log.exception("Error while delivering xqueue submission %s", item['id'])
+            (error, msg) = (1, 'Error delivering submission: {0}'.format(err))
+        finally:
+            for spooled in files:
+                spooled.close()
+
+        if not error:
+            self.outbox.done(item)
+            dog_stats_api.histogram('xqueue.outbox.latency', time.time() - item['queued_at'])
+            dog_stats_api.increment('xqueue.outbox.delivered')
+            return True
+
+        if item['attempts'] + 1 >= self.max_attempts:
+            log.error("Giving up on xqueue submission %s after %d attempts: %s", item['id'], self.max_attempts, msg)
+            self.outbox.fail(item)
+            dog_stats_api.increment('xqueue.outbox.failed')
+        else:
+            log.warning("Failed to deliver xqueue submission %s, will retry: %s", item['id'], msg)
+            self.outbox.retry(item, self.retry_delay * (2 ** item['attempts']))
+            dog_stats_api.increment('xqueue.outbox.retried')
+        return False
+
+    def _ensure_worker(self):
+        """
+        Start the background delivery thread if this process doesn't have one.
+        """
+        with self._worker_lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self.outbox.recover()
+            self._worker = threading.Thread(target=self._run, name='xqueue-outbox')
+            self._worker.daemon = True
+            self._worker.start()
+
+    def _run(self):
+        """
+        Background loop: drain the outbox, then wait for new submissions or
+        for retries to come due.
+        """
+        while True:
+            try:
+                self.deliver_pending()
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Error while draining the xqueue outbox")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
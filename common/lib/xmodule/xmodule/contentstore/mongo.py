@@ -8,6 +8,10 @@ from xmodule.contentstore.content import XASSET_LOCATION_TAG
 
 import logging
 
+# maximum number of GridFS chunks (of 256KB by default) held in memory at a
+# time while copying the assets of a course
+CLONE_CHUNK_BATCH_SIZE = 16
+
 from .content import StaticContent, ContentStore, StaticContentStream
 from xmodule.exceptions import NotFoundError
 from fs.osfs import OSFS
@@ -39,6 +43,7 @@ class MongoContentStore(ContentStore):
         self.fs = gridfs.GridFS(_db, bucket)
 
         self.fs_files = _db[bucket + ".files"]  # the underlying collection GridFS uses
+        self.fs_chunks = _db[bucket + ".chunks"]  # and the collection of the files' contents
 
     def save(self, content):
         content_id = content.get_id()
@@ -127,18 +132,88 @@ class MongoContentStore(ContentStore):
         :param assets_policy_file: the filename for the policy file which should be in the same
         directory as the other policy files.
         """
+        self.export_all_for_course_to_fs(
+            course_location, OSFS('/'), os.path.abspath(output_directory), os.path.abspath(assets_policy_file)
+        )
+
+    def export_all_for_course_to_fs(self, course_location, output_fs, static_path, assets_policy_path):
+        """
+        Export all of this course's assets under `static_path` in the filesystem `output_fs`
+        (an `fs` filesystem), and all of the assets' attributes to the policy file at
+        `assets_policy_path` in it.
+
+        Each asset is copied from GridFS as a file object, a chunk at a time, so that an
+        asset is never held in memory as a whole.
+        """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_location)
 
         for asset in assets:
             asset_location = Location(asset['_id'])
-            self.export(asset_location, output_directory)
+            with self.fs.get(StaticContent.get_id_from_location(asset_location)) as asset_file:
+                directory = static_path
+                if getattr(asset_file, 'import_path', None) is not None:
+                    directory = directory + '/' + os.path.dirname(asset_file.import_path)
+                output_fs.makedir(directory, recursive=True, allow_recreate=True)
+                output_fs.setcontents(
+                    directory + '/' + asset_file.displayname, asset_file, chunk_size=asset_file.chunk_size
+                )
             for attr, value in asset.iteritems():
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize']:
                     policy.setdefault(asset_location.name, {})[attr] = value
 
-        with open(assets_policy_file, 'w') as f:
-            json.dump(policy, f)
+        output_fs.setcontents(assets_policy_path, json.dumps(policy))
+
+    def clone_course_assets(self, source_location, dest_location, progress_callback=None):
+        """
+        Copy all the assets and thumbnails of the course at `source_location`
+        to the course at `dest_location`.
+
+        The GridFS documents are copied as they are, with their ids and
+        references moved to the destination course, so the files' contents
+        aren't decoded and re-encoded. Each file's chunks are written before
+        its files document, so that a partly copied file isn't visible, and
+        any copy of a file left by an interrupted clone is replaced.
+
+        `progress_callback`, if given, is called after each file with the
+        number of files copied so far and the total number to copy.
+        """
+        def dest_location_of(location):
+            """Return the location in the destination course of a source location"""
+            return Location(location).replace(org=dest_location.org, course=dest_location.course)
+
+        source_query = {
+            '_id.tag': XASSET_LOCATION_TAG, '_id.org': source_location.org, '_id.course': source_location.course
+        }
+        file_ids = [item['_id'] for item in self.fs_files.find(source_query, {'_id': True})]
+        total = len(file_ids)
+        for copied, file_id in enumerate(file_ids, 1):
+            item = self.fs_files.find_one({'_id': file_id})
+            if item is None:
+                continue
+            new_location = dest_location_of(item['_id'])
+            new_id = StaticContent.get_id_from_location(new_location)
+            item['_id'] = new_id
+            item['filename'] = StaticContent.get_url_path_from_location(new_location)
+            if item.get('thumbnail_location'):
+                item['thumbnail_location'] = list(dest_location_of(item['thumbnail_location']))
+
+            self.fs_files.remove({'_id': new_id}, safe=True)
+            self.fs_chunks.remove({'files_id': new_id}, safe=True)
+            chunks = []
+            for chunk in self.fs_chunks.find({'files_id': file_id}, {'_id': False}):
+                chunk['files_id'] = new_id
+                chunks.append(chunk)
+                if len(chunks) == CLONE_CHUNK_BATCH_SIZE:
+                    self.fs_chunks.insert(chunks, safe=True)
+                    chunks = []
+            if chunks:
+                self.fs_chunks.insert(chunks, safe=True)
+            self.fs_files.insert(item, safe=True)
+
+            if progress_callback is not None:
+                progress_callback(copied, total)
+        return total
 
     def get_all_content_thumbnails_for_course(self, location):
         return self._get_all_content_for_course(location, get_thumbnails=True)[0]
@@ -387,7 +387,172 @@ class CourseFields(object):
     max_student_enrollments_allowed = Integer(help="Limit the number of students allowed to enroll in this course.",
                                               scope=Scope.settings)
 
-class CourseDescriptor(CourseFields, SequenceDescriptor):
+class CourseListingMixin(object):
+    """
+    The properties used to list and describe a course (dates, newness and
+    display names), shared by CourseDescriptor and course overviews, which
+    only need to provide the underlying field values.
+    """
+    def _i18n_service(self):
+        """
+        Return the i18n service used to format dates
+        """
+        return self.runtime.service(self, "i18n")
+
+    def has_ended(self):
+        """
+        Returns True if the current time is after the specified course end date.
+        Returns False if there is no end date specified.
+        """
+        if self.end is None:
+            return False
+
+        return datetime.now(UTC()) > self.end
+
+    def has_started(self):
+        return datetime.now(UTC()) > self.start
+
+    @property
+    def is_newish(self):
+        """
+        Returns if the course has been flagged as new. If
+        there is no flag, return a heuristic value considering the
+        announcement and the start dates.
+        """
+        flag = self.is_new
+        if flag is None:
+            # Use a heuristic if the course has not been flagged
+            announcement, start, now = self._sorting_dates()
+            if announcement and (now - announcement).days < 30:
+                # The course has been announced for less that month
+                return True
+            elif (now - start).days < 1:
+                # The course has not started yet
+                return True
+            else:
+                return False
+        elif isinstance(flag, basestring):
+            return flag.lower() in ['true', 'yes', 'y']
+        else:
+            return bool(flag)
+
+    @property
+    def sorting_score(self):
+        """
+        Returns a tuple that can be used to sort the courses according
+        the how "new" they are. The "newness" score is computed using a
+        heuristic that takes into account the announcement and
+        (advertized) start dates of the course if available.
+
+        The lower the number the "newer" the course.
+        """
+        # Make courses that have an announcement date shave a lower
+        # score than courses than don't, older courses should have a
+        # higher score.
+        announcement, start, now = self._sorting_dates()
+        scale = 300.0  # about a year
+        if announcement:
+            days = (now - announcement).days
+            score = -exp(-days / scale)
+        else:
+            days = (now - start).days
+            score = exp(days / scale)
+        return score
+
+    def _sorting_dates(self):
+        # utility function to get datetime objects for dates used to
+        # compute the is_new flag and the sorting_score
+
+        announcement = self.announcement
+        if announcement is not None:
+            announcement = announcement
+
+        try:
+            start = dateutil.parser.parse(self.advertised_start)
+            if start.tzinfo is None:
+                start = start.replace(tzinfo=UTC())
+        except (ValueError, AttributeError):
+            start = self.start
+
+        now = datetime.now(UTC())
+
+        return announcement, start, now
+
+    @property
+    def start_date_text(self):
+        """
+        Returns the desired text corresponding the course's start date.  Prefers .advertised_start,
+        then falls back to .start
+        """
+        i18n = self._i18n_service()
+        _ = i18n.ugettext
+        strftime = i18n.strftime
+
+        def try_parse_iso_8601(text):
+            try:
+                result = Date().from_json(text)
+                if result is None:
+                    result = text.title()
+                else:
+                    result = strftime(result, "SHORT_DATE")
+            except ValueError:
+                result = text.title()
+
+            return result
+
+        if isinstance(self.advertised_start, basestring):
+            return try_parse_iso_8601(self.advertised_start)
+        elif self.start_date_is_still_default:
+            # Translators: TBD stands for 'To Be Determined' and is used when a course
+            # does not yet have an announced start date.
+            return _('TBD')
+        else:
+            when = self.advertised_start or self.start
+            return strftime(when, "SHORT_DATE")
+
+    @property
+    def start_date_is_still_default(self):
+        """
+        Checks if the start date set for the course is still default, i.e. .start has not been modified,
+        and .advertised_start has not been set.
+        """
+        return self.advertised_start is None and self.start == CourseFields.start.default
+
+    @property
+    def end_date_text(self):
+        """
+        Returns the end date for the course formatted as a string.
+
+        If the course does not have an end date set (course.end is None), an empty string will be returned.
+        """
+        if self.end is None:
+            return ''
+        else:
+            strftime = self._i18n_service().strftime
+            return strftime(self.end, "SHORT_DATE")
+
+    @property
+    def display_number_with_default(self):
+        """
+        Return a display course number if it has been specified, otherwise return the 'course' that is in the location
+        """
+        if self.display_coursenumber:
+            return self.display_coursenumber
+
+        return self.number
+
+    @property
+    def display_org_with_default(self):
+        """
+        Return a display organization if it has been specified, otherwise return the 'org' that is in the location
+        """
+        if self.display_organization:
+            return self.display_organization
+
+        return self.org
+
+
+class CourseDescriptor(CourseListingMixin, CourseFields, SequenceDescriptor):
     module_class = SequenceModule
 
     def __init__(self, *args, **kwargs):
@@ -569,19 +734,6 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
 
         return xml_object
 
-    def has_ended(self):
-        """
-        Returns True if the current time is after the specified course end date.
-        Returns False if there is no end date specified.
-        """
-        if self.end is None:
-            return False
-
-        return datetime.now(UTC()) > self.end
-
-    def has_started(self):
-        return datetime.now(UTC()) > self.start
-
     @property
     def grader(self):
         return grader_from_conf(self.raw_grader)
@@ -671,72 +823,6 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
 
         return set(config.get("cohorted_discussions", []))
 
-    @property
-    def is_newish(self):
-        """
-        Returns if the course has been flagged as new. If
-        there is no flag, return a heuristic value considering the
-        announcement and the start dates.
-        """
-        flag = self.is_new
-        if flag is None:
-            # Use a heuristic if the course has not been flagged
-            announcement, start, now = self._sorting_dates()
-            if announcement and (now - announcement).days < 30:
-                # The course has been announced for less that month
-                return True
-            elif (now - start).days < 1:
-                # The course has not started yet
-                return True
-            else:
-                return False
-        elif isinstance(flag, basestring):
-            return flag.lower() in ['true', 'yes', 'y']
-        else:
-            return bool(flag)
-
-    @property
-    def sorting_score(self):
-        """
-        Returns a tuple that can be used to sort the courses according
-        the how "new" they are. The "newness" score is computed using a
-        heuristic that takes into account the announcement and
-        (advertized) start dates of the course if available.
-
-        The lower the number the "newer" the course.
-        """
-        # Make courses that have an announcement date shave a lower
-        # score than courses than don't, older courses should have a
-        # higher score.
-        announcement, start, now = self._sorting_dates()
-        scale = 300.0  # about a year
-        if announcement:
-            days = (now - announcement).days
-            score = -exp(-days / scale)
-        else:
-            days = (now - start).days
-            score = exp(days / scale)
-        return score
-
-    def _sorting_dates(self):
-        # utility function to get datetime objects for dates used to
-        # compute the is_new flag and the sorting_score
-
-        announcement = self.announcement
-        if announcement is not None:
-            announcement = announcement
-
-        try:
-            start = dateutil.parser.parse(self.advertised_start)
-            if start.tzinfo is None:
-                start = start.replace(tzinfo=UTC())
-        except (ValueError, AttributeError):
-            start = self.start
-
-        now = datetime.now(UTC())
-
-        return announcement, start, now
-
     @lazy
     def grading_context(self):
         """
@@ -822,59 +908,6 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
         """Return the course_id for this course"""
         return self.location_to_id(self.location)
 
-    @property
-    def start_date_text(self):
-        """
-        Returns the desired text corresponding the course's start date.  Prefers .advertised_start,
-        then falls back to .start
-        """
-        i18n = self.runtime.service(self, "i18n")
-        _ = i18n.ugettext
-        strftime = i18n.strftime
-
-        def try_parse_iso_8601(text):
-            try:
-                result = Date().from_json(text)
-                if result is None:
-                    result = text.title()
-                else:
-                    result = strftime(result, "SHORT_DATE")
-            except ValueError:
-                result = text.title()
-
-            return result
-
-        if isinstance(self.advertised_start, basestring):
-            return try_parse_iso_8601(self.advertised_start)
-        elif self.start_date_is_still_default:
-            # Translators: TBD stands for 'To Be Determined' and is used when a course
-            # does not yet have an announced start date.
-            return _('TBD')
-        else:
-            when = self.advertised_start or self.start
-            return strftime(when, "SHORT_DATE")
-
-    @property
-    def start_date_is_still_default(self):
-        """
-        Checks if the start date set for the course is still default, i.e. .start has not been modified,
-        and .advertised_start has not been set.
-        """
-        return self.advertised_start is None and self.start == CourseFields.start.default
-
-    @property
-    def end_date_text(self):
-        """
-        Returns the end date for the course formatted as a string.
-
-        If the course does not have an end date set (course.end is None), an empty string will be returned.
-        """
-        if self.end is None:
-            return ''
-        else:
-            strftime = self.runtime.service(self, "i18n").strftime
-            return strftime(self.end, "SHORT_DATE")
-
     @property
     def forum_posts_allowed(self):
         date_proxy = Date()
@@ -896,26 +929,6 @@ class CourseDescriptor(CourseFields, SequenceDescriptor):
     def number(self):
         return self.location.course
 
-    @property
-    def display_number_with_default(self):
-        """
-        Return a display course number if it has been specified, otherwise return the 'course' that is in the location
-        """
-        if self.display_coursenumber:
-            return self.display_coursenumber
-
-        return self.number
-
     @property
     def org(self):
         return self.location.org
-
-    @property
-    def display_org_with_default(self):
-        """
-        Return a display organization if it has been specified, otherwise return the 'org' that is in the location
-        """
-        if self.display_organization:
-            return self.display_organization
-
-        return self.org
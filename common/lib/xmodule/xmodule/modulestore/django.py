@@ -6,13 +6,16 @@ Passes settings.MODULESTORE as kwargs to MongoModuleStore
 
 from __future__ import absolute_import
 from importlib import import_module
+import cPickle as pickle
 import re
+from uuid import uuid4
 
 from django.conf import settings
 from django.core.cache import get_cache, InvalidCacheBackendError
 from django.dispatch import Signal
 import django.utils
 
+from xmodule.modulestore import XML_MODULESTORE_TYPE
 from xmodule.modulestore.loc_mapper_store import LocMapperStore
 from xmodule.util.django import get_current_request_hostname
 
@@ -28,6 +31,16 @@ _MODULESTORES = {}
 
 FUNCTION_KEYS = ['render_template']
 
+# XML courses can only change when the process restarts, so their cache
+# version is tied to the life of this process.
+_XML_COURSE_VERSION = uuid4().hex
+
+# Location indexes larger than this (pickled) aren't cached, as memcache
+# silently drops values over 1MB
+LOCATION_INDEX_MAX_BYTES = 900 * 1024
+# Cached instead of the location index of a course whose index is too large
+_LOCATION_INDEX_TOO_LARGE = 'too_large'
+
 
 def load_function(path):
     """
@@ -63,10 +76,13 @@ def create_modulestore_instance(engine, doc_store_config, options, i18n_service=
     except InvalidCacheBackendError:
         metadata_inheritance_cache = get_cache('default')
 
+    modulestore_update_signal = Signal(providing_args=['modulestore', 'course_id', 'location'])
+    modulestore_update_signal.connect(_bump_course_cache_version)
+
     return class_(
         metadata_inheritance_cache_subsystem=metadata_inheritance_cache,
         request_cache=request_cache,
-        modulestore_update_signal=Signal(providing_args=['modulestore', 'course_id', 'location']),
+        modulestore_update_signal=modulestore_update_signal,
         xblock_mixins=getattr(settings, 'XBLOCK_MIXINS', ()),
         xblock_select=getattr(settings, 'XBLOCK_SELECT_FUNCTION', None),
         doc_store_config=doc_store_config,
@@ -161,6 +177,73 @@ def clear_existing_modulestores():
     _loc_singleton = None
 
 
+def _course_cache_version_key(course_id):
+    """
+    Return the cache key holding the version token of the course `course_id`.
+
+    The key uses only the org and course number, because that is all the
+    modulestore update signal reports.
+    """
+    return u'course_cache_version.{0}'.format(u'/'.join(course_id.split('/')[:2]))
+
+
+def _bump_course_cache_version(sender, course_id=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Receiver for the modulestore update signal: give the course a new cache
+    version, which invalidates everything cached under the old one.
+    """
+    if course_id:
+        get_cache('default').set(_course_cache_version_key(course_id), uuid4().hex)
+
+
+def course_cache_version(course_id):
+    """
+    Return a token which changes whenever the content of the course
+    `course_id` changes (e.g. on publish or import), for use in the keys of
+    caches derived from the course's content.
+    """
+    if modulestore().get_modulestore_type(course_id) == XML_MODULESTORE_TYPE:
+        return _XML_COURSE_VERSION
+
+    cache = get_cache('default')
+    key = _course_cache_version_key(course_id)
+    version = cache.get(key)
+    if version is None:
+        # Use add, so that concurrent processes agree on one version
+        version = uuid4().hex
+        cache.add(key, version)
+        version = cache.get(key) or version
+    return version
+
+
+def location_index(course_id):
+    """
+    Return the location index of the course `course_id` (see
+    `xmodule.modulestore.search.build_location_index`), from the cache if it
+    has already been built for the current version of the course.
+
+    Returns None if the index is too large to be cached, so that callers use
+    `path_to_location` rather than rebuild the index on every request.
+
+    Raises ItemNotFoundError if the course doesn't exist.
+    """
+    from xmodule.course_module import CourseDescriptor
+    from xmodule.modulestore.search import build_location_index
+
+    cache = get_cache('default')
+    key = u'location_index.{0}.{1}'.format(course_id, course_cache_version(course_id))
+    index = cache.get(key)
+    if index is None:
+        course = modulestore().get_instance(course_id, CourseDescriptor.id_to_location(course_id), depth=None)
+        index = build_location_index(course)
+        if len(pickle.dumps(index, pickle.HIGHEST_PROTOCOL)) > LOCATION_INDEX_MAX_BYTES:
+            index = _LOCATION_INDEX_TOO_LARGE
+        cache.set(key, index)
+    if index == _LOCATION_INDEX_TOO_LARGE:
+        return None
+    return index
+
+
 def editable_modulestore(name='default'):
     """
     Retrieve a modulestore that we can modify.
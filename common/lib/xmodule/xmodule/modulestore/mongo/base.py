@@ -33,11 +33,15 @@ from xblock.fields import Scope, ScopeIds
 from xmodule.modulestore import ModuleStoreWriteBase, Location, MONGO_MODULESTORE_TYPE
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import own_metadata, InheritanceMixin, inherit_metadata, InheritanceKeyValueStore
+from xmodule.modulestore.store_utilities import rewrite_nonportable_content_links
 from xmodule.modulestore.xml import LocationReader
 from xblock.core import XBlock
 
 log = logging.getLogger(__name__)
 
+# number of module documents read and written at a time when cloning a course
+CLONE_BATCH_SIZE = 500
+
 
 def get_course_id_no_run(location):
     '''
@@ -890,6 +894,124 @@ class MongoModuleStore(ModuleStoreWriteBase):
         item_locs -= all_reachable
         return list(item_locs)
 
+    def clone_course_documents(self, source_location, dest_location, progress_callback=None):
+        """
+        Copy all the modules of the course at `source_location`, published
+        and draft, to the existing course at `dest_location`, by copying their
+        documents rather than loading them as xmodules.
+
+        The documents are read with a cursor and written CLONE_BATCH_SIZE at
+        a time. Their locations and children are moved to the destination
+        course, and the non-portable links in their data are rewritten.
+
+        The destination may only contain its course and overview modules,
+        or modules copied by an earlier, interrupted clone of the same
+        source: documents are replaced rather than added, so running the
+        clone again completes it.
+
+        `progress_callback`, if given, is called after each batch with the
+        number of documents copied so far and the total number to copy.
+        """
+        source_query = {'_id.tag': source_location.tag, '_id.org': source_location.org, '_id.course': source_location.course}
+        dest_query = {'_id.tag': dest_location.tag, '_id.org': dest_location.org, '_id.course': dest_location.course}
+
+        def dest_id(son_id):
+            """Return the id in the destination course of a source document's id"""
+            location = Location(son_id)
+            location = location._replace(tag=dest_location.tag, org=dest_location.org, course=dest_location.course)
+            if location.category == 'course':
+                location = location._replace(name=dest_location.name)
+            return namedtuple_to_son(location)
+
+        # check that the destination is empty, or holds modules of an earlier clone
+        cloned_ids = set(
+            Location(dest_id(item['_id'])).url() for item in self.collection.find(source_query, {'_id': True})
+        )
+        for item in self.collection.find(dest_query, {'_id': True}):
+            location = Location(item['_id'])
+            if location.category == 'course' or (location.category == 'about' and location.name == 'overview'):
+                continue
+            if location.url() not in cloned_ids:
+                raise Exception(
+                    "Course at destination {0} is not an empty course. You can only clone into an empty course. "
+                    "Aborting...".format(dest_location)
+                )
+
+        def clone_document(item):
+            """Return the document of a module in the destination course"""
+            item['_id'] = dest_id(item['_id'])
+            definition = item.get('definition', {})
+            data = definition.get('data')
+            if isinstance(data, basestring):
+                definition['data'] = rewrite_nonportable_content_links(
+                    source_location.course_id, dest_location.course_id, data
+                )
+            elif isinstance(data, dict) and isinstance(data.get('data'), basestring):
+                data['data'] = rewrite_nonportable_content_links(
+                    source_location.course_id, dest_location.course_id, data['data']
+                )
+            if definition.get('children'):
+                definition['children'] = [
+                    Location(child).replace(
+                        tag=dest_location.tag, org=dest_location.org, course=dest_location.course
+                    ).url()
+                    for child in definition['children']
+                ]
+            return item
+
+        total = len(cloned_ids)
+        copied = 0
+        batch = []
+        for item in self.collection.find(source_query).batch_size(CLONE_BATCH_SIZE):
+            batch.append(clone_document(item))
+            if len(batch) == CLONE_BATCH_SIZE:
+                self._replace_documents(batch)
+                copied += len(batch)
+                batch = []
+                if progress_callback is not None:
+                    progress_callback(copied, total)
+        if batch:
+            self._replace_documents(batch)
+            copied += len(batch)
+            if progress_callback is not None:
+                progress_callback(copied, total)
+
+        # recompute (and update) the metadata inheritance tree which is cached
+        self.refresh_cached_metadata_inheritance_tree(dest_location)
+        self.fire_updated_modulestore_signal(get_course_id_no_run(dest_location), dest_location)
+        return copied
+
+    def _replace_documents(self, documents):
+        """
+        Write `documents`, replacing any documents with the same ids, with a
+        bulk remove and a bulk insert.
+
+        Readers see no document between the two writes, so this is only for
+        documents which aren't live yet, such as those of a clone; use
+        `_upsert_documents` for the others.
+        """
+        if not documents:
+            return
+        # Must include this to avoid the django debug toolbar (which defines the deprecated "safe=False")
+        # from overriding our default value set in the init method.
+        self.collection.remove({'_id': {'$in': [item['_id'] for item in documents]}}, safe=self.collection.safe)
+        self.collection.insert(documents, safe=self.collection.safe)
+
+    def _upsert_documents(self, documents):
+        """
+        Write `documents`, replacing any documents with the same ids, one
+        upsert at a time, so that readers always find each of them.
+        """
+        for document in documents:
+            self.collection.update(
+                {'_id': document['_id']},
+                document,
+                upsert=True,
+                # Must include this to avoid the django debug toolbar (which defines the deprecated "safe=False")
+                # from overriding our default value set in the init method.
+                safe=self.collection.safe
+            )
+
     def _create_new_field_data(self, _category, _location, definition_data, metadata):
         """
         To instantiate a new xmodule which will be saved latter, set up the dbModel and kvs
@@ -6,7 +6,9 @@ returns the i4x://org/course/cat/name@draft object if that exists,
 and otherwise returns i4x://org/course/cat/name).
 """
 
+import copy
 from datetime import datetime
+from uuid import uuid4
 
 from xmodule.exceptions import InvalidVersionError
 from xmodule.modulestore import Location
@@ -237,6 +239,185 @@ class DraftModuleStore(MongoModuleStore):
         super(DraftModuleStore, self).update_item(draft, '**replace_user**')
         self.delete_item(location)
 
+    def _get_subtree_documents(self, location):
+        """
+        Return the published and draft documents of the module at `location`
+        and of all its descendants, as two dicts keyed by their non-draft
+        Locations, and the list of those Locations, parents before children.
+
+        The children of a module are those of its draft, if it has one.
+        Both revisions of a whole level of the tree are read in one query.
+        Raises ItemNotFoundError if there is no module at `location`;
+        missing descendants are skipped.
+        """
+        location = as_published(location)
+        published = {}
+        drafts = {}
+        subtree = []
+        seen = set([location])
+        to_process = [location]
+        while to_process:
+            query = {'_id': {'$in': [
+                namedtuple_to_son(revision)
+                for item_location in to_process
+                for revision in (item_location, as_draft(item_location))
+            ]}}
+            for item in self.collection.find(query):
+                item_location = Location(item['_id'])
+                if item_location.revision == DRAFT:
+                    drafts[as_published(item_location)] = item
+                else:
+                    published[item_location] = item
+
+            children = []
+            for item_location in to_process:
+                item = drafts.get(item_location) or published.get(item_location)
+                if item is None:
+                    if item_location == location:
+                        raise ItemNotFoundError(location)
+                    continue
+                subtree.append(item_location)
+                for child in item.get('definition', {}).get('children', []):
+                    child_location = Location(child)
+                    if child_location not in seen:
+                        seen.add(child_location)
+                        children.append(child_location)
+            to_process = children
+        return published, drafts, subtree
+
+    def publish_subtree(self, location, published_by_id):
+        """
+        Publish the module at `location` and all its descendants, with the
+        same results as publishing each of them, but reading the subtree
+        level by level. The published modules are upserted in place, and the
+        drafts and removed children are deleted with one bulk remove.
+
+        Each published module gets the same published_date and the
+        published_by `published_by_id`, as `publish` sets them.
+
+        Children removed from a draft are deleted if the published module
+        was their only parent, as in `publish`.
+        """
+        published, drafts, subtree = self._get_subtree_documents(location)
+        # stored as time tuples, as the published_date field serializes them
+        published_date = list(datetime.now(UTC).timetuple())
+
+        to_publish = []
+        removed_children = {}
+        for item_location in subtree:
+            draft = drafts.get(item_location)
+            if draft is None:
+                continue
+            original_published = published.get(item_location)
+            if original_published is not None:
+                # see if children were deleted or moved (see publish)
+                draft_children = draft.get('definition', {}).get('children', [])
+                for child in original_published.get('definition', {}).get('children', []):
+                    if child not in draft_children:
+                        removed_children[child] = item_location
+            item = copy.copy(draft)
+            item['_id'] = namedtuple_to_son(item_location)
+            item['metadata'] = dict(
+                draft.get('metadata', {}), published_date=published_date, published_by=published_by_id
+            )
+            to_publish.append(item)
+
+        to_delete = []
+        if removed_children:
+            parents = {}
+            for item in self.collection.find(
+                {'definition.children': {'$in': removed_children.keys()}},
+                {'_id': True, 'definition.children': True}
+            ):
+                for child in item['definition']['children']:
+                    parents.setdefault(child, []).append(Location(item['_id']))
+            for child, parent_location in removed_children.items():
+                if parents.get(child) == [parent_location]:
+                    to_delete.extend([Location(child), as_draft(child)])
+
+        # live modules are overwritten in place, so that readers never miss them
+        self._upsert_documents(to_publish)
+        self.collection.remove(
+            {'_id': {'$in': [
+                namedtuple_to_son(as_draft(item_location)) for item_location in drafts
+            ] + [namedtuple_to_son(item_location) for item_location in to_delete]}},
+            safe=self.collection.safe
+        )
+
+        location = Location(location)
+        self.refresh_cached_metadata_inheritance_tree(location)
+        self.fire_updated_modulestore_signal(get_course_id_no_run(location), location)
+
+    def duplicate_subtree(self, source_location, parent_location=None, update_metadata=None):
+        """
+        Copy the module at `source_location` and all its descendants to new,
+        uniquely named locations, and return the location of the copy.
+
+        Each module is copied from its draft, if it has one, and the copies
+        are drafts unless their category can't be. The subtree is read level
+        by level, and its copies are written with one bulk insert.
+
+        If `parent_location` is given, the copy is added to the children of
+        that module, right after the source if it is one of them, or else at
+        the end.
+
+        `update_metadata`, if given, is called with the location of each
+        source module and the metadata of its copy, which it may change.
+        """
+        published, drafts, subtree = self._get_subtree_documents(source_location)
+        new_locations = dict(
+            (item_location, item_location.replace(name=uuid4().hex)) for item_location in subtree
+        )
+
+        def stored_location(item_location):
+            """Return the location at which the module at `item_location` is stored"""
+            if item_location.category in DIRECT_ONLY_CATEGORIES:
+                return item_location
+            return as_draft(item_location)
+
+        copies = []
+        for item_location in subtree:
+            item = drafts.get(item_location) or published[item_location]
+            metadata = copy.deepcopy(item.get('metadata', {}))
+            if update_metadata is not None:
+                update_metadata(item_location, metadata)
+            definition = item.get('definition', {})
+            copies.append({
+                '_id': namedtuple_to_son(stored_location(new_locations[item_location])),
+                'metadata': metadata,
+                'definition': {
+                    'data': copy.deepcopy(definition.get('data', {})),
+                    'children': [
+                        new_locations[Location(child)].url()
+                        for child in definition.get('children', [])
+                        if Location(child) in new_locations
+                    ],
+                },
+            })
+        self.collection.insert(copies, safe=self.collection.safe)
+
+        source_location = as_published(source_location)
+        dest_location = new_locations[source_location]
+        if parent_location is not None:
+            parent_location = as_published(parent_location)
+            parent = self.collection.find_one({'_id': namedtuple_to_son(as_draft(parent_location))})
+            if parent is None:
+                parent = self.collection.find_one({'_id': namedtuple_to_son(parent_location)})
+                if parent is None:
+                    raise ItemNotFoundError(parent_location)
+            # changing a module which can be a draft makes a draft of it
+            parent['_id'] = namedtuple_to_son(stored_location(parent_location))
+            children = parent.setdefault('definition', {}).setdefault('children', [])
+            if source_location.url() in children:
+                children.insert(children.index(source_location.url()) + 1, dest_location.url())
+            else:
+                children.append(dest_location.url())
+            self.collection.save(parent, safe=self.collection.safe)
+
+        self.refresh_cached_metadata_inheritance_tree(dest_location)
+        self.fire_updated_modulestore_signal(get_course_id_no_run(dest_location), dest_location)
+        return dest_location
+
     def unpublish(self, location):
         """
         Turn the published version into a draft, removing the published version
@@ -115,3 +115,59 @@ def path_to_location(modulestore, course_id, location):
         position = "_".join(position_list)
 
     return (course_id, chapter, section, position)
+
+
+def build_location_index(course):
+    '''
+    Compute the chapter/section/position path of every module in `course`
+    with a single traversal of the course tree, for the redirects which
+    would otherwise call path_to_location on every request. `course` should
+    be loaded with depth=None, so that the traversal doesn't hit the
+    modulestore.
+
+    Return a dict with:
+        'paths': location url -> (chapter, section, position), as returned
+            by path_to_location
+        'names': location name -> list of the location urls with that name,
+            in traversal order
+    '''
+    paths = {}
+    names = {}
+
+    # Use an explicit stack, as courses can be deeply nested. Each entry is
+    # (descriptor, path of locations from the course, position parts)
+    stack = [(course, [], [])]
+    while stack:
+        descriptor, path, position_list = stack.pop()
+        location = descriptor.location
+        path = path + [location]
+        url = location.url()
+        if url in paths:
+            # reachable by several paths; keep the first one found
+            continue
+
+        n = len(path)
+        chapter = path[1].name if n > 1 else None
+        section = path[2].name if n > 2 else None
+        position = "_".join(position_list) if n > 3 else None
+        paths[url] = (course.id, chapter, section, position)
+        names.setdefault(location.name, []).append(url)
+
+        children = descriptor.get_children() if descriptor.has_children else []
+        # position parts are only collected below the section
+        positional = n >= 3 and location.category in ('sequential', 'videosequence')
+        # push in reverse, so that children are visited in order
+        for index in reversed(range(len(children))):
+            child_positions = position_list + [str(index + 1)] if positional else position_list
+            stack.append((children[index], path, child_positions))
+
+    return {'paths': paths, 'names': names}
+
+
+def path_from_location_index(index, location):
+    '''
+    Return the (course_id, chapter, section, position) path of `location`
+    from a location index built by build_location_index, or None if the
+    location isn't in the index.
+    '''
+    return index['paths'].get(Location(location).url())
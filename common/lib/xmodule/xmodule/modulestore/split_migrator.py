@@ -23,7 +23,7 @@ class SplitMigrator(object):
         self.draft_modulestore = draft_modulestore
         self.loc_mapper = loc_mapper
 
-    def migrate_mongo_course(self, course_location, user, new_package_id=None):
+    def migrate_mongo_course(self, course_location, user, new_package_id=None, bulk=False):
         """
         Create a new course in split_mongo representing the published and draft versions of the course from the
         original mongo store. And return the new_package_id (which the caller can also get by calling
@@ -35,9 +35,15 @@ class SplitMigrator(object):
         :param user: the user whose action is causing this migration
         :param new_package_id: (optional) the Locator.package_id for the new course. Defaults to
         whatever translate_location_to_locator returns
+        :param bulk: (optional) if True, build each branch of the new course in memory and write it at once
+        rather than item by item (see _bulk_migrate_mongo_course)
         """
         new_package_id = self.loc_mapper.create_map_entry(course_location, package_id=new_package_id)
         old_course_id = course_location.course_id
+        if bulk:
+            self._bulk_migrate_mongo_course(course_location, old_course_id, new_package_id, user)
+            return new_package_id
+
         # the only difference in data between the old and split_mongo xblocks are the locations;
         # so, any field which holds a location must change to a Locator; otherwise, the persistence
         # layer and kvs's know how to store it.
@@ -55,10 +61,54 @@ class SplitMigrator(object):
         )
 
         self._copy_published_modules_to_course(new_course, course_location, old_course_id, user)
-        self._add_draft_modules_to_course(new_package_id, old_course_id, course_location, user)
+        # write all of the drafts as a single new version of the draft branch
+        with self.split_modulestore.bulk_write_operations(new_package_id):
+            self._add_draft_modules_to_course(new_package_id, old_course_id, course_location, user)
 
         return new_package_id
 
+    def _bulk_migrate_mongo_course(self, course_location, old_course_id, new_package_id, user):
+        """
+        Create the published and draft branches of the new course, each as a single structure version, from
+        all of the modules of the 'direct' and 'draft' versions of the course. Unlike the item by item
+        migration, this writes each branch once, so a course of n items doesn't generate n structure versions.
+
+        The course only becomes visible in split once completely written; so, an interrupted migration can be
+        resumed by running it again: the location map entries it made are reused.
+        """
+        original_course = self.direct_modulestore.get_item(course_location)
+        published_root = self.loc_mapper.translate_location(old_course_id, course_location, True)
+        draft_root = self.loc_mapper.translate_location(old_course_id, course_location, False)
+        published_blocks = self._get_blocks(self.direct_modulestore, course_location, old_course_id, True)
+        draft_blocks = self._get_blocks(self.draft_modulestore, course_location, old_course_id, False)
+        self.split_modulestore.create_course_from_blocks(
+            course_location.org, original_course.display_name, user.id, new_package_id, published_root.block_id,
+            [(published_root.branch, published_blocks), (draft_root.branch, draft_blocks)]
+        )
+
+    def _get_blocks(self, modulestore, old_course_loc, old_course_id, published):
+        """
+        Return the dict of block_id -> (category, fields) of the published or draft version of the course
+        in modulestore, as expected by create_course_from_blocks.
+        """
+        blocks = {}
+        # iterate over the course elements rather than descending b/c some elements are orphaned (e.g.,
+        # course about pages, conditionals). The draft store returns the draft version of the elements
+        # having one, and the published version of the others.
+        for module in modulestore.get_items(
+            old_course_loc.replace(category=None, name=None, revision=None),
+            old_course_id
+        ):
+            if published and getattr(module, 'is_draft', False):
+                continue
+            new_locator = self.loc_mapper.translate_location(
+                old_course_id, module.location, published, add_entry_if_missing=True
+            )
+            blocks[new_locator.block_id] = (
+                module.category, self._get_json_fields_translate_children(module, old_course_id, True)
+            )
+        return blocks
+
     def _copy_published_modules_to_course(self, new_course, old_course_loc, old_course_id, user):
         """
         Copy all of the modules from the 'direct' version of the course to the new split course.
@@ -98,8 +148,7 @@ class SplitMigrator(object):
         """
         update each draft. Create any which don't exist in published and attach to their parents.
         """
-        # each true update below will trigger a new version of the structure. We may want to just have one new version
-        # but that's for a later date.
+        # run within a bulk write, so that the updates below continue a single new version of the structure
         new_draft_course_loc = CourseLocator(package_id=new_package_id, branch='draft')
         # to prevent race conditions of grandchilden being added before their parents and thus having no parent to
         # add to
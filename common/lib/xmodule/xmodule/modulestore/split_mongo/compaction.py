@@ -0,0 +1,215 @@
+"""
+Compaction of the version history of the split mongo modulestore.
+
+Every change to a course writes a new version of its structure, which points to the version it revises by
+previous_version. compact_history deletes the versions of each course's history which are older than a
+retention policy, and the definitions which no remaining structure uses.
+
+Kept are
+* the head of every branch of every course in the course index,
+* up to keep_versions versions preceding each head,
+* the original_version of each course's history, and
+* every version and definition younger than min_age, which also protects those being written.
+
+The history a course loses is squashed into the versions it keeps: each kept version's previous_version
+becomes its nearest kept ancestor, and the blocks which changed in deleted versions are recorded as
+changed in the first kept version which has the change.
+
+Only the ancestors of the heads in the course index are deleted. Structures of courses no longer in the
+course index (see SplitMongoModuleStore.delete_course) are left alone, with all their ancestors, so that
+they can still be restored, even when such a course shares its history with an indexed one (as a course
+created from another's version does).
+"""
+import datetime
+import logging
+
+from pytz import UTC
+
+log = logging.getLogger(__name__)
+
+# Number of versions kept before the head of each branch
+DEFAULT_KEEP_VERSIONS = 20
+# Structures and definitions younger than this are always kept
+DEFAULT_MIN_AGE = datetime.timedelta(days=7)
+# Number of documents deleted by each delete request
+DELETE_BATCH_SIZE = 500
+
+
+def compact_history(db_connection, keep_versions=DEFAULT_KEEP_VERSIONS, min_age=DEFAULT_MIN_AGE, dry_run=False):
+    """
+    Delete the structures older than the retention policy and the definitions no longer used.
+
+    :param db_connection: the MongoConnection of the split modulestore
+    :param keep_versions: the number of versions kept before the head of each branch
+    :param min_age: a timedelta; structures and definitions younger than it are kept
+    :param dry_run: if True, only report what would be deleted
+
+    Returns a dict with, for 'structures' and for 'definitions', the number of documents deleted and the
+    number of bytes they took, e.g. {'structures': (120, 524288), 'definitions': (3, 1024)}
+    """
+    cutoff = datetime.datetime.now(UTC) - min_age
+    heads = set()
+    for index in db_connection.find_matching_course_indexes({}):
+        heads.update(index['versions'].itervalues())
+
+    versions = _find_lineages(db_connection, heads)
+    deleted = _find_deleted_versions(versions, heads, keep_versions, cutoff)
+    if deleted and not dry_run:
+        _squash_history(db_connection, versions, deleted)
+
+    unused_definitions = _find_unused_definitions(db_connection, deleted, cutoff)
+
+    report = {
+        'structures': _delete_documents(
+            db_connection.get_structures_size, db_connection.delete_structures, deleted, dry_run
+        ),
+        'definitions': _delete_documents(
+            db_connection.get_definitions_size, db_connection.delete_definitions, unused_definitions, dry_run
+        ),
+    }
+    log.info(
+        "%s %d structures (%d bytes) and %d definitions (%d bytes) from split-mongo",
+        "would delete" if dry_run else "deleted",
+        report['structures'][0], report['structures'][1],
+        report['definitions'][0], report['definitions'][1],
+    )
+    return report
+
+
+def _find_lineages(db_connection, heads):
+    """
+    Return the summaries (previous_version, original_version and edited_on) of all the versions sharing
+    an original_version with any of heads, keyed by version id.
+    """
+    originals = set(
+        structure['original_version']
+        for structure in db_connection.find_matching_structures(
+            {'_id': {'$in': list(heads)}}, fields=['original_version']
+        )
+    )
+    return dict(
+        (structure['_id'], structure)
+        for structure in db_connection.find_matching_structures(
+            {'original_version': {'$in': list(originals)}},
+            fields=['previous_version', 'original_version', 'edited_on']
+        )
+    )
+
+
+def _find_deleted_versions(versions, heads, keep_versions, cutoff):
+    """
+    Return the ids of the versions the retention policy doesn't keep, among the ancestors of heads.
+    """
+    kept = set(heads)
+    for version_id in heads:
+        for _ in range(keep_versions + 1):
+            if version_id not in versions:
+                break
+            kept.add(version_id)
+            version_id = versions[version_id]['previous_version']
+    for version_id, version in versions.iteritems():
+        if version['original_version'] == version_id or version['edited_on'] > cutoff:
+            kept.add(version_id)
+
+    indexed = _ancestors(versions, heads)
+    # the versions sharing a lineage with the heads which aren't their ancestors, such as the heads of
+    # courses removed from the index, are kept with their whole history
+    kept.update(_ancestors(versions, set(versions) - indexed))
+    return indexed - kept
+
+
+def _ancestors(versions, version_ids):
+    """
+    Return the ids of version_ids and of all their ancestors in versions.
+    """
+    ancestors = set()
+    for version_id in version_ids:
+        while version_id in versions and version_id not in ancestors:
+            ancestors.add(version_id)
+            version_id = versions[version_id]['previous_version']
+    return ancestors
+
+
+def _squash_history(db_connection, versions, deleted):
+    """
+    Rewrite the history recorded in the kept versions so that it no longer refers to the deleted ones.
+    """
+    # (block id, update_version) of a block version -> its (update_version, previous_version) in the
+    # compacted history; shared by all the structures containing that block version
+    squashed_edits = {}
+    # kept version id -> {block id: update_version} of its blocks after squashing
+    block_versions = {}
+    kept = sorted(
+        (version for version_id, version in versions.iteritems() if version_id not in deleted),
+        key=lambda version: version['edited_on']
+    )
+    # ancestors were edited before their successors, so they are squashed first
+    for version in kept:
+        structure = db_connection.get_structure(version['_id'])
+        changed = False
+        ancestor = structure['previous_version']
+        while ancestor in deleted:
+            ancestor = versions[ancestor]['previous_version']
+        if ancestor != structure['previous_version']:
+            structure['previous_version'] = ancestor
+            changed = True
+        ancestor_blocks = block_versions.get(ancestor, {})
+
+        for block_id, block in structure['blocks'].iteritems():
+            edit_info = block['edit_info']
+            key = (block_id, edit_info['update_version'])
+            if key not in squashed_edits:
+                update_version = edit_info['update_version']
+                previous_version = edit_info.get('previous_version')
+                if update_version in deleted:
+                    update_version = structure['_id']
+                if previous_version in deleted:
+                    previous_version = ancestor_blocks.get(block_id)
+                    if previous_version == update_version:
+                        previous_version = None
+                squashed_edits[key] = (update_version, previous_version)
+            update_version, previous_version = squashed_edits[key]
+            if edit_info['update_version'] != update_version or edit_info.get('previous_version') != previous_version:
+                edit_info['update_version'] = update_version
+                edit_info['previous_version'] = previous_version
+                changed = True
+        block_versions[structure['_id']] = dict(
+            (block_id, block['edit_info']['update_version'])
+            for block_id, block in structure['blocks'].iteritems()
+        )
+
+        if changed:
+            db_connection.update_structure(structure)
+
+
+def _find_unused_definitions(db_connection, deleted, cutoff):
+    """
+    Return the ids of the definitions older than cutoff which no structure but the deleted ones uses.
+    """
+    used = set()
+    for structure in db_connection.find_matching_structures({}, fields=['blocks']):
+        if structure['_id'] not in deleted:
+            used.update(block['definition'] for block in structure['blocks'].itervalues())
+    return set(
+        definition['_id']
+        for definition in db_connection.find_matching_definitions(
+            {'edit_info.edited_on': {'$lt': cutoff}}, fields=['_id']
+        )
+        if definition['_id'] not in used
+    )
+
+
+def _delete_documents(get_size, delete, keys, dry_run):
+    """
+    Delete the documents whose ids are keys in batches, unless dry_run.
+
+    Returns the number of documents and the number of bytes they took.
+    """
+    keys = list(keys)
+    size = 0
+    for start in range(0, len(keys), DELETE_BATCH_SIZE):
+        batch = keys[start:start + DELETE_BATCH_SIZE]
+        size += get_size(batch)
+        if not dry_run:
+            delete(batch)
+    return len(keys), size
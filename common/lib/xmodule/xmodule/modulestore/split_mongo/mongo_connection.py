@@ -1,18 +1,48 @@
 """
 Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
+
+Structures are normally stored as full documents. With delta_structures, a structure is instead stored
+as the changes of its blocks from its previous_version (delta_blocks and deleted_blocks, with its
+delta_base and its delta_depth, the number of deltas since the last full document), and a full
+document is stored every snapshot_interval versions, when the previous version isn't stored, or when
+most of the blocks changed. Structures are rebuilt from their deltas when read, and the rebuilt ones
+are kept in an LRU cache of structure_cache_size structures. Versions are never changed once written,
+except by update_structure, whose changes other processes may not see until their cached copy is
+evicted. Both formats can be read, so the option can be turned on for an existing collection.
 """
+import collections
+import copy
+import threading
+
 import pymongo
+from bson import BSON
+
+# Fields of the structures stored as deltas
+DELTA_FIELDS = ('delta_base', 'delta_depth', 'delta_blocks', 'deleted_blocks')
+
 
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
     """
     def __init__(
-        self, db, collection, host, port=27017, tz_aware=True, user=None, password=None, **kwargs
+        self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
+        delta_structures=False, snapshot_interval=20, structure_cache_size=100, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        :param delta_structures: store structures as deltas from their previous version (see above)
+        :param snapshot_interval: with delta_structures, the maximum number of versions between full documents
+        :param structure_cache_size: with delta_structures, the number of rebuilt structures cached
         """
+        self.delta_structures = delta_structures
+        self.snapshot_interval = snapshot_interval
+        self.structure_cache_size = structure_cache_size
+        # structure id -> (full structure, delta_depth) in least to most recently used order
+        self._structure_cache = collections.OrderedDict()
+        self._structure_cache_lock = threading.Lock()
+
         self.database = pymongo.database.Database(
             pymongo.MongoClient(
                 host=host,
@@ -38,30 +68,219 @@ class MongoConnection(object):
         self.structures.write_concern = {'w': 1}
         self.definitions.write_concern = {'w': 1}
 
+        if self.delta_structures:
+            self.structures.ensure_index('delta_base', sparse=True)
+
     def get_structure(self, key):
         """
         Get the structure from the persistence mechanism whose id is the given key
         """
-        return self.structures.find_one({'_id': key})
+        if not self.delta_structures:
+            return self.structures.find_one({'_id': key})
+        structure = self._load_structure(key)[0]
+        return copy.deepcopy(structure)
 
-    def find_matching_structures(self, query):
+    def find_matching_structures(self, query, fields=None):
         """
         Find the structure matching the query. Right now the query must be a legal mongo query
         :param query: a mongo-style query of {key: [value|{$in ..}|..], ..}
+        :param fields: if provided, the list of the fields to return
+
+        With delta_structures, a query on blocks only matches the structures stored as deltas if they
+        changed the matching blocks.
         """
-        return self.structures.find(query)
+        if not self.delta_structures:
+            return self.structures.find(query, fields=fields)
+        if fields is not None and 'blocks' in fields:
+            fields = list(fields) + list(DELTA_FIELDS)
+        return (
+            self._rebuild_structure(document)
+            for document in self.structures.find(self._delta_query(query), fields=fields)
+        )
 
     def insert_structure(self, structure):
         """
         Create the structure in the db
         """
-        self.structures.insert(structure)
+        if not self.delta_structures:
+            self.structures.insert(structure)
+            return
+        document, depth = self._encode_structure(structure)
+        self.structures.insert(document)
+        self._cache_structure(copy.deepcopy(structure), depth)
 
     def update_structure(self, structure):
         """
         Update the db record for structure
         """
-        self.structures.update({'_id': structure['_id']}, structure)
+        if not self.delta_structures:
+            self.structures.update({'_id': structure['_id']}, structure)
+            return
+        # the structures stored as deltas from this one keep their contents
+        successors = [
+            self._load_structure(document['_id'])[0]
+            for document in self.structures.find({'delta_base': structure['_id']}, fields=['_id'])
+        ]
+        self._uncache_structures([structure['_id']] + [successor['_id'] for successor in successors])
+        for version in [structure] + successors:
+            document, _depth = self._encode_structure(version)
+            self.structures.update({'_id': version['_id']}, document)
+
+    def delete_structures(self, keys):
+        """
+        Delete the structures whose ids are in keys
+        """
+        keys = list(keys)
+        if self.delta_structures:
+            # the structures stored as deltas from deleted ones are stored as full documents instead
+            for document in self.structures.find(
+                {'delta_base': {'$in': keys}, '_id': {'$nin': keys}}, fields=['_id']
+            ):
+                structure = self._load_structure(document['_id'])[0]
+                self.structures.update({'_id': structure['_id']}, structure)
+                self._uncache_structures([structure['_id']])
+            self._uncache_structures(keys)
+        self.structures.remove({'_id': {'$in': keys}})
+
+    def get_structures_size(self, keys):
+        """
+        Return the number of bytes the structures whose ids are in keys take in the db
+        """
+        return sum(
+            len(BSON.encode(document)) for document in self.structures.find({'_id': {'$in': list(keys)}})
+        )
+
+    def _load_structure(self, key):
+        """
+        Return the full structure key, which the caller must not modify, and its delta_depth, or
+        (None, None) if there's no such structure
+        """
+        # find the deltas down to a cached or full structure
+        documents = []
+        cached = None
+        while cached is None:
+            cached = self._get_cached_structure(key)
+            if cached is not None:
+                break
+            document = self.structures.find_one({'_id': key})
+            if document is None:
+                return None, None
+            if 'delta_base' not in document:
+                cached = (document, 0)
+                self._cache_structure(document, 0)
+                break
+            documents.append(document)
+            key = document['delta_base']
+
+        structure, depth = cached
+        for document in reversed(documents):
+            structure = self._apply_delta(structure, document)
+            depth = document['delta_depth']
+            self._cache_structure(structure, depth)
+        return structure, depth
+
+    def _rebuild_structure(self, document):
+        """
+        Return a copy of the full structure stored as document, which may be a delta
+        """
+        if 'delta_base' not in document:
+            return document
+        structure = self._load_structure(document['delta_base'])[0]
+        if structure is None:
+            raise ValueError("The base {} of structure {} is missing".format(
+                document['delta_base'], document['_id']
+            ))
+        return copy.deepcopy(self._apply_delta(structure, document))
+
+    @staticmethod
+    def _apply_delta(base, document):
+        """
+        Return the structure stored as document, a delta from the full structure base. Shares the
+        unchanged blocks with base.
+        """
+        structure = dict(
+            (field, value) for field, value in document.iteritems() if field not in DELTA_FIELDS
+        )
+        blocks = dict(base['blocks'])
+        for block_id in document['deleted_blocks']:
+            blocks.pop(block_id, None)
+        blocks.update(document['delta_blocks'])
+        structure['blocks'] = blocks
+        return structure
+
+    def _encode_structure(self, structure):
+        """
+        Return the document storing structure, a delta from its previous_version unless a full
+        document is due, and its delta_depth
+        """
+        base, depth = None, None
+        if structure.get('previous_version') is not None:
+            base, depth = self._load_structure(structure['previous_version'])
+        if base is None or depth + 1 >= self.snapshot_interval:
+            return structure, 0
+
+        blocks = structure['blocks']
+        base_blocks = base['blocks']
+        delta_blocks = dict(
+            (block_id, block) for block_id, block in blocks.iteritems() if base_blocks.get(block_id) != block
+        )
+        deleted_blocks = [block_id for block_id in base_blocks if block_id not in blocks]
+        if 2 * (len(delta_blocks) + len(deleted_blocks)) > len(blocks):
+            return structure, 0
+
+        document = dict((field, value) for field, value in structure.iteritems() if field != 'blocks')
+        document.update({
+            'delta_base': structure['previous_version'],
+            'delta_depth': depth + 1,
+            'delta_blocks': delta_blocks,
+            'deleted_blocks': deleted_blocks,
+        })
+        return document, depth + 1
+
+    @staticmethod
+    def _delta_query(query):
+        """
+        Return query extended so that its conditions on blocks also match the changed blocks of the
+        structures stored as deltas
+        """
+        block_fields = [field for field in query if field.startswith('blocks.')]
+        if not block_fields:
+            return query
+        query = dict(query)
+        query['$and'] = query.get('$and', []) + [
+            {'$or': [{field: query[field]}, {'delta_' + field: query[field]}]} for field in block_fields
+        ]
+        for field in block_fields:
+            del query[field]
+        return query
+
+    def _get_cached_structure(self, key):
+        """
+        Return the cached (structure, delta_depth) of the structure key, or None
+        """
+        with self._structure_cache_lock:
+            cached = self._structure_cache.pop(key, None)
+            if cached is not None:
+                self._structure_cache[key] = cached
+            return cached
+
+    def _cache_structure(self, structure, depth):
+        """
+        Cache the full structure, evicting the least recently used ones beyond structure_cache_size
+        """
+        with self._structure_cache_lock:
+            self._structure_cache.pop(structure['_id'], None)
+            self._structure_cache[structure['_id']] = (structure, depth)
+            while len(self._structure_cache) > self.structure_cache_size:
+                self._structure_cache.popitem(last=False)
+
+    def _uncache_structures(self, keys):
+        """
+        Remove the structures whose ids are in keys from the cache
+        """
+        with self._structure_cache_lock:
+            for key in keys:
+                self._structure_cache.pop(key, None)
 
     def get_course_index(self, key):
         """
@@ -82,11 +301,19 @@ class MongoConnection(object):
         """
         self.course_index.insert(course_index)
 
-    def update_course_index(self, course_index):
+    def update_course_index(self, course_index, from_index=None):
         """
         Update the db record for course_index
+
+        If from_index is given, the record is only updated if the heads of its branches are still those of
+        from_index (and it has no branch from_index lacks); returns whether it was updated.
         """
-        self.course_index.update({'_id': course_index['_id']}, course_index)
+        query = {'_id': course_index['_id']}
+        if from_index is not None:
+            for branch in set(from_index['versions']) | set(course_index['versions']):
+                query['versions.{}'.format(branch)] = from_index['versions'].get(branch, {'$exists': False})
+        result = self.course_index.update(query, course_index)
+        return result is None or result['n'] > 0
 
     def delete_course_index(self, key):
         """
@@ -100,12 +327,13 @@ class MongoConnection(object):
         """
         return self.definitions.find_one({'_id': key})
 
-    def find_matching_definitions(self, query):
+    def find_matching_definitions(self, query, fields=None):
         """
         Find the definitions matching the query. Right now the query must be a legal mongo query
         :param query: a mongo-style query of {key: [value|{$in ..}|..], ..}
+        :param fields: if provided, the list of the fields to return
         """
-        return self.definitions.find(query)
+        return self.definitions.find(query, fields=fields)
 
     def insert_definition(self, definition):
         """
@@ -113,4 +341,22 @@ class MongoConnection(object):
         """
         self.definitions.insert(definition)
 
+    def insert_definitions(self, definitions):
+        """
+        Create the definitions in the db with a single write
+        """
+        self.definitions.insert(definitions)
 
+    def delete_definitions(self, keys):
+        """
+        Delete the definitions whose ids are in keys
+        """
+        self.definitions.remove({'_id': {'$in': list(keys)}})
+
+    def get_definitions_size(self, keys):
+        """
+        Return the number of bytes the definitions whose ids are in keys take in the db
+        """
+        return sum(
+            len(BSON.encode(document)) for document in self.definitions.find({'_id': {'$in': list(keys)}})
+        )
@@ -53,6 +53,7 @@ from importlib import import_module
 from path import path
 import collections
 import copy
+from contextlib import contextmanager
 from pytz import UTC
 
 from xmodule.errortracker import null_error_tracker
@@ -70,10 +71,15 @@ from xblock.fields import Scope
 from xblock.runtime import Mixologist
 from bson.objectid import ObjectId
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from xmodule.modulestore.split_mongo import compaction
 from xblock.core import XBlock
 from xmodule.modulestore.loc_mapper_store import LocMapperStore
 
 log = logging.getLogger(__name__)
+
+# Number of definitions written at once by create_course_from_blocks
+DEFINITION_BATCH_SIZE = 500
+
 #==============================================================================
 # Documentation is at
 # https://edx-wiki.atlassian.net/wiki/display/ENG/Mongostore+Data+Structure
@@ -230,10 +236,123 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         :param course_version_guid: if provided, clear only this entry
         """
         if course_version_guid:
-            del self.thread_cache.course_cache[course_version_guid]
+            if hasattr(self.thread_cache, 'course_cache'):
+                self.thread_cache.course_cache.pop(course_version_guid, None)
         else:
             self.thread_cache.course_cache = {}
 
+    @contextmanager
+    def bulk_write_operations(self, package_id):
+        """
+        A context manager within which the edits of the course package_id by this thread are buffered in
+        memory. The edits continue revising a single new version of each branch they change, rather than
+        each creating a new version, and are written when the outermost context exits: one structure per
+        changed branch and one update of the course index. If the context exits with an exception, none of
+        the edits made within it are written.
+
+        Raises VersionConflictError on exit if another writer changed the head of a branch of the course
+        since the context was entered; the course index is then left as that writer made it.
+        """
+        records = self._bulk_write_records()
+        record = records.get(package_id)
+        if record is not None:
+            # nested: the outermost context writes the changes
+            yield
+            return
+
+        index = self.db_connection.get_course_index(package_id)
+        if index is None:
+            raise ItemNotFoundError(package_id)
+        record = records[package_id] = {
+            'initial_index': copy.deepcopy(index),
+            'index': index,
+            # the new versions of the structures, which haven't been written yet
+            'structures': {},
+        }
+        try:
+            yield
+        except Exception:
+            for structure_id in record['structures']:
+                self._clear_cache(structure_id)
+            raise
+        else:
+            for structure in record['structures'].itervalues():
+                self.db_connection.insert_structure(structure)
+            if record['index'] != record['initial_index'] and not self.db_connection.update_course_index(
+                record['index'], from_index=record['initial_index']
+            ):
+                for structure_id in record['structures']:
+                    self._clear_cache(structure_id)
+                self._raise_index_conflict(package_id, record['initial_index'])
+        finally:
+            del records[package_id]
+
+    def _raise_index_conflict(self, package_id, initial_index):
+        """
+        Raise VersionConflictError for a branch of the course package_id whose head is no longer the one it
+        had in initial_index.
+        """
+        current_index = self.db_connection.get_course_index(package_id)
+        if current_index is None:
+            raise ItemNotFoundError(package_id)
+        for branch in sorted(set(initial_index['versions']) | set(current_index['versions'])):
+            if current_index['versions'].get(branch) != initial_index['versions'].get(branch):
+                raise VersionConflictError(
+                    CourseLocator(package_id=package_id, branch=branch), current_index['versions'].get(branch)
+                )
+        # the heads were changed and changed back
+        raise VersionConflictError(CourseLocator(package_id=package_id), None)
+
+    def _bulk_write_records(self):
+        """
+        Return the dict of package_id -> record of buffered changes of the bulk_write_operations active in
+        this thread.
+        """
+        if not hasattr(self.thread_cache, 'bulk_write_records'):
+            self.thread_cache.bulk_write_records = {}
+        return self.thread_cache.bulk_write_records
+
+    def _get_course_index(self, package_id):
+        """
+        Get the index entry of the course package_id, including the changes of any bulk write in progress
+        """
+        record = self._bulk_write_records().get(package_id)
+        if record is not None:
+            return record['index']
+        return self.db_connection.get_course_index(package_id)
+
+    def _get_structure(self, version_guid):
+        """
+        Get the structure version_guid, whether it's written or buffered by a bulk write
+        """
+        for record in self._bulk_write_records().itervalues():
+            if version_guid in record['structures']:
+                return record['structures'][version_guid]
+        return self.db_connection.get_structure(version_guid)
+
+    def _is_buffered(self, structure):
+        """
+        Return whether structure is a new version buffered by a bulk write
+        """
+        return any(
+            structure['_id'] in record['structures'] for record in self._bulk_write_records().itervalues()
+        )
+
+    def _insert_structure(self, structure, index_entry):
+        """
+        Save the new version structure of the course whose index entry is index_entry (None if the
+        structure isn't in a course's history). Bulk writes to the course buffer it instead.
+        """
+        record = None
+        if index_entry is not None:
+            record = self._bulk_write_records().get(index_entry['_id'])
+        if record is not None:
+            record['structures'][structure['_id']] = structure
+            # the structure may have changed since its items were cached
+            self._clear_cache(structure['_id'])
+        else:
+            self.db_connection.insert_structure(structure)
+
     def _lookup_course(self, course_locator):
         '''
         Decode the locator into the right series of db access. Does not
@@ -254,7 +373,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
 
         if course_locator.package_id is not None and course_locator.branch is not None:
             # use the package_id
-            index = self.db_connection.get_course_index(course_locator.package_id)
+            index = self._get_course_index(course_locator.package_id)
             if index is None:
                 raise ItemNotFoundError(course_locator)
             if course_locator.branch not in index['versions']:
@@ -269,7 +388,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
 
         # cast string to ObjectId if necessary
         version_guid = course_locator.as_object_id(version_guid)
-        entry = self.db_connection.get_structure(version_guid)
+        entry = self._get_structure(version_guid)
 
         # b/c more than one course can use same structure, the 'package_id' and 'branch' are not intrinsic to structure
         # and the one assoc'd w/ it by another fetch may not be the one relevant to this fetch; so,
@@ -484,7 +603,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         """
         if course_locator.package_id is None:
             return None
-        index = self.db_connection.get_course_index(course_locator.package_id)
+        index = self._get_course_index(course_locator.package_id)
         return index
 
     # TODO figure out a way to make this info accessible from the course descriptor
@@ -805,18 +924,18 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
             encoded_block_id = LocMapperStore.encode_key_for_mongo(course_or_parent_locator.block_id)
             parent = new_structure['blocks'][encoded_block_id]
             parent['fields'].setdefault('children', []).append(new_block_id)
-            if not continue_version or parent['edit_info']['update_version'] != structure['_id']:
+            if parent['edit_info']['update_version'] != new_id:
                 parent['edit_info']['edited_on'] = datetime.datetime.now(UTC)
                 parent['edit_info']['edited_by'] = user_id
                 parent['edit_info']['previous_version'] = parent['edit_info']['update_version']
                 parent['edit_info']['update_version'] = new_id
-        if continue_version:
+        if continue_version and not self._is_buffered(new_structure):
             # db update
             self.db_connection.update_structure(new_structure)
             # clear cache so things get refetched and inheritance recomputed
             self._clear_cache(new_id)
         else:
-            self.db_connection.insert_structure(new_structure)
+            self._insert_structure(new_structure, index_entry)
 
         # update the index entry if appropriate
         if index_entry is not None:
@@ -946,6 +1065,92 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         self.db_connection.insert_course_index(index_entry)
         return self.get_course(CourseLocator(package_id=new_id, branch=master_branch))
 
+    def create_course_from_blocks(self, org, prettyid, user_id, package_id, root_block_id, branches):
+        """
+        Create the course package_id from the complete contents of its branches, writing its definitions in
+        batches, a single structure per branch and, last, its index entry. Unlike building the course with
+        create_item, this creates no intermediate versions. As nothing refers to the new structures before the
+        index entry is written, an interrupted call leaves no course behind and can simply be repeated.
+        Returns the course root of the first branch.
+
+        raises DuplicateItemError if the course already exists.
+
+        :param root_block_id: the block_id of the course root in each branch
+        :param branches: a list of (branch, blocks) where blocks is a dict of block_id -> (category, fields)
+        and fields has the json value of every explicitly set field. Children which aren't blocks of the
+        branch are dropped. Each branch after the first is recorded as a successor version of the previous
+        one: its blocks which didn't change share the previous branch's block entries and definitions.
+        """
+        if self.db_connection.get_course_index(package_id) is not None:
+            raise DuplicateItemError(package_id, self, 'course_index')
+
+        new_definitions = []
+        definition_fields = {}  # definition id -> fields, for the definitions of previous branches
+        structures = []
+        previous_structure = None
+        for branch, blocks in branches:
+            structure = self._new_structure(user_id, root_block_id)
+            new_id = structure['_id']
+            if previous_structure is not None:
+                structure['previous_version'] = previous_structure['_id']
+                structure['original_version'] = previous_structure['original_version']
+            for block_id, (category, fields) in blocks.iteritems():
+                partitioned_fields = self._partition_fields_by_scope(category, fields)
+                block_fields = partitioned_fields.get(Scope.settings, {})
+                if Scope.children in partitioned_fields:
+                    block_fields.update(partitioned_fields[Scope.children])
+                if 'children' in block_fields:
+                    block_fields['children'] = [child for child in block_fields['children'] if child in blocks]
+                new_def_data = self._filter_special_fields(partitioned_fields.get(Scope.content, {}))
+
+                encoded_block_id = LocMapperStore.encode_key_for_mongo(block_id)
+                previous_block = None
+                if previous_structure is not None:
+                    previous_block = previous_structure['blocks'].get(encoded_block_id)
+                if previous_block is not None and definition_fields[previous_block['definition']] == new_def_data:
+                    if previous_block['category'] == category and previous_block['fields'] == block_fields:
+                        structure['blocks'][encoded_block_id] = copy.deepcopy(previous_block)
+                        continue
+                    definition_id = previous_block['definition']
+                else:
+                    definition_id = ObjectId()
+                    new_definitions.append({
+                        '_id': definition_id,
+                        'category': category,
+                        'fields': new_def_data,
+                        'edit_info': {
+                            'edited_by': user_id,
+                            'edited_on': datetime.datetime.now(UTC),
+                            'previous_version': previous_block['definition'] if previous_block else None,
+                            'original_version': definition_id,
+                        }
+                    })
+                    definition_fields[definition_id] = new_def_data
+                    if len(new_definitions) >= DEFINITION_BATCH_SIZE:
+                        self.db_connection.insert_definitions(new_definitions)
+                        new_definitions = []
+
+                block = self._new_block(user_id, category, block_fields, definition_id, new_id)
+                if previous_block is not None:
+                    block['edit_info']['previous_version'] = previous_block['edit_info']['update_version']
+                structure['blocks'][encoded_block_id] = block
+            structures.append((branch, structure))
+            previous_structure = structure
+
+        if new_definitions:
+            self.db_connection.insert_definitions(new_definitions)
+        for _branch, structure in structures:
+            self.db_connection.insert_structure(structure)
+        self.db_connection.insert_course_index({
+            '_id': package_id,
+            'org': org,
+            'prettyid': prettyid,
+            'edited_by': user_id,
+            'edited_on': datetime.datetime.now(UTC),
+            'versions': {branch: structure['_id'] for branch, structure in structures},
+        })
+        return self.get_course(CourseLocator(package_id=package_id, branch=branches[0][0]))
+
     def update_item(self, descriptor, user_id, allow_not_found=False, force=False):
         """
         Save the descriptor's fields. it doesn't descend the course dag to save the children.
@@ -989,13 +1194,8 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
                 block_data['fields']["children"] = descriptor.children
 
             new_id = new_structure['_id']
-            block_data['edit_info'] = {
-                'edited_on': datetime.datetime.now(UTC),
-                'edited_by': user_id,
-                'previous_version': block_data['edit_info']['update_version'],
-                'update_version': new_id,
-            }
-            self.db_connection.insert_structure(new_structure)
+            self._update_edit_info(block_data['edit_info'], user_id, new_id)
+            self._insert_structure(new_structure, index_entry)
             # update the index entry if appropriate
             if index_entry is not None:
                 self._update_head(index_entry, descriptor.location.branch, new_id)
@@ -1033,7 +1233,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         is_updated = self._persist_subdag(xblock, user_id, new_structure['blocks'], new_id)
 
         if is_updated:
-            self.db_connection.insert_structure(new_structure)
+            self._insert_structure(new_structure, index_entry)
 
             # update the index entry if appropriate
             if index_entry is not None:
@@ -1093,7 +1293,15 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
             block_fields['children'] = children
 
         if is_updated:
-            previous_version = None if is_new else structure_blocks[encoded_block_id]['edit_info'].get('update_version')
+            if is_new:
+                previous_version = None
+            else:
+                edit_info = structure_blocks[encoded_block_id]['edit_info']
+                # blocks already changed by this version (in a bulk write) keep their previous version
+                if edit_info.get('update_version') == new_id:
+                    previous_version = edit_info.get('previous_version')
+                else:
+                    previous_version = edit_info.get('update_version')
             structure_blocks[encoded_block_id] = {
                 "category": xblock.category,
                 "definition": xblock.definition_locator.definition_id,
@@ -1159,7 +1367,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         """
         # get the destination's index, and source and destination structures.
         source_structure = self._lookup_course(source_course)['structure']
-        index_entry = self.db_connection.get_course_index(destination_course.package_id)
+        index_entry = self._get_course_index(destination_course.package_id)
         if index_entry is None:
             # brand new course
             raise ItemNotFoundError(destination_course)
@@ -1200,7 +1408,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
             self._delete_if_true_orphan(orphan, destination_structure)
 
         # update the db
-        self.db_connection.insert_structure(destination_structure)
+        self._insert_structure(destination_structure, index_entry)
         self._update_head(index_entry, destination_course.branch, destination_structure['_id'])
 
     def update_course_index(self, updated_index_entry):
@@ -1211,7 +1419,11 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
 
         Does not return anything useful.
         """
-        self.db_connection.update_course_index(updated_index_entry)
+        record = self._bulk_write_records().get(updated_index_entry['_id'])
+        if record is not None:
+            record['index'] = updated_index_entry
+        else:
+            self.db_connection.update_course_index(updated_index_entry)
 
     # TODO impl delete_all_versions
     def delete_item(self, usage_locator, user_id, delete_all_versions=False, delete_children=False, force=False):
@@ -1242,10 +1454,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
             encoded_block_id = LocMapperStore.encode_key_for_mongo(parent.block_id)
             parent_block = new_blocks[encoded_block_id]
             parent_block['fields']['children'].remove(usage_locator.block_id)
-            parent_block['edit_info']['edited_on'] = datetime.datetime.now(UTC)
-            parent_block['edit_info']['edited_by'] = user_id
-            parent_block['edit_info']['previous_version'] = parent_block['edit_info']['update_version']
-            parent_block['edit_info']['update_version'] = new_id
+            self._update_edit_info(parent_block['edit_info'], user_id, new_id)
 
         def remove_subtree(block_id):
             """
@@ -1261,7 +1470,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
             del new_blocks[LocMapperStore.encode_key_for_mongo(usage_locator.block_id)]
 
         # update index if appropriate and structures
-        self.db_connection.insert_structure(new_structure)
+        self._insert_structure(new_structure, index_entry)
 
         result = CourseLocator(version_guid=new_id)
 
@@ -1290,6 +1499,19 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         log.info("deleting course from split-mongo: %s", package_id)
         self.db_connection.delete_course_index(index['_id'])
 
+    def compact_history(self, keep_versions=compaction.DEFAULT_KEEP_VERSIONS,
+                        min_age=compaction.DEFAULT_MIN_AGE, dry_run=False):
+        """
+        Delete the versions of the courses' structures older than the retention policy and the definitions
+        no longer used. See xmodule.modulestore.split_mongo.compaction.
+
+        Returns the number of documents deleted and of bytes reclaimed for 'structures' and 'definitions'.
+        """
+        report = compaction.compact_history(self.db_connection, keep_versions, min_age, dry_run)
+        if not dry_run:
+            self._clear_cache()
+        return report
+
     def get_errored_courses(self):
         """
         This function doesn't make sense for the mongo modulestore, as structures
@@ -1389,7 +1611,8 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
                     block_id for block_id in block['fields']["children"]
                     if LocMapperStore.encode_key_for_mongo(block_id) in original_structure['blocks']
                 ]
-        self.db_connection.update_structure(original_structure)
+        if not self._is_buffered(original_structure):
+            self.db_connection.update_structure(original_structure)
         # clear cache again b/c inheritance may be wrong over orphans
         self._clear_cache(original_structure['_id'])
 
@@ -1446,7 +1669,7 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
             else:
                 return None
         else:
-            index_entry = self.db_connection.get_course_index(locator.package_id)
+            index_entry = self._get_course_index(locator.package_id)
             is_head = (
                 locator.version_guid is None or
                 index_entry['versions'][locator.branch] == locator.version_guid
@@ -1462,9 +1685,15 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
     def _version_structure(self, structure, user_id):
         """
         Copy the structure and update the history info (edited_by, edited_on, previous_version)
+
+        Within a bulk write, the new version made by the first edit is changed in place by the later ones.
         :param structure:
         :param user_id:
         """
+        if self._is_buffered(structure):
+            structure['edited_by'] = user_id
+            structure['edited_on'] = datetime.datetime.now(UTC)
+            return structure
         new_structure = copy.deepcopy(structure)
         new_structure['_id'] = ObjectId()
         new_structure['previous_version'] = structure['_id']
@@ -1492,7 +1721,11 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
         :param new_id:
         """
         index_entry['versions'][branch] = new_id
-        self.db_connection.update_course_index(index_entry)
+        record = self._bulk_write_records().get(index_entry['_id'])
+        if record is not None:
+            record['index'] = index_entry
+        else:
+            self.db_connection.update_course_index(index_entry)
 
     def _partition_fields_by_scope(self, category, fields):
         """
@@ -1637,6 +1870,17 @@ class SplitMongoModuleStore(ModuleStoreWriteBase):
                 self._delete_if_true_orphan(child, structure)
             del structure['blocks'][encoded_block_id]
 
+    def _update_edit_info(self, edit_info, user_id, new_id):
+        """
+        Record in a block's edit_info that user_id changed it in the structure version new_id. A block which
+        was already changed in that version (by an earlier edit in a bulk write) keeps its previous version.
+        """
+        if edit_info.get('update_version') != new_id:
+            edit_info['previous_version'] = edit_info.get('update_version')
+            edit_info['update_version'] = new_id
+        edit_info['edited_on'] = datetime.datetime.now(UTC)
+        edit_info['edited_by'] = user_id
+
     def _new_block(self, user_id, category, block_fields, definition_id, new_id):
         return {
             'category': category,
@@ -146,12 +146,39 @@ def _clone_modules(modulestore, modules, source_location, dest_location):
         modulestore.update_item(module, '**replace_user**')
 
 
-def clone_course(modulestore, contentstore, source_location, dest_location, delete_original=False):
+def clone_course(modulestore, contentstore, source_location, dest_location, delete_original=False,
+                 progress_callback=None):
+    """
+    Copy the modules and assets of the course at `source_location` to the
+    empty course at `dest_location`.
+
+    Stores which can copy their documents directly (MongoModuleStore and
+    MongoContentStore) do so, in batches; such a clone can be run again to
+    complete it if it was interrupted. `progress_callback`, if given, is then
+    called with the kind of documents being copied ('modules' or 'assets'),
+    the number copied so far and the total number to copy.
+    """
     # check to see if the dest_location exists as an empty course
     # we need an empty course because the app layers manage the permissions and users
     if not modulestore.has_item(dest_location.course_id, dest_location):
         raise Exception("An empty course at {0} must have already been created. Aborting...".format(dest_location))
 
+    if hasattr(modulestore, 'clone_course_documents') and hasattr(contentstore, 'clone_course_assets'):
+        # check to see if the source course is actually there
+        if not modulestore.has_item(source_location.course_id, source_location):
+            raise Exception("Cannot find a course at {0}. Aborting".format(source_location))
+
+        def report(kind):
+            """Return the progress callback for copying documents of `kind`"""
+            if progress_callback is None:
+                return None
+            return lambda copied, total: progress_callback(kind, copied, total)
+
+        # the module store checks that the destination is empty
+        modulestore.clone_course_documents(source_location, dest_location, report('modules'))
+        contentstore.clone_course_assets(source_location, dest_location, report('assets'))
+        return True
+
     # verify that the dest_location really is an empty course, which means only one with an optional 'overview'
     dest_modules = modulestore.get_items([dest_location.tag, dest_location.org, dest_location.course, None, None, None])
 
@@ -1,7 +1,8 @@
 from nose.tools import assert_equals, assert_raises  # pylint: disable=E0611
 
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from xmodule.modulestore.search import path_to_location
+from xmodule.course_module import CourseDescriptor
+from xmodule.modulestore.search import path_to_location, build_location_index, path_from_location_index
 
 def check_path_to_location(modulestore):
     """
@@ -19,8 +20,16 @@ def check_path_to_location(modulestore):
     for location, expected in should_work:
         assert_equals(path_to_location(modulestore, course_id, location), expected)
 
+    # The location index gives the same paths
+    course = modulestore.get_instance(course_id, CourseDescriptor.id_to_location(course_id), depth=None)
+    index = build_location_index(course)
+    for location, expected in should_work:
+        assert_equals(path_from_location_index(index, location), expected)
+    assert_equals(index['names']['Welcome'], ["i4x://edX/toy/video/Welcome"])
+
     not_found = (
         "i4x://edX/toy/video/WelcomeX", "i4x://edX/toy/course/NotHome"
     )
     for location in not_found:
         assert_raises(ItemNotFoundError, path_to_location, modulestore, course_id, location)
+        assert_equals(path_from_location_index(index, location), None)
@@ -0,0 +1,126 @@
+"""
+Tests for the compaction of the split modulestore's version history
+"""
+import datetime
+import unittest
+import uuid
+
+import mock
+
+from xmodule.modulestore.inheritance import InheritanceMixin
+from xmodule.modulestore.locator import CourseLocator, BlockUsageLocator
+from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.x_module import XModuleMixin
+
+
+class TestHistoryCompaction(unittest.TestCase):
+    """
+    Test compact_history on a course with a few versions
+    """
+    # Snippet of what would be in the django settings envs file
+    db_config = {
+        'host': 'localhost',
+        'db': 'test_xmodule',
+        'collection': 'modulestore{0}'.format(uuid.uuid4().hex[:5]),
+    }
+
+    modulestore_options = {
+        'default_class': 'xmodule.raw_module.RawDescriptor',
+        'fs_root': '',
+        'render_template': mock.Mock(return_value=""),
+        'xblock_mixins': (InheritanceMixin, XModuleMixin)
+    }
+
+    def setUp(self):
+        super(TestHistoryCompaction, self).setUp()
+        # pylint: disable=W0142
+        self.store = SplitMongoModuleStore(doc_store_config=self.db_config, **self.modulestore_options)
+        self.user = 'test_compaction'
+        course = self.store.create_course('test_org', 'test_compaction', self.user)
+        self.original_version = course.location.version_guid
+        self.course_locator = CourseLocator(package_id=course.location.package_id, branch=course.location.branch)
+
+        self.store.create_item(self.course_locator, 'chapter', self.user, fields={'display_name': 'chapter'})
+        problem = self.store.create_item(
+            self.course_locator, 'problem', self.user, fields={'data': '<problem>0</problem>'}
+        )
+        self.problem_locator = BlockUsageLocator(
+            package_id=course.location.package_id, branch=course.location.branch, block_id=problem.location.block_id
+        )
+        # each change of the problem's data makes a new definition as well as a new version
+        self.versions = []
+        for index in range(1, 4):
+            problem.data = '<problem>{}</problem>'.format(index)
+            problem = self.store.update_item(problem, self.user)
+            self.versions.append(problem.location.version_guid)
+
+    def tearDown(self):
+        split_db = self.store.db
+        split_db.drop_collection(self.store.db_connection.course_index)
+        split_db.drop_collection(self.store.db_connection.structures)
+        split_db.drop_collection(self.store.db_connection.definitions)
+        split_db.connection.close()
+        super(TestHistoryCompaction, self).tearDown()
+
+    def test_dry_run(self):
+        structure_count = self.store.db_connection.structures.count()
+        report = self.store.compact_history(keep_versions=1, min_age=datetime.timedelta(0), dry_run=True)
+        self.assertEqual(report['structures'][0], 3)
+        self.assertEqual(report['definitions'][0], 2)
+        self.assertEqual(self.store.db_connection.structures.count(), structure_count)
+        self.assertEqual(report, self.store.compact_history(keep_versions=1, min_age=datetime.timedelta(0)))
+
+    def test_compact_history(self):
+        # the versions: create_course, create chapter, create problem and 3 updates of the problem
+        self.assertEqual(self.store.db_connection.structures.count(), 6)
+        report = self.store.compact_history(keep_versions=1, min_age=datetime.timedelta(0))
+
+        # kept are the head, the version before it and the original version
+        self.assertEqual(report['structures'][0], 3)
+        self.assertGreater(report['structures'][1], 0)
+        self.assertEqual(self.store.db_connection.structures.count(), 3)
+        history = self.store.get_course_history_info(self.course_locator)
+        self.assertEqual(history['previous_version'], self.versions[1])
+        self.assertEqual(history['original_version'], self.original_version)
+        self.assertEqual(
+            self.store.db_connection.get_structure(self.versions[1])['previous_version'], self.original_version
+        )
+
+        # the problem's first two definitions are no longer used
+        self.assertEqual(report['definitions'][0], 2)
+        self.assertGreater(report['definitions'][1], 0)
+        problem = self.store.get_item(self.problem_locator)
+        self.assertEqual(problem.data, '<problem>3</problem>')
+        self.assertEqual(len(self.store.get_course(self.course_locator).children), 2)
+
+        # the problem's history starts with the first kept version having it
+        generations = self.store.get_block_generations(self.problem_locator)
+        self.assertEqual(generations.locator.version_guid, self.versions[1])
+        self.assertEqual([child.locator.version_guid for child in generations.children], [self.versions[2]])
+
+        # a compacted history has nothing more to delete
+        report = self.store.compact_history(keep_versions=1, min_age=datetime.timedelta(0))
+        self.assertEqual(report, {'structures': (0, 0), 'definitions': (0, 0)})
+
+    def test_min_age(self):
+        report = self.store.compact_history(keep_versions=1)
+        self.assertEqual(report, {'structures': (0, 0), 'definitions': (0, 0)})
+        self.assertEqual(self.store.db_connection.structures.count(), 6)
+
+    def test_deleted_course_sharing_history(self):
+        # a course created from a version of the indexed one, edited, then removed from the index
+        fork = self.store.create_course(
+            'test_org', 'test_compaction_fork', self.user, versions_dict={'draft': self.versions[0]}
+        )
+        fork_locator = CourseLocator(package_id=fork.location.package_id, branch=fork.location.branch)
+        fork_head = self.store.create_item(
+            fork_locator, 'chapter', self.user, fields={'display_name': 'fork'}
+        ).location.version_guid
+        self.store.delete_course(fork.location.package_id)
+        structure_count = self.store.db_connection.structures.count()
+
+        # the fork's history, which includes all the versions before the indexed course's kept ones, is kept
+        report = self.store.compact_history(keep_versions=1, min_age=datetime.timedelta(0))
+        self.assertEqual(report['structures'], (0, 0))
+        self.assertEqual(self.store.db_connection.structures.count(), structure_count)
+        self.assertEqual(self.store.db_connection.get_structure(fork_head)['previous_version'], self.versions[0])
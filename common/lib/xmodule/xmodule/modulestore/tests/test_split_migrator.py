@@ -276,3 +276,11 @@ class TestMigration(unittest.TestCase):
         # now compare the migrated to the original course
         self.compare_courses(self.old_mongo, True)
         self.compare_courses(self.draft_mongo, False)
+
+    def test_bulk_migrator(self):
+        user = mock.Mock(id=1)
+        self.migrator.migrate_mongo_course(self.course_location, user, bulk=True)
+        self.compare_courses(self.old_mongo, True)
+        self.compare_courses(self.draft_mongo, False)
+        # a single version of each branch was written
+        self.assertEqual(self.split_mongo.db_connection.structures.count(), 2)
@@ -5,6 +5,7 @@ Created on Mar 25, 2013
 '''
 import datetime
 import subprocess
+import threading
 import unittest
 import uuid
 from importlib import import_module
@@ -733,6 +734,87 @@ class TestItemCrud(SplitModuleTest):
         self.assertEqual(refetch_course.previous_version, course_block_update_version)
         self.assertEqual(refetch_course.update_version, transaction_guid)
 
+    def test_bulk_write_operations(self):
+        """
+        Test that the edits within bulk_write_operations make a single new version of the course
+        """
+        user = random.getrandbits(32)
+        new_course = modulestore().create_course('test_org', 'test_bulk', user)
+        package_id = new_course.location.package_id
+        versionless_course_locator = CourseLocator(package_id=package_id, branch=new_course.location.branch)
+        course_root_locator = BlockUsageLocator(
+            package_id=package_id, branch=new_course.location.branch, block_id=new_course.location.block_id
+        )
+        structures = modulestore().db_connection.structures
+        structure_count = structures.count()
+
+        with modulestore().bulk_write_operations(package_id):
+            chapter = modulestore().create_item(
+                versionless_course_locator, 'chapter', user, fields={'display_name': 'chapter 1'}
+            )
+            modulestore().create_item(
+                course_root_locator, 'chapter', user, fields={'display_name': 'chapter 2'}
+            )
+            chapter.display_name = 'chapter 1 renamed'
+            modulestore().update_item(chapter, user)
+            # nothing's written until the bulk write ends, but the edits are visible
+            self.assertEqual(structures.count(), structure_count)
+            self.assertEqual(
+                modulestore().db_connection.get_course_index(package_id)['versions'][new_course.location.branch],
+                new_course.location.version_guid
+            )
+            self.assertEqual(len(modulestore().get_course(versionless_course_locator).children), 2)
+
+        self.assertEqual(structures.count(), structure_count + 1)
+        refetch_course = modulestore().get_course(versionless_course_locator)
+        self.assertEqual(refetch_course.previous_version, new_course.location.version_guid)
+        self.assertEqual(len(refetch_course.children), 2)
+        refetch_chapter = modulestore().get_item(
+            BlockUsageLocator(
+                package_id=package_id, branch=new_course.location.branch, block_id=chapter.location.block_id
+            )
+        )
+        self.assertEqual(refetch_chapter.display_name, 'chapter 1 renamed')
+        self.assertIsNone(refetch_chapter.previous_version)
+
+        # an exception discards the edits
+        with self.assertRaises(ValueError):
+            with modulestore().bulk_write_operations(package_id):
+                modulestore().create_item(
+                    versionless_course_locator, 'chapter', user, fields={'display_name': 'chapter 3'}
+                )
+                raise ValueError()
+        self.assertEqual(structures.count(), structure_count + 1)
+        self.assertEqual(len(modulestore().get_course(versionless_course_locator).children), 2)
+
+    def test_bulk_write_conflict(self):
+        """
+        Test that a bulk write doesn't overwrite the head written by another writer meanwhile
+        """
+        user = random.getrandbits(32)
+        new_course = modulestore().create_course('test_org', 'test_bulk_conflict', user)
+        package_id = new_course.location.package_id
+        branch = new_course.location.branch
+        versionless_course_locator = CourseLocator(package_id=package_id, branch=branch)
+
+        def concurrent_edit():
+            """Add a chapter outside of the bulk write, as another request would"""
+            modulestore().create_item(versionless_course_locator, 'chapter', user, fields={'display_name': 'other'})
+
+        with self.assertRaises(VersionConflictError):
+            with modulestore().bulk_write_operations(package_id):
+                modulestore().create_item(
+                    versionless_course_locator, 'chapter', user, fields={'display_name': 'bulk'}
+                )
+                # bulk writes are per thread
+                thread = threading.Thread(target=concurrent_edit)
+                thread.start()
+                thread.join()
+
+        # the other writer's version is still the head
+        children = modulestore().get_course(versionless_course_locator).get_children()
+        self.assertEqual([child.display_name for child in children], ['other'])
+
     def test_update_metadata(self):
         """
         test updating an items metadata ensuring the definition doesn't version but the course does if it should
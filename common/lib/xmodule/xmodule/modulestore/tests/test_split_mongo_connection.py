@@ -0,0 +1,132 @@
+"""
+Tests for the storage of split structures as deltas
+"""
+import copy
+import datetime
+import unittest
+import uuid
+
+from bson.objectid import ObjectId
+from pytz import UTC
+
+from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+
+
+class TestDeltaStructures(unittest.TestCase):
+    """
+    Test MongoConnection with delta_structures
+    """
+    # Snippet of what would be in the django settings envs file
+    db_config = {
+        'host': 'localhost',
+        'db': 'test_xmodule',
+        'collection': 'modulestore{0}'.format(uuid.uuid4().hex[:5]),
+        'delta_structures': True,
+        'snapshot_interval': 3,
+    }
+
+    def setUp(self):
+        super(TestDeltaStructures, self).setUp()
+        self.connection = MongoConnection(**self.db_config)  # pylint: disable=W0142
+        # a history of 5 versions, each changing one of 10 blocks
+        structure = {
+            '_id': ObjectId(),
+            'root': 'course',
+            'previous_version': None,
+            'edited_by': 'test_delta',
+            'blocks': dict(
+                ('block{}'.format(index), self.make_block(index)) for index in range(10)
+            ),
+        }
+        structure['original_version'] = structure['_id']
+        self.versions = [structure]
+        for index in range(4):
+            structure = self.make_successor(structure)
+            structure['blocks']['block{}'.format(index)]['fields']['display_name'] = 'changed'
+            self.versions.append(structure)
+        for structure in self.versions:
+            self.connection.insert_structure(structure)
+
+    def tearDown(self):
+        self.connection.database.drop_collection(self.connection.structures)
+        self.connection.database.connection.close()
+        super(TestDeltaStructures, self).tearDown()
+
+    @staticmethod
+    def make_block(index):
+        """
+        Return a block with some fields
+        """
+        return {
+            'category': 'html',
+            'definition': ObjectId(),
+            'fields': {'display_name': 'block {}'.format(index), 'children': []},
+            'edit_info': {'edited_by': 'test_delta', 'edited_on': datetime.datetime(2014, 1, 1, tzinfo=UTC)},
+        }
+
+    @staticmethod
+    def make_successor(structure):
+        """
+        Return a new version of structure
+        """
+        successor = copy.deepcopy(structure)
+        successor['_id'] = ObjectId()
+        successor['previous_version'] = structure['_id']
+        return successor
+
+    def stored(self, structure):
+        """
+        Return the document storing structure
+        """
+        return self.connection.structures.find_one({'_id': structure['_id']})
+
+    def test_storage(self):
+        # a full document every snapshot_interval versions, deltas in between
+        self.assertEqual(
+            [self.stored(structure).get('delta_depth', 0) for structure in self.versions], [0, 1, 2, 0, 1]
+        )
+        delta = self.stored(self.versions[1])
+        self.assertNotIn('blocks', delta)
+        self.assertEqual(delta['delta_blocks'].keys(), ['block0'])
+
+    def test_get_structure(self):
+        for connection in (self.connection, MongoConnection(**self.db_config)):  # pylint: disable=W0142
+            for structure in self.versions:
+                self.assertEqual(connection.get_structure(structure['_id']), structure)
+        # callers may change what they get
+        structure = self.connection.get_structure(self.versions[2]['_id'])
+        structure['blocks']['block5']['fields']['display_name'] = 'not saved'
+        self.assertEqual(self.connection.get_structure(self.versions[2]['_id']), self.versions[2])
+
+    def test_deleted_blocks(self):
+        structure = self.make_successor(self.versions[-1])
+        del structure['blocks']['block9']
+        self.connection.insert_structure(structure)
+        self.assertEqual(self.stored(structure)['deleted_blocks'], ['block9'])
+        self.assertEqual(MongoConnection(**self.db_config).get_structure(structure['_id']), structure)
+
+    def test_find_matching_structures(self):
+        structures = list(self.connection.find_matching_structures({'original_version': self.versions[0]['_id']}))
+        self.assertEqual(sorted(structures), sorted(self.versions))
+        # queries on blocks match the full documents and the deltas which changed the blocks
+        matching = self.connection.find_matching_structures({'blocks.block1.fields.display_name': 'changed'})
+        self.assertEqual(
+            set(structure['_id'] for structure in matching), set([self.versions[2]['_id'], self.versions[3]['_id']])
+        )
+
+    def test_update_structure(self):
+        structure = copy.deepcopy(self.versions[1])
+        structure['blocks']['block9']['fields']['display_name'] = 'updated'
+        self.connection.update_structure(structure)
+        connection = MongoConnection(**self.db_config)  # pylint: disable=W0142
+        self.assertEqual(connection.get_structure(structure['_id']), structure)
+        # its successor keeps its contents
+        self.assertEqual(connection.get_structure(self.versions[2]['_id']), self.versions[2])
+
+    def test_delete_structures(self):
+        self.connection.delete_structures([self.versions[0]['_id'], self.versions[1]['_id']])
+        self.assertNotIn('delta_base', self.stored(self.versions[2]))
+        connection = MongoConnection(**self.db_config)  # pylint: disable=W0142
+        self.assertIsNone(connection.get_structure(self.versions[1]['_id']))
+        for structure in self.versions[2:]:
+            self.assertEqual(connection.get_structure(structure['_id']), structure)
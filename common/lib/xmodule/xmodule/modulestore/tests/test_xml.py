@@ -3,6 +3,8 @@ Tests around our XML modulestore, including importing
 well-formed and not-well-formed XML.
 """
 import os.path
+import shutil
+import tempfile
 import unittest
 from glob import glob
 from mock import patch
@@ -78,3 +80,73 @@ class TestXMLModuleStore(unittest.TestCase):
         about_module = course_module[about_location]
         self.assertIn("GREEN", about_module.data)
         self.assertNotIn("RED", about_module.data)
+
+    def test_lazy_loading(self):
+        modulestore = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], lazy=True)
+        self.assertEqual(modulestore.courses, {})
+
+        location = CourseDescriptor.id_to_location('edX/toy/2012_Fall')
+        course = modulestore.get_instance('edX/toy/2012_Fall', location)
+        self.assertEqual(course.location, location)
+        self.assertEqual(modulestore.courses.keys(), ['toy'])
+
+        self.assertEqual(
+            sorted(course.location.course for course in modulestore.get_courses()),
+            ['simple', 'toy']
+        )
+        check_path_to_location(modulestore)
+
+    def test_lazy_get_course(self):
+        modulestore = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], lazy=True)
+        course = modulestore.get_course('edX/toy/2012_Fall')
+        self.assertEqual(course.location, CourseDescriptor.id_to_location('edX/toy/2012_Fall'))
+        # only the requested course is loaded
+        self.assertEqual(modulestore.courses.keys(), ['toy'])
+        self.assertIsNone(modulestore.get_course('edX/unknown/2012_Fall'))
+        self.assertEqual(modulestore.courses.keys(), ['toy'])
+
+    def test_lazy_loading_course_ids(self):
+        modulestore = XMLModuleStore(
+            DATA_DIR, course_dirs=['toy', 'simple'], course_ids=['edX/toy/2012_Fall'], lazy=True
+        )
+        self.assertEqual([course.id for course in modulestore.get_courses()], ['edX/toy/2012_Fall'])
+
+    def test_course_snapshot(self):
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir)
+        parsed = XMLModuleStore(DATA_DIR, course_dirs=['toy'], snapshot_dir=snapshot_dir)
+        self.assertTrue(os.path.exists(os.path.join(snapshot_dir, 'toy.snapshot')))
+
+        # the second load doesn't parse any xml
+        with patch('xmodule.modulestore.xml.create_block_from_xml', side_effect=Exception):
+            loaded = XMLModuleStore(DATA_DIR, course_dirs=['toy'], snapshot_dir=snapshot_dir)
+
+        self.assertEqual(
+            set(parsed.modules['edX/toy/2012_Fall'].keys()), set(loaded.modules['edX/toy/2012_Fall'].keys())
+        )
+        course = loaded.get_courses()[0]
+        self.assertEqual(course.display_name, parsed.get_courses()[0].display_name)
+        self.assertEqual(course.location, CourseDescriptor.id_to_location('edX/toy/2012_Fall'))
+        self.assertEqual(len(course.get_children()), len(parsed.get_courses()[0].get_children()))
+        chapter = Location('i4x://edX/toy/chapter/Overview')
+        self.assertEqual(
+            loaded.get_parent_locations(chapter, 'edX/toy/2012_Fall'),
+            parsed.get_parent_locations(chapter, 'edX/toy/2012_Fall')
+        )
+
+    def test_snapshot_of_linked_directory(self):
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        shared_dir = os.path.join(data_dir, 'shared_html')
+        shutil.copytree(os.path.join(DATA_DIR, 'toy'), os.path.join(data_dir, 'toy'))
+        shutil.move(os.path.join(data_dir, 'toy', 'html'), shared_dir)
+        os.symlink(shared_dir, os.path.join(data_dir, 'toy', 'html'))
+        snapshot_dir = os.path.join(data_dir, 'snapshots')
+        os.mkdir(snapshot_dir)
+
+        modulestore = XMLModuleStore(data_dir, course_dirs=['toy'], snapshot_dir=snapshot_dir)
+        fingerprint = modulestore._course_fingerprint('toy')  # pylint: disable=protected-access
+        # a change to the files of the linked directory makes the snapshot stale
+        with open(os.path.join(shared_dir, 'toyhtml.html'), 'a') as html_file:
+            html_file.write('<p>changed</p>')
+        self.assertNotEqual(modulestore._course_fingerprint('toy'), fingerprint)  # pylint: disable=protected-access
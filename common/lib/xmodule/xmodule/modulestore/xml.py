@@ -1,3 +1,4 @@
+import cPickle as pickle
 import hashlib
 import itertools
 import json
@@ -6,6 +7,8 @@ import os
 import re
 import sys
 import glob
+import tempfile
+import threading
 
 from collections import defaultdict
 from cStringIO import StringIO
@@ -21,13 +24,13 @@ from xmodule.mako_module import MakoDescriptorSystem
 from xmodule.x_module import XMLParsingSystem, policy_key
 
 from xblock.fields import ScopeIds
-from xblock.field_data import DictFieldData
+from xblock.field_data import DictFieldData, KvsFieldData
 from xblock.runtime import DictKeyValueStore, IdReader, IdGenerator
 
 from . import ModuleStoreReadBase, Location, XML_MODULESTORE_TYPE
 
 from .exceptions import ItemNotFoundError
-from .inheritance import compute_inherited_metadata, inheriting_field_data
+from .inheritance import compute_inherited_metadata, inheriting_field_data, InheritanceKeyValueStore
 
 edx_xml_parser = etree.XMLParser(dtd_validation=False, load_dtd=False,
                                  remove_comments=True, remove_blank_text=True)
@@ -36,6 +39,11 @@ etree.set_default_parser(edx_xml_parser)
 
 log = logging.getLogger(__name__)
 
+# Version of the format of course snapshots (see XMLModuleStore.snapshot_dir).
+# Change it whenever the way courses are loaded changes, to discard the
+# existing snapshots.
+SNAPSHOT_VERSION = 1
+
 
 # VS[compat]
 # TODO (cpennington): Remove this once all fall 2012 courses have been imported
@@ -349,7 +357,7 @@ class XMLModuleStore(ModuleStoreReadBase):
     """
     def __init__(
         self, data_dir, default_class=None, course_dirs=None, course_ids=None,
-        load_error_modules=True, i18n_service=None, **kwargs
+        load_error_modules=True, i18n_service=None, lazy=False, snapshot_dir=None, **kwargs
     ):
         """
         Initialize an XMLModuleStore from data_dir
@@ -361,6 +369,15 @@ class XMLModuleStore(ModuleStoreReadBase):
 
         course_dirs or course_ids: If specified, the list of course_dirs or course_ids to load. Otherwise,
             load all courses. Note, providing both
+
+        lazy: If True, only read the course.xml of each course on startup, and
+            load a course the first time one of its items is read. Listing all
+            the courses (or items of all courses) loads all of them.
+
+        snapshot_dir: If specified, a directory in which to keep a snapshot of
+            each loaded course. A course whose files haven't changed since its
+            snapshot was taken is loaded from the snapshot, without parsing its
+            xml or computing metadata inheritance again.
         """
         super(XMLModuleStore, self).__init__(**kwargs)
 
@@ -371,6 +388,11 @@ class XMLModuleStore(ModuleStoreReadBase):
 
         self.load_error_modules = load_error_modules
 
+        self.snapshot_dir = path(snapshot_dir) if snapshot_dir is not None else None
+        # course_dir -> fingerprint, for the courses parsed while a snapshot
+        # of them is to be taken
+        self._snapshot_fingerprints = {}
+
         if default_class is None:
             self.default_class = None
         else:
@@ -386,6 +408,10 @@ class XMLModuleStore(ModuleStoreReadBase):
 
         self.i18n_service = i18n_service
 
+        # course_id -> course_dir, for the courses which aren't loaded yet
+        self._unloaded_courses = {}
+        self._load_lock = threading.RLock()
+
         # If we are specifically asked for missing courses, that should
         # be an error.  If we are asked for "all" courses, find the ones
         # that have a course.xml. We sort the dirs in alpha order so we always
@@ -395,7 +421,45 @@ class XMLModuleStore(ModuleStoreReadBase):
             course_dirs = sorted([d for d in os.listdir(self.data_dir) if
                                   os.path.exists(self.data_dir / d / "course.xml")])
         for course_dir in course_dirs:
+            if lazy:
+                self._defer_course(course_dir, course_ids)
+            else:
+                self.try_load_course(course_dir, course_ids)
+
+    def _defer_course(self, course_dir, course_ids=None):
+        """
+        Record the course in course_dir to be loaded on first access, or load
+        it now if its course.xml can't be read (so that the errors are
+        reported as they would be without lazy loading).
+        """
+        try:
+            course_id = self._read_course_xml(course_dir, lambda msg: None)[1]
+        except Exception:  # pylint: disable=broad-except
             self.try_load_course(course_dir, course_ids)
+            return
+        if course_ids is None or course_id in course_ids:
+            self._unloaded_courses[course_id] = course_dir
+
+    def _ensure_course_loaded(self, course_id):
+        """
+        Load the course course_id if it was deferred by lazy loading.
+        """
+        if course_id not in self._unloaded_courses:
+            return
+        with self._load_lock:
+            # the course is only removed once loaded, so that other threads
+            # wait for it rather than reading a partly loaded course
+            course_dir = self._unloaded_courses.get(course_id)
+            if course_dir is not None:
+                self.try_load_course(course_dir)
+                del self._unloaded_courses[course_id]
+
+    def _ensure_all_courses_loaded(self):
+        """
+        Load all the courses deferred by lazy loading.
+        """
+        for course_id in self._unloaded_courses.keys():
+            self._ensure_course_loaded(course_id)
 
     def try_load_course(self, course_dir, course_ids=None):
         '''
@@ -428,6 +492,13 @@ class XMLModuleStore(ModuleStoreReadBase):
             self._location_errors[course_descriptor.scope_ids.usage_id] = errorlog
             self.parent_trackers[course_descriptor.id].make_known(course_descriptor.scope_ids.usage_id)
 
+            # Only take snapshots of courses which load without errors, so
+            # that the errors are reported on every load
+            fingerprint = self._snapshot_fingerprints.get(course_dir)
+            if fingerprint is not None and not errorlog.errors:
+                self._save_course_snapshot(course_dir, fingerprint, course_descriptor)
+        self._snapshot_fingerprints.pop(course_dir, None)
+
     def __unicode__(self):
         '''
         String representation - for debugging
@@ -454,15 +525,12 @@ class XMLModuleStore(ModuleStoreReadBase):
             log.warning(msg + " " + str(err))
         return {}
 
-    def load_course(self, course_dir, course_ids, tracker):
+    def _read_course_xml(self, course_dir, tracker):
         """
-        Load a course into this module store
-        course_path: Course directory name
+        Read the course.xml of course_dir.
 
-        returns a CourseDescriptor for the course
+        returns (the course element, the course id, the url_name of the course)
         """
-        log.debug('========> Starting course import from {0}'.format(course_dir))
-
         with open(self.data_dir / course_dir / "course.xml") as course_file:
 
             # VS[compat]
@@ -472,106 +540,251 @@ class XMLModuleStore(ModuleStoreReadBase):
 
             course_data = etree.parse(course_file, parser=edx_xml_parser).getroot()
 
-            org = course_data.get('org')
-
-            if org is None:
-                msg = ("No 'org' attribute set for course in {dir}. "
-                       "Using default 'edx'".format(dir=course_dir))
-                log.warning(msg)
-                tracker(msg)
-                org = 'edx'
-
-            course = course_data.get('course')
-
-            if course is None:
-                msg = ("No 'course' attribute set for course in {dir}."
-                       " Using default '{default}'".format(dir=course_dir,
-                                                           default=course_dir
-                                                           )
-                       )
-                log.warning(msg)
-                tracker(msg)
-                course = course_dir
-
-            url_name = course_data.get('url_name', course_data.get('slug'))
-            policy_dir = None
-            if url_name:
-                policy_dir = self.data_dir / course_dir / 'policies' / url_name
-                policy_path = policy_dir / 'policy.json'
-
-                policy = self.load_policy(policy_path, tracker)
-
-                # VS[compat]: remove once courses use the policy dirs.
-                if policy == {}:
-                    old_policy_path = self.data_dir / course_dir / 'policies' / '{0}.json'.format(url_name)
-                    policy = self.load_policy(old_policy_path, tracker)
+        org = course_data.get('org')
+
+        if org is None:
+            msg = ("No 'org' attribute set for course in {dir}. "
+                   "Using default 'edx'".format(dir=course_dir))
+            log.warning(msg)
+            tracker(msg)
+            org = 'edx'
+
+        course = course_data.get('course')
+
+        if course is None:
+            msg = ("No 'course' attribute set for course in {dir}."
+                   " Using default '{default}'".format(dir=course_dir,
+                                                       default=course_dir
+                                                       )
+                   )
+            log.warning(msg)
+            tracker(msg)
+            course = course_dir
+
+        url_name = course_data.get('url_name', course_data.get('slug'))
+        if not url_name:
+            # VS[compat] : 'name' is deprecated, but support it for now...
+            if course_data.get('name'):
+                url_name = Location.clean(course_data.get('name'))
+                tracker("'name' is deprecated for module xml.  Please use "
+                        "display_name and url_name.")
             else:
-                policy = {}
-                # VS[compat] : 'name' is deprecated, but support it for now...
-                if course_data.get('name'):
-                    url_name = Location.clean(course_data.get('name'))
-                    tracker("'name' is deprecated for module xml.  Please use "
-                            "display_name and url_name.")
-                else:
-                    raise ValueError("Can't load a course without a 'url_name' "
-                                     "(or 'name') set.  Set url_name.")
+                raise ValueError("Can't load a course without a 'url_name' "
+                                 "(or 'name') set.  Set url_name.")
 
-            course_id = CourseDescriptor.make_id(org, course, url_name)
-            if course_ids is not None and course_id not in course_ids:
-                return None
+        return course_data, CourseDescriptor.make_id(org, course, url_name), url_name
 
-            def get_policy(usage_id):
-                """
-                Return the policy dictionary to be applied to the specified XBlock usage
-                """
-                return policy.get(policy_key(usage_id), {})
-
-            services = {}
-            if self.i18n_service:
-                services['i18n'] = self.i18n_service
-
-            system = ImportSystem(
-                xmlstore=self,
-                course_id=course_id,
-                course_dir=course_dir,
-                error_tracker=tracker,
-                parent_tracker=self.parent_trackers[course_id],
-                load_error_modules=self.load_error_modules,
-                get_policy=get_policy,
-                mixins=self.xblock_mixins,
-                default_class=self.default_class,
-                select=self.xblock_select,
-                field_data=self.field_data,
-                services=services,
-            )
+    def load_course(self, course_dir, course_ids, tracker):
+        """
+        Load a course into this module store
+        course_path: Course directory name
 
-            course_descriptor = system.process_xml(etree.tostring(course_data, encoding='unicode'))
+        returns a CourseDescriptor for the course
+        """
+        log.debug('========> Starting course import from {0}'.format(course_dir))
 
-            # If we fail to load the course, then skip the rest of the loading steps
-            if isinstance(course_descriptor, ErrorDescriptor):
-                return course_descriptor
+        course_data, course_id, url_name = self._read_course_xml(course_dir, tracker)
+        if course_ids is not None and course_id not in course_ids:
+            return None
+
+        if course_data.get('url_name', course_data.get('slug')):
+            policy_dir = self.data_dir / course_dir / 'policies' / url_name
+            policy_path = policy_dir / 'policy.json'
 
-            # NOTE: The descriptors end up loading somewhat bottom up, which
-            # breaks metadata inheritance via get_children().  Instead
-            # (actually, in addition to, for now), we do a final inheritance pass
-            # after we have the course descriptor.
-            compute_inherited_metadata(course_descriptor)
+            policy = self.load_policy(policy_path, tracker)
 
-            # now import all pieces of course_info which is expected to be stored
-            # in <content_dir>/info or <content_dir>/info/<url_name>
-            self.load_extra_content(system, course_descriptor, 'course_info', self.data_dir / course_dir / 'info', course_dir, url_name)
+            # VS[compat]: remove once courses use the policy dirs.
+            if policy == {}:
+                old_policy_path = self.data_dir / course_dir / 'policies' / '{0}.json'.format(url_name)
+                policy = self.load_policy(old_policy_path, tracker)
+        else:
+            policy = {}
 
-            # now import all static tabs which are expected to be stored in
-            # in <content_dir>/tabs or <content_dir>/tabs/<url_name>
-            self.load_extra_content(system, course_descriptor, 'static_tab', self.data_dir / course_dir / 'tabs', course_dir, url_name)
+        def get_policy(usage_id):
+            """
+            Return the policy dictionary to be applied to the specified XBlock usage
+            """
+            return policy.get(policy_key(usage_id), {})
+
+        services = {}
+        if self.i18n_service:
+            services['i18n'] = self.i18n_service
+
+        system = ImportSystem(
+            xmlstore=self,
+            course_id=course_id,
+            course_dir=course_dir,
+            error_tracker=tracker,
+            parent_tracker=self.parent_trackers[course_id],
+            load_error_modules=self.load_error_modules,
+            get_policy=get_policy,
+            mixins=self.xblock_mixins,
+            default_class=self.default_class,
+            select=self.xblock_select,
+            field_data=self.field_data,
+            services=services,
+        )
 
-            self.load_extra_content(system, course_descriptor, 'custom_tag_template', self.data_dir / course_dir / 'custom_tags', course_dir, url_name)
+        if self.snapshot_dir is not None:
+            fingerprint = self._course_fingerprint(course_dir)
+            course_descriptor = self._load_course_snapshot(course_dir, course_id, fingerprint, system)
+            if course_descriptor is not None:
+                return course_descriptor
+            self._snapshot_fingerprints[course_dir] = fingerprint
 
-            self.load_extra_content(system, course_descriptor, 'about', self.data_dir / course_dir / 'about', course_dir, url_name)
+        course_descriptor = system.process_xml(etree.tostring(course_data, encoding='unicode'))
 
-            log.debug('========> Done with course import from {0}'.format(course_dir))
+        # If we fail to load the course, then skip the rest of the loading steps
+        if isinstance(course_descriptor, ErrorDescriptor):
             return course_descriptor
 
+        # NOTE: The descriptors end up loading somewhat bottom up, which
+        # breaks metadata inheritance via get_children().  Instead
+        # (actually, in addition to, for now), we do a final inheritance pass
+        # after we have the course descriptor.
+        compute_inherited_metadata(course_descriptor)
+
+        # now import all pieces of course_info which is expected to be stored
+        # in <content_dir>/info or <content_dir>/info/<url_name>
+        self.load_extra_content(system, course_descriptor, 'course_info', self.data_dir / course_dir / 'info', course_dir, url_name)
+
+        # now import all static tabs which are expected to be stored in
+        # in <content_dir>/tabs or <content_dir>/tabs/<url_name>
+        self.load_extra_content(system, course_descriptor, 'static_tab', self.data_dir / course_dir / 'tabs', course_dir, url_name)
+
+        self.load_extra_content(system, course_descriptor, 'custom_tag_template', self.data_dir / course_dir / 'custom_tags', course_dir, url_name)
+
+        self.load_extra_content(system, course_descriptor, 'about', self.data_dir / course_dir / 'about', course_dir, url_name)
+
+        log.debug('========> Done with course import from {0}'.format(course_dir))
+        return course_descriptor
+
+    def _course_fingerprint(self, course_dir):
+        """
+        Return a hash of the names, sizes and modification times of the files
+        of course_dir, and of the options used to load it.
+        """
+        fingerprint = hashlib.sha1()
+        fingerprint.update(repr((
+            SNAPSHOT_VERSION, course_dir, self.load_error_modules, self.default_class, self.xblock_mixins,
+        )))
+        course_path = self.data_dir / course_dir
+        # courses may link in shared directories, which are read as theirs
+        seen_dirs = set()
+        for dirpath, dirnames, filenames in os.walk(course_path, followlinks=True):
+            real_path = os.path.realpath(dirpath)
+            if real_path in seen_dirs:
+                # don't follow links in a cycle
+                del dirnames[:]
+                continue
+            seen_dirs.add(real_path)
+            dirnames.sort()
+            for filename in sorted(filenames):
+                filepath = os.path.join(dirpath, filename)
+                stat = os.stat(filepath)
+                fingerprint.update(repr((os.path.relpath(filepath, course_path), stat.st_size, stat.st_mtime)))
+        return fingerprint.hexdigest()
+
+    def _snapshot_path(self, course_dir):
+        """
+        Return the path of the snapshot of the course in course_dir.
+        """
+        return self.snapshot_dir / '{0}.snapshot'.format(course_dir)
+
+    @staticmethod
+    def _code_versions(classes):
+        """
+        Return a dict of source file -> modification time, for the modules
+        defining `classes` and their base classes, to tell whether the code
+        which took a snapshot has changed since.
+        """
+        versions = {}
+        for cls in set(itertools.chain.from_iterable(cls.__mro__ for cls in classes)):
+            filename = getattr(sys.modules.get(cls.__module__), '__file__', None)
+            if filename:
+                versions[filename] = os.path.getmtime(filename)
+        return versions
+
+    def _save_course_snapshot(self, course_dir, fingerprint, course_descriptor):
+        """
+        Take a snapshot of the loaded course course_descriptor, if all of its
+        items keep their fields in a form which can be saved.
+        """
+        course_id = course_descriptor.id
+        course_location = course_descriptor.scope_ids.usage_id
+        blocks = []
+        for location, block in self.modules[course_id].iteritems():
+            block.save()
+            field_data = block._field_data  # pylint: disable=protected-access
+            kvs = getattr(field_data, '_kvs', None)
+            if isinstance(kvs, InheritanceKeyValueStore):
+                fields = ('kvs', kvs._fields, kvs.inherited_settings)  # pylint: disable=protected-access
+            elif isinstance(field_data, DictFieldData):
+                fields = ('dict', field_data._data, None)  # pylint: disable=protected-access
+            else:
+                log.debug("Not taking a snapshot of %s: the fields of %s can't be saved", course_dir, location)
+                return
+            blocks.append((block.scope_ids, fields, getattr(block, 'data_dir', None)))
+        # construct the course last, so that all of its items exist
+        blocks.sort(key=lambda block: block[0].usage_id == course_location)
+
+        snapshot = {
+            'fingerprint': fingerprint,
+            'code_versions': self._code_versions(set(type(block) for block in self.modules[course_id].itervalues())),
+            'blocks': blocks,
+            'parents': self.parent_trackers[course_id]._parents,  # pylint: disable=protected-access
+        }
+        self.snapshot_dir.makedirs_p()
+        # write the snapshot to a temporary file first, so that a partly
+        # written snapshot is never read
+        handle, temp_path = tempfile.mkstemp(dir=self.snapshot_dir)
+        try:
+            with os.fdopen(handle, 'wb') as snapshot_file:
+                pickle.dump(snapshot, snapshot_file, pickle.HIGHEST_PROTOCOL)
+            os.rename(temp_path, self._snapshot_path(course_dir))
+        except Exception:  # pylint: disable=broad-except
+            log.warning("Failed to save the snapshot of %s", course_dir, exc_info=True)
+            os.remove(temp_path)
+
+    def _load_course_snapshot(self, course_dir, course_id, fingerprint, system):
+        """
+        Load the course in course_dir from its snapshot, if it has one taken
+        from the same files (fingerprint) with the same code.
+
+        returns the CourseDescriptor for the course, or None if the course
+        needs to be parsed
+        """
+        snapshot_path = self._snapshot_path(course_dir)
+        if not snapshot_path.isfile():
+            return None
+        try:
+            with open(snapshot_path, 'rb') as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+            if snapshot['fingerprint'] != fingerprint:
+                return None
+            for filename, mtime in snapshot['code_versions'].iteritems():
+                if not os.path.exists(filename) or os.path.getmtime(filename) != mtime:
+                    return None
+
+            block = None
+            for scope_ids, (kind, fields, inherited_settings), data_dir in snapshot['blocks']:
+                if kind == 'kvs':
+                    field_data = KvsFieldData(InheritanceKeyValueStore(fields, inherited_settings))
+                else:
+                    field_data = DictFieldData(fields)
+                block = system.construct_xblock(scope_ids.block_type, scope_ids, field_data)
+                block.data_dir = data_dir
+                self.modules[course_id][scope_ids.usage_id] = block
+            self.parent_trackers[course_id]._parents.update(snapshot['parents'])  # pylint: disable=protected-access
+        except Exception:  # pylint: disable=broad-except
+            log.warning("Failed to load the snapshot of %s, parsing it instead", course_dir, exc_info=True)
+            self.modules[course_id].clear()
+            self.parent_trackers[course_id]._parents.clear()  # pylint: disable=protected-access
+            return None
+
+        log.debug('========> Loaded course %s from its snapshot', course_dir)
+        return block
+
     def load_extra_content(self, system, course_descriptor, category, base_dir, course_dir, url_name):
         self._load_extra_content(system, course_descriptor, category, base_dir, course_dir)
 
@@ -633,6 +846,7 @@ class XMLModuleStore(ModuleStoreReadBase):
         location: Something that can be passed to Location
         """
         location = Location(location)
+        self._ensure_course_loaded(course_id)
         try:
             return self.modules[course_id][location]
         except KeyError:
@@ -643,8 +857,14 @@ class XMLModuleStore(ModuleStoreReadBase):
         Returns True if location exists in this ModuleStore.
         """
         location = Location(location)
+        self._ensure_course_loaded(course_id)
         return location in self.modules[course_id]
 
+    def get_item_errors(self, location):
+        # the errors of a course are only known once it is loaded
+        self._ensure_all_courses_loaded()
+        return super(XMLModuleStore, self).get_item_errors(location)
+
     def get_item(self, location, depth=0):
         """
         Returns an XBlock instance for the item at location.
@@ -671,9 +891,11 @@ class XMLModuleStore(ModuleStoreReadBase):
                     items.append(module)
 
         if course_id is None:
+            self._ensure_all_courses_loaded()
             for _, modules in self.modules.iteritems():
                 _add_get_items(self, location, modules)
         else:
+            self._ensure_course_loaded(course_id)
             _add_get_items(self, location, self.modules[course_id])
 
         return items
@@ -683,13 +905,26 @@ class XMLModuleStore(ModuleStoreReadBase):
         Returns a list of course descriptors.  If there were errors on loading,
         some of these may be ErrorDescriptors instead.
         """
+        self._ensure_all_courses_loaded()
         return self.courses.values()
 
+    def get_course(self, course_id):
+        """
+        Returns the course descriptor of course_id, or None if not found,
+        loading only that course if it was deferred by lazy loading.
+        """
+        self._ensure_course_loaded(course_id)
+        for course in self.courses.itervalues():
+            if course.id == course_id:
+                return course
+        return None
+
     def get_errored_courses(self):
         """
         Return a dictionary of course_dir -> [(msg, exception_str)], for each
         course_dir where course loading failed.
         """
+        self._ensure_all_courses_loaded()
         return dict((k, self.errored_courses[k].errors) for k in self.errored_courses)
 
     def get_orphans(self, course_location, _branch):
@@ -719,6 +954,7 @@ class XMLModuleStore(ModuleStoreReadBase):
         be empty if there are no parents.
         '''
         location = Location.ensure_fully_specified(location)
+        self._ensure_course_loaded(course_id)
         if not self.parent_trackers[course_id].is_known(location):
             raise ItemNotFoundError("{0} not in {1}".format(location, course_id))
 
@@ -6,19 +6,30 @@ import logging
 import lxml.etree
 from xmodule.modulestore import Location
 from xmodule.modulestore.inheritance import own_metadata
+from fs.base import FS
+from fs.errors import DestinationExistsError, ResourceNotFoundError, UnsupportedError
 from fs.osfs import OSFS
+from fs.path import abspath, normpath, relpath, dirname, basename, recursepath
 from json import dumps
 import json
 import datetime
+import hashlib
 import os
 from path import path
 import shutil
+import tarfile
+import tempfile
+import time
 
 DRAFT_DIR = "drafts"
 PUBLISHED_DIR = "published"
 EXPORT_VERSION_FILE = "format.json"
 EXPORT_VERSION_KEY = "export_format"
 
+# size up to which a file written to an archive is held in memory before
+# being spooled to a temporary file
+ARCHIVE_SPOOL_SIZE = 1024 * 1024
+
 class EdxJSONEncoder(json.JSONEncoder):
     """
     Custom JSONEncoder that handles `Location` and `datetime.datetime` objects.
@@ -41,6 +52,182 @@ class EdxJSONEncoder(json.JSONEncoder):
             return super(EdxJSONEncoder, self).default(obj)
 
 
+class _ArchiveMemberFile(object):
+    """
+    A file open for writing in an `ArchiveFS`, which is added to the archive
+    when it is closed.
+    """
+    def __init__(self, archive_fs, path):
+        self.archive_fs = archive_fs
+        self.path = path
+        self.closed = False
+        self._buffer = tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_SIZE)
+
+    def write(self, data):
+        """Write `data` to the file"""
+        self._buffer.write(data)
+
+    def writelines(self, lines):
+        """Write each of `lines` to the file"""
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        """Nothing is written until the file is closed"""
+        pass
+
+    def close(self):
+        """Add the file to the archive"""
+        if not self.closed:
+            self.closed = True
+            size = self._buffer.tell()
+            self._buffer.seek(0)
+            self.archive_fs.add_file(self.path, self._buffer, size)
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # don't add a partly written file to the archive
+            self.closed = True
+            self._buffer.close()
+
+
+class _DigestingReader(object):
+    """
+    A file object reading from `fileobj`, which keeps the digest of what was read.
+    """
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.digest = hashlib.sha1()
+
+    def read(self, size=-1):
+        """Read up to `size` bytes"""
+        data = self.fileobj.read(size)
+        self.digest.update(data)
+        return data
+
+
+class ArchiveFS(FS):
+    """
+    A write-only `fs` filesystem which adds the files written to it to the
+    tarfile `archive`, in the order in which they are closed, so that an
+    archive of a course can be written without writing the course to disk.
+
+    Files opened for writing are held in memory up to ARCHIVE_SPOOL_SIZE.
+    Contents given to `setcontents` as file objects with a `length` (such
+    as GridFS files) are copied straight into the archive.
+
+    A file written again is added to the archive again, so that the last
+    write wins when the archive is extracted, as it does in an `OSFS`,
+    unless its contents are the same as those already added.
+    """
+    _meta = {
+        'thread_safe': False,
+        'virtual': True,
+        'read_only': False,
+        'unicode_paths': True,
+        'case_insensitive_paths': False,
+        'network': False,
+    }
+
+    def __init__(self, archive):
+        super(ArchiveFS, self).__init__()
+        self.archive = archive
+        self._dirs = set([u'/'])
+        self._file_sizes = {}
+        self._file_digests = {}
+
+    def __str__(self):
+        return '<ArchiveFS: {0}>'.format(self.archive.name)
+
+    def add_file(self, path, fileobj, size):
+        """
+        Add the `size` bytes read from the file object `fileobj` to the
+        archive, as the file at `path`.
+        """
+        path = abspath(normpath(path))
+        if path in self._file_sizes and self._file_sizes[path] == size and hasattr(fileobj, 'seek'):
+            start = fileobj.tell()
+            reader = _DigestingReader(fileobj)
+            while reader.read(64 * 1024):
+                pass
+            fileobj.seek(start)
+            if reader.digest.hexdigest() == self._file_digests[path]:
+                return
+        reader = _DigestingReader(fileobj)
+        info = tarfile.TarInfo(relpath(path))
+        info.size = size
+        info.mtime = time.time()
+        self.archive.addfile(info, reader)
+        self._file_sizes[path] = size
+        self._file_digests[path] = reader.digest.hexdigest()
+
+    def open(self, path, mode='r', **kwargs):
+        if 'w' not in mode and 'a' not in mode:
+            raise UnsupportedError('read', path)
+        return _ArchiveMemberFile(self, path)
+
+    def setcontents(self, path, data, chunk_size=64 * 1024):
+        if hasattr(data, 'read') and hasattr(data, 'length'):
+            self.add_file(path, data, data.length)
+        else:
+            super(ArchiveFS, self).setcontents(path, data, chunk_size)
+
+    def createfile(self, path):
+        self.setcontents(path, '')
+
+    def makedir(self, path, recursive=False, allow_recreate=False):
+        path = abspath(normpath(path))
+        if path in self._dirs:
+            if not allow_recreate:
+                raise DestinationExistsError(path)
+            return
+        # tar doesn't require parent directories, so all are created
+        for dir_path in recursepath(path):
+            if dir_path not in self._dirs:
+                info = tarfile.TarInfo(relpath(dir_path))
+                info.type = tarfile.DIRTYPE
+                info.mode = 0755
+                info.mtime = time.time()
+                self.archive.addfile(info)
+                self._dirs.add(dir_path)
+
+    def isdir(self, path):
+        return abspath(normpath(path)) in self._dirs
+
+    def isfile(self, path):
+        return abspath(normpath(path)) in self._file_sizes
+
+    def exists(self, path):
+        return self.isdir(path) or self.isfile(path)
+
+    def listdir(self, path='./', wildcard=None, full=False, absolute=False, dirs_only=False, files_only=False):
+        path = abspath(normpath(path))
+        if path not in self._dirs:
+            raise ResourceNotFoundError(path)
+        entries = []
+        if not files_only:
+            entries.extend(dir_path for dir_path in self._dirs if dir_path != path and dirname(dir_path) == path)
+        if not dirs_only:
+            entries.extend(file_path for file_path in self._file_sizes if dirname(file_path) == path)
+        return self._listdir_helper(
+            path, sorted(basename(entry) for entry in entries), wildcard, full, absolute, False, False
+        )
+
+    def getinfo(self, path):
+        path = abspath(normpath(path))
+        if path in self._file_sizes:
+            return {'size': self._file_sizes[path]}
+        if path in self._dirs:
+            return {}
+        raise ResourceNotFoundError(path)
+
+
 def export_to_xml(modulestore, contentstore, course_location, root_dir, course_dir, draft_modulestore=None):
     """
     Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
@@ -53,12 +240,35 @@ def export_to_xml(modulestore, contentstore, course_location, root_dir, course_d
     `draft_modulestore`: An optional `DraftModuleStore` that contains draft content, which will be exported
         alongside the public content in the course.
     """
+    export_to_fs(modulestore, contentstore, course_location, OSFS(root_dir), course_dir, draft_modulestore)
+
+
+def export_to_archive(modulestore, contentstore, course_location, fileobj, course_dir, draft_modulestore=None):
+    """
+    Export the course as `export_to_xml` does, as a tar.gz archive written to
+    the file object `fileobj`, with the course content in `course_dir`.
+
+    The archive is written as a stream, so `fileobj` only needs a `write`
+    method, and neither the course nor its assets are written to disk or
+    held in memory as a whole.
+    """
+    archive = tarfile.open(fileobj=fileobj, mode='w|gz')
+    try:
+        export_to_fs(modulestore, contentstore, course_location, ArchiveFS(archive), course_dir, draft_modulestore)
+    finally:
+        archive.close()
+
+
+def export_to_fs(modulestore, contentstore, course_location, root_fs, course_dir, draft_modulestore=None):
+    """
+    Export the course as `export_to_xml` does, to the directory `course_dir`
+    of the `fs` filesystem `root_fs`.
+    """
 
     course_id = course_location.course_id
     course = modulestore.get_course(course_id)
 
-    fs = OSFS(root_dir)
-    export_fs = course.runtime.export_fs = fs.makeopendir(course_dir)
+    export_fs = course.runtime.export_fs = root_fs.makeopendir(course_dir)
 
     root = lxml.etree.Element('unknown')
     course.add_xml_to_node(root)
@@ -69,10 +279,11 @@ def export_to_xml(modulestore, contentstore, course_location, root_dir, course_d
     # export the static assets
     policies_dir = export_fs.makeopendir('policies')
     if contentstore:
-        contentstore.export_all_for_course(
+        contentstore.export_all_for_course_to_fs(
             course_location,
-            root_dir + '/' + course_dir + '/static/',
-            root_dir + '/' + course_dir + '/policies/assets.json',
+            export_fs,
+            'static',
+            'policies/assets.json',
         )
 
     # export the static tabs
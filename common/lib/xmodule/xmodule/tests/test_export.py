@@ -25,7 +25,7 @@ from xblock.test.tools import blocks_are_equivalent
 from xmodule.modulestore import Location
 from xmodule.modulestore.xml import XMLModuleStore
 from xmodule.modulestore.xml_exporter import (
-    EdxJSONEncoder, convert_between_versions, get_version
+    ArchiveFS, EdxJSONEncoder, convert_between_versions, get_version
 )
 from xmodule.tests import DATA_DIR
 from xmodule.tests.helpers import directories_equal
@@ -152,6 +152,51 @@ class RoundTripTestCase(unittest.TestCase):
             ))
 
 
+class TestArchiveFS(unittest.TestCase):
+    """
+    Tests for xml_exporter.ArchiveFS
+    """
+    def setUp(self):
+        self.temp_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.archive_path = os.path.join(self.temp_dir, 'archive.tar')
+
+    def write_archive(self, contents):
+        """
+        Write each of the contents in turn to the same file of an archive.
+        """
+        archive = tarfile.open(self.archive_path, 'w')
+        archive_fs = ArchiveFS(archive)
+        for content in contents:
+            with archive_fs.open('course/html/shared.xml', 'w') as archive_file:
+                archive_file.write(content)
+        archive.close()
+
+    def extracted(self):
+        """
+        Return the members of the archive and the extracted contents of the file.
+        """
+        archive = tarfile.open(self.archive_path)
+        try:
+            members = [member.name for member in archive.getmembers() if member.isfile()]
+            archive.extractall(self.temp_dir)
+        finally:
+            archive.close()
+        with open(os.path.join(self.temp_dir, 'course/html/shared.xml')) as extracted_file:
+            return members, extracted_file.read()
+
+    def test_identical_rewrite(self):
+        # a module with several parents is exported once for each of them
+        self.write_archive(['<html/>', '<html/>'])
+        self.assertEqual(self.extracted(), (['course/html/shared.xml'], '<html/>'))
+
+    def test_last_write_wins(self):
+        self.write_archive(['<html/>', '<html>new</html>'])
+        self.assertEqual(
+            self.extracted(), (['course/html/shared.xml', 'course/html/shared.xml'], '<html>new</html>')
+        )
+
+
 class TestEdxJsonEncoder(unittest.TestCase):
     """
     Tests for xml_exporter.EdxJSONEncoder
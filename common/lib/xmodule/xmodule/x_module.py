@@ -385,6 +385,10 @@ class XModule(XModuleMixin, HTMLSnippet, XBlock):  # pylint: disable=abstract-me
     _field_data = descriptor_attr('_field_data')
     _dirty_fields = descriptor_attr('_dirty_fields')
 
+    # Set to True by modules whose student_view renders the same html for
+    # every user, which allows the LMS to cache the rendered fragment
+    user_independent_student_view = False
+
     def __init__(self, descriptor, *args, **kwargs):
         """
         Construct a new xmodule
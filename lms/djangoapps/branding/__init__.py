@@ -2,18 +2,25 @@ from xmodule.modulestore.django import modulestore
 from xmodule.course_module import CourseDescriptor
 from django.conf import settings
 
+from course_overviews.models import CourseOverview
 from microsite_configuration.middleware import MicrositeConfiguration
 
 
 def get_visible_courses():
     """
     Return the set of CourseDescriptors that should be visible in this branded instance
+
+    With FEATURES['ENABLE_COURSE_OVERVIEWS'], CourseOverviews are returned
+    instead, without loading any course from the modulestore.
     """
-    _courses = modulestore().get_courses()
+    if settings.FEATURES.get('ENABLE_COURSE_OVERVIEWS'):
+        courses = CourseOverview.get_all()
+    else:
+        _courses = modulestore().get_courses()
 
-    courses = [c for c in _courses
-               if isinstance(c, CourseDescriptor)]
-    courses = sorted(courses, key=lambda course: course.number)
+        courses = [c for c in _courses
+                   if isinstance(c, CourseDescriptor)]
+        courses = sorted(courses, key=lambda course: course.number)
 
     subdomain = MicrositeConfiguration.get_microsite_configuration_value('subdomain')
 
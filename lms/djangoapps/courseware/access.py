@@ -14,6 +14,7 @@ from xmodule.x_module import XModule
 
 from xblock.core import XBlock
 
+from course_overviews.models import CourseOverview
 from student.models import CourseEnrollmentAllowed
 from external_auth.models import ExternalAuthMap
 from courseware.masquerade import is_masquerading_as_student
@@ -21,7 +22,8 @@ from django.utils.timezone import UTC
 from student.models import CourseEnrollment
 from student.roles import (
     GlobalStaff, CourseStaffRole, CourseInstructorRole,
-    OrgStaffRole, OrgInstructorRole, CourseBetaTesterRole
+    OrgStaffRole, OrgInstructorRole, CourseBetaTesterRole,
+    course_group_suffixes, user_group_names
 )
 DEBUG_ACCESS = False
 
@@ -68,7 +70,7 @@ def has_access(user, obj, action, course_context=None):
 
     # delegate the work to type-specific functions.
     # (start with more specific types, then get more general)
-    if isinstance(obj, CourseDescriptor):
+    if isinstance(obj, (CourseDescriptor, CourseOverview)):
         return _has_access_course_desc(user, obj, action)
 
     if isinstance(obj, ErrorDescriptor):
@@ -421,20 +423,22 @@ def _has_access_to_location(user, location, access_level, course_context):
         debug("Deny: unknown access level")
         return False
 
-    staff_access = (
-        CourseStaffRole(location, course_context).has_user(user) or
-        OrgStaffRole(location).has_user(user)
-    )
+    # The user's roles only depend on the course, so they are remembered on
+    # the user object (which lives as long as the request) for all the blocks
+    # of the course; they are forgotten when the user's roles change.
+    # pylint: disable=protected-access
+    course_name = location.name if location.category == 'course' else None
+    key = (location.org, location.course, course_name, course_context)
+    if not hasattr(user, '_access_decisions'):
+        user._access_decisions = {}
+    if key not in user._access_decisions:
+        user._access_decisions[key] = _course_roles(user, location, course_context)
+    staff_access, instructor_access = user._access_decisions[key]
 
     if staff_access and access_level == 'staff':
         debug("Allow: user has course staff access")
         return True
 
-    instructor_access = (
-        CourseInstructorRole(location, course_context).has_user(user) or
-        OrgInstructorRole(location).has_user(user)
-    )
-
     if instructor_access and access_level in ('staff', 'instructor'):
         debug("Allow: user has course instructor access")
         return True
@@ -443,6 +447,27 @@ def _has_access_to_location(user, location, access_level, course_context):
     return False
 
 
+def _course_roles(user, location, course_context):
+    """
+    Returns a (staff, instructor) pair of whether the user is in the staff
+    or instructor groups of the course or org of location, resolved with a
+    single intersection against the user's groups.
+    """
+    suffixes = course_group_suffixes(location, course_context)
+    staff_groups = set(
+        [u'{0}_{1}'.format(CourseStaffRole.ROLE, suffix).lower() for suffix in suffixes] +
+        OrgStaffRole(location).group_names
+    )
+    instructor_groups = set(
+        [u'{0}_{1}'.format(CourseInstructorRole.ROLE, suffix).lower() for suffix in suffixes] +
+        OrgInstructorRole(location).group_names
+    )
+    if not user.is_active:
+        return False, False
+    user_groups = user_group_names(user) & (staff_groups | instructor_groups)
+    return bool(user_groups & staff_groups), bool(user_groups & instructor_groups)
+
+
 def _has_staff_access_to_course_id(user, course_id):
     """Helper method that takes a course_id instead of a course name"""
     loc = CourseDescriptor.id_to_location(course_id)
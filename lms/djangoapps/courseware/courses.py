@@ -8,13 +8,14 @@ from django.http import Http404
 from django.conf import settings
 from .module_render import get_module
 from xmodule.course_module import CourseDescriptor
-from xmodule.modulestore import Location, XML_MODULESTORE_TYPE
+from xmodule.modulestore import Location
 from xmodule.modulestore.django import modulestore, loc_mapper
-from xmodule.contentstore.content import StaticContent
 from xmodule.modulestore.exceptions import ItemNotFoundError, InvalidLocationError
 from courseware.model_data import FieldDataCache
 from static_replace import replace_static_urls
 from courseware.access import has_access
+from course_overviews.models import CourseOverview
+import course_overviews.utils
 import branding
 
 log = logging.getLogger(__name__)
@@ -102,12 +103,9 @@ def get_opt_course_with_access(user, course_id, action):
 def course_image_url(course):
     """Try to look up the image url for the course.  If it's not found,
     log an error and return the dead link"""
-    if course.static_asset_path or modulestore().get_modulestore_type(course.location.course_id) == XML_MODULESTORE_TYPE:
-        return '/static/' + (course.static_asset_path or getattr(course, 'data_dir', '')) + "/images/course_image.jpg"
-    else:
-        loc = StaticContent.compute_location(course.location.org, course.location.course, course.course_image)
-        _path = StaticContent.get_url_path_from_location(loc)
-        return _path
+    if isinstance(course, CourseOverview):
+        return course.course_image_url
+    return course_overviews.utils.course_image_url(course)
 
 
 def find_file(filesystem, dirs, filename):
@@ -155,6 +153,13 @@ def get_course_about_section(course, section_key):
     # markup. This can change without effecting this interface when we find a
     # good format for defining so many snippets of text/html.
 
+    # Course overviews only hold what course listings show
+    if isinstance(course, CourseOverview):
+        if section_key == 'short_description':
+            return course.short_description
+        if section_key not in ('title', 'university', 'number'):
+            course = course.load_descriptor()
+
 # TODO: Remove number, instructors from this list
     if section_key in ['short_description', 'description', 'key_dates', 'video',
                        'course_staff_short', 'course_staff_extended',
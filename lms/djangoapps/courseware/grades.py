@@ -1,6 +1,6 @@
 # Compute grades using real division, with no integer truncation
 from __future__ import division
-from collections import defaultdict
+from collections import defaultdict, Counter
 import json
 import random
 import logging
@@ -15,6 +15,7 @@ from dogapi import dog_stats_api
 from courseware import courses
 from courseware.model_data import FieldDataCache
 from xmodule import graders
+from xmodule.course_module import CourseDescriptor
 from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -48,7 +49,50 @@ def yield_dynamic_descriptor_descendents(descriptor, module_creator):
         yield next_descriptor
 
 
-def answer_distributions(course_id):
+# Number of StudentModule rows read by each query of answer_distributions
+ANSWER_DISTRIBUTION_BATCH_SIZE = 1000
+
+
+def _submitted_problem_states(course_id):
+    """
+    Yield (id, student_id, module_state_key, state) for every problem
+    submitted in `course_id`, reading only these columns, in batches of
+    ANSWER_DISTRIBUTION_BATCH_SIZE rows ordered by id. Each batch is a short
+    query, so the read replica isn't held by one long running cursor.
+    """
+    queryset = StudentModule.all_submitted_problems_read_only(course_id).order_by('id')
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(id__gt=last_id).values_list('id', 'student_id', 'module_state_key', 'state')[:ANSWER_DISTRIBUTION_BATCH_SIZE]
+        )
+        if not rows:
+            return
+        for row in rows:
+            yield row
+        last_id = rows[-1][0]
+
+
+def _problem_info_by_state_key(course_id):
+    """
+    Return a dict of module_state_key -> (url_name, display_name) for all
+    the modules of the course, with a single traversal of the course tree.
+    """
+    try:
+        course = modulestore().get_instance(course_id, CourseDescriptor.id_to_location(course_id), depth=None)
+    except ItemNotFoundError:
+        return {}
+    problem_info = {}
+    stack = [course]
+    while stack:
+        descriptor = stack.pop()
+        problem_info[descriptor.location.url()] = (descriptor.url_name, descriptor.display_name_with_default)
+        if descriptor.has_children:
+            stack.extend(descriptor.get_children())
+    return problem_info
+
+
+def answer_distributions(course_id, progress_callback=None):
     """
     Given a course_id, return answer distributions in the form of a dictionary
     mapping:
@@ -75,21 +119,57 @@ def answer_distributions(course_id):
     not be aware of problems that are not visible to the user being used to
     generate the report.
 
+    The answers are counted per module_state_key first, and the problems'
+    names are resolved once per problem at the end, from one traversal of
+    the course tree.
+
+    If given, `progress_callback` is called with the number of rows read
+    so far after each batch of rows.
+
     This method will try to use a read-replica database if one is available.
     """
-    # dict: { module.module_state_key : (url_name, display_name) }
-    state_keys_to_problem_info = {}  # For caching, used by url_and_display_name
+    # Count the answers of each problem part of each module, in no particular order
+    state_key_counts = defaultdict(Counter)
+    num_rows = 0
+    for module_id, _student_id, module_state_key, state in _submitted_problem_states(course_id):
+        num_rows += 1
+        if progress_callback is not None and num_rows % ANSWER_DISTRIBUTION_BATCH_SIZE == 0:
+            progress_callback(num_rows)
+        try:
+            state_dict = json.loads(state) if state else {}
+            raw_answers = state_dict.get("student_answers", {})
+        except ValueError:
+            log.error(
+                "Answer Distribution: Could not parse module state for " +
+                "StudentModule id={}, course={}".format(module_id, course_id)
+            )
+            continue
+
+        # Each problem part has an ID that is derived from the
+        # module.module_state_key (with some suffix appended)
+        for problem_part_id, raw_answer in raw_answers.items():
+            # Convert whatever raw answers we have (numbers, unicode, None, etc.)
+            # to be unicode values. Note that if we get a string, it's always
+            # unicode and not str -- state comes from the json decoder, and that
+            # always returns unicode for strings.
+            state_key_counts[(module_state_key, problem_part_id)][unicode(raw_answer)] += 1
+
+    if progress_callback is not None:
+        progress_callback(num_rows)
+
+    # Resolve the names of the problems
+    problem_info = _problem_info_by_state_key(course_id) if state_key_counts else {}
+    missing_state_keys = set()
 
     def url_and_display_name(module_state_key):
         """
         For a given module_state_key, return the problem's url and display_name.
-        Handle modulestore access and caching. This method ignores permissions.
-        May throw an ItemNotFoundError if there is no content that corresponds
-        to this module_state_key.
+        Problems outside of the course tree are looked up in the modulestore.
+        This method ignores permissions. May throw an ItemNotFoundError if there
+        is no content that corresponds to this module_state_key.
         """
-        problem_store = modulestore()
-        if module_state_key not in state_keys_to_problem_info:
-            problems = problem_store.get_items(module_state_key, course_id=course_id, depth=1)
+        if module_state_key not in problem_info:
+            problems = modulestore().get_items(module_state_key, course_id=course_id, depth=1)
             if not problems:
                 # Likely means that the problem was deleted from the course
                 # after the student had answered. We log this suspicion where
@@ -99,50 +179,42 @@ def answer_distributions(course_id):
                     .format(module_state_key, course_id)
                 )
             problem = problems[0]
-            problem_info = (problem.url_name, problem.display_name_with_default)
-            state_keys_to_problem_info[module_state_key] = problem_info
+            problem_info[module_state_key] = (problem.url_name, problem.display_name_with_default)
 
-        return state_keys_to_problem_info[module_state_key]
+        return problem_info[module_state_key]
 
-    # Iterate through all problems submitted for this course in no particular
-    # order, and build up our answer_counts dict that we will eventually return
-    answer_counts = defaultdict(lambda: defaultdict(int))
-    for module in StudentModule.all_submitted_problems_read_only(course_id):
+    answer_counts = defaultdict(Counter)
+    for (module_state_key, problem_part_id), counts in state_key_counts.iteritems():
+        if module_state_key in missing_state_keys:
+            continue
         try:
-            state_dict = json.loads(module.state) if module.state else {}
-            raw_answers = state_dict.get("student_answers", {})
-        except ValueError:
-            log.error(
-                "Answer Distribution: Could not parse module state for " +
-                "StudentModule id={}, course={}".format(module.id, course_id)
-            )
+            url, display_name = url_and_display_name(module_state_key)
+        except ItemNotFoundError:
+            missing_state_keys.add(module_state_key)
+            msg = "Answer Distribution: Item {} referenced in StudentModule entries " + \
+                  "in course {} not found; " + \
+                  "This can happen if a student answered a question that " + \
+                  "was later deleted from the course. These answers will be " + \
+                  "omitted from the answer distribution CSV."
+            log.warning(msg.format(module_state_key, course_id))
             continue
 
-        # Each problem part has an ID that is derived from the
-        # module.module_state_key (with some suffix appended)
-        for problem_part_id, raw_answer in raw_answers.items():
-            # Convert whatever raw answers we have (numbers, unicode, None, etc.)
-            # to be unicode values. Note that if we get a string, it's always
-            # unicode and not str -- state comes from the json decoder, and that
-            # always returns unicode for strings.
-            answer = unicode(raw_answer)
+        answer_counts[(url, display_name, problem_part_id)].update(counts)
 
-            try:
-                url, display_name = url_and_display_name(module.module_state_key)
-            except ItemNotFoundError:
-                msg = "Answer Distribution: Item {} referenced in StudentModule {} " + \
-                      "for user {} in course {} not found; " + \
-                      "This can happen if a student answered a question that " + \
-                      "was later deleted from the course. This answer will be " + \
-                      "omitted from the answer distribution CSV."
-                log.warning(
-                    msg.format(module.module_state_key, module.id, module.student_id, course_id)
-                )
-                continue
+    return answer_counts
 
-            answer_counts[(url, display_name, problem_part_id)][answer] += 1
 
-    return answer_counts
+def answer_distribution_rows(course_id, progress_callback=None):
+    """
+    Yield the rows of the answer distribution CSV of `course_id`, header
+    first, sorted by problem.
+    """
+    dist = answer_distributions(course_id, progress_callback)
+    yield ['url_name', 'display name', 'answer id', 'answer', 'count']
+    for (url_name, display_name, answer_id), answers in sorted(dist.items()):
+        for answer, count in answers.iteritems():
+            yield [url_name, display_name, answer_id, answer, count]
+
 
 @transaction.commit_manually
 def grade(student, request, course, keep_raw_scores=False):
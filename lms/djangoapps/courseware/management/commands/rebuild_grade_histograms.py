@@ -0,0 +1,26 @@
+"""
+Rebuild the grade histograms shown in staff debug info for the given
+courses, from the grades of their students. Run once for existing courses,
+or to repair histograms after grades are changed outside the LMS.
+"""
+from textwrap import dedent
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courseware.models import StudentModuleGradeBucket
+
+
+class Command(BaseCommand):
+    """
+    Rebuild grade histograms
+    """
+    args = '<course_id> [<course_id> ...]'
+    help = dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        if not args:
+            raise CommandError('At least one course_id is required')
+
+        for course_id in args:
+            count = StudentModuleGradeBucket.rebuild(course_id)
+            self.stdout.write('Rebuilt {0} grade buckets for {1}\n'.format(count, course_id))
@@ -14,8 +14,10 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 """
 from django.contrib.auth.models import User
 from django.conf import settings
-from django.db import models
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import models, transaction, IntegrityError
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 
@@ -119,6 +121,140 @@ class StudentModuleHistory(models.Model):
             history_entry.save()
 
 
+class StudentModuleGradeBucket(models.Model):
+    """
+    The number of students who have a given grade on a module.
+
+    Together, the buckets of a module are a materialized histogram of the
+    grades in StudentModule, which staff debug info shows for each problem.
+    They are updated as grades are published (see `record_grade_change`)
+    and as student modules are deleted, and can be rebuilt from
+    StudentModule for a course with the `rebuild_grade_histograms`
+    management command, which should be run once for existing courses.
+
+    Module state keys don't include the run, so the buckets are kept per
+    course id, and the histogram of a module sums those of all the runs.
+    """
+    class Meta:
+        unique_together = (('module_state_key', 'course_id', 'grade'),)
+
+    module_state_key = models.CharField(max_length=255, db_column='module_id')
+    course_id = models.CharField(max_length=255, db_index=True)
+    grade = models.FloatField()
+    count = models.IntegerField(default=0)
+
+    @staticmethod
+    def _cache_key(module_state_key):
+        """
+        Return the key under which the histogram of a module is cached.
+        """
+        return u'grade_histogram.{0}'.format(module_state_key)
+
+    @classmethod
+    def histogram(cls, module_state_key):
+        """
+        Return the sorted list of (grade, count) of the students who have
+        been graded on the module `module_state_key`, in any run of its
+        course.
+
+        The histogram is cached for GRADE_HISTOGRAM_CACHE_TIMEOUT seconds,
+        so it may lag slightly behind newly published grades.
+        """
+        key = cls._cache_key(module_state_key)
+        histogram = cache.get(key)
+        if histogram is None:
+            histogram = [
+                (row['grade'], row['students'])
+                for row in cls.objects.filter(
+                    module_state_key=module_state_key, count__gt=0
+                ).values('grade').annotate(students=Sum('count')).order_by('grade')
+            ]
+            cache.set(key, histogram, settings.GRADE_HISTOGRAM_CACHE_TIMEOUT)
+        return histogram
+
+    @classmethod
+    def record_grade_change(cls, student_module, old_grade):
+        """
+        Move the student of `student_module` from the bucket of `old_grade`
+        to the bucket of their new grade.
+        """
+        new_grade = student_module.grade
+        if old_grade == new_grade:
+            return
+        key = student_module.module_state_key
+        course_id = student_module.course_id
+        if old_grade is not None:
+            cls.remove_grade(student_module, old_grade)
+        if new_grade is not None:
+            buckets = cls.objects.filter(module_state_key=key, course_id=course_id, grade=new_grade)
+            if not buckets.update(count=F('count') + 1):
+                sid = transaction.savepoint()
+                try:
+                    cls.objects.create(
+                        module_state_key=key,
+                        course_id=course_id,
+                        grade=new_grade,
+                        count=1,
+                    )
+                    transaction.savepoint_commit(sid)
+                except IntegrityError:
+                    # the bucket was created by a concurrent request
+                    transaction.savepoint_rollback(sid)
+                    buckets.update(count=F('count') + 1)
+
+    @classmethod
+    def remove_grade(cls, student_module, grade):
+        """
+        Remove the student of `student_module` from the bucket of `grade`.
+        """
+        cls.objects.filter(
+            module_state_key=student_module.module_state_key,
+            course_id=student_module.course_id,
+            grade=grade,
+            count__gt=0,
+        ).update(count=F('count') - 1)
+
+    @classmethod
+    @transaction.commit_on_success
+    def rebuild(cls, course_id):
+        """
+        Replace the buckets of all the modules of the course `course_id` by
+        counts of the grades currently in StudentModule.
+
+        Returns the number of buckets created.
+        """
+        old_keys = set(
+            cls.objects.filter(course_id=course_id).values_list('module_state_key', flat=True)
+        )
+        cls.objects.filter(course_id=course_id).delete()
+        counts = StudentModule.objects.filter(
+            course_id=course_id, grade__isnull=False
+        ).values('module_state_key', 'grade').annotate(students=Count('id')).order_by()
+        buckets = [
+            cls(
+                module_state_key=row['module_state_key'],
+                course_id=course_id,
+                grade=row['grade'],
+                count=row['students'],
+            )
+            for row in counts
+        ]
+        cls.objects.bulk_create(buckets)
+        keys = old_keys | set(bucket.module_state_key for bucket in buckets)
+        cache.delete_many([cls._cache_key(key) for key in keys])
+        return len(buckets)
+
+
+@receiver(post_delete, sender=StudentModule)
+def remove_deleted_grade(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remove the grade of a deleted student module (e.g. when an instructor
+    deletes a student's state) from the grade histogram of its module.
+    """
+    if instance.grade is not None:
+        StudentModuleGradeBucket.remove_grade(instance, instance.grade)
+
+
 class XModuleUserStateSummaryField(models.Model):
     """
     Stores data set in the Scope.user_state_summary scope by an xmodule field
@@ -15,10 +15,12 @@ from django.core.urlresolvers import reverse
 from django.http import Http404, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 
-from capa.xqueue_interface import XQueueInterface
+from capa.xqueue_interface import XQueueInterface, AsyncXQueueInterface
 from courseware.access import has_access, get_user_role
 from courseware.masquerade import setup_masquerade
 from courseware.model_data import FieldDataCache, DjangoKeyValueStore
+from courseware.models import StudentModuleGradeBucket
+from courseware.outline import user_course_outline
 from lms.lib.xblock.field_data import LmsFieldData
 from lms.lib.xblock.runtime import LmsModuleSystem, unquote_slashes
 from edxmako.shortcuts import render_to_string
@@ -32,9 +34,8 @@ from xblock.django.request import django_to_webob_request, webob_to_django_respo
 from xmodule.error_module import ErrorDescriptor, NonStaffErrorDescriptor
 from xmodule.exceptions import NotFoundError, ProcessingError
 from xmodule.modulestore import Location
-from xmodule.modulestore.django import modulestore, ModuleI18nService
+from xmodule.modulestore.django import modulestore, ModuleI18nService, course_cache_version
 from xmodule.modulestore.exceptions import ItemNotFoundError
-from xmodule.util.duedate import get_extended_due_date
 from xmodule_modifiers import replace_course_urls, replace_jump_to_id_urls, replace_static_urls, add_staff_debug_info, wrap_xblock
 from xmodule.lti_module import LTIModule
 from xmodule.x_module import XModuleDescriptor
@@ -51,11 +52,19 @@ if settings.XQUEUE_INTERFACE.get('basic_auth') is not None:
 else:
     requests_auth = None
 
-xqueue_interface = XQueueInterface(
-    settings.XQUEUE_INTERFACE['url'],
-    settings.XQUEUE_INTERFACE['django_auth'],
-    requests_auth,
-)
+if getattr(settings, 'XQUEUE_OUTBOX', None):
+    xqueue_interface = AsyncXQueueInterface(
+        settings.XQUEUE_INTERFACE['url'],
+        settings.XQUEUE_INTERFACE['django_auth'],
+        requests_auth,
+        **settings.XQUEUE_OUTBOX
+    )
+else:
+    xqueue_interface = XQueueInterface(
+        settings.XQUEUE_INTERFACE['url'],
+        settings.XQUEUE_INTERFACE['django_auth'],
+        requests_auth,
+    )
 
 
 def make_track_function(request):
@@ -70,7 +79,7 @@ def make_track_function(request):
     return function
 
 
-def toc_for_course(user, request, course, active_chapter, active_section, field_data_cache):
+def toc_for_course(user, request, course, active_chapter, active_section):
     '''
     Create a table of contents from the module store
 
@@ -91,37 +100,36 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
     NOTE: assumes that if we got this far, user has access to course.  Returns
     None if this is not the case.
 
-    field_data_cache must include data from the course module and 2 levels of its descendents
+    The chapters and sections come from the cached course outline, so no
+    XModules are created.
     '''
-
-    course_module = get_module_for_descriptor(user, request, course, field_data_cache, course.id)
-    if course_module is None:
+    if not has_access(user, course, 'load', course.id):
         return None
 
     chapters = list()
-    for chapter in course_module.get_display_items():
-        if chapter.hide_from_toc:
+    for chapter in user_course_outline(user, course):
+        if chapter['hide_from_toc']:
             continue
 
         sections = list()
-        for section in chapter.get_display_items():
+        for section in chapter['sections']:
 
-            active = (chapter.url_name == active_chapter and
-                      section.url_name == active_section)
+            active = (chapter['url_name'] == active_chapter and
+                      section['url_name'] == active_section)
 
-            if not section.hide_from_toc:
-                sections.append({'display_name': section.display_name_with_default,
-                                 'url_name': section.url_name,
-                                 'format': section.format if section.format is not None else '',
-                                 'due': get_extended_due_date(section),
+            if not section['hide_from_toc']:
+                sections.append({'display_name': section['display_name'],
+                                 'url_name': section['url_name'],
+                                 'format': section['format'],
+                                 'due': section['due'],
                                  'active': active,
-                                 'graded': section.graded,
+                                 'graded': section['graded'],
                                  })
 
-        chapters.append({'display_name': chapter.display_name_with_default,
-                         'url_name': chapter.url_name,
+        chapters.append({'display_name': chapter['display_name'],
+                         'url_name': chapter['url_name'],
                          'sections': sections,
-                         'active': chapter.url_name == active_chapter})
+                         'active': chapter['url_name'] == active_chapter})
     return chapters
 
 
@@ -309,11 +317,13 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
         )
 
         student_module = field_data_cache.find_or_create(key)
+        old_grade = student_module.grade
         # Update the grades
         student_module.grade = event.get('value')
         student_module.max_grade = event.get('max_value')
         # Save all changes to the underlying KeyValueStore
         student_module.save()
+        StudentModuleGradeBucket.record_grade_change(student_module, old_grade)
 
         # Bin score into range and increment stats
         score_bucket = get_score_bucket(student_module.grade, student_module.max_grade)
@@ -367,9 +377,28 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
         reverse('jump_to_id', kwargs={'course_id': course_id, 'module_id': ''}),
     ))
 
+    staff_debug_info = False
     if settings.FEATURES.get('DISPLAY_DEBUG_INFO_TO_STAFF'):
         if has_access(user, descriptor, 'staff', course_id):
             block_wrappers.append(partial(add_staff_debug_info, user))
+            staff_debug_info = True
+
+    # The output of the wrappers above only depends on the course and the
+    # static asset path, except for the staff debug info, so user-independent
+    # views can be cached per block, course version and wrapper configuration.
+    # The key is only built for the blocks which can use it, as reading the
+    # course version costs a cache lookup.
+    get_fragment_cache_key = None
+    if settings.FEATURES.get('ENABLE_XBLOCK_FRAGMENT_CACHE') and not staff_debug_info:
+        def get_fragment_cache_key():
+            """Return the fragment cache key of this block's user-independent views"""
+            return u'xblock_fragment.{0}.{1}.{2}.{3}.{4}'.format(
+                course_id,
+                course_cache_version(course_id),
+                descriptor.location.url(),
+                wrap_xmodule_display,
+                static_asset_path or descriptor.static_asset_path,
+            )
 
     # These modules store data using the anonymous_student_id as a key.
     # To prevent loss of data, we will continue to provide old modules with
@@ -431,6 +460,7 @@ def get_module_for_descriptor_internal(user, descriptor, field_data_cache, cours
         },
         get_user_role=lambda: get_user_role(user, course_id),
         descriptor_runtime=descriptor.runtime,
+        get_fragment_cache_key=get_fragment_cache_key,
     )
 
     # pass position specified in URL to module through ModuleSystem
@@ -0,0 +1,158 @@
+"""
+A user-independent outline of a course's chapters and sections.
+
+Building the courseware navigation used to mean instantiating an XModule
+for every chapter and section and running has_access on each of them.
+Instead, the outline (ids, display names, dates and flags of the first two
+levels of the course) is computed once per course version and cached, and
+only a cheap per-user pass is done on each request to apply start dates,
+beta tester offsets, extended due dates and staff visibility.
+"""
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import UTC
+
+from courseware.access import has_access
+from courseware.masquerade import is_masquerading_as_student
+from courseware.models import StudentModule
+from student.roles import CourseBetaTesterRole
+from xblock.fields import Date
+from xmodule.modulestore.django import course_cache_version, modulestore
+from xmodule.util.duedate import get_extended_due_date
+
+DATE_FIELD = Date()
+
+
+def _outline_node(descriptor):
+    """
+    Return the outline entry for a chapter or section descriptor.
+    """
+    return {
+        'location': descriptor.location.url(),
+        'url_name': descriptor.url_name,
+        'display_name': descriptor.display_name_with_default,
+        'format': descriptor.format if descriptor.format is not None else '',
+        'start': descriptor.start,
+        'days_early_for_beta': descriptor.days_early_for_beta,
+        'detached': 'detached' in descriptor._class_tags,  # pylint: disable=protected-access
+        'due': descriptor.due,
+        'graded': descriptor.graded,
+        'hide_from_toc': descriptor.hide_from_toc,
+    }
+
+
+def build_course_outline(course):
+    """
+    Compute the outline of `course`, which must have been loaded with
+    depth of at least 2.
+
+    Returns a list of chapter dicts (see `_outline_node`), each with a
+    'sections' list of section dicts.
+    """
+    chapters = []
+    for chapter in course.get_display_items():
+        chapter_node = _outline_node(chapter)
+        chapter_node['sections'] = [_outline_node(section) for section in chapter.get_display_items()]
+        chapters.append(chapter_node)
+    return chapters
+
+
+def get_course_outline(course):
+    """
+    Return the outline of `course`, from the cache if it has already been
+    computed for the current version of the course. Otherwise the course is
+    read again with depth 2 to compute it, so `course` may have been loaded
+    with any depth.
+    """
+    key = u'course_outline.{0}.{1}'.format(course.id, course_cache_version(course.id))
+    outline = cache.get(key)
+    if outline is None:
+        outline = build_course_outline(modulestore().get_instance(course.id, course.location, depth=2))
+        cache.set(key, outline)
+    return outline
+
+
+def _extended_due_dates(user, course_id):
+    """
+    Return a dict of section location to the extended due date granted to
+    `user`, read with a single query.
+    """
+    extended = {}
+    student_modules = StudentModule.objects.filter(
+        student_id=user.id,
+        course_id=course_id,
+        module_type='sequential',
+        state__contains='extended_due',
+    ).values_list('module_state_key', 'state')
+    for module_state_key, state in student_modules:
+        try:
+            extended_due = json.loads(state).get('extended_due')
+        except ValueError:
+            continue
+        if extended_due:
+            extended[module_state_key] = DATE_FIELD.from_json(extended_due)
+    return extended
+
+
+def user_course_outline(user, course, outline=None):
+    """
+    Filter the outline of `course` down to the chapters and sections that
+    `user` can currently load, applying the same start date rules as
+    `courseware.access.has_access`, and attach each section's effective due
+    date for the user as 'due'.
+
+    Nodes hidden from the table of contents are kept (with their
+    'hide_from_toc' flag), as they are still reachable by url.
+    """
+    if outline is None:
+        outline = get_course_outline(course)
+
+    ignore_start_dates = settings.FEATURES['DISABLE_START_DATES'] and not is_masquerading_as_student(user)
+    is_staff = has_access(user, course, 'staff')
+    # The beta testers role is only looked up if the course uses it
+    beta_tester = []
+    now = datetime.now(UTC())
+
+    def is_beta_tester():
+        """
+        Return whether the user is a beta tester of the course, memoized.
+        """
+        if not beta_tester:
+            beta_tester.append(CourseBetaTesterRole(course.location, course_context=course.id).has_user(user))
+        return beta_tester[0]
+
+    def can_load(node):
+        """
+        Return whether the node has started for the user.
+        """
+        if ignore_start_dates or is_staff or node['detached'] or node['start'] is None:
+            return True
+        start = node['start']
+        if node['days_early_for_beta'] is not None and is_beta_tester():
+            start -= timedelta(node['days_early_for_beta'])
+        return now > start
+
+    extended_due_dates = None
+    chapters = []
+    for chapter in outline:
+        if not can_load(chapter):
+            continue
+        sections = []
+        for section in chapter['sections']:
+            if not can_load(section):
+                continue
+            if section['due'] is not None and extended_due_dates is None:
+                extended_due_dates = _extended_due_dates(user, course.id)
+            section = dict(section)
+            section['due'] = get_extended_due_date({
+                'due': section['due'],
+                'extended_due': (extended_due_dates or {}).get(section['location']),
+            })
+            sections.append(section)
+        chapter = dict(chapter)
+        chapter['sections'] = sections
+        chapters.append(chapter)
+    return chapters
@@ -1,14 +1,16 @@
 import courseware.access as access
 import datetime
 
-from mock import Mock
+from mock import Mock, patch
 
 from django.test import TestCase
 from django.test.utils import override_settings
 
 from courseware.tests.factories import UserFactory, CourseEnrollmentAllowedFactory, StaffFactory, InstructorFactory
+from student.roles import CourseInstructorRole
 from student.tests.factories import AnonymousUserFactory
 from xmodule.modulestore import Location
+from xmodule.modulestore.django import loc_mapper
 from courseware.tests.tests import TEST_DATA_MIXED_MODULESTORE
 import pytz
 
@@ -99,6 +101,28 @@ class AccessTestCase(TestCase):
         # TODO:
         # Non-staff cannot enroll outside the open enrollment period if not specifically allowed
 
+    def test__has_access_to_location_remembered_per_course(self):
+        """
+        Staff checks on many blocks of a course resolve the user's roles once
+        """
+        locations = [self.course.replace(category='problem', name='p{0}'.format(i)) for i in range(10)]
+        with patch('student.roles.loc_mapper', wraps=loc_mapper) as mock_loc_mapper:
+            with self.assertNumQueries(1):
+                for location in locations:
+                    self.assertTrue(access._has_staff_access_to_location(
+                        self.course_staff, location, self.course.course_id
+                    ))
+                    self.assertFalse(access._has_instructor_access_to_location(
+                        self.course_staff, location, self.course.course_id
+                    ))
+        self.assertEqual(mock_loc_mapper.call_count, 1)
+
+        # Changing the user's roles forgets the decisions
+        CourseInstructorRole(self.course).add_users(self.course_staff)
+        self.assertTrue(access._has_instructor_access_to_location(
+            self.course_staff, locations[0], self.course.course_id
+        ))
+
     def test__user_passed_as_none(self):
         """Ensure has_access handles a user being passed as null"""
         access.has_access(None, 'global', 'staff', None)
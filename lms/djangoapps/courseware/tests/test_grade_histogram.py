@@ -0,0 +1,92 @@
+"""
+Tests of the grade histograms shown in staff debug info.
+"""
+from StringIO import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from courseware.models import StudentModuleGradeBucket
+from courseware.tests.factories import StudentModuleFactory
+from xmodule_modifiers import grade_histogram
+
+COURSE_ID = 'edX/histogram/2014'
+OTHER_RUN_ID = 'edX/histogram/2015'
+MODULE_ID = 'i4x://edX/histogram/problem/p1'
+
+
+class GradeHistogramTest(TestCase):
+    """
+    Check that the grade buckets follow published grades, and can be rebuilt.
+    """
+    def setUp(self):
+        cache.clear()
+
+    def publish(self, student_module, grade):
+        """
+        Give `student_module` the grade `grade`, as module_render's publish does.
+        """
+        old_grade = student_module.grade
+        student_module.grade = grade
+        student_module.save()
+        StudentModuleGradeBucket.record_grade_change(student_module, old_grade)
+
+    def make_module(self, grade=None, course_id=COURSE_ID):
+        """
+        Return the student module of a new student on the problem.
+        """
+        return StudentModuleFactory.create(
+            course_id=course_id, module_state_key=MODULE_ID, grade=grade, max_grade=2
+        )
+
+    def test_published_grades(self):
+        first, second, third = self.make_module(), self.make_module(), self.make_module()
+        self.publish(first, 1)
+        self.publish(second, 1)
+        self.publish(third, 2)
+        self.publish(first, 2)
+        self.publish(first, 2)
+        self.assertEqual(grade_histogram(MODULE_ID), [(1.0, 1), (2.0, 2)])
+
+    def test_histogram_cached(self):
+        self.publish(self.make_module(), 1)
+        self.assertEqual(grade_histogram(MODULE_ID), [(1.0, 1)])
+        self.publish(self.make_module(), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(grade_histogram(MODULE_ID), [(1.0, 1)])
+        cache.clear()
+        self.assertEqual(grade_histogram(MODULE_ID), [(1.0, 2)])
+
+    def test_rebuild_command(self):
+        # grades set without publishing, as by a data migration
+        self.make_module(grade=0)
+        self.make_module(grade=2)
+        self.make_module(grade=2)
+        self.make_module()
+        self.assertEqual(grade_histogram(MODULE_ID), [])
+
+        out = StringIO()
+        call_command('rebuild_grade_histograms', COURSE_ID, stdout=out)
+        self.assertIn('Rebuilt 2 grade buckets', out.getvalue())
+        self.assertEqual(grade_histogram(MODULE_ID), [(0.0, 1), (2.0, 2)])
+
+    def test_runs(self):
+        # the module state key is the same in every run of the course
+        self.publish(self.make_module(), 1)
+        self.publish(self.make_module(course_id=OTHER_RUN_ID), 1)
+        self.publish(self.make_module(course_id=OTHER_RUN_ID), 2)
+        self.assertEqual(grade_histogram(MODULE_ID), [(1.0, 2), (2.0, 1)])
+
+        # rebuilding a run leaves the buckets of the others alone
+        call_command('rebuild_grade_histograms', COURSE_ID, stdout=StringIO())
+        self.assertEqual(grade_histogram(MODULE_ID), [(1.0, 2), (2.0, 1)])
+
+    def test_deleted_module(self):
+        first, second = self.make_module(), self.make_module()
+        self.publish(first, 1)
+        self.publish(second, 2)
+        # as when an instructor deletes a student's state
+        first.delete()
+        cache.clear()
+        self.assertEqual(grade_histogram(MODULE_ID), [(2.0, 1)])
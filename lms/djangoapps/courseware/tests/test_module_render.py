@@ -9,6 +9,7 @@ import json
 from django.http import Http404, HttpResponse
 from django.core.urlresolvers import reverse
 from django.conf import settings
+from django.core.cache import cache
 from django.test import TestCase
 from django.test.client import RequestFactory
 from django.test.utils import override_settings
@@ -319,9 +320,6 @@ class TestTOC(TestCase):
         chapter_url = '%s/%s/%s' % ('/courses', self.course_name, chapter)
         factory = RequestFactory()
         request = factory.get(chapter_url)
-        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-            self.toy_course.id, self.portal_user, self.toy_course, depth=2)
-
         expected = ([{'active': True, 'sections':
                       [{'url_name': 'Toy_Videos', 'display_name': u'Toy Videos', 'graded': True,
                         'format': u'Lecture Sequence', 'due': None, 'active': False},
@@ -337,7 +335,7 @@ class TestTOC(TestCase):
                         'format': '', 'due': None, 'active': False}],
                       'url_name': 'secret:magic', 'display_name': 'secret:magic'}])
 
-        actual = render.toc_for_course(self.portal_user, request, self.toy_course, chapter, None, field_data_cache)
+        actual = render.toc_for_course(self.portal_user, request, self.toy_course, chapter, None)
         for toc_section in expected:
             self.assertIn(toc_section, actual)
 
@@ -347,9 +345,6 @@ class TestTOC(TestCase):
         section = 'Welcome'
         factory = RequestFactory()
         request = factory.get(chapter_url)
-        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-            self.toy_course.id, self.portal_user, self.toy_course, depth=2)
-
         expected = ([{'active': True, 'sections':
                       [{'url_name': 'Toy_Videos', 'display_name': u'Toy Videos', 'graded': True,
                         'format': u'Lecture Sequence', 'due': None, 'active': False},
@@ -365,7 +360,7 @@ class TestTOC(TestCase):
                         'format': '', 'due': None, 'active': False}],
                       'url_name': 'secret:magic', 'display_name': 'secret:magic'}])
 
-        actual = render.toc_for_course(self.portal_user, request, self.toy_course, chapter, section, field_data_cache)
+        actual = render.toc_for_course(self.portal_user, request, self.toy_course, chapter, section)
         for toc_section in expected:
             self.assertIn(toc_section, actual)
 
@@ -509,6 +504,68 @@ class TestHtmlModifiers(ModuleStoreTestCase):
         )
 
 
+@override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_XBLOCK_FRAGMENT_CACHE': True})
+class TestXBlockFragmentCache(ModuleStoreTestCase):
+    """
+    Tests that user-independent student views are rendered once and then
+    served from the fragment cache
+    """
+    def setUp(self):
+        cache.clear()
+        self.course = CourseFactory.create()
+        self.descriptor = ItemFactory.create(
+            category='html',
+            data='<p>This is the content</p><a href="/static/foo/content">Test rewrite</a>'
+        )
+
+    def _render(self, user, descriptor=None):
+        """
+        Render the student view of `descriptor` (by default the html module) for `user`
+        """
+        descriptor = descriptor or self.descriptor
+        request = RequestFactory().get('/')
+        request.user = user
+        request.session = {}
+        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(self.course.id, user, descriptor)
+        module = render.get_module(user, request, descriptor.location, field_data_cache, self.course.id)
+        return module.render('student_view').content
+
+    def test_cached_for_all_users(self):
+        first = self._render(UserFactory.create())
+        with patch('xmodule.html_module.HtmlModule.get_html') as mock_get_html:
+            second = self._render(UserFactory.create())
+        self.assertFalse(mock_get_html.called)
+        self.assertEqual(first, second)
+        self.assertIn('/c4x/', second)
+
+    def test_user_dependent_html_not_cached(self):
+        self.descriptor.data = '<p>%%USER_ID%%</p>'
+        modulestore().update_item(self.descriptor, '**replace_user**')
+        self.assertNotEqual(self._render(UserFactory.create()), self._render(UserFactory.create()))
+
+    def test_invalidated_on_update(self):
+        self.assertIn('This is the content', self._render(UserFactory.create()))
+        self.descriptor.data = '<p>New content</p>'
+        modulestore().update_item(self.descriptor, '**replace_user**')
+        self.assertIn('New content', self._render(UserFactory.create()))
+
+    def test_key_only_built_for_independent_blocks(self):
+        problem = ItemFactory.create(category='problem')
+        with patch('courseware.module_render.course_cache_version') as mock_course_cache_version:
+            self._render(UserFactory.create(), problem)
+        self.assertFalse(mock_course_cache_version.called)
+
+    @patch.dict('django.conf.settings.FEATURES', {'DISPLAY_DEBUG_INFO_TO_STAFF': True})
+    @patch('courseware.module_render.has_access', Mock(return_value=True))
+    def test_not_cached_with_staff_debug_info(self):
+        self._render(UserFactory.create(is_staff=True))
+        with patch('xmodule.html_module.HtmlModule.get_html') as mock_get_html:
+            mock_get_html.return_value = ''
+            self._render(UserFactory.create(is_staff=True))
+        self.assertTrue(mock_get_html.called)
+
+
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
 @patch.dict('django.conf.settings.FEATURES', {'DISPLAY_DEBUG_INFO_TO_STAFF': True, 'DISPLAY_HISTOGRAMS_TO_STAFF': True})
 @patch('courseware.module_render.has_access', Mock(return_value=True))
@@ -0,0 +1,110 @@
+"""
+Tests for the cached course outline and its per-user filtering.
+"""
+import datetime
+import json
+
+from mock import patch
+from pytz import UTC
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+from courseware import outline
+from courseware.tests.factories import BetaTesterFactory, StaffFactory, StudentModuleFactory, UserFactory
+from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
+
+
+@override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
+@patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+class CourseOutlineTest(ModuleStoreTestCase):
+    """
+    Check that the outline is built once per course version, and filtered
+    for each user.
+    """
+    def setUp(self):
+        cache.clear()
+        now = datetime.datetime.now(UTC)
+        self.past = now - datetime.timedelta(days=10)
+        self.future = now + datetime.timedelta(days=10)
+        self.due = now + datetime.timedelta(days=20)
+
+        self.course = CourseFactory.create(start=self.past)
+        self.open_chapter = ItemFactory.create(
+            parent_location=self.course.location, category='chapter', display_name='Open', start=self.past
+        )
+        self.open_section = ItemFactory.create(
+            parent_location=self.open_chapter.location, category='sequential', display_name='Homework',
+            start=self.past, due=self.due, graded=True, format='Homework'
+        )
+        self.later_section = ItemFactory.create(
+            parent_location=self.open_chapter.location, category='sequential', start=self.future,
+        )
+        self.beta_chapter = ItemFactory.create(
+            parent_location=self.course.location, category='chapter', start=self.future,
+            days_early_for_beta=20,
+        )
+        self.course = modulestore().get_instance(self.course.id, self.course.location, depth=2)
+
+    def _url_names(self, user):
+        """
+        Return the url names of the chapters and sections `user` can see.
+        """
+        names = []
+        for chapter in outline.user_course_outline(user, self.course):
+            names.append(chapter['url_name'])
+            names.extend(section['url_name'] for section in chapter['sections'])
+        return names
+
+    def test_outline_fields(self):
+        chapter = outline.get_course_outline(self.course)[0]
+        self.assertEqual(chapter['display_name'], 'Open')
+        section = chapter['sections'][0]
+        self.assertEqual(section['location'], self.open_section.location.url())
+        self.assertEqual(section['format'], 'Homework')
+        self.assertEqual(section['due'], self.due)
+        self.assertTrue(section['graded'])
+
+    def test_outline_cached_per_course_version(self):
+        outline.get_course_outline(self.course)
+        with patch('courseware.outline.build_course_outline') as mock_build:
+            outline.get_course_outline(self.course)
+        self.assertFalse(mock_build.called)
+
+        self.open_chapter.display_name = 'Renamed'
+        modulestore().update_item(self.open_chapter, '**replace_user**')
+        self.assertEqual(outline.get_course_outline(self.course)[0]['display_name'], 'Renamed')
+
+    def test_student_sees_started_nodes(self):
+        self.assertEqual(
+            self._url_names(UserFactory.create()),
+            [self.open_chapter.url_name, self.open_section.url_name]
+        )
+
+    def test_staff_sees_everything(self):
+        staff = StaffFactory.create(course=self.course.location)
+        self.assertEqual(len(self._url_names(staff)), 4)
+
+    def test_beta_tester_sees_early_nodes(self):
+        beta_tester = BetaTesterFactory.create(course=self.course.location)
+        self.assertIn(self.beta_chapter.url_name, self._url_names(beta_tester))
+        self.assertNotIn(self.later_section.url_name, self._url_names(beta_tester))
+
+    def test_extended_due_date(self):
+        user = UserFactory.create()
+        extended_due = self.due + datetime.timedelta(days=3)
+        StudentModuleFactory.create(
+            student=user,
+            course_id=self.course.id,
+            module_type='sequential',
+            module_state_key=self.open_section.location.url(),
+            state=json.dumps({'extended_due': extended_due.isoformat()}),
+        )
+        section = outline.user_course_outline(user, self.course)[0]['sections'][0]
+        self.assertEqual(section['due'], extended_due)
+        other_section = outline.user_course_outline(UserFactory.create(), self.course)[0]['sections'][0]
+        self.assertEqual(other_section['due'], self.due)
@@ -934,6 +934,24 @@ class TestAnswerDistributions(TestSubmittingProblems):
             }
         )
 
+    def test_batches(self):
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        self.submit_question_answer('p2', {'2_1': u'Incorrect'})
+        self.submit_question_answer('p3', {'2_1': u'Correct'})
+
+        progress = []
+        with patch('courseware.grades.ANSWER_DISTRIBUTION_BATCH_SIZE', 2):
+            with patch('courseware.grades.modulestore', wraps=grades.modulestore) as mock_modulestore:
+                distributions = grades.answer_distributions(self.course.id, progress.append)
+        self.assertEqual(len(distributions), 3)
+        self.assertEqual(progress, [2, 3])
+        # the problems are all resolved from one load of the course tree
+        self.assertEqual(mock_modulestore.call_count, 1)
+
+        rows = list(grades.answer_distribution_rows(self.course.id))
+        self.assertEqual(rows[0], ['url_name', 'display name', 'answer id', 'answer', 'count'])
+        self.assertEqual(rows[1], ['p1', 'p1', 'i4x-MITx-100-problem-p1_2_1', 'Correct', 1])
+
     def test_other_data_types(self):
         # We'll submit one problem, and then muck with the student_answers
         # dict inside its state to try different data types (str, int, float,
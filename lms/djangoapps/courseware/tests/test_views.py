@@ -14,6 +14,7 @@ from django.contrib.auth.models import User, AnonymousUser
 from django.test.client import RequestFactory
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 
 from student.models import CourseEnrollment
@@ -21,7 +22,7 @@ from student.tests.factories import AdminFactory
 from edxmako.middleware import MakoMiddleware
 
 from xmodule.modulestore import Location
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import modulestore, location_index
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from student.tests.factories import UserFactory
@@ -70,6 +71,30 @@ class TestJumpTo(TestCase):
         response = self.client.get(jumpto_url)
         self.assertEqual(response.status_code, 404)
 
+    def test_jumpto_uses_location_index(self):
+        location = Location('i4x', 'edX', 'toy', 'chapter', 'Overview')
+        jumpto_url = '{0}/{1}/jump_to/{2}'.format('/courses', self.course_name, location)
+        expected = 'courses/edX/toy/2012_Fall/courseware/Overview/'
+        with patch('courseware.views.path_to_location') as mock_path_to_location:
+            response = self.client.get(jumpto_url)
+        self.assertFalse(mock_path_to_location.called)
+        self.assertRedirects(response, expected, status_code=302, target_status_code=302)
+
+    @patch('xmodule.modulestore.django.LOCATION_INDEX_MAX_BYTES', 0)
+    def test_jumpto_without_location_index(self):
+        # the course is too large to be indexed
+        cache.clear()
+        self.assertIsNone(location_index(self.course_name))
+
+        location = Location('i4x', 'edX', 'toy', 'chapter', 'Overview')
+        expected = 'courses/edX/toy/2012_Fall/courseware/Overview/'
+        for jumpto_url in [
+            '{0}/{1}/jump_to/{2}'.format('/courses', self.course_name, location),
+            '{0}/{1}/jump_to_id/{2}'.format('/courses', self.course_name, location.name),
+        ]:
+            response = self.client.get(jumpto_url)
+            self.assertRedirects(response, expected, status_code=302, target_status_code=302)
+
 
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
 class ViewsTestCase(TestCase):
@@ -136,9 +161,24 @@ class ViewsTestCase(TestCase):
         mock_module = MagicMock()
         mock_module.descriptor.id = 'Underwater Basketweaving'
         mock_module.position = 3
-        mock_module.get_display_items.return_value = []
         self.assertRaises(Http404, views.redirect_to_course_position,
-                          mock_module)
+                          mock_module, [])
+
+    def test_redirect_to_course_position_from_outline(self):
+        mock_module = MagicMock()
+        mock_module.id = 'edX/toy/2012_Fall'
+        mock_module.position = None
+        outline = [
+            {'url_name': 'Overview', 'sections': [{'url_name': 'Welcome'}]},
+            {'url_name': 'Second', 'sections': []},
+        ]
+        # a first visit goes to the first section
+        self.assertTrue(
+            views.redirect_to_course_position(mock_module, outline)['Location'].endswith('/Overview/Welcome/')
+        )
+        # later visits go to the current chapter
+        mock_module.position = 2
+        self.assertTrue(views.redirect_to_course_position(mock_module, outline)['Location'].endswith('/Second/'))
 
     def test_registered_for_course(self):
         self.assertFalse(views.registered_for_course('Basketweaving', None))
@@ -368,7 +408,7 @@ class TestAccordionDueDate(BaseDueDateTests):
     def get_text(self, course):
         """ Returns the HTML for the accordion """
         return views.render_accordion(
-            self.request, course, course.get_children()[0].id, None, None
+            self.request, course, course.get_children()[0].id, None
         )
 
 
@@ -24,6 +24,7 @@ import courseware.tabs as tabs
 from courseware.masquerade import setup_masquerade
 from courseware.model_data import FieldDataCache
 from .module_render import toc_for_course, get_module_for_descriptor
+from courseware.outline import user_course_outline
 from courseware.models import StudentModule, StudentModuleHistory
 from course_modes.models import CourseMode
 
@@ -32,9 +33,9 @@ from student.views import course_from_id, single_course_reverification_info
 from util.cache import cache, cache_if_anonymous
 from xblock.fragment import Fragment
 from xmodule.modulestore import Location
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import modulestore, location_index
 from xmodule.modulestore.exceptions import InvalidLocationError, ItemNotFoundError, NoPathToItem
-from xmodule.modulestore.search import path_to_location
+from xmodule.modulestore.search import path_to_location, path_from_location_index
 from xmodule.course_module import CourseDescriptor
 import shoppingcart
 
@@ -79,7 +80,7 @@ def courses(request):
     return render_to_response("courseware/courses.html", {'courses': courses})
 
 
-def render_accordion(request, course, chapter, section, field_data_cache):
+def render_accordion(request, course, chapter, section):
     """
     Draws navigation bar. Takes current position in accordion as
     parameter.
@@ -94,7 +95,7 @@ def render_accordion(request, course, chapter, section, field_data_cache):
     # grab the table of contents
     user = User.objects.prefetch_related("groups").get(id=request.user.id)
     request.user = user	# keep just one instance of User
-    toc = toc_for_course(user, request, course, chapter, section, field_data_cache)
+    toc = toc_for_course(user, request, course, chapter, section)
 
     context = dict([('toc', toc),
                     ('course_id', course.id),
@@ -129,7 +130,7 @@ def get_current_child(xmodule):
     return child
 
 
-def redirect_to_course_position(course_module):
+def redirect_to_course_position(course_module, outline):
     """
     Return a redirect to the user's current place in the course.
 
@@ -141,23 +142,31 @@ def redirect_to_course_position(course_module):
     If there is no current position in the course or chapter, then selects
     the first child.
 
+    `outline` is the user's course outline (see
+    `courseware.outline.user_course_outline`), which lists the chapters
+    and sections in the order of the modules' display items.
     """
     urlargs = {'course_id': course_module.id}
-    chapter = get_current_child(course_module)
-    if chapter is None:
+    position = (course_module.position or 1) - 1
+    if 0 <= position < len(outline):
+        chapter = outline[position]
+    elif outline:
+        # Something is wrong.  Default to first chapter
+        chapter = outline[0]
+    else:
         # oops.  Something bad has happened.
         raise Http404("No chapter found when loading current position in course")
 
-    urlargs['chapter'] = chapter.url_name
+    urlargs['chapter'] = chapter['url_name']
     if course_module.position is not None:
         return redirect(reverse('courseware_chapter', kwargs=urlargs))
 
-    # Relying on default of returning first child
-    section = get_current_child(chapter)
-    if section is None:
+    # A first visit has no position in the chapter either, so the first
+    # section is the current one
+    if not chapter['sections']:
         raise Http404("No section found when loading current position in course")
 
-    urlargs['section'] = section.url_name
+    urlargs['section'] = chapter['sections'][0]['url_name']
     return redirect(reverse('courseware_section', kwargs=urlargs))
 
 
@@ -233,7 +242,9 @@ def index(request, course_id, chapter=None, section=None,
     """
     user = User.objects.prefetch_related("groups").get(id=request.user.id)
     request.user = user  # keep just one instance of User
-    course = get_course_with_access(user, course_id, 'load', depth=2)
+    # the navigation comes from the cached course outline, so only the
+    # course and the active chapter and section are loaded
+    course = get_course_with_access(user, course_id, 'load', depth=0)
     staff_access = has_access(user, course, 'staff')
     registered = registered_for_course(course, user)
     if not registered:
@@ -245,7 +256,7 @@ def index(request, course_id, chapter=None, section=None,
 
     try:
         field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-            course.id, user, course, depth=2)
+            course.id, user, course, depth=0)
 
         course_module = get_module_for_descriptor(user, request, course, field_data_cache, course.id)
         if course_module is None:
@@ -253,12 +264,13 @@ def index(request, course_id, chapter=None, section=None,
                         u' far, should have gotten a course module for this user')
             return redirect(reverse('about_course', args=[course.id]))
 
+        outline = user_course_outline(user, course)
         if chapter is None:
-            return redirect_to_course_position(course_module)
+            return redirect_to_course_position(course_module, outline)
 
         context = {
             'csrf': csrf(request)['csrf_token'],
-            'accordion': render_accordion(request, course, chapter, section, field_data_cache),
+            'accordion': render_accordion(request, course, chapter, section),
             'COURSE_TITLE': course.display_name_with_default,
             'course': course,
             'init': '',
@@ -281,13 +293,29 @@ def index(request, course_id, chapter=None, section=None,
 
         context['show_chat'] = show_chat
 
-        chapter_descriptor = course.get_child_by(lambda m: m.url_name == chapter)
-        if chapter_descriptor is not None:
-            save_child_position(course_module, chapter)
-        else:
+        chapter_node = None
+        for position, node in enumerate(outline, start=1):
+            if node['url_name'] == chapter:
+                chapter_node = node
+                # save the position of the chapter, as save_child_position does
+                if position != course_module.position:
+                    course_module.position = position
+                course_module.save()
+                break
+
+        chapter_module = None
+        if chapter_node is not None:
+            chapter_descriptor = modulestore().get_instance(
+                course.id, Location(chapter_node['location']), depth=1
+            )
+            chapter_field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+                course.id, user, chapter_descriptor, depth=1)
+            chapter_module = get_module_for_descriptor(
+                user, request, chapter_descriptor, chapter_field_data_cache, course.id
+            )
+        elif not any(Location(child).name == chapter for child in course.children):
             raise Http404('No chapter descriptor found with name {}'.format(chapter))
 
-        chapter_module = course_module.get_child_by(lambda m: m.url_name == chapter)
         if chapter_module is None:
             # User may be trying to access a chapter that isn't live yet
             if masq=='student':  # if staff is masquerading as student be kinder, don't 404
@@ -381,6 +409,23 @@ def index(request, course_id, chapter=None, section=None,
     return result
 
 
+def _path_to_location(course_id, location):
+    """
+    Return the path of `location` in the course `course_id` from the
+    course's cached location index, or None if it isn't indexed (an unknown
+    or malformed course id, a course too large to be indexed, or a location
+    outside of the course tree), in
+    which case path_to_location gives the answer or the error.
+    """
+    try:
+        index = location_index(course_id)
+    except (ItemNotFoundError, ValueError):
+        return None
+    if index is None:
+        return None
+    return path_from_location_index(index, location)
+
+
 @ensure_csrf_cookie
 def jump_to_id(request, course_id, module_id):
     """
@@ -388,21 +433,30 @@ def jump_to_id(request, course_id, module_id):
     passed in. This assumes that id is unique within the course_id namespace
     """
 
-    course_location = CourseDescriptor.id_to_location(course_id)
-
-    items = modulestore().get_items(
-        Location('i4x', course_location.org, course_location.course, None, module_id),
-        course_id=course_id
-    )
+    try:
+        index = location_index(course_id)
+    except (ItemNotFoundError, ValueError):
+        index = None
+    locations = index['names'].get(module_id) if index is not None else None
+
+    if not locations:
+        # Not in the course tree (e.g. an orphan) or the course is too large
+        # to be indexed, so search the modulestore
+        course_location = CourseDescriptor.id_to_location(course_id)
+        items = modulestore().get_items(
+            Location('i4x', course_location.org, course_location.course, None, module_id),
+            course_id=course_id
+        )
+        locations = [item.location.url() for item in items]
 
-    if len(items) == 0:
+    if len(locations) == 0:
         raise Http404("Could not find id = {0} in course_id = {1}. Referer = {2}".
                       format(module_id, course_id, request.META.get("HTTP_REFERER", "")))
-    if len(items) > 1:
+    if len(locations) > 1:
         log.warning("Multiple items found with id = {0} in course_id = {1}. Referer = {2}. Using first found {3}...".
-                    format(module_id, course_id, request.META.get("HTTP_REFERER", ""), items[0].location.url()))
+                    format(module_id, course_id, request.META.get("HTTP_REFERER", ""), locations[0]))
 
-    return jump_to(request, course_id, items[0].location.url())
+    return jump_to(request, course_id, locations[0])
 
 
 @ensure_csrf_cookie
@@ -423,7 +477,10 @@ def jump_to(request, course_id, location):
 
     # Complain if there's not data for this location
     try:
-        (course_id, chapter, section, position) = path_to_location(modulestore(), course_id, location)
+        path = _path_to_location(course_id, location)
+        if path is None:
+            path = path_to_location(modulestore(), course_id, location)
+        (course_id, chapter, section, position) = path
     except ItemNotFoundError:
         raise Http404(u"No data at this location: {0}".format(location))
     except NoPathToItem:
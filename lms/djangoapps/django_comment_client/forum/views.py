@@ -1,6 +1,7 @@
 import json
 import logging
 import xml.sax.saxutils as saxutils
+from functools import partial
 
 from django.contrib.auth.decorators import login_required
 from django.http import Http404
@@ -105,6 +106,7 @@ def get_threads(request, course_id, discussion_id=None, per_page=THREADS_PER_PAG
 
 
 @login_required
+@cc.utils.coalesce_requests
 def inline_discussion(request, course_id, discussion_id):
     """
     Renders JSON for DiscussionModules
@@ -161,6 +163,7 @@ def inline_discussion(request, course_id, discussion_id):
 
 
 @login_required
+@cc.utils.coalesce_requests
 def forum_form_discussion(request, course_id):
     """
     Renders the main Discussion page, potentially filtered by a search query
@@ -232,21 +235,25 @@ def forum_form_discussion(request, course_id):
 
 @require_GET
 @login_required
+@cc.utils.coalesce_requests
 def single_thread(request, course_id, discussion_id, thread_id):
     nr_transaction = newrelic.agent.current_transaction()
 
     course = get_course_with_access(request.user, course_id, 'load_forum')
     cc_user = cc.User.from_django_user(request.user)
-    user_info = cc_user.to_dict()
 
     # Currently, the front end always loads responses via AJAX, even for this
     # page; it would be a nice optimization to avoid that extra round trip to
     # the comments service.
-    thread = cc.Thread.find(thread_id).retrieve(
-        recursive=request.is_ajax(),
-        user_id=request.user.id,
-        response_skip=request.GET.get("resp_skip"),
-        response_limit=request.GET.get("resp_limit")
+    user_info, thread = cc.utils.perform_concurrently(
+        cc_user.to_dict,
+        partial(
+            cc.Thread.find(thread_id).retrieve,
+            recursive=request.is_ajax(),
+            user_id=request.user.id,
+            response_skip=request.GET.get("resp_skip"),
+            response_limit=request.GET.get("resp_limit")
+        ),
     )
 
     if request.is_ajax():
@@ -322,6 +329,7 @@ def single_thread(request, course_id, discussion_id, thread_id):
 
 
 @login_required
+@cc.utils.coalesce_requests
 def user_profile(request, course_id, user_id):
     nr_transaction = newrelic.agent.current_transaction()
 
@@ -335,10 +343,12 @@ def user_profile(request, course_id, user_id):
             'per_page': THREADS_PER_PAGE,   # more than threads_per_page to show more activities
         }
 
-        threads, page, num_pages = profiled_user.active_threads(query_params)
+        (threads, page, num_pages), user_info = cc.utils.perform_concurrently(
+            partial(profiled_user.active_threads, query_params),
+            cc.User.from_django_user(request.user).to_dict,
+        )
         query_params['page'] = page
         query_params['num_pages'] = num_pages
-        user_info = cc.User.from_django_user(request.user).to_dict()
 
         with newrelic.agent.FunctionTrace(nr_transaction, "get_metadata_for_threads"):
             annotated_content_info = utils.get_metadata_for_threads(course_id, threads, request.user, user_info)
@@ -368,6 +378,7 @@ def user_profile(request, course_id, user_id):
 
 
 @login_required
+@cc.utils.coalesce_requests
 def followed_threads(request, course_id, user_id):
     nr_transaction = newrelic.agent.current_transaction()
 
@@ -382,10 +393,12 @@ def followed_threads(request, course_id, user_id):
             'sort_order': request.GET.get('sort_order', 'desc'),
         }
 
-        threads, page, num_pages = profiled_user.subscribed_threads(query_params)
+        (threads, page, num_pages), user_info = cc.utils.perform_concurrently(
+            partial(profiled_user.subscribed_threads, query_params),
+            cc.User.from_django_user(request.user).to_dict,
+        )
         query_params['page'] = page
         query_params['num_pages'] = num_pages
-        user_info = cc.User.from_django_user(request.user).to_dict()
 
         with newrelic.agent.FunctionTrace(nr_transaction, "get_metadata_for_threads"):
             annotated_content_info = utils.get_metadata_for_threads(course_id, threads, request.user, user_info)
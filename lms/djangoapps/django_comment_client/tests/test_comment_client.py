@@ -0,0 +1,127 @@
+"""
+Tests of the comments service client's connection handling, against a stub
+comments service.
+"""
+import threading
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import translation
+from mock import patch
+
+from lms.lib.comment_client import utils
+from lms.lib.comment_client.user import User
+from terrain.stubs.comments import StubCommentsService, StubCommentsServiceHandler
+
+
+class RecordingCommentsServiceHandler(StubCommentsServiceHandler):
+    """
+    Stub comments service handler which records the GET requests it serves,
+    and accepts writes.
+    """
+    def do_GET(self):
+        self.server.requests.append((self.path_only, self.headers.get('Accept-Language')))
+        super(RecordingCommentsServiceHandler, self).do_GET()
+
+    def do_PUT(self):
+        self.send_json_response({})
+
+
+class RecordingCommentsService(StubCommentsService):
+    """
+    Stub comments service recording the GET requests it serves.
+    """
+    HANDLER_CLASS = RecordingCommentsServiceHandler
+
+    def __init__(self, *args, **kwargs):
+        self.requests = []
+        super(RecordingCommentsService, self).__init__(*args, **kwargs)
+
+
+@override_settings(COMMENTS_SERVICE_CONCURRENCY=4, COMMENTS_SERVICE_CACHE_TIMEOUT=0)
+class PerformRequestTest(TestCase):
+    """
+    Check the pooling, coalescing, fan-out and caching of the requests made
+    with `perform_request`.
+    """
+    def setUp(self):
+        cache.clear()
+        self.server = RecordingCommentsService()
+        self.addCleanup(self.server.shutdown)
+        self.prefix = 'http://127.0.0.1:{0}/api/v1'.format(self.server.port)
+        self.user_url = self.prefix + '/users/1'
+
+    def get_count(self, path):
+        """
+        Return the number of GET requests the service served for `path`.
+        """
+        return len([request for request in self.server.requests if request[0] == path])
+
+    def test_session_reused(self):
+        self.assertIs(utils._session(), utils._session())  # pylint: disable=protected-access
+
+    def test_coalesced_gets(self):
+        with utils.coalesced_requests():
+            first = utils.perform_request('get', self.user_url)
+            first['upvoted_ids'].append('changed')
+            second = utils.perform_request('get', self.user_url)
+        self.assertEqual(self.get_count('/api/v1/users/1'), 1)
+        # each caller gets its own copy of the response
+        self.assertEqual(second['upvoted_ids'], [])
+
+        utils.perform_request('get', self.user_url)
+        self.assertEqual(self.get_count('/api/v1/users/1'), 2)
+
+    def test_write_discards_coalesced_gets(self):
+        with utils.coalesced_requests():
+            utils.perform_request('get', self.user_url)
+            utils.perform_request('put', self.user_url, {'username': 'changed'})
+            utils.perform_request('get', self.user_url)
+        self.assertEqual(self.get_count('/api/v1/users/1'), 2)
+
+    def test_perform_concurrently(self):
+        translation.activate('eo')
+        self.addCleanup(translation.deactivate)
+        thread_ids = set()
+
+        def get_thread(thread_id):
+            """Retrieve a thread, recording the thread doing it."""
+            thread_ids.add(threading.current_thread().ident)
+            return utils.perform_request('get', '{0}/threads/{1}'.format(self.prefix, thread_id))
+
+        results = utils.perform_concurrently(*[
+            lambda thread_id=thread_id: get_thread(thread_id) for thread_id in ['a', 'b', 'c']
+        ])
+        self.assertEqual([result['id'] for result in results], ['a', 'b', 'c'])
+        self.assertNotIn(threading.current_thread().ident, thread_ids)
+        # the workers use the language of the caller
+        self.assertEqual(set(request[1] for request in self.server.requests), set(['eo']))
+
+    def test_perform_concurrently_raises(self):
+        with self.assertRaises(utils.CommentClientRequestError):
+            utils.perform_concurrently(
+                lambda: utils.perform_request('get', self.user_url),
+                lambda: utils.perform_request('get', self.prefix + '/missing'),
+            )
+
+    @override_settings(COMMENTS_SERVICE_CACHE_TIMEOUT=10)
+    def test_cached_user_info(self):
+        with patch.object(User, 'base_url', self.prefix + '/users'):
+            User(id='1').retrieve()
+            User(id='1').retrieve()
+            self.assertEqual(self.get_count('/api/v1/users/1'), 1)
+
+            # a write affecting the user invalidates the cached info
+            utils.perform_request('put', self.prefix + '/threads/a/votes', {'user_id': '1', 'value': 'up'})
+            User(id='1').retrieve()
+            self.assertEqual(self.get_count('/api/v1/users/1'), 2)
+
+    @patch('lms.lib.comment_client.utils.dog_stats_api')
+    def test_endpoint_histogram(self, mock_dog_stats_api):
+        utils.perform_request('get', self.user_url)
+        utils.perform_request('get', self.prefix + '/threads')
+        endpoint_tags = [
+            kwargs['tags'][0] for (_args, kwargs) in mock_dog_stats_api.histogram.call_args_list if 'tags' in kwargs
+        ]
+        self.assertEqual(endpoint_tags, ['endpoint:users/:id', 'endpoint:threads'])
@@ -169,6 +169,20 @@ class CategoryMapTestCase(ModuleStoreTestCase):
             {"entries": {}, "subcategories": {}, "children": []}
         )
 
+    def test_cached_per_course_version(self):
+        self.create_discussion("Chapter", "Discussion 1", sort_key="A")
+        utils.get_discussion_category_map(self.course)
+        with mock.patch('django_comment_client.utils.modulestore') as mock_modulestore:
+            utils.get_discussion_category_map(self.course)
+            utils.add_courseware_context([{"commentable_id": "discussion1"}], self.course)
+        self.assertFalse(mock_modulestore.called)
+
+        self.create_discussion("Chapter", "Discussion 2", sort_key="B")
+        self.assertEqual(
+            utils.get_discussion_category_map(self.course)["subcategories"]["Chapter"]["children"],
+            ["Discussion 1", "Discussion 2"]
+        )
+
     def test_configured_topics(self):
         self.course.discussion_topics = {
             "Topic A": {"id": "Topic_A"},
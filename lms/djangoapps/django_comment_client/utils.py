@@ -2,8 +2,10 @@ import pytz
 from collections import defaultdict
 import logging
 from datetime import datetime
+from hashlib import md5
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.db import connection
 from django.http import HttpResponse
@@ -14,7 +16,7 @@ from django_comment_client.permissions import check_permissions_by_view
 from edxmako import lookup_template
 import pystache_custom as pystache
 
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import modulestore, course_cache_version
 from xmodule.modulestore import Location
 from django.utils.timezone import UTC
 
@@ -70,14 +72,36 @@ def _get_discussion_modules(course):
     return filter(has_required_keys, all_modules)
 
 
+def _get_discussion_entries(course):
+    """
+    Return the values of the discussion modules of `course` used by the
+    category and id maps, read from the modulestore once per version of the
+    course and cached.
+    """
+    key = u'discussion_entries.{0}.{1}'.format(course.id, course_cache_version(course.id))
+    entries = cache.get(key)
+    if entries is None:
+        entries = [
+            {
+                "id": module.discussion_id,
+                "title": module.discussion_target,
+                "category": module.discussion_category,
+                "sort_key": module.sort_key,
+                "start": module.start,
+                "location": module.location.url(),
+            }
+            for module in _get_discussion_modules(course)
+        ]
+        cache.set(key, entries)
+    return entries
+
+
 def _get_discussion_id_map(course):
-    def get_entry(module):
-        discussion_id = module.discussion_id
-        title = module.discussion_target
-        last_category = module.discussion_category.split("/")[-1].strip()
-        return (discussion_id, {"location": module.location, "title": last_category + " / " + title})
+    def get_entry(entry):
+        last_category = entry["category"].split("/")[-1].strip()
+        return (entry["id"], {"location": entry["location"], "title": last_category + " / " + entry["title"]})
 
-    return dict(map(get_entry, _get_discussion_modules(course)))
+    return dict(map(get_entry, _get_discussion_entries(course)))
 
 
 def _filter_unstarted_categories(category_map):
@@ -130,21 +154,18 @@ def _sort_map_entries(category_map, sort_alpha):
     category_map["children"] = [x[0] for x in sorted(things, key=lambda x: x[1]["sort_key"])]
 
 
-def get_discussion_category_map(course):
-    course_id = course.id
-
+def _build_discussion_category_map(course):
+    """
+    Build the category map of `course`, before filtering out the categories
+    and entries which haven't started.
+    """
     unexpanded_category_map = defaultdict(list)
 
-    modules = _get_discussion_modules(course)
-
-    for module in modules:
-        id = module.discussion_id
-        title = module.discussion_target
-        sort_key = module.sort_key
-        category = " / ".join([x.strip() for x in module.discussion_category.split("/")])
+    for entry in _get_discussion_entries(course):
+        category = " / ".join([x.strip() for x in entry["category"].split("/")])
         #Handle case where module.start is None
-        entry_start_date = module.start if module.start else datetime.max.replace(tzinfo=pytz.UTC)
-        unexpanded_category_map[category].append({"title": title, "id": id, "sort_key": sort_key, "start_date": entry_start_date})
+        entry_start_date = entry["start"] if entry["start"] else datetime.max.replace(tzinfo=pytz.UTC)
+        unexpanded_category_map[category].append({"title": entry["title"], "id": entry["id"], "sort_key": entry["sort_key"], "start_date": entry_start_date})
 
     category_map = {"entries": defaultdict(dict), "subcategories": defaultdict(dict)}
     for category_path, entries in unexpanded_category_map.items():
@@ -193,6 +214,24 @@ def get_discussion_category_map(course):
 
     _sort_map_entries(category_map, course.discussion_sort_alpha)
 
+    return category_map
+
+
+def get_discussion_category_map(course):
+    """
+    Return the category map of the discussions of `course` which have
+    started.
+
+    The map is built once per version of the course (and of its configured
+    topics, which may be set on `course` without being saved) and cached;
+    only the start dates are checked on each call.
+    """
+    topics_digest = md5(repr((sorted(course.discussion_topics.items()), course.discussion_sort_alpha))).hexdigest()
+    key = u'discussion_category_map.{0}.{1}.{2}'.format(course.id, course_cache_version(course.id), topics_digest)
+    category_map = cache.get(key)
+    if category_map is None:
+        category_map = _build_discussion_category_map(course)
+        cache.set(key, category_map)
     return _filter_unstarted_categories(category_map)
 
 
@@ -344,7 +383,7 @@ def add_courseware_context(content_list, course):
     for content in content_list:
         commentable_id = content['commentable_id']
         if commentable_id in id_map:
-            location = id_map[commentable_id]["location"].url()
+            location = id_map[commentable_id]["location"]
             title = id_map[commentable_id]["title"]
 
             url = reverse('jump_to', kwargs={"course_id": course.location.course_id,
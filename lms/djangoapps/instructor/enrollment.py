@@ -5,17 +5,23 @@ Does not include any access control, be sure to check access before calling.
 """
 
 import json
+import logging
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.mail import send_mail
+from django.db import transaction
 
-from student.models import CourseEnrollment, CourseEnrollmentAllowed
+from student.models import (
+    CourseEnrollment, CourseEnrollmentAllowed, UserProfile, EVENT_NAME_ENROLLMENT_ACTIVATED
+)
 from courseware.models import StudentModule
 from edxmako.shortcuts import render_to_string
 
 from microsite_configuration.middleware import MicrositeConfiguration
 
+log = logging.getLogger(__name__)
+
 # For determining if a shibboleth course
 SHIBBOLETH_DOMAIN_PREFIX = 'shib:'
 
@@ -50,6 +56,36 @@ class EmailEnrollmentState(object):
             self.auto_enroll,
         )
 
+    @classmethod
+    def for_emails(cls, course_id, emails):
+        """
+        Return a dict of the EmailEnrollmentState of each of `emails`,
+        read with a few queries for all of them rather than a few per email.
+        """
+        users = users_by_email(emails)
+        user_ids = [user.id for user in users.values()]
+        full_names = dict(UserProfile.objects.filter(user__in=user_ids).values_list('user', 'name'))
+        enrolled_ids = set(CourseEnrollment.objects.filter(
+            course_id=course_id, user__in=user_ids, is_active=True
+        ).values_list('user', flat=True))
+        allowed = dict(
+            (allowance.email, allowance.auto_enroll)
+            for allowance in allowances_by_email(course_id, emails).values()
+        )
+
+        states = {}
+        for email in emails:
+            user = users.get(email)
+            # the state is already known, so skip the queries of __init__
+            state = cls.__new__(cls)
+            state.user = user is not None
+            state.enrollment = user is not None and user.id in enrolled_ids
+            state.allowed = email in allowed
+            state.auto_enroll = bool(allowed.get(email))
+            state.full_name = full_names.get(user.id) if user is not None else None
+            states[email] = state
+        return states
+
     def to_dict(self):
         """
         example: {
@@ -140,6 +176,132 @@ def unenroll_email(course_id, student_email, email_students=False, email_params=
     return previous_state, after_state
 
 
+def users_by_email(emails):
+    """
+    Return a dict of the Users whose email is one of `emails`, keyed by email.
+
+    Emails are matched exactly, as `enroll_email` does, whatever the collation
+    of the database.
+    """
+    emails = set(emails)
+    return dict(
+        (user.email, user) for user in User.objects.filter(email__in=emails) if user.email in emails
+    )
+
+
+def allowances_by_email(course_id, emails):
+    """
+    Return a dict of the CourseEnrollmentAlloweds of `emails` in the course
+    `course_id`, keyed by email, matched exactly like `users_by_email`.
+    """
+    emails = set(emails)
+    return dict(
+        (allowance.email, allowance)
+        for allowance in CourseEnrollmentAllowed.objects.filter(course_id=course_id, email__in=emails)
+        if allowance.email in emails
+    )
+
+
+def bulk_enroll_emails(course_id, emails, auto_enroll=False, email_students=False, email_params=None):
+    """
+    Enroll many students by email.
+
+    Has the same effect as calling `enroll_email` for each of `emails`, but
+    reads and writes the enrollments and enrollment allowances of all the
+    students with a few queries. Meant for rosters of hundreds of emails at
+    a time; split longer ones.
+
+    The enrollments are changed in one transaction, and the tracking events
+    and emails are only sent once it is committed. A student who can't be
+    emailed is still enrolled, and the error is returned for that student.
+
+    returns a list of (email, EmailEnrollmentState before, EmailEnrollmentState after, error)
+        in the order of `emails`, where error is the message of the failure
+        to email the student, or None.
+    """
+    with transaction.commit_on_success():
+        previous_states = EmailEnrollmentState.for_emails(course_id, emails)
+
+        activated = CourseEnrollment.bulk_enroll(users_by_email(emails).values(), course_id, send_events=False)
+
+        unregistered = set(email for email in emails if not previous_states[email].user)
+        if unregistered:
+            allowances = allowances_by_email(course_id, unregistered)
+            CourseEnrollmentAllowed.objects.filter(
+                id__in=[allowance.id for allowance in allowances.values()]
+            ).update(auto_enroll=auto_enroll)
+            CourseEnrollmentAllowed.objects.bulk_create([
+                CourseEnrollmentAllowed(course_id=course_id, email=email, auto_enroll=auto_enroll)
+                for email in unregistered if email not in allowances
+            ])
+
+    CourseEnrollment.emit_events(activated, EVENT_NAME_ENROLLMENT_ACTIVATED)
+
+    mail_errors = {}
+    if email_students:
+        for email in emails:
+            state = previous_states[email]
+            if state.user:
+                _send_bulk_mail(email, dict(
+                    email_params, message='enrolled_enroll', email_address=email, full_name=state.full_name
+                ), mail_errors)
+            else:
+                _send_bulk_mail(
+                    email, dict(email_params, message='allowed_enroll', email_address=email), mail_errors
+                )
+
+    after_states = EmailEnrollmentState.for_emails(course_id, emails)
+    return [(email, previous_states[email], after_states[email], mail_errors.get(email)) for email in emails]
+
+
+def bulk_unenroll_emails(course_id, emails, email_students=False, email_params=None):
+    """
+    Unenroll many students by email.
+
+    Has the same effect as calling `unenroll_email` for each of `emails`,
+    with a few queries for all of them, and the same transaction, events,
+    emails and results as `bulk_enroll_emails`.
+    """
+    with transaction.commit_on_success():
+        previous_states = EmailEnrollmentState.for_emails(course_id, emails)
+
+        deactivated = CourseEnrollment.bulk_unenroll(users_by_email(emails).values(), course_id, send_events=False)
+        CourseEnrollmentAllowed.objects.filter(
+            id__in=[allowance.id for allowance in allowances_by_email(course_id, emails).values()]
+        ).delete()
+
+    CourseEnrollment.send_unenrollment_events(deactivated)
+
+    mail_errors = {}
+    if email_students:
+        for email in emails:
+            state = previous_states[email]
+            if state.enrollment:
+                _send_bulk_mail(email, dict(
+                    email_params, message='enrolled_unenroll', email_address=email, full_name=state.full_name
+                ), mail_errors)
+            if state.allowed:
+                _send_bulk_mail(
+                    email, dict(email_params, message='allowed_unenroll', email_address=email), mail_errors
+                )
+
+    after_states = EmailEnrollmentState.for_emails(course_id, emails)
+    return [(email, previous_states[email], after_states[email], mail_errors.get(email)) for email in emails]
+
+
+def _send_bulk_mail(student, param_dict, errors):
+    """
+    Send an email with `send_mail_to_student` for a bulk enrollment change,
+    recording the message of its failure in `errors`, keyed by email,
+    rather than raising it.
+    """
+    try:
+        send_mail_to_student(student, param_dict)
+    except Exception as err:  # pylint: disable=broad-except
+        log.exception(u'Failed to send the %s email to %s', param_dict['message'], student)
+        errors[student] = unicode(err) or err.__class__.__name__
+
+
 def reset_student_attempts(course_id, student, module_state_key, delete_module=False):
     """
     Reset student attempts for a problem. Optionally deletes all student state for the specified problem.
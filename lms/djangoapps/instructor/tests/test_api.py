@@ -132,6 +132,8 @@ class TestInstructorAPIDenyLevels(ModuleStoreTestCase, LoginEnrollmentTestCase):
             ('list_background_email_tasks', {}),
             ('list_grade_downloads', {}),
             ('calculate_grades_csv', {}),
+            ('calculate_answer_distribution_csv', {}),
+            ('bulk_update_enrollment', {'emails': 'foo@example.org', 'action': 'enroll'}),
         ]
         # Endpoints that only Instructors can access
         self.instructor_level_endpoints = [
@@ -150,7 +152,7 @@ class TestInstructorAPIDenyLevels(ModuleStoreTestCase, LoginEnrollmentTestCase):
         msg: message to display if assertion fails.
         """
         url = reverse(endpoint, kwargs={'course_id': self.course.id})
-        if endpoint in 'send_email':
+        if endpoint in ['send_email', 'bulk_update_enrollment']:
             response = self.client.post(url, args)
         else:
             response = self.client.get(url, args)
@@ -838,6 +840,44 @@ class TestInstructorAPILevelsDataDump(ModuleStoreTestCase, LoginEnrollmentTestCa
         already_running_status = "A grade report generation task is already in progress. Check the 'Pending Instructor Tasks' table for the status of the task. When completed, the report will be available for download in the table below."
         self.assertIn(already_running_status, response.content)
 
+    def test_bulk_update_enrollment(self):
+        url = reverse('bulk_update_enrollment', kwargs={'course_id': self.course.id})
+
+        with patch('instructor_task.api.submit_bulk_update_enrollment') as mock_submit:
+            response = self.client.post(url, {
+                'action': 'enroll', 'emails': 'robot1@robot.org, robot2@robot.org', 'auto_enroll': 'true'
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("The enrollment of 2 students is being updated.", response.content)
+        args = mock_submit.call_args[0]
+        self.assertEqual(args[1:], (self.course.id, 'enroll', ['robot1@robot.org', 'robot2@robot.org'], True, False))
+
+    def test_bulk_update_enrollment_bad_action(self):
+        url = reverse('bulk_update_enrollment', kwargs={'course_id': self.course.id})
+
+        with patch('instructor_task.api.submit_bulk_update_enrollment') as mock_submit:
+            response = self.client.post(url, {'action': 'robot-not-an-action', 'emails': 'robot1@robot.org'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(mock_submit.called)
+
+    def test_calculate_answer_distribution_csv_success(self):
+        url = reverse('calculate_answer_distribution_csv', kwargs={'course_id': self.course.id})
+
+        with patch('instructor_task.api.submit_calculate_answer_distribution_csv') as mock_submit:
+            mock_submit.return_value = True
+            response = self.client.get(url, {})
+        success_status = "Your answer distribution report is being generated! You can view the status of the generation task in the 'Pending Instructor Tasks' section."
+        self.assertIn(success_status, response.content)
+
+    def test_calculate_answer_distribution_csv_already_running(self):
+        url = reverse('calculate_answer_distribution_csv', kwargs={'course_id': self.course.id})
+
+        with patch('instructor_task.api.submit_calculate_answer_distribution_csv') as mock_submit:
+            mock_submit.side_effect = AlreadyRunningError()
+            response = self.client.get(url, {})
+        already_running_status = "An answer distribution report generation task is already in progress."
+        self.assertIn(already_running_status, response.content)
+
     def test_get_students_features_csv(self):
         """
         Test that some minimum of information is formatted
@@ -6,11 +6,13 @@ import json
 from abc import ABCMeta
 from courseware.models import StudentModule
 from django.test import TestCase
+from mock import patch
 from student.tests.factories import UserFactory
 
 from student.models import CourseEnrollment, CourseEnrollmentAllowed
 from instructor.enrollment import (EmailEnrollmentState,
                                    enroll_email, unenroll_email,
+                                   bulk_enroll_emails, bulk_unenroll_emails,
                                    reset_student_attempts)
 
 
@@ -297,6 +299,72 @@ class TestInstructorEnrollmentStudentModule(TestCase):
         self.assertEqual(StudentModule.objects.filter(student=user, course_id=self.course_id, module_state_key=msk).count(), 0)
 
 
+class TestInstructorBulkEnrollDB(TestCase):
+    """ Test instructor.enrollment.bulk_enroll_emails and bulk_unenroll_emails """
+    def setUp(self):
+        self.course_id = 'robot:/a/fake/c::rse/id'
+        self.enrolled = UserFactory()
+        CourseEnrollment.enroll(self.enrolled, self.course_id)
+        self.unenrolled = UserFactory()
+        CourseEnrollment.enroll(self.unenrolled, self.course_id)
+        CourseEnrollment.unenroll(self.unenrolled, self.course_id)
+        self.registered = UserFactory()
+        self.allowed_email = 'robot-allowed@robot.org'
+        CourseEnrollmentAllowed.objects.create(email=self.allowed_email, course_id=self.course_id)
+        self.unknown_email = 'robot-unknown@robot.org'
+        self.emails = [
+            self.enrolled.email, self.unenrolled.email, self.registered.email, self.allowed_email, self.unknown_email
+        ]
+
+    def test_states_match(self):
+        states = EmailEnrollmentState.for_emails(self.course_id, self.emails)
+        for email in self.emails:
+            self.assertEqual(states[email].to_dict(), EmailEnrollmentState(self.course_id, email).to_dict())
+
+    def test_bulk_enroll(self):
+        results = bulk_enroll_emails(self.course_id, self.emails, auto_enroll=True)
+        self.assertEqual([email for email, _before, _after, _error in results], self.emails)
+        for _email, _before, after, _error in results[:3]:
+            self.assertEqual(after.to_dict(), {'user': True, 'enrollment': True, 'allowed': False, 'auto_enroll': False})
+        for _email, _before, after, _error in results[3:]:
+            self.assertEqual(after.to_dict(), {'user': False, 'enrollment': False, 'allowed': True, 'auto_enroll': True})
+        self.assertEqual(CourseEnrollment.objects.filter(course_id=self.course_id).count(), 3)
+
+    def test_email_case(self):
+        # emails are matched exactly, as by enroll_email
+        email = self.registered.email.upper()
+        states = EmailEnrollmentState.for_emails(self.course_id, [email])
+        self.assertEqual(states[email].to_dict(), EmailEnrollmentState(self.course_id, email).to_dict())
+        # the reported states agree with the enrollments made
+        (_email, _before, after, _error), = bulk_enroll_emails(self.course_id, [email])
+        self.assertEqual(after.to_dict(), EmailEnrollmentState(self.course_id, email).to_dict())
+        self.assertEqual(after.enrollment, CourseEnrollment.is_enrolled(self.registered, self.course_id))
+
+    def test_bulk_unenroll(self):
+        results = bulk_unenroll_emails(self.course_id, self.emails)
+        befores = [before.to_dict() for _email, before, _after, _error in results]
+        self.assertEqual([before['enrollment'] for before in befores], [True, False, False, False, False])
+        self.assertEqual([before['allowed'] for before in befores], [False, False, False, True, False])
+        for email, _before, after, _error in results:
+            self.assertEqual(after.to_dict(), EmailEnrollmentState(self.course_id, email).to_dict())
+            self.assertFalse(after.enrollment or after.allowed)
+
+    def test_mail_error(self):
+        def send_mail(student, _param_dict):
+            """Fail to email the registered student only"""
+            if student == self.registered.email:
+                raise IOError('SMTP unavailable')
+
+        with patch('instructor.enrollment.send_mail_to_student', side_effect=send_mail):
+            results = bulk_enroll_emails(self.course_id, self.emails, email_students=True, email_params={})
+        # the failure is reported for that student, and doesn't undo any enrollment
+        self.assertEqual(
+            [error for _email, _before, _after, error in results], [None, None, 'SMTP unavailable', None, None]
+        )
+        self.assertTrue(CourseEnrollment.is_enrolled(self.registered, self.course_id))
+        self.assertEqual(CourseEnrollment.objects.filter(course_id=self.course_id, is_active=True).count(), 3)
+
+
 class EnrollmentObjects(object):
     """
     Container for enrollment objects.
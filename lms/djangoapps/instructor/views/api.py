@@ -272,6 +272,39 @@ def students_update_enrollment(request, course_id):
     return JsonResponse(response_payload)
 
 
+@ensure_csrf_cookie
+@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@require_level('staff')
+@require_post_params(action="enroll or unenroll", emails="stringified list of emails")
+def bulk_update_enrollment(request, course_id):
+    """
+    Enroll or unenroll students by email, as a background task.
+    Requires staff access.
+
+    Takes the same parameters as `students_update_enrollment`, as POST
+    parameters so that rosters of many thousands of emails can be given.
+    The results are stored as a CSV, listed with the grade reports.
+
+    AlreadyRunningError is raised if an enrollment update is already running for the course.
+    """
+    action = request.POST.get('action')
+    if action not in ('enroll', 'unenroll'):
+        return HttpResponseBadRequest("Unrecognized action '{}'".format(action))
+    emails = _split_input_list(request.POST.get('emails'))
+    auto_enroll = request.POST.get('auto_enroll') in ['true', 'True', True]
+    email_students = request.POST.get('email_students') in ['true', 'True', True]
+
+    try:
+        instructor_task.api.submit_bulk_update_enrollment(
+            request, course_id, action, emails, auto_enroll, email_students
+        )
+        success_status = _("The enrollment of {count} students is being updated. You can view the status of the task in the 'Pending Instructor Tasks' section, and download its results from the 'Data Download' section when it completes.").format(count=len(emails))
+        return JsonResponse({"status": success_status})
+    except AlreadyRunningError:
+        already_running_status = _("An enrollment update is already in progress. Check the 'Pending Instructor Tasks' table for the status of the task.")
+        return JsonResponse({"status": already_running_status})
+
+
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @require_level('instructor')
@@ -797,6 +830,24 @@ def calculate_grades_csv(request, course_id):
         })
 
 
+@ensure_csrf_cookie
+@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@require_level('staff')
+def calculate_answer_distribution_csv(request, course_id):
+    """
+    AlreadyRunningError is raised if the course's answer distribution is already being computed.
+    """
+    try:
+        instructor_task.api.submit_calculate_answer_distribution_csv(request, course_id)
+        success_status = _("Your answer distribution report is being generated! You can view the status of the generation task in the 'Pending Instructor Tasks' section.")
+        return JsonResponse({"status": success_status})
+    except AlreadyRunningError:
+        already_running_status = _("An answer distribution report generation task is already in progress. Check the 'Pending Instructor Tasks' table for the status of the task. When completed, the report will be available for download in the table below.")
+        return JsonResponse({
+            "status": already_running_status
+        })
+
+
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @require_level('staff')
@@ -7,6 +7,8 @@ from django.conf.urls import patterns, url
 urlpatterns = patterns('',  # nopep8
     url(r'^students_update_enrollment$',
         'instructor.views.api.students_update_enrollment', name="students_update_enrollment"),
+    url(r'^bulk_update_enrollment$',
+        'instructor.views.api.bulk_update_enrollment', name="bulk_update_enrollment"),
     url(r'^list_course_role_members$',
         'instructor.views.api.list_course_role_members', name="list_course_role_members"),
     url(r'^modify_access$',
@@ -51,4 +53,6 @@ urlpatterns = patterns('',  # nopep8
         'instructor.views.api.list_grade_downloads', name="list_grade_downloads"),
     url(r'calculate_grades_csv$',
         'instructor.views.api.calculate_grades_csv', name="calculate_grades_csv"),
+    url(r'calculate_answer_distribution_csv$',
+        'instructor.views.api.calculate_answer_distribution_csv', name="calculate_answer_distribution_csv"),
 )
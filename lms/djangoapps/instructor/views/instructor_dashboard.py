@@ -142,6 +142,7 @@ def _section_membership(course_id, access):
         'access': access,
         'enroll_button_url': reverse('students_update_enrollment', kwargs={'course_id': course_id}),
         'unenroll_button_url': reverse('students_update_enrollment', kwargs={'course_id': course_id}),
+        'bulk_update_enrollment_url': reverse('bulk_update_enrollment', kwargs={'course_id': course_id}),
         'list_course_role_members_url': reverse('list_course_role_members', kwargs={'course_id': course_id}),
         'modify_access_url': reverse('modify_access', kwargs={'course_id': course_id}),
         'list_forum_members_url': reverse('list_forum_members', kwargs={'course_id': course_id}),
@@ -192,6 +193,7 @@ def _section_data_download(course_id, access):
         'list_instructor_tasks_url': reverse('list_instructor_tasks', kwargs={'course_id': course_id}),
         'list_grade_downloads_url': reverse('list_grade_downloads', kwargs={'course_id': course_id}),
         'calculate_grades_csv_url': reverse('calculate_grades_csv', kwargs={'course_id': course_id}),
+        'calculate_answer_distribution_csv_url': reverse('calculate_answer_distribution_csv', kwargs={'course_id': course_id}),
     }
     return section_data
 
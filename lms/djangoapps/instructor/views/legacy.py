@@ -1526,16 +1526,11 @@ def get_answers_distribution(request, course_id):
     """
     course = get_course_with_access(request.user, course_id, 'staff')
 
-    dist = grades.answer_distributions(course.id)
+    rows = grades.answer_distribution_rows(course.id)
 
     d = {}
-    d['header'] = ['url_name', 'display name', 'answer id', 'answer', 'count']
-
-    d['data'] = [
-        [url_name, display_name, answer_id, a, answers[a]]
-        for (url_name, display_name, answer_id), answers in sorted(dist.items())
-        for a in answers
-    ]
+    d['header'] = next(rows)
+    d['data'] = list(rows)
     return d
 
 
@@ -12,12 +12,14 @@ from celery.states import READY_STATES
 
 from xmodule.modulestore.django import modulestore
 
-from instructor_task.models import InstructorTask
+from instructor_task.models import EnrollmentRoster, InstructorTask
 from instructor_task.tasks import (rescore_problem,
                                    reset_problem_attempts,
                                    delete_problem_state,
                                    send_bulk_course_email,
-                                   calculate_grades_csv)
+                                   calculate_grades_csv,
+                                   calculate_answer_distribution_csv,
+                                   bulk_update_enrollment)
 
 from instructor_task.api_helper import (check_arguments_for_rescoring,
                                         encode_problem_and_student_input,
@@ -219,3 +221,44 @@ def submit_calculate_grades_csv(request, course_id):
     task_key = ""
 
     return submit_task(request, task_type, task_class, course_id, task_input, task_key)
+
+
+def submit_calculate_answer_distribution_csv(request, course_id):
+    """
+    AlreadyRunningError is raised if the course's answer distribution is already being computed.
+    """
+    task_type = 'answer_distribution'
+    task_class = calculate_answer_distribution_csv
+    task_input = {}
+    task_key = ""
+
+    return submit_task(request, task_type, task_class, course_id, task_input, task_key)
+
+
+def submit_bulk_update_enrollment(request, course_id, action, emails, auto_enroll=False, email_students=False):
+    """
+    Request to have the students with the given `emails` enrolled in or
+    unenrolled from a course, as a background task.
+
+    `action` is 'enroll' or 'unenroll', and `auto_enroll` and `email_students`
+    are as for the instructor API's students_update_enrollment. The emails
+    are stored in an EnrollmentRoster, as there may be too many for the
+    task's input.
+
+    AlreadyRunningError is raised if an enrollment update is already running for the course.
+    """
+    if action not in ('enroll', 'unenroll'):
+        raise ValueError("Unrecognized action '{}'".format(action))
+    roster = EnrollmentRoster.create(course_id, emails, request.user)
+
+    task_type = 'bulk_update_enrollment'
+    task_class = bulk_update_enrollment
+    task_input = {
+        'roster_id': roster.id,
+        'action': action,
+        'auto_enroll': auto_enroll,
+        'email_students': email_students,
+    }
+    task_key = ""
+
+    return submit_task(request, task_type, task_class, course_id, task_input, task_key)
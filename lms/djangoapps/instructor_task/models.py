@@ -12,8 +12,8 @@ file and check it in at the same time as your model changes. To do that,
 ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
-from cStringIO import StringIO
 from gzip import GzipFile
+from tempfile import TemporaryFile
 from uuid import uuid4
 import csv
 import json
@@ -189,6 +189,47 @@ class InstructorTask(models.Model):
         return json.dumps({'message': 'Task revoked before running'})
 
 
+class EnrollmentRoster(models.Model):
+    """
+    The email addresses given to a bulk enrollment task, which are too many
+    to be stored in the `task_input` of its InstructorTask.
+
+    `emails` stores the addresses, one per line.
+    """
+    course_id = models.CharField(max_length=255, db_index=True)
+    emails = models.TextField()
+    requester = models.ForeignKey(User)
+    created = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def create(cls, course_id, emails, requester):
+        """
+        Store the list `emails`, without duplicates, and return the roster.
+        """
+        unique_emails = []
+        seen = set()
+        for email in emails:
+            if email.lower() not in seen:
+                seen.add(email.lower())
+                unique_emails.append(email)
+        roster = cls(course_id=course_id, emails=u'\n'.join(unique_emails), requester=requester)
+        roster.save_now()
+        return roster
+
+    @transaction.autocommit
+    def save_now(self):
+        """
+        Writes the roster immediately, so that the task can read it.
+        """
+        self.save()
+
+    def email_list(self):
+        """
+        Return the list of email addresses of the roster.
+        """
+        return [email for email in self.emails.split(u'\n') if email]
+
+
 class GradesStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for grades
@@ -302,13 +343,29 @@ class S3GradesStore(GradesStore):
 
         Even though we store it in gzip format, browsers will transparently
         download and decompress it. Filenames should end in `.csv`, not `.gz`.
-        """
-        output_buffer = StringIO()
-        gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
-        csv.writer(gzip_file).writerows(rows)
-        gzip_file.close()
 
-        self.store(course_id, filename, output_buffer)
+        The file is written to a temporary file as `rows` are produced and
+        then uploaded from it, so rows can be a generator of any length.
+        """
+        with TemporaryFile() as output_file:
+            gzip_file = GzipFile(fileobj=output_file, mode="wb")
+            csv.writer(gzip_file).writerows(rows)
+            gzip_file.close()
+            size = output_file.tell()
+            output_file.seek(0)
+
+            key = self.key_for(course_id, filename)
+            key.size = size
+            key.content_encoding = "gzip"
+            key.content_type = "text/csv"
+            key.set_contents_from_file(
+                output_file,
+                headers={
+                    "Content-Encoding": "gzip",
+                    "Content-Length": size,
+                    "Content-Type": "text/csv",
+                }
+            )
 
     def links_for(self, course_id):
         """
@@ -380,11 +437,15 @@ class LocalFSGradesStore(GradesStore):
     def store_rows(self, course_id, filename, rows):
         """
         Given a course_id, filename, and rows (each row is an iterable of strings),
-        write this data out.
+        write this data out as the rows are produced.
         """
-        output_buffer = StringIO()
-        csv.writer(output_buffer).writerows(rows)
-        self.store(course_id, filename, output_buffer)
+        full_path = self.path_to(course_id, filename)
+        directory = os.path.dirname(full_path)
+        if not os.path.exists(directory):
+            os.mkdir(directory)
+
+        with open(full_path, "wb") as f:
+            csv.writer(f).writerows(rows)
 
     def links_for(self, course_id):
         """
@@ -31,6 +31,8 @@ from instructor_task.tasks_helper import (
     reset_attempts_module_state,
     delete_problem_module_state,
     push_grades_to_s3,
+    push_answer_distribution_to_s3,
+    update_enrollments_from_roster,
 )
 from bulk_email.tasks import perform_delegate_email_batches
 
@@ -139,3 +141,40 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     action_name = ugettext_noop('graded')
     task_fn = partial(push_grades_to_s3, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
+
+
+@task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=E1102
+def calculate_answer_distribution_csv(entry_id, xmodule_instance_args):
+    """
+    Compute the answer distributions of a course and push them as a CSV to
+    the grades download store.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('counted')
+    task_fn = partial(push_answer_distribution_to_s3, xmodule_instance_args)
+    return run_main_task(entry_id, task_fn, action_name)
+
+
+@task(base=BaseInstructorTask)  # pylint: disable=E1102
+def bulk_update_enrollment(entry_id, xmodule_instance_args):
+    """Enrolls or unenrolls a roster of students in a course.
+
+    `entry_id` is the id value of the InstructorTask entry that corresponds to this task.
+    The entry contains the `course_id` that identifies the course, as well as the
+    `task_input`, which contains task-specific input.
+
+    The task_input should be a dict with the following entries:
+
+      'roster_id': the id of the EnrollmentRoster listing the students' emails.  (required)
+
+      'action': 'enroll' or 'unenroll'.  (required)
+
+      'auto_enroll', 'email_students': the options of an enrollment from the
+          instructor dashboard.
+
+    A CSV of the results is stored next to the grade reports.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('processed')
+    task_fn = partial(update_enrollments_from_roster, xmodule_instance_args)
+    return run_main_task(entry_id, task_fn, action_name)
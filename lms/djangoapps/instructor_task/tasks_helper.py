@@ -19,11 +19,13 @@ from pytz import UTC
 from xmodule.modulestore.django import modulestore
 from track.views import task_track
 
-from courseware.grades import iterate_grades_for
+from courseware.grades import iterate_grades_for, answer_distribution_rows
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
+from courseware.courses import get_course_by_id
 from courseware.module_render import get_module_for_descriptor_internal
-from instructor_task.models import GradesStore, InstructorTask, PROGRESS
+from instructor.enrollment import bulk_enroll_emails, bulk_unenroll_emails, get_email_params
+from instructor_task.models import EnrollmentRoster, GradesStore, InstructorTask, PROGRESS
 from student.models import CourseEnrollment
 
 # define different loggers for use within tasks and on client side
@@ -37,6 +39,9 @@ UPDATE_STATUS_SUCCEEDED = 'succeeded'
 UPDATE_STATUS_FAILED = 'failed'
 UPDATE_STATUS_SKIPPED = 'skipped'
 
+# number of students enrolled or unenrolled at a time by a bulk enrollment
+BULK_ENROLLMENT_CHUNK_SIZE = 500
+
 
 class BaseInstructorTask(Task):
     """
@@ -572,3 +577,154 @@ def push_grades_to_s3(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
     # One last update before we close out...
     return update_task_progress()
+
+
+def push_answer_distribution_to_s3(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+    """
+    For a given `course_id`, generate the answer distribution CSV of all the
+    submitted problems, and store it using a `GradesStore`, next to the
+    grade reports.
+
+    The StudentModule rows are read in batches, and the CSV rows are written
+    as they are generated, rather than built up in a list first.
+    """
+    start_time = datetime.now(UTC)
+    num_total = StudentModule.all_submitted_problems_read_only(course_id).count()
+
+    def update_task_progress(num_attempted, curr_step):
+        """Return a dict containing info about current task"""
+        current_time = datetime.now(UTC)
+        progress = {
+            'action_name': action_name,
+            'attempted': num_attempted,
+            'succeeded': num_attempted,
+            'failed': 0,
+            'total': num_total,
+            'duration_ms': int((current_time - start_time).total_seconds() * 1000),
+            'step': curr_step,
+        }
+        _get_current_task().update_state(state=PROGRESS, meta=progress)
+        return progress
+
+    update_task_progress(0, "Counting Answers")
+    rows = answer_distribution_rows(
+        course_id, progress_callback=lambda num_rows: update_task_progress(num_rows, "Counting Answers")
+    )
+
+    # Generate parts of the file name
+    timestamp_str = start_time.strftime("%Y-%m-%d-%H%M")
+    course_id_prefix = urllib.quote(course_id.replace("/", "_"))
+
+    # Encode the rows in utf-8 as the csv module needs, as they are written
+    encoded_rows = (
+        [value.encode('utf-8') if isinstance(value, unicode) else value for value in row]
+        for row in rows
+    )
+    GradesStore.from_config().store_rows(
+        course_id,
+        u"{}_answer_distribution_{}.csv".format(course_id_prefix, timestamp_str),
+        encoded_rows
+    )
+
+    # One last update before we close out...
+    return update_task_progress(num_total, "Uploaded CSV")
+
+
+def update_enrollments_from_roster(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
+    """
+    Enroll or unenroll the students of an `EnrollmentRoster` in the course
+    `course_id`, and store a CSV of their enrollment state before and after
+    using a `GradesStore`, next to the grade reports.
+
+    `task_input` contains the 'roster_id' of the roster, the 'action'
+    ('enroll' or 'unenroll'), and the 'auto_enroll' and 'email_students'
+    options of the instructor API's students_update_enrollment.
+
+    The students are processed BULK_ENROLLMENT_CHUNK_SIZE at a time, with a
+    few queries per chunk, each in its own transaction. When a chunk fails,
+    none of its changes are kept, its students are reported in the CSV with
+    the error, and the following chunks are still processed. Emails are sent
+    once a chunk is committed, and a student who can't be emailed is
+    reported with the mail error.
+    """
+    start_time = datetime.now(UTC)
+    emails = EnrollmentRoster.objects.get(id=task_input['roster_id']).email_list()
+    action = task_input['action']
+    auto_enroll = task_input.get('auto_enroll', False)
+    email_students = task_input.get('email_students', False)
+    email_params = None
+    if email_students:
+        email_params = get_email_params(get_course_by_id(course_id), auto_enroll)
+
+    num_total = len(emails)
+    counts = {'attempted': 0, 'succeeded': 0, 'failed': 0}
+
+    def update_task_progress(curr_step):
+        """Return a dict containing info about current task"""
+        current_time = datetime.now(UTC)
+        progress = {
+            'action_name': action_name,
+            'attempted': counts['attempted'],
+            'succeeded': counts['succeeded'],
+            'failed': counts['failed'],
+            'total': num_total,
+            'duration_ms': int((current_time - start_time).total_seconds() * 1000),
+            'step': curr_step,
+        }
+        _get_current_task().update_state(state=PROGRESS, meta=progress)
+        return progress
+
+    def state_columns(state):
+        """Return the CSV columns of an EmailEnrollmentState"""
+        return [state.enrollment, state.allowed, state.auto_enroll]
+
+    def update_chunk(chunk):
+        """
+        Update the enrollments of the students of `chunk`, in a transaction
+        so that a chunk that fails leaves none of its changes behind.
+        """
+        if action == 'enroll':
+            return bulk_enroll_emails(course_id, chunk, auto_enroll, email_students, email_params)
+        return bulk_unenroll_emails(course_id, chunk, email_students, email_params)
+
+    def result_rows():
+        """Process the roster a chunk at a time, generating the CSV rows"""
+        yield [
+            'email', 'action', 'user exists',
+            'enrolled before', 'allowed before', 'auto enroll before',
+            'enrolled after', 'allowed after', 'auto enroll after', 'error',
+        ]
+        for start in xrange(0, num_total, BULK_ENROLLMENT_CHUNK_SIZE):
+            chunk = emails[start:start + BULK_ENROLLMENT_CHUNK_SIZE]
+            try:
+                results = update_chunk(chunk)
+            except Exception as err:  # pylint: disable=broad-except
+                TASK_LOG.exception(u'Failed to %s students %s to %s of course %s', action, start, start + len(chunk), course_id)
+                counts['failed'] += len(chunk)
+                error = unicode(err).encode('utf-8') or err.__class__.__name__
+                for email in chunk:
+                    yield [email.encode('utf-8'), action, '', '', '', '', '', '', '', error]
+            else:
+                counts['succeeded'] += len(chunk)
+                for email, before, after, mail_error in results:
+                    yield (
+                        [email.encode('utf-8'), action, before.user] +
+                        state_columns(before) + state_columns(after) + [(mail_error or u'').encode('utf-8')]
+                    )
+            counts['attempted'] += len(chunk)
+            update_task_progress("Updating Enrollments")
+
+    update_task_progress("Updating Enrollments")
+
+    # Generate parts of the file name
+    timestamp_str = start_time.strftime("%Y-%m-%d-%H%M")
+    course_id_prefix = urllib.quote(course_id.replace("/", "_"))
+
+    GradesStore.from_config().store_rows(
+        course_id,
+        u"{}_{}_results_{}.csv".format(course_id_prefix, action, timestamp_str),
+        result_rows()
+    )
+
+    # One last update before we close out...
+    return update_task_progress("Uploaded CSV")
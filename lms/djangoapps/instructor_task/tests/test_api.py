@@ -1,6 +1,7 @@
 """
 Test for LMS instructor background task queue management
 """
+import json
 
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
@@ -15,10 +16,11 @@ from instructor_task.api import (
     submit_reset_problem_attempts_for_all_students,
     submit_delete_problem_state_for_all_students,
     submit_bulk_course_email,
+    submit_bulk_update_enrollment,
 )
 
 from instructor_task.api_helper import AlreadyRunningError
-from instructor_task.models import InstructorTask, PROGRESS
+from instructor_task.models import EnrollmentRoster, InstructorTask, PROGRESS
 from instructor_task.tests.test_base import (InstructorTaskTestCase,
                                              InstructorTaskCourseTestCase,
                                              InstructorTaskModuleTestCase,
@@ -183,3 +185,17 @@ class InstructorTaskCourseSubmitTest(InstructorTaskCourseTestCase):
 
         with self.assertRaises(AlreadyRunningError):
             instructor_task = submit_bulk_course_email(self.create_task_request(self.instructor), self.course.id, email_id)
+
+    def test_submit_bulk_update_enrollment(self):
+        request = self.create_task_request(self.instructor)
+        emails = ['robot1@robot.org', 'robot2@robot.org', 'Robot1@robot.org']
+        instructor_task = submit_bulk_update_enrollment(request, self.course.id, 'enroll', emails, auto_enroll=True)
+
+        task_input = json.loads(instructor_task.task_input)
+        self.assertEqual(task_input['action'], 'enroll')
+        self.assertTrue(task_input['auto_enroll'])
+        roster = EnrollmentRoster.objects.get(id=task_input['roster_id'])
+        self.assertEqual(roster.email_list(), ['robot1@robot.org', 'robot2@robot.org'])
+
+        with self.assertRaises(AlreadyRunningError):
+            submit_bulk_update_enrollment(request, self.course.id, 'unenroll', emails)
@@ -218,6 +218,15 @@ FEATURES = {
 
     # Turn off account locking if failed login attempts exceeds a limit
     'ENABLE_MAX_FAILED_LOGIN_ATTEMPTS': False,
+
+    # Cache the rendered html of blocks whose student view is the same for
+    # every user (e.g. html, static tabs, course info and about sections)
+    'ENABLE_XBLOCK_FRAGMENT_CACHE': False,
+
+    # List courses on the catalog, dashboard and university pages from the
+    # course overview table instead of loading them from the modulestore.
+    # Run the generate_course_overviews command when turning this on.
+    'ENABLE_COURSE_OVERVIEWS': False,
 }
 
 # Used for A/B testing
@@ -229,6 +238,12 @@ GENERATE_PROFILE_SCORES = False
 # Used with XQueue
 XQUEUE_WAITTIME_BETWEEN_REQUESTS = 5  # seconds
 
+# If set, CodeResponse submissions are spooled to a local outbox and delivered
+# to xqueue by a background thread instead of inside the learner's request.
+# Keys are passed to capa.xqueue_interface.AsyncXQueueInterface, e.g.
+#   {'spool_dir': '/edx/var/lms/xqueue_outbox', 'max_depth': 1000, 'max_attempts': 5}
+XQUEUE_OUTBOX = None
+
 
 ############################# SET PATH INFORMATION #############################
 PROJECT_ROOT = path(__file__).abspath().dirname().dirname()  # /edx-platform/lms
@@ -376,6 +391,10 @@ TRACKING_BACKENDS = {
     }
 }
 
+# Set to a dict of options for track.dispatcher.BufferedDispatcher to send
+# tracking events to the backends in batches from a background thread.
+TRACKING_BUFFER = None
+
 # Backwards compatibility with ENABLE_SQL_TRACKING_LOGS feature flag.
 # In the future, adding the backend to TRACKING_BACKENDS enough.
 if FEATURES.get('ENABLE_SQL_TRACKING_LOGS'):
@@ -1138,6 +1157,9 @@ INSTALLED_APPS = (
 
     # Student Identity Reverification
     'reverification',
+
+    # Course listings
+    'course_overviews',
 )
 
 ######################### MARKETING SITE ###############################
@@ -1261,6 +1283,10 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+# Seconds for which the grade histogram of a problem shown in staff debug
+# info is cached
+GRADE_HISTOGRAM_CACHE_TIMEOUT = 60
+
 #### PASSWORD POLICY SETTINGS #####
 
 PASSWORD_MIN_LENGTH = None
@@ -3,3 +3,10 @@
 # pylint: disable=W0614
 
 DISCUSSION_ALLOWED_UPLOAD_FILE_TYPES = ('.jpg', '.jpeg', '.gif', '.bmp', '.png', '.tiff')
+
+# Number of requests to the comments service a forum page may have in
+# flight at once, which is also the number of connections kept open to it
+COMMENTS_SERVICE_CONCURRENCY = 4
+# Seconds for which read-mostly data from the comments service (user info,
+# commentables) is cached; 0 disables this cache
+COMMENTS_SERVICE_CACHE_TIMEOUT = 10
@@ -28,6 +28,11 @@ FEATURES['DISABLE_START_DATES'] = True
 # to reload
 FEATURES['ENABLE_DISCUSSION_SERVICE'] = False
 
+# Send the requests to the comments service one at a time, in order, and
+# don't cache them between tests, so that mocked requests are deterministic
+COMMENTS_SERVICE_CONCURRENCY = 1
+COMMENTS_SERVICE_CACHE_TIMEOUT = 0
+
 FEATURES['ENABLE_SERVICE_STATUS'] = True
 
 FEATURES['ENABLE_HINTER_INSTRUCTOR_VIEW'] = True
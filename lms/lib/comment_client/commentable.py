@@ -5,4 +5,5 @@ import settings
 class Commentable(models.Model):
 
     base_url = "{prefix}/commentables".format(prefix=settings.PREFIX)
+    cacheable = True
     type = 'commentable'
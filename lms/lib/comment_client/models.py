@@ -8,6 +8,9 @@ class Model(object):
     initializable_fields = ['id']
     base_url = None
     default_retrieve_params = {}
+    # whether retrieved values may be cached across requests for a few
+    # seconds (see utils.perform_request)
+    cacheable = False
 
     DEFAULT_ACTIONS_WITH_ID = ['get', 'put', 'delete']
     DEFAULT_ACTIONS_WITHOUT_ID = ['get_all', 'post']
@@ -62,7 +65,7 @@ class Model(object):
 
     def _retrieve(self, *args, **kwargs):
         url = self.url(action='get', params=self.attributes)
-        response = perform_request('get', url, self.default_retrieve_params)
+        response = perform_request('get', url, self.default_retrieve_params, cacheable=self.cacheable)
         self.update_attributes(**response)
 
     @classmethod
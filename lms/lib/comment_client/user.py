@@ -18,6 +18,7 @@ class User(models.Model):
 
     base_url = "{prefix}/users".format(prefix=settings.PREFIX)
     default_retrieve_params = {'complete': True}
+    cacheable = True
     type = 'user'
 
     @classmethod
@@ -80,7 +81,7 @@ class User(models.Model):
         retrieve_params = self.default_retrieve_params
         if self.attributes.get('course_id'):
             retrieve_params['course_id'] = self.course_id
-        response = perform_request('get', url, retrieve_params)
+        response = perform_request('get', url, retrieve_params, cacheable=self.cacheable)
         self.update_attributes(**response)
 
 
@@ -1,15 +1,41 @@
 from contextlib import contextmanager
 from dogapi import dog_stats_api
+from functools import wraps
+from hashlib import md5
+from multiprocessing.pool import ThreadPool
 import json
 import logging
+import os
+import re
 import requests
+from requests.adapters import HTTPAdapter
+import threading
+import urlparse
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
 from time import time
 from uuid import uuid4
 from django.utils.translation import get_language
 
 log = logging.getLogger(__name__)
 
+# The connection pool and the thread pool used to talk to the comments
+# service, created lazily in each process (they can't be shared with a
+# forked child), with the id of the process which created them
+_SESSION = None
+_THREAD_POOL = None
+_POOLS_PID = None
+
+# Per-thread state: the responses to coalesce while serving a request, and
+# whether the thread is a fan-out worker
+_request_state = threading.local()
+
+# Path segments of the comments service api which name a resource; any
+# other segment in the first position names a commentable
+_RESOURCES = ('users', 'threads', 'comments', 'commentables', 'search')
+_USER_URL_RE = re.compile(r'/users/(?P<user_id>[^/?]+)')
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -32,6 +58,23 @@ def merge_dict(dic1, dic2):
     return dict(dic1.items() + dic2.items())
 
 
+def _endpoint(url):
+    """
+    Return the comments service endpoint of `url`, with the ids left out,
+    e.g. "users/:id/subscriptions", to tag request metrics with.
+    """
+    path = urlparse.urlparse(url).path
+    segments = path.split('/api/v1/', 1)[-1].strip('/').split('/')
+    endpoint = []
+    for index, segment in enumerate(segments):
+        if index == 0 and segment not in _RESOURCES:
+            segment = ':id'
+        elif index == 1 and segments[0] in _RESOURCES and segments[0] != 'search':
+            segment = ':id'
+        endpoint.append(segment)
+    return '/'.join(endpoint)
+
+
 @contextmanager
 def request_timer(request_id, method, url):
     start = time()
@@ -39,6 +82,10 @@ def request_timer(request_id, method, url):
     end = time()
     duration = end - start
     dog_stats_api.histogram('comment_client.request.time', duration, end)
+    dog_stats_api.histogram(
+        'comment_client.request.endpoint_time', duration, end,
+        tags=[u'endpoint:{0}'.format(_endpoint(url)), u'method:{0}'.format(method)]
+    )
     log.info(
         "comment_client_request_log: request_id={request_id}, method={method}, "
         "url={url}, duration={duration}".format(
@@ -50,7 +97,173 @@ def request_timer(request_id, method, url):
     )
 
 
+def _concurrency():
+    """
+    Return the number of requests to the comments service which may be in
+    flight at once for a page.
+    """
+    return max(1, getattr(settings, 'COMMENTS_SERVICE_CONCURRENCY', 1))
+
+
+def _check_pools():
+    """
+    (Re)create the pools when first used in this process.
+    """
+    global _SESSION, _THREAD_POOL, _POOLS_PID  # pylint: disable=global-statement
+    if _POOLS_PID != os.getpid():
+        session = requests.Session()
+        # keep one connection per concurrent request open to the service
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_concurrency())
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _SESSION = session
+        _THREAD_POOL = None
+        _POOLS_PID = os.getpid()
+
+
+def _session():
+    """
+    Return the requests Session of this process, whose connections to the
+    comments service are kept alive between requests.
+    """
+    _check_pools()
+    return _SESSION
+
+
+def _thread_pool():
+    """
+    Return the pool of threads of this process used by `perform_concurrently`.
+    """
+    global _THREAD_POOL  # pylint: disable=global-statement
+    _check_pools()
+    if _THREAD_POOL is None:
+        _THREAD_POOL = ThreadPool(_concurrency())
+    return _THREAD_POOL
+
+
+def _coalesced_responses():
+    """
+    Return the dict of GET responses coalesced in the current request, or
+    None if requests aren't coalesced.
+    """
+    return getattr(_request_state, 'responses', None)
+
+
+@contextmanager
+def coalesced_requests():
+    """
+    Within this context, identical GET requests to the comments service are
+    only sent once, and later ones get the same response. A write request
+    discards the responses read so far, so that reads after a write see it.
+    """
+    if _coalesced_responses() is not None:
+        # already coalescing
+        yield
+        return
+    _request_state.responses = {}
+    try:
+        yield
+    finally:
+        _request_state.responses = None
+
+
+def coalesce_requests(func):
+    """
+    Decorator coalescing the comments service requests made by a view (see
+    `coalesced_requests`).
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with coalesced_requests():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _call_in_context(func, language, responses):
+    """
+    Call `func` in a worker thread, with the language and the coalesced
+    responses of the thread which handed it over.
+    """
+    _request_state.in_worker = True
+    _request_state.responses = responses
+    translation.activate(language)
+    try:
+        return func()
+    finally:
+        translation.deactivate()
+        _request_state.responses = None
+        _request_state.in_worker = False
+
+
+def perform_concurrently(*funcs):
+    """
+    Call the functions `funcs`, which make independent requests to the
+    comments service, concurrently, and return the list of their results.
+    The first exception raised by a function is raised again here.
+
+    The functions run in other threads, so they must not use the database.
+    They are called in order, one at a time, when settings
+    COMMENTS_SERVICE_CONCURRENCY is 1, or when called from a function which
+    is itself run concurrently.
+    """
+    if _concurrency() == 1 or len(funcs) < 2 or getattr(_request_state, 'in_worker', False):
+        return [func() for func in funcs]
+    pool = _thread_pool()
+    results = [
+        pool.apply_async(_call_in_context, (func, get_language(), _coalesced_responses()))
+        for func in funcs
+    ]
+    return [result.get() for result in results]
+
+
+def _user_cache_version(user_id):
+    """
+    Return the version of the cached reads about the user `user_id`.
+    """
+    return cache.get(u'comment_client.user_version.{0}'.format(user_id), 0)
+
+
+def _bump_user_cache_version(url, data):
+    """
+    Give the user affected by a write request a new cache version, which
+    invalidates the cached reads about them.
+    """
+    match = _USER_URL_RE.search(url)
+    user_id = match.group('user_id') if match else data.get('user_id')
+    if user_id is None:
+        return
+    key = u'comment_client.user_version.{0}'.format(user_id)
+    if not cache.add(key, 1):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # expired in between
+            cache.set(key, 1)
+
+
+def _response_key(url, params, cache_timeout):
+    """
+    Return the key identifying the response to a GET request of `url` with
+    `params` in the current language.
+    """
+    key = [url, sorted(params.items()), get_language()]
+    if cache_timeout:
+        match = _USER_URL_RE.search(url)
+        if match:
+            key.append(_user_cache_version(match.group('user_id')))
+    return u'comment_client.response.{0}'.format(md5(repr(key)).hexdigest())
+
+
 def perform_request(method, url, data_or_params=None, *args, **kwargs):
+    """
+    Send a request to the comments service and return its decoded response
+    (or its text if `raw` is given).
+
+    GET requests are coalesced within `coalesced_requests`. Those made with
+    `cacheable=True`, for read-mostly data, are also cached across requests
+    for settings.COMMENTS_SERVICE_CACHE_TIMEOUT seconds. Writes invalidate
+    the cached reads about the user they affect.
+    """
     if data_or_params is None:
         data_or_params = {}
     headers = {
@@ -60,34 +273,61 @@ def perform_request(method, url, data_or_params=None, *args, **kwargs):
     request_id = uuid4()
     request_id_dict = {'request_id': request_id}
 
+    responses = _coalesced_responses()
+    cache_timeout = getattr(settings, 'COMMENTS_SERVICE_CACHE_TIMEOUT', 0) if kwargs.get('cacheable') else 0
+    response_key = None
     if method in ['post', 'put', 'patch']:
         data = data_or_params
         params = request_id_dict
     else:
         data = None
+        if method == 'get':
+            response_key = _response_key(url, data_or_params, cache_timeout)
         params = merge_dict(data_or_params, request_id_dict)
-    with request_timer(request_id, method, url):
-        response = requests.request(
-            method,
-            url,
-            data=data,
-            params=params,
-            headers=headers,
-            timeout=5
-        )
 
-    if 200 < response.status_code < 500:
-        raise CommentClientRequestError(response.text, response.status_code)
-    # Heroku returns a 503 when an application is in maintenance mode
-    elif response.status_code == 503:
-        raise CommentClientMaintenanceError(response.text)
-    elif response.status_code == 500:
-        raise CommentClient500Error(response.text)
+    if method != 'get':
+        if responses:
+            responses.clear()
+        if getattr(settings, 'COMMENTS_SERVICE_CACHE_TIMEOUT', 0):
+            _bump_user_cache_version(url, data_or_params)
+
+    text = None
+    if response_key is not None:
+        if responses is not None:
+            text = responses.get(response_key)
+        if text is None and cache_timeout:
+            text = cache.get(response_key)
+    if text is None:
+        with request_timer(request_id, method, url):
+            response = _session().request(
+                method,
+                url,
+                data=data,
+                params=params,
+                headers=headers,
+                timeout=5
+            )
+
+        if 200 < response.status_code < 500:
+            raise CommentClientRequestError(response.text, response.status_code)
+        # Heroku returns a 503 when an application is in maintenance mode
+        elif response.status_code == 503:
+            raise CommentClientMaintenanceError(response.text)
+        elif response.status_code == 500:
+            raise CommentClient500Error(response.text)
+
+        text = response.text
+        if response_key is not None:
+            if responses is not None:
+                responses[response_key] = text
+            if cache_timeout:
+                cache.set(response_key, text, cache_timeout)
+
+    # Each caller decodes its own copy, as callers modify the data
+    if kwargs.get("raw", False):
+        return text
     else:
-        if kwargs.get("raw", False):
-            return response.text
-        else:
-            return json.loads(response.text)
+        return json.loads(text)
 
 
 class CommentClientError(Exception):
@@ -5,6 +5,7 @@ Module implementing `xblock.runtime.Runtime` functionality for the LMS
 import re
 
 from django.core.urlresolvers import reverse
+from dogapi import dog_stats_api
 
 from xmodule.x_module import ModuleSystem
 
@@ -104,4 +105,31 @@ class LmsModuleSystem(LmsHandlerUrls, ModuleSystem):  # pylint: disable=abstract
     """
     ModuleSystem specialized to the LMS
     """
-    pass
+    def __init__(self, get_fragment_cache_key=None, **kwargs):
+        """
+        :param get_fragment_cache_key: If set, the fully wrapped student_view
+            of blocks that declare `user_independent_student_view` is cached
+            in `cache`, since it is the same for every user, under the key
+            this function returns. It is only called when rendering such
+            blocks. The key must identify the block, its version and the
+            wrappers.
+        """
+        super(LmsModuleSystem, self).__init__(**kwargs)
+        self.get_fragment_cache_key = get_fragment_cache_key
+
+    def render(self, block, view_name, context=None):
+        if (
+            self.get_fragment_cache_key is None or view_name != 'student_view' or
+            not getattr(block, 'user_independent_student_view', False)
+        ):
+            return super(LmsModuleSystem, self).render(block, view_name, context)
+
+        key = u'{0}.{1}'.format(self.get_fragment_cache_key(), view_name)
+        frag = self.cache.get(key)
+        if frag is None:
+            dog_stats_api.increment('lms.xblock.fragment_cache.miss')
+            frag = super(LmsModuleSystem, self).render(block, view_name, context)
+            self.cache.set(key, frag)
+        else:
+            dog_stats_api.increment('lms.xblock.fragment_cache.hit')
+        return frag